@@ -111,6 +111,22 @@ def load_iotops_help():
         - name: Include multiple services in the support bundle with multiple --ops-service flags.
           text: >
             az iot ops support create-bundle --ops-service broker --ops-service connectors --ops-service deviceregistry
+
+        - name: Increase collector concurrency and bound the time any single collector may take.
+          text: >
+            az iot ops support create-bundle --max-workers 16 --element-timeout 300
+
+        - name: Stream container logs and keep at most the last 50 MB of each.
+          text: >
+            az iot ops support create-bundle --log-max-bytes 52428800
+
+        - name: Capture only what changed since a previous bundle.
+          text: >
+            az iot ops support create-bundle --since-bundle ~/ops/support_bundle_20241015T101500_aio.zip
+
+        - name: Include Prometheus metrics of broker, dataflow and connector pods, sampled twice 30 seconds apart to capture counter rates.
+          text: >
+            az iot ops support create-bundle --include-metrics --metrics-interval 30
     """
 
     helps[
@@ -183,6 +199,31 @@ def load_iotops_help():
             az iot ops broker list --in myinstance -g myresourcegroup
     """
 
+    helps[
+        "iot ops broker stats"
+    ] = """
+        type: command
+        short-summary: Show mqtt broker statistics from the diagnostics service.
+        long-summary: |
+            Statistics are read from the metrics endpoint of the broker diagnostics service
+            over a port-forwarded connection, no Prometheus deployment is required.
+            With --watch the connection is kept open and sampled at a fixed interval. Counters
+            are shown as rates per second next to their average over the sample window.
+
+        examples:
+        - name: Show the current broker statistics in the default namespace.
+          text: >
+            az iot ops broker stats
+
+        - name: Watch broker throughput, sampling every 2 seconds and averaging over the last 30 samples.
+          text: >
+            az iot ops broker stats --watch --refresh 2 --window 30
+
+        - name: Watch broker throughput in a custom namespace.
+          text: >
+            az iot ops broker stats -n mynamespace --watch
+    """
+
     helps[
         "iot ops broker delete"
     ] = """
@@ -1688,6 +1729,9 @@ def load_iotops_help():
         - name: Reverse application of init.
           text: >
             az iot ops delete -n myinstance -g myresourcegroup --include-deps
+        - name: Limit the number of resource deletions in progress at once.
+          text: >
+            az iot ops delete -n myinstance -g myresourcegroup --concurrency 4
     """
 
     helps[
@@ -1945,6 +1989,12 @@ def load_iotops_help():
         - name: Query for assets that have the given model, manufacturer, and serial number.
           text: >
             az iot ops asset query --model model1 --manufacturer contoso --serial-number 000-000-ABC10
+        - name: Count the assets within a given resource group.
+          text: >
+            az iot ops asset query -g myresourcegroup --count
+        - name: Stream the first 5000 assets of an instance as newline delimited JSON, 500 per page.
+          text: >
+            az iot ops asset query --instance myinstance --stream --top 5000 --page-size 500
     """
 
     helps[
@@ -1991,6 +2041,30 @@ def load_iotops_help():
             az iot ops asset update --name myasset -g myresourcegroup --disable --custom-attribute work_site=""
     """
 
+    helps[
+        "iot ops asset bulk-apply"
+    ] = """
+        type: command
+        short-summary: Create or replace many assets defined in a file.
+        long-summary: |
+            The file is json or yaml, holding a list of assets or a mapping with an `assets` list.
+            Each asset takes the `az iot ops asset create` arguments as keys, such as `asset_name`,
+            `endpoint_profile` and `description`. Events may be written as mappings with the keys of --event.
+            The resource group and instance arguments of this command are defaults for assets that do not set them.
+
+            Assets are submitted concurrently. Throttled requests are retried with backoff while the
+            concurrency is reduced. The result holds the outcome of each asset.
+
+        examples:
+        - name: Apply the assets of a file using the given instance in the same resource group.
+          text: >
+            az iot ops asset bulk-apply --file assets.yaml -g myresourcegroup --instance myinstance
+
+        - name: Apply the assets of a file with at most 4 submissions in flight and show the results as a table.
+          text: >
+            az iot ops asset bulk-apply --file assets.yaml -g myresourcegroup --instance myinstance --concurrency 4 -o table
+    """
+
     helps[
         "iot ops asset delete"
     ] = """
@@ -2318,6 +2392,12 @@ def load_iotops_help():
         - name: Query for asset endpoint profiles that have the given target address and instance name.
           text: >
             az iot ops asset endpoint query --target-address opc.tcp://opcplc-000000:50000 --instance myinstance
+        - name: Count the asset endpoint profiles of a given instance.
+          text: >
+            az iot ops asset endpoint query --instance myinstance --count
+        - name: Stream asset endpoint profiles as newline delimited JSON as each page is received.
+          text: >
+            az iot ops asset endpoint query --authentication-mode Anonymous --stream
     """
 
     helps[
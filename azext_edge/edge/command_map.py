@@ -76,6 +76,7 @@ def load_iotops_commands(self, _):
     ) as cmd_group:
         cmd_group.show_command("show", "show_broker")
         cmd_group.command("list", "list_brokers")
+        cmd_group.command("stats", "show_broker_stats", is_preview=True)
         cmd_group.command("delete", "delete_broker", deprecate_info=cmd_group.deprecate(hide=True))
 
     with self.command_group(
@@ -180,6 +181,7 @@ def load_iotops_commands(self, _):
         "iot ops asset",
         command_type=asset_resource_ops,
     ) as cmd_group:
+        cmd_group.command("bulk-apply", "bulk_apply_assets", is_preview=True)
         cmd_group.command("create", "create_asset")
         cmd_group.command("delete", "delete_asset")
         cmd_group.command("query", "query_assets")
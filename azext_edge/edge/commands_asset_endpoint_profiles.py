@@ -10,6 +10,7 @@ from knack.log import get_logger
 
 from .providers.rpsaas.adr.asset_endpoint_profiles import AssetEndpointProfiles
 from .common import AEPTypes
+from .util.resource_cache import disable_resource_cache
 
 logger = get_logger(__name__)
 
@@ -177,7 +178,15 @@ def query_asset_endpoint_profiles(
     location: Optional[str] = None,
     resource_group_name: Optional[str] = None,
     target_address: Optional[str] = None,
+    count: Optional[bool] = None,
+    stream: Optional[bool] = None,
+    page_size: Optional[int] = None,
+    top: Optional[int] = None,
+    no_cache: Optional[bool] = None,
 ) -> List[dict]:
+    if no_cache:
+        disable_resource_cache(cmd.cli_ctx)
+
     return AssetEndpointProfiles(cmd).query_asset_endpoint_profiles(
         asset_endpoint_profile_name=asset_endpoint_profile_name,
         auth_mode=auth_mode,
@@ -188,6 +197,10 @@ def query_asset_endpoint_profiles(
         location=location,
         resource_group_name=resource_group_name,
         target_address=target_address,
+        count=count,
+        stream=stream,
+        page_size=page_size,
+        top=top,
     )
 
 
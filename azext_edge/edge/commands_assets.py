@@ -9,6 +9,7 @@ from typing import Dict, List, Optional
 from knack.log import get_logger
 
 from .providers.rpsaas.adr.assets import Assets
+from .util.resource_cache import disable_resource_cache
 
 logger = get_logger(__name__)
 
@@ -84,6 +85,27 @@ def create_asset(
     )
 
 
+def bulk_apply_assets(
+    cmd,
+    file_path: str,
+    resource_group_name: Optional[str] = None,
+    instance_name: Optional[str] = None,
+    instance_resource_group: Optional[str] = None,
+    instance_subscription: Optional[str] = None,
+    concurrency: int = 16,
+    **kwargs
+) -> List[dict]:
+    return Assets(cmd).bulk_apply(
+        file_path=file_path,
+        resource_group_name=resource_group_name,
+        instance_name=instance_name,
+        instance_resource_group=instance_resource_group,
+        instance_subscription=instance_subscription,
+        concurrency=concurrency,
+        **kwargs
+    )
+
+
 def delete_asset(
     cmd,
     asset_name: str,
@@ -128,7 +150,15 @@ def query_assets(
     resource_group_name: Optional[str] = None,
     serial_number: Optional[str] = None,
     software_revision: Optional[str] = None,
+    count: Optional[bool] = None,
+    stream: Optional[bool] = None,
+    page_size: Optional[int] = None,
+    top: Optional[int] = None,
+    no_cache: Optional[bool] = None,
 ) -> dict:
+    if no_cache:
+        disable_resource_cache(cmd.cli_ctx)
+
     return Assets(cmd).query_assets(
         asset_name=asset_name,
         custom_query=custom_query,
@@ -150,7 +180,11 @@ def query_assets(
         product_code=product_code,
         serial_number=serial_number,
         software_revision=software_revision,
-        resource_group_name=resource_group_name
+        resource_group_name=resource_group_name,
+        count=count,
+        stream=stream,
+        page_size=page_size,
+        top=top,
     )
 
 
@@ -22,6 +22,7 @@ from .providers.orchestration.common import (
 )
 from .providers.orchestration.resources import Instances
 from .providers.support.base import get_bundle_path
+from .util.resource_cache import disable_resource_cache
 
 
 logger = get_logger(__name__)
@@ -35,6 +36,15 @@ def support_bundle(
     context_name: Optional[str] = None,
     ops_services: Optional[List[str]] = None,
     bundle_name: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    element_timeout: Optional[int] = None,
+    buffer_size_mb: Optional[int] = None,
+    stream_logs: Optional[bool] = None,
+    log_max_bytes: Optional[int] = None,
+    use_resource_snapshot: Optional[bool] = None,
+    since_bundle: Optional[str] = None,
+    include_metrics: Optional[bool] = None,
+    metrics_interval: Optional[int] = None,
 ) -> Union[Dict[str, Any], None]:
     load_config_context(context_name=context_name)
     from .providers.support_bundle import build_bundle
@@ -45,6 +55,15 @@ def support_bundle(
         bundle_path=str(bundle_path),
         log_age_seconds=log_age_seconds,
         include_mq_traces=include_mq_traces,
+        max_workers=max_workers,
+        element_timeout=element_timeout,
+        buffer_size=buffer_size_mb * 1024 * 1024 if buffer_size_mb else None,
+        stream_logs=stream_logs,
+        log_max_bytes=log_max_bytes,
+        use_resource_snapshot=use_resource_snapshot,
+        since_bundle=since_bundle,
+        include_metrics=include_metrics,
+        metrics_interval=metrics_interval,
     )
 
 
@@ -285,10 +304,14 @@ def upgrade_instance(
     plat_train: Optional[str] = None,
     plat_config_sync_mode: Optional[str] = None,
     force: Optional[bool] = None,
+    no_cache: Optional[bool] = None,
     **kwargs,
 ) -> Optional[List[dict]]:
     from .providers.orchestration.upgrade2 import upgrade_ops_instance
 
+    if no_cache:
+        disable_resource_cache(cmd.cli_ctx)
+
     return upgrade_ops_instance(
         cmd=cmd,
         resource_group_name=resource_group_name,
@@ -329,9 +352,14 @@ def delete(
     no_progress: Optional[bool] = None,
     force: Optional[bool] = None,
     include_dependencies: Optional[bool] = None,
+    concurrency: Optional[int] = None,
+    no_cache: Optional[bool] = None,
 ):
     from .providers.orchestration.deletion import delete_ops_resources
 
+    if no_cache:
+        disable_resource_cache(cmd.cli_ctx)
+
     return delete_ops_resources(
         cmd=cmd,
         instance_name=instance_name,
@@ -341,11 +369,22 @@ def delete(
         no_progress=no_progress,
         force=force,
         include_dependencies=include_dependencies,
+        concurrency=concurrency,
     )
 
 
-def show_instance(cmd, instance_name: str, resource_group_name: str, show_tree: Optional[bool] = None) -> dict:
-    return Instances(cmd).show(name=instance_name, resource_group_name=resource_group_name, show_tree=show_tree)
+def show_instance(
+    cmd,
+    instance_name: str,
+    resource_group_name: str,
+    show_tree: Optional[bool] = None,
+    no_cache: Optional[bool] = None,
+) -> dict:
+    if no_cache:
+        disable_resource_cache(cmd.cli_ctx)
+    return Instances(cmd).show(
+        name=instance_name, resource_group_name=resource_group_name, show_tree=show_tree, use_cache=True
+    )
 
 
 def list_instances(cmd, resource_group_name: Optional[str] = None) -> Iterable[dict]:
@@ -23,6 +23,21 @@ def list_brokers(cmd, instance_name: str, resource_group_name: str) -> Iterable[
     return Brokers(cmd).list(instance_name=instance_name, resource_group_name=resource_group_name)
 
 
+def show_broker_stats(
+    cmd,
+    namespace: Optional[str] = None,
+    context_name: Optional[str] = None,
+    watch: Optional[bool] = None,
+    refresh_in_seconds: int = 5,
+    window: int = 60,
+) -> Optional[dict]:
+    from .providers.base import load_config_context
+    from .providers.stats import get_stats
+
+    load_config_context(context_name=context_name)
+    return get_stats(namespace=namespace, watch=watch, refresh_in_seconds=refresh_in_seconds, window=window)
+
+
 def delete_broker(
     cmd, broker_name: str, instance_name: str, resource_group_name: str, confirm_yes: Optional[bool] = None, **kwargs
 ):
@@ -287,6 +287,10 @@ DEFAULT_BROKER_AUTHN = "default"
 DEFAULT_DATAFLOW_PROFILE = "default"
 DEFAULT_DATAFLOW_ENDPOINT = "default"
 
+# Asset constants
+MAX_ASSET_EVENTS = 1000
+MAX_ASSET_DATAPOINTS = 1000
+
 # Init Env Control
 
 INIT_NO_PREFLIGHT_ENV_KEY = "AIO_CLI_INIT_PREFLIGHT_DISABLED"
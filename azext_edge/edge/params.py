@@ -94,6 +94,13 @@ def load_iotops_arguments(self, _):
             arg_type=get_three_state_flag(),
             help="Force the operation to execute.",
         )
+        context.argument(
+            "no_cache",
+            options_list=["--no-cache"],
+            arg_type=get_three_state_flag(),
+            help="Bypass the resource cache and fetch all resources from Azure. The cache is opt-in, "
+            "enabled by setting a time to live in seconds with 'az config set iotops.cache_ttl=300'.",
+        )
         context.argument(
             "tags",
             options_list=["--tags"],
@@ -209,6 +216,73 @@ def load_iotops_arguments(self, _):
             help="The file name for the support bundle zip file. "
             "If not provided, the following format will be used: 'support_bundle_{timestamp}_aio'",
         )
+        context.argument(
+            "since_bundle",
+            options_list=["--since-bundle"],
+            help="Path to a previously produced support bundle. The new bundle will only contain objects "
+            "whose resourceVersion changed and container logs produced since the previous capture.",
+        )
+        context.argument(
+            "include_metrics",
+            options_list=["--include-metrics"],
+            arg_type=get_three_state_flag(),
+            help="Include a Prometheus metrics snapshot of broker, dataflow and connector pods in the support bundle.",
+        )
+        context.argument(
+            "metrics_interval",
+            options_list=["--metrics-interval"],
+            help="Seconds between two metrics samples. When provided with --include-metrics, the snapshot "
+            "also contains the per second rate of each counter over the interval.",
+            type=int,
+        )
+        context.argument(
+            "max_workers",
+            options_list=["--max-workers"],
+            help="Maximum number of support bundle collectors to run concurrently. "
+            "Use 1 to collect serially. The default is 8.",
+            type=int,
+            arg_group="Performance",
+        )
+        context.argument(
+            "element_timeout",
+            options_list=["--element-timeout"],
+            help="Time in seconds an individual collector may run before its collateral is omitted from the bundle. "
+            "By default collectors are not time constrained.",
+            type=int,
+            arg_group="Performance",
+        )
+        context.argument(
+            "buffer_size_mb",
+            options_list=["--buffer-size"],
+            help="Maximum size in MB of collected data held in memory while waiting to be written to the bundle. "
+            "The default is 64.",
+            type=int,
+            arg_group="Performance",
+        )
+        context.argument(
+            "stream_logs",
+            options_list=["--stream-logs"],
+            arg_type=get_three_state_flag(),
+            help="Stream container logs into the bundle in fixed-size chunks instead of reading each log into memory.",
+            arg_group="Performance",
+        )
+        context.argument(
+            "log_max_bytes",
+            options_list=["--log-max-bytes"],
+            help="Maximum number of bytes captured per container log. The most recent output is kept. "
+            "Implies --stream-logs.",
+            type=int,
+            arg_group="Performance",
+        )
+        context.argument(
+            "use_resource_snapshot",
+            options_list=["--resource-snapshot"],
+            arg_type=get_three_state_flag(),
+            help="List each runtime resource kind (pods, deployments, replicasets, services, daemonsets, "
+            "statefulsets, configmaps and jobs) once across the cluster and serve every collector from memory. "
+            "Reduces API server round-trips on large clusters.",
+            arg_group="Performance",
+        )
 
     with self.argument_context("iot ops check") as context:
         context.argument(
@@ -870,6 +944,26 @@ def load_iotops_arguments(self, _):
             help="Broker name.",
         )
 
+    with self.argument_context("iot ops broker stats") as context:
+        context.argument(
+            "watch",
+            options_list=["--watch"],
+            arg_type=get_three_state_flag(),
+            help="Keep sampling the broker metrics and render current and windowed rates live until interrupted.",
+        )
+        context.argument(
+            "refresh_in_seconds",
+            type=int,
+            options_list=["--refresh"],
+            help="Sampling interval in seconds when watching.",
+        )
+        context.argument(
+            "window",
+            type=int,
+            options_list=["--window"],
+            help="Number of samples averaged over when watching.",
+        )
+
     with self.argument_context("iot ops broker listener") as context:
         context.argument(
             "listener_name",
@@ -1102,7 +1196,7 @@ def load_iotops_arguments(self, _):
                 "enable_rsync_rules",
                 options_list=["--enable-rsync"],
                 arg_type=get_three_state_flag(),
-                deprecate_info=context.deprecate(target="--enable-rsync", redirect='az iot ops rsync enable'),
+                deprecate_info=context.deprecate(target="--enable-rsync", redirect="az iot ops rsync enable"),
                 help="Resource sync rules will be included in the IoT Operations deployment.",
             )
             context.argument(
@@ -1359,6 +1453,13 @@ def load_iotops_arguments(self, _):
             options_list=["--cluster"],
             help="Target cluster name for IoT Operations deletion.",
         )
+        context.argument(
+            "concurrency",
+            options_list=["--concurrency"],
+            type=int,
+            help="Maximum number of resource deletions in progress at once. "
+            "A resource is deleted as soon as the resources depending on it are gone.",
+        )
 
     with self.argument_context("iot ops secretsync") as context:
         context.argument(
@@ -6,8 +6,8 @@
 
 import socket
 from contextlib import contextmanager
+from threading import Lock
 from typing import Dict, Iterator, List, Optional, Union
-from urllib.request import urlopen
 
 from azure.cli.core.azclierror import ResourceNotFoundError
 from knack.log import get_logger
@@ -25,6 +25,8 @@ from ..common import K8sSecretType
 from ..util import is_enabled_str
 
 DEFAULT_NAMESPACE: str = "azure-iot-operations"
+METRICS_API_GROUP: str = "metrics.k8s.io"
+METRICS_API_VERSION: str = "v1beta1"
 
 logger = get_logger(__name__)
 generic = client.ApiClient()
@@ -130,6 +132,57 @@ def get_custom_objects(
         return _custom_object_cache[target_resource_key]
 
 
+_metrics_cache: dict = {}
+_metrics_locks: Dict[tuple, Lock] = {}
+_metrics_locks_lock = Lock()
+
+
+def get_pod_metrics(namespace: str, use_cache: bool = True) -> Dict[str, dict]:
+    """
+    Map pod name to its PodMetrics for all pods in a namespace using a single list call.
+    """
+    return _get_metrics(plural="pods", kind="PodMetrics", namespace=namespace, use_cache=use_cache)
+
+
+def get_node_metrics(use_cache: bool = True) -> Dict[str, dict]:
+    """
+    Map node name to its NodeMetrics using a single list call.
+    """
+    return _get_metrics(plural="nodes", kind="NodeMetrics", use_cache=use_cache)
+
+
+def _get_metrics(plural: str, kind: str, namespace: Optional[str] = None, use_cache: bool = True) -> Dict[str, dict]:
+    target_metrics_key = (plural, namespace)
+    with _metrics_locks_lock:
+        lock = _metrics_locks.setdefault(target_metrics_key, Lock())
+
+    # Serialize per key so concurrent callers share one list call, without waiting on other keys.
+    with lock:
+        if use_cache and target_metrics_key in _metrics_cache:
+            return _metrics_cache[target_metrics_key]
+
+        result = {}
+        try:
+            custom_client = client.CustomObjectsApi()
+            kwargs = {"group": METRICS_API_GROUP, "version": METRICS_API_VERSION, "plural": plural}
+            if namespace:
+                result = custom_client.list_namespaced_custom_object(namespace=namespace, **kwargs)
+            else:
+                result = custom_client.list_cluster_custom_object(**kwargs)
+        except ApiException as ae:
+            logger.debug(str(ae))
+
+        metrics = {}
+        if isinstance(result, dict):
+            api_version = result.get("apiVersion", f"{METRICS_API_GROUP}/{METRICS_API_VERSION}")
+            for item in result.get("items", []):
+                # List items omit their own type information.
+                metrics[item["metadata"]["name"]] = {"apiVersion": api_version, "kind": kind, **item}
+        # Unavailable metrics are cached too, avoiding a failing call per pod.
+        _metrics_cache[target_metrics_key] = metrics
+        return metrics
+
+
 _cluster_resource_api_cache: dict = {}
 
 
@@ -151,54 +204,155 @@ def get_cluster_custom_api(group: str, version: str, raise_on_404: bool = False)
         return _cluster_resource_api_cache[target_resource_api_key]
 
 
-class PodRequest:
-    def __init__(self, namespace: str, pod_name: str, pod_port: str):
-        self.namespace = namespace
-        self.pod_name = pod_name
-        self.pod_port = pod_port
-
-    def get(self, resource_path: str):
-        with urlopen(self._build_url(resource_path=resource_path)) as response:
-            return response.read().decode("utf-8")
+PORTFORWARD_SOCKET_TIMEOUT_SEC = 10.0
+PORTFORWARD_IDLE_TIMEOUT_SEC = 60
+PORTFORWARD_MAX_IDLE_PER_KEY = 4
 
-    def _build_url(self, resource_path: str):
-        return f"http://{self.pod_name}.{self.namespace}.kubernetes:{self.pod_port}{resource_path}"
 
+class PortforwardTunnel:
+    """
+    A port-forward websocket to a single pod port and the socket connected through it.
+    """
 
-@contextmanager
-def portforward_http(namespace: str, pod_name: str, pod_port: str, **kwargs) -> Iterator[PodRequest]:
-    from kubernetes.stream import portforward
+    def __init__(self, key: tuple, portforward, pod_socket: socket.socket):
+        self.key = key
+        self.portforward = portforward
+        self.socket = pod_socket
+        self.released_at: Optional[float] = None
+
+    def is_reusable(self, now: float, idle_timeout_sec: float) -> bool:
+        import select
+
+        if self.released_at is not None and now - self.released_at > idle_timeout_sec:
+            return False
+        if self.socket.fileno() == -1 or not getattr(self.portforward, "connected", True):
+            return False
+        try:
+            readable, _, _ = select.select([self.socket], [], [], 0)
+        except (OSError, ValueError):
+            return False
+        # An idle connection has nothing to read. Readable means the pod side closed it.
+        return not readable
+
+    def close(self):
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
+        self.portforward.close()
+
+
+class PortforwardPool:
+    """
+    Thread-safe pool of port-forward tunnels keyed by (namespace, pod name, pod port).
 
-    api = client.CoreV1Api()
+    Tunnels returned in good order are kept for reuse by later requests to the same pod port, so the
+    websocket handshake is paid once. Tunnels idle for longer than idle_timeout_sec, closed by the pod,
+    or released after an error are closed instead. Used as a context manager the pool closes all idle
+    tunnels on exit.
+    """
 
-    def kubernetes_create_connection(address, *args, **kwargs):
-        dns_name = address[0]
-        if isinstance(dns_name, bytes):
-            dns_name = dns_name.decode()
-        dns_name = dns_name.split(".")
-        if len(dns_name) != 3 or dns_name[2] != "kubernetes":
-            return socket_create_connection(address, *args, **kwargs)
-        pf = portforward(
-            api.connect_get_namespaced_pod_portforward,
-            dns_name[0],
-            dns_name[1],
-            ports=str(address[1]),
+    def __init__(
+        self,
+        idle_timeout_sec: float = PORTFORWARD_IDLE_TIMEOUT_SEC,
+        max_idle_per_key: int = PORTFORWARD_MAX_IDLE_PER_KEY,
+    ):
+        self.idle_timeout_sec = idle_timeout_sec
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[tuple, List[PortforwardTunnel]] = {}
+        self._lock = Lock()
+
+    def __enter__(self) -> "PortforwardPool":
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    @contextmanager
+    def socket(
+        self, namespace: str, pod_name: str, pod_port: Union[int, str], internal_tls: Optional[bool] = None
+    ) -> Iterator[socket.socket]:
+        """
+        Lease a socket connected to the pod port. The socket must be left ready for another request.
+        """
+        key = (namespace, pod_name, int(pod_port))
+        tunnel = self._acquire(key) or open_portforward_tunnel(
+            namespace=namespace, pod_name=pod_name, pod_port=pod_port, internal_tls=internal_tls
         )
-        return pf.socket(address[1])
-
-    socket_create_connection = socket.create_connection
-    try:
-        socket.create_connection = kubernetes_create_connection
-        pod_request = PodRequest(namespace=namespace, pod_name=pod_name, pod_port=pod_port)
-        yield pod_request
-    finally:
-        socket.create_connection = socket_create_connection
+        try:
+            yield tunnel.socket
+        except BaseException:
+            tunnel.close()
+            raise
+        self._release(tunnel)
+
+    def close(self):
+        with self._lock:
+            tunnels = [tunnel for key_tunnels in self._idle.values() for tunnel in key_tunnels]
+            self._idle.clear()
+        for tunnel in tunnels:
+            tunnel.close()
+
+    def _acquire(self, key: tuple) -> Optional[PortforwardTunnel]:
+        from time import monotonic
+
+        stale = []
+        leased = None
+        with self._lock:
+            key_tunnels = self._idle.get(key, [])
+            while key_tunnels:
+                # Most recently released first, the least likely to have been closed by the pod.
+                tunnel = key_tunnels.pop()
+                if tunnel.is_reusable(now=monotonic(), idle_timeout_sec=self.idle_timeout_sec):
+                    leased = tunnel
+                    break
+                stale.append(tunnel)
+        for tunnel in stale:
+            tunnel.close()
+        if leased:
+            logger.debug(f"Reusing port-forward tunnel to {key}.")
+        return leased
+
+    def _release(self, tunnel: PortforwardTunnel):
+        from time import monotonic
+
+        if tunnel.socket.fileno() == -1:
+            tunnel.close()
+            return
+        tunnel.released_at = monotonic()
+        evicted = []
+        with self._lock:
+            key_tunnels = self._idle.setdefault(tunnel.key, [])
+            key_tunnels.append(tunnel)
+            while len(key_tunnels) > self.max_idle_per_key:
+                evicted.append(key_tunnels.pop(0))
+            for key in list(self._idle):
+                for idle_tunnel in list(self._idle[key]):
+                    if tunnel.released_at - idle_tunnel.released_at > self.idle_timeout_sec:
+                        self._idle[key].remove(idle_tunnel)
+                        evicted.append(idle_tunnel)
+        for idle_tunnel in evicted:
+            idle_tunnel.close()
+
+
+def open_portforward_tunnel(
+    namespace: str, pod_name: str, pod_port: Union[int, str], internal_tls: Optional[bool] = None
+) -> PortforwardTunnel:
+    """
+    internal_tls: whether the broker encrypts internal traffic. When not provided it is determined
+    from the first broker in the namespace.
+    """
+    from kubernetes.stream import portforward
 
+    if internal_tls is None:
+        from .edge_api import MqResourceKinds, MQ_ACTIVE_API
 
-@contextmanager
-def portforward_socket(namespace: str, pod_name: str, pod_port: str) -> Iterator[socket.socket]:
-    from kubernetes.stream import portforward
-    from .edge_api import MqResourceKinds, MQ_ACTIVE_API
+        namespaced_brokers: dict = MQ_ACTIVE_API.get_resources(MqResourceKinds.BROKER, namespace=namespace)
+        broker = None
+        if namespaced_brokers and namespaced_brokers["items"]:
+            broker = namespaced_brokers["items"][0]
+        internal_tls = is_broker_internal_tls(broker)
 
     api = client.CoreV1Api()
     pf = portforward(
@@ -209,17 +363,6 @@ def portforward_socket(namespace: str, pod_name: str, pod_port: str) -> Iterator
     )
     target_socket: socket.socket = pf.socket(int(pod_port))._socket
 
-    internal_tls = False
-    namespaced_brokers: dict = MQ_ACTIVE_API.get_resources(MqResourceKinds.BROKER, namespace=namespace)
-    broker = None
-    if namespaced_brokers and namespaced_brokers["items"]:
-        broker: Dict[str, Union[str, dict]] = namespaced_brokers["items"][0]
-
-    if broker and broker["spec"]:
-        encrypt_internal_traffic = broker["spec"].get("advanced", {}).get("encryptInternalTraffic")
-        if is_enabled_str(encrypt_internal_traffic):
-            internal_tls = True
-
     if internal_tls:
         import ssl
 
@@ -229,10 +372,121 @@ def portforward_socket(namespace: str, pod_name: str, pod_port: str) -> Iterator
         context.verify_mode = ssl.CERT_NONE
         target_socket = context.wrap_socket(sock=target_socket)
 
-    target_socket.settimeout(10.0)
-    yield target_socket
-    target_socket.shutdown(socket.SHUT_RDWR)
-    target_socket.close()
+    target_socket.settimeout(PORTFORWARD_SOCKET_TIMEOUT_SEC)
+    return PortforwardTunnel(key=(namespace, pod_name, int(pod_port)), portforward=pf, pod_socket=target_socket)
+
+
+class PodRequest:
+    """
+    HTTP requests to a pod port over pooled keep-alive port-forward tunnels.
+    """
+
+    def __init__(self, namespace: str, pod_name: str, pod_port: str, pool: PortforwardPool):
+        self.namespace = namespace
+        self.pod_name = pod_name
+        self.pod_port = pod_port
+        self.pool = pool
+
+    def get(self, resource_path: str) -> str:
+        from http.client import RemoteDisconnected
+        from urllib.error import HTTPError
+
+        try:
+            return self._get(resource_path=resource_path)
+        except HTTPError:
+            # The pod answered, retrying will not help.
+            raise
+        except (ConnectionError, RemoteDisconnected) as e:
+            # A pooled tunnel can be closed by the pod between requests, retry once on a new one.
+            logger.debug(f"Request to {self.pod_name} failed, retrying on a new tunnel: {e}")
+            return self._get(resource_path=resource_path)
+
+    def iter_lines(self, resource_path: str) -> Iterator[str]:
+        """
+        Stream the response body line by line rather than reading it into memory.
+        """
+        with self.pool.socket(
+            namespace=self.namespace, pod_name=self.pod_name, pod_port=self.pod_port, internal_tls=False
+        ) as pod_socket:
+            response = self._request(pod_socket=pod_socket, resource_path=resource_path)
+            for line in response:
+                yield line.decode("utf-8")
+
+    def _get(self, resource_path: str) -> str:
+        with self.pool.socket(
+            namespace=self.namespace, pod_name=self.pod_name, pod_port=self.pod_port, internal_tls=False
+        ) as pod_socket:
+            return self._request(pod_socket=pod_socket, resource_path=resource_path).read().decode("utf-8")
+
+    def _request(self, pod_socket: socket.socket, resource_path: str):
+        from http.client import HTTPConnection
+        from urllib.error import HTTPError
+
+        connection = HTTPConnection(host=f"{self.pod_name}.{self.namespace}", port=int(self.pod_port))
+        connection.sock = pod_socket
+        # Never dial a new connection directly, the pool owns the tunnels.
+        connection.auto_open = 0
+        connection.request("GET", resource_path)
+        response = connection.getresponse()
+        if response.status >= 400:
+            raise HTTPError(
+                url=self._build_url(resource_path), code=response.status, msg=response.reason, hdrs=None, fp=None
+            )
+        return response
+
+    def _build_url(self, resource_path: str):
+        return f"http://{self.pod_name}.{self.namespace}:{self.pod_port}{resource_path}"
+
+
+@contextmanager
+def portforward_http(
+    namespace: str, pod_name: str, pod_port: str, pool: Optional[PortforwardPool] = None, **kwargs
+) -> Iterator[PodRequest]:
+    """
+    Requests made through the yielded PodRequest share keep-alive tunnels from pool. Without a pool
+    the tunnels are kept for the duration of the context.
+    """
+    if pool:
+        yield PodRequest(namespace=namespace, pod_name=pod_name, pod_port=pod_port, pool=pool)
+        return
+    with PortforwardPool() as context_pool:
+        yield PodRequest(namespace=namespace, pod_name=pod_name, pod_port=pod_port, pool=context_pool)
+
+
+@contextmanager
+def portforward_socket(
+    namespace: str,
+    pod_name: str,
+    pod_port: str,
+    internal_tls: Optional[bool] = None,
+    pool: Optional[PortforwardPool] = None,
+) -> Iterator[socket.socket]:
+    """
+    internal_tls: whether the broker encrypts internal traffic. When not provided it is determined
+    from the first broker in the namespace.
+    pool: lease the socket from a pool of tunnels. Without a pool a new tunnel is opened and closed on exit.
+    """
+    if pool:
+        with pool.socket(
+            namespace=namespace, pod_name=pod_name, pod_port=pod_port, internal_tls=internal_tls
+        ) as pod_socket:
+            yield pod_socket
+        return
+
+    tunnel = open_portforward_tunnel(
+        namespace=namespace, pod_name=pod_name, pod_port=pod_port, internal_tls=internal_tls
+    )
+    try:
+        yield tunnel.socket
+    finally:
+        tunnel.close()
+
+
+def is_broker_internal_tls(broker: Optional[Dict[str, Union[str, dict]]]) -> bool:
+    if broker and broker.get("spec"):
+        encrypt_internal_traffic = broker["spec"].get("advanced", {}).get("encryptInternalTraffic")
+        return is_enabled_str(encrypt_internal_traffic)
+    return False
 
 
 def create_namespaced_secret(
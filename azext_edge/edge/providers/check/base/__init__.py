@@ -5,8 +5,9 @@
 # ----------------------------------------------------------------------------------------------
 
 from .check_manager import CheckManager
-from .deployment import check_pre_deployment, check_post_deployment
+from .deployment import check_pre_deployment, check_post_deployment, run_check_funcs
 from .display import add_display_and_eval, display_as_list
+from .index import CheckResourceIndex, check_resource_index
 from .node import check_nodes
 from .pod import evaluate_pod_health
 from .resource import (
@@ -14,6 +15,7 @@ from .resource import (
     filter_resources_by_name,
     filter_resources_by_namespace,
     generate_target_resource_name,
+    get_resource_by_ref,
     get_resources_by_name,
     get_resources_grouped_by_namespace,
     get_resource_metadata_property,
@@ -29,15 +31,18 @@ from .resource import (
 __all__ = [
     "add_display_and_eval",
     "CheckManager",
+    "CheckResourceIndex",
     "check_nodes",
     "check_post_deployment",
     "check_pre_deployment",
+    "check_resource_index",
     "display_as_list",
     "enumerate_ops_service_resources",
     "evaluate_pod_health",
     "filter_resources_by_name",
     "filter_resources_by_namespace",
     "generate_target_resource_name",
+    "get_resource_by_ref",
     "get_resources_by_name",
     "get_resources_grouped_by_namespace",
     "get_resource_metadata_property",
@@ -46,6 +51,7 @@ __all__ = [
     "process_resource_properties",
     "validate_one_of_conditions",
     "process_custom_resource_status",
+    "run_check_funcs",
     "validate_runtime_resource_ref",
     "get_valid_resource_names",
 ]
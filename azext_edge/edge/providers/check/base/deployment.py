@@ -16,7 +16,7 @@ from rich.padding import Padding
 from ....common import CheckTaskStatus, ListableEnum
 from ....providers.edge_api import EdgeResourceApi
 from ...base import client, load_config_context
-from ..common import NON_ERROR_STATUSES, CoreServiceResourceKinds, ResourceOutputDetailLevel
+from ..common import CHECK_MAX_WORKERS, NON_ERROR_STATUSES, CoreServiceResourceKinds, ResourceOutputDetailLevel
 from .check_manager import CheckManager
 from .node import check_nodes
 from .resource import enumerate_ops_service_resources
@@ -107,6 +107,7 @@ def check_post_deployment(
         results = [resource_enumeration]
         lowercase_api_resources = {k.lower(): v for k, v in api_resources.items()}
 
+    pending_evaluations: List[Callable[[], dict]] = []
     for resource, evaluate_func in evaluate_funcs.items():
         should_check_resource = not resource_kinds or resource.value in resource_kinds
         append_resource = False
@@ -119,10 +120,31 @@ def check_post_deployment(
             append_resource = True
 
         if append_resource:
-            results.append(evaluate_func(detail_level=detail_level, as_list=as_list, resource_name=resource_name))
+            pending_evaluations.append(
+                partial(evaluate_func, detail_level=detail_level, as_list=as_list, resource_name=resource_name)
+            )
+
+    results.extend(run_check_funcs(pending_evaluations))
     return results
 
 
+def run_check_funcs(check_funcs: List[Callable[[], Any]], max_workers: int = CHECK_MAX_WORKERS) -> List[Any]:
+    """
+    Run independent check functions concurrently, returning their results in the given order.
+
+    Each check builds its own CheckManager, so results are only combined by the caller
+    after all complete and output stays the same as a serial run.
+    """
+    if len(check_funcs) <= 1 or max_workers <= 1:
+        return [check_func() for check_func in check_funcs]
+
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(check_funcs)), thread_name_prefix="aio-check") as executor:
+        futures = [executor.submit(check_func) for check_func in check_funcs]
+        return [future.result() for future in futures]
+
+
 def _check_k8s_version(as_list: bool = False) -> Dict[str, Any]:
     from kubernetes.client.models import VersionInfo
 
@@ -0,0 +1,142 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import re
+from contextlib import contextmanager
+from enum import Enum
+from fnmatch import translate
+from functools import lru_cache
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from knack.log import get_logger
+
+from ...edge_api import EdgeResourceApi
+
+logger = get_logger(__name__)
+
+IndexKey = Tuple[str, str, str]
+_GLOB_CHARS = re.compile(r"[*?\[]")
+
+
+@lru_cache(maxsize=256)
+def compile_name_pattern(resource_name: str) -> Callable[[str], bool]:
+    """
+    Compile a resource name glob once into a matcher, using fnmatch semantics.
+    """
+    resource_name = resource_name.lower()
+    if not _GLOB_CHARS.search(resource_name):
+        return lambda name: name == resource_name
+    match = re.compile(translate(resource_name)).match
+    return lambda name: name is not None and match(name) is not None
+
+
+class CheckResourceIndex:
+    """
+    Check run scoped index of custom resources as kind -> namespace -> name -> object.
+
+    Each kind is listed once across all namespaces. Name filters and reference lookups
+    by evaluators are then served from memory.
+    """
+
+    def __init__(self):
+        self.lists_issued = 0
+        self._items: Dict[IndexKey, List[dict]] = {}
+        self._by_namespace: Dict[IndexKey, Dict[Optional[str], Dict[str, dict]]] = {}
+        self._locks: Dict[IndexKey, Lock] = {}
+        self._locks_lock = Lock()
+
+    def get_resources(
+        self,
+        api_info: EdgeResourceApi,
+        kind: Union[str, Enum],
+        resource_name: Optional[str] = None,
+        namespace: Optional[str] = None,
+    ) -> List[dict]:
+        key = self._ensure_kind(api_info, kind)
+        if namespace:
+            resources = list(self._by_namespace[key].get(namespace, {}).values())
+        else:
+            resources = self._items[key]
+
+        if not resource_name:
+            return list(resources)
+        if not _GLOB_CHARS.search(resource_name):
+            return self._get_by_name(key, resource_name.lower(), namespace)
+
+        matcher = compile_name_pattern(resource_name)
+        return [resource for resource in resources if matcher(resource.get("metadata", {}).get("name"))]
+
+    def get_resource(
+        self,
+        api_info: EdgeResourceApi,
+        kind: Union[str, Enum],
+        name: str,
+        namespace: Optional[str] = None,
+    ) -> Optional[dict]:
+        if not name:
+            return None
+        key = self._ensure_kind(api_info, kind)
+        resources = self._get_by_name(key, name, namespace)
+        return resources[0] if resources else None
+
+    def get_names(
+        self, api_info: EdgeResourceApi, kind: Union[str, Enum], namespace: Optional[str] = None
+    ) -> List[str]:
+        return [
+            resource.get("metadata", {}).get("name")
+            for resource in self.get_resources(api_info=api_info, kind=kind, namespace=namespace)
+        ]
+
+    def _get_by_name(self, key: IndexKey, name: str, namespace: Optional[str] = None) -> List[dict]:
+        by_namespace = self._by_namespace[key]
+        namespaces = [namespace] if namespace else list(by_namespace)
+        return [
+            by_namespace[ns][name] for ns in namespaces if ns in by_namespace and name in by_namespace[ns]
+        ]
+
+    def _ensure_kind(self, api_info: EdgeResourceApi, kind: Union[str, Enum]) -> IndexKey:
+        if isinstance(kind, Enum):
+            kind = kind.value
+        key = (api_info.group, api_info.version, kind)
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, Lock())
+
+        with lock:
+            if key not in self._items:
+                items: List[dict] = (api_info.get_resources(kind=kind) or {}).get("items", [])
+                by_namespace: Dict[Optional[str], Dict[str, dict]] = {}
+                for item in items:
+                    metadata = item.get("metadata", {})
+                    # First listed wins, matching a scan of the listing.
+                    by_namespace.setdefault(metadata.get("namespace"), {}).setdefault(metadata.get("name"), item)
+                self._by_namespace[key] = by_namespace
+                self._items[key] = items
+                self.lists_issued += 1
+                logger.debug(f"Indexed {len(items)} {kind} resources.")
+        return key
+
+
+_active_index: Optional[CheckResourceIndex] = None
+
+
+def get_check_resource_index() -> Optional[CheckResourceIndex]:
+    return _active_index
+
+
+@contextmanager
+def check_resource_index() -> Iterator[CheckResourceIndex]:
+    """
+    Serve custom resource lookups by check evaluators from one index for the duration of a check run.
+    """
+    global _active_index
+
+    index = CheckResourceIndex()
+    _active_index = index
+    try:
+        yield index
+    finally:
+        _active_index = None
@@ -86,6 +86,7 @@ def _generate_node_table(
     from kubernetes.utils import parse_quantity
 
     from ....util.machinery import scoped_semver_import
+    from ...base import get_node_metrics
 
     semver = scoped_semver_import()
 
@@ -114,9 +115,19 @@ def _generate_node_table(
         ]
     )
     single_node = len(nodes.items) == 1
+    # Shares the cached metrics.k8s.io listing used by the support bundle.
+    node_metrics = get_node_metrics()
+    usage_lines = []
     node: V1Node
     for node in nodes.items:
         node_name = node.metadata.name
+        node_usage = node_metrics.get(node_name, {}).get("usage")
+        if node_usage:
+            usage_cpu = parse_quantity(node_usage.get("cpu", 0))
+            usage_memory = parse_quantity(node_usage.get("memory", 0))
+            usage_lines.append(
+                f"{node_name}: {'%.2f' % usage_cpu} vCPU, {'%.2f' % (usage_memory / DISPLAY_BYTES_PER_GIGABYTE)}G memory"
+            )
 
         # skip control plane node checks if not single node
         is_control_plane_node = node.metadata.labels and NODE_CONTROL_PLANE_LABEL in node.metadata.labels
@@ -217,6 +228,8 @@ def _generate_node_table(
             row_status = CheckTaskStatus.skipped
             node_name = f"[dim]{node_name}[/dim]"
         table.add_row(COLOR_STR_FORMAT.format(color=row_status.color, value=node_name), *row_cells)
+    if usage_lines:
+        table.caption = "\n".join(["Current usage", *usage_lines])
     return table
 
 
@@ -18,6 +18,7 @@ from azext_edge.edge.providers.k8s.config_map import get_config_map
 
 from .check_manager import CheckManager
 from .display import process_value_color
+from .index import compile_name_pattern, get_check_resource_index
 from ..common import COLOR_STR_FORMAT, PADDING_SIZE, ResourceOutputDetailLevel, ValidationResourceType
 from ...base import get_cluster_custom_api, get_namespaced_secret
 from ...edge_api import EdgeResourceApi
@@ -80,16 +81,12 @@ def filter_resources_by_name(
     resources: List[dict],
     resource_name: str,
 ) -> List[dict]:
-    from fnmatch import fnmatch
-
     if not resource_name:
         return resources
 
-    resource_name = resource_name.lower()
+    matcher = compile_name_pattern(resource_name)
     resources = [
-        resource
-        for resource in resources
-        if fnmatch(get_resource_metadata_property(resource, prop_name="name"), resource_name)
+        resource for resource in resources if matcher(get_resource_metadata_property(resource, prop_name="name"))
     ]
 
     return resources
@@ -114,11 +111,36 @@ def get_resources_by_name(
     resource_name: str,
     namespace: str = None,
 ) -> List[dict]:
+    index = get_check_resource_index()
+    if index:
+        return index.get_resources(api_info=api_info, kind=kind, resource_name=resource_name, namespace=namespace)
+
     resources: list = api_info.get_resources(kind=kind, namespace=namespace).get("items", [])
     resources = filter_resources_by_name(resources, resource_name)
     return resources
 
 
+def get_resource_by_ref(
+    api_info: EdgeResourceApi,
+    kind: Union[str, Enum],
+    name: str,
+    namespace: Optional[str] = None,
+) -> Optional[dict]:
+    """
+    Resolve a resource reference by exact name, from the check run index when active.
+    """
+    index = get_check_resource_index()
+    if index:
+        return index.get_resource(api_info=api_info, kind=kind, name=name, namespace=namespace)
+
+    if not name:
+        return None
+    resources = api_info.get_resources(kind=kind, namespace=namespace).get("items", [])
+    for resource in resources:
+        if get_resource_metadata_property(resource, prop_name="name") == name:
+            return resource
+
+
 def get_resources_grouped_by_namespace(resources: List[dict]):
     resources.sort(key=_get_namespace)
     return groupby(resources, key=_get_namespace)
@@ -487,6 +509,10 @@ def validate_runtime_resource_ref(name: str, namespace: str, ref_type: Validatio
 def get_valid_resource_names(
     api: EdgeResourceApi, kind: Union[Enum, str], namespace: Optional[str] = None
 ) -> List[str]:
+    index = get_check_resource_index()
+    if index:
+        return index.get_names(api_info=api, kind=kind, namespace=namespace)
+
     custom_objects = api.get_resources(kind=kind, namespace=namespace)
     if custom_objects:
         objects: List[dict] = custom_objects.get("items", [])
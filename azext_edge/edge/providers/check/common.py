@@ -99,12 +99,12 @@ BROKER_DIAGNOSTICS_PROPERTIES = [
     ("traces.mode", "Trace Mode", False),
 ]
 
-MAX_ASSET_EVENTS = 1000
-MAX_ASSET_DATAPOINTS = 1000
-
 # Check constants
 ALL_NAMESPACES_TARGET = "_all_"
 
+# Upper bound on independent check evaluations run concurrently
+CHECK_MAX_WORKERS = 8
+
 
 # when there are runtime resources related to the service but not
 # related to any service resource, use this as the resource name
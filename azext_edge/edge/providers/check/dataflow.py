@@ -4,7 +4,7 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
-from typing import List
+from typing import Dict, List
 
 from knack.log import get_logger
 from rich.padding import Padding
@@ -194,7 +194,7 @@ def _process_dataflow_sourcesettings(
     target: str,
     namespace: str,
     dataflow_name: str,
-    endpoints: List[dict],
+    endpoints: Dict[str, dict],
     operation: dict,
     detail_level: int,
     padding: int,
@@ -212,9 +212,7 @@ def _process_dataflow_sourcesettings(
     endpoint_ref_status = endpoint_type_status = CheckTaskStatus.error
     endpoint_type_status_string = "invalid"
 
-    found_endpoint = next(
-        (endpoint for endpoint in endpoints if "name" in endpoint and endpoint["name"] == endpoint_ref), None
-    )
+    found_endpoint = endpoints.get(endpoint_ref)
     endpoint_type = found_endpoint["type"] if found_endpoint and "type" in found_endpoint else None
 
     if found_endpoint:
@@ -421,7 +419,7 @@ def _process_dataflow_destinationsettings(
     target: str,
     namespace: str,
     dataflow_name: str,
-    endpoints: List[dict],
+    endpoints: Dict[str, dict],
     operation: dict,
     detail_level: int,
     padding: int,
@@ -435,9 +433,7 @@ def _process_dataflow_destinationsettings(
 
     # currently we are only looking for endpoint references in the same namespace
     # duplicate names should not exist, so check the first endpoint that matches the name ref
-    endpoint_match = next(
-        (endpoint for endpoint in endpoints if "name" in endpoint and endpoint["name"] == endpoint_ref), None
-    )
+    endpoint_match = endpoints.get(endpoint_ref)
 
     endpoint_validity = "valid"
     endpoint_status = CheckTaskStatus.success
@@ -1044,13 +1040,13 @@ def evaluate_dataflows(
             resource_name=None,
         )
 
-        endpoints = [
-            {
-                "name": endpoint.get("metadata", {}).get("name"),
-                "type": endpoint.get("spec", {}).get("endpointType"),
-            }
-            for endpoint in all_endpoints
-        ]
+        # endpoint refs are resolved by name, duplicate names should not exist so the first wins
+        endpoints: Dict[str, dict] = {}
+        for endpoint in all_endpoints:
+            endpoint_name = endpoint.get("metadata", {}).get("name")
+            endpoints.setdefault(
+                endpoint_name, {"name": endpoint_name, "type": endpoint.get("spec", {}).get("endpointType")}
+            )
 
         for dataflow in list(dataflows):
             spec = dataflow.get("spec", {})
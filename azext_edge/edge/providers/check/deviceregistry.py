@@ -11,6 +11,7 @@ from .base import (
     add_display_and_eval,
     check_post_deployment,
     generate_target_resource_name,
+    get_resource_by_ref,
     get_resources_by_name,
     process_list_resource,
     process_resource_properties,
@@ -19,14 +20,12 @@ from .base import (
 
 from rich.padding import Padding
 
-from ...common import CheckTaskStatus
+from ...common import MAX_ASSET_DATAPOINTS, MAX_ASSET_EVENTS, CheckTaskStatus
 
 from .common import (
     ASSET_DATAPOINT_PROPERTIES,
     ASSET_EVENT_PROPERTIES,
     ASSET_PROPERTIES,
-    MAX_ASSET_DATAPOINTS,
-    MAX_ASSET_EVENTS,
     PADDING_SIZE,
     ResourceOutputDetailLevel,
 )
@@ -120,10 +119,10 @@ def evaluate_assets(
 
             asset_spec = asset["spec"]
             endpoint_profile_uri = asset_spec.get("assetEndpointProfileRef", "")
-            endpoint_profile = get_resources_by_name(
+            endpoint_profile = get_resource_by_ref(
                 api_info=DEVICEREGISTRY_API_V1,
                 kind=DeviceRegistryResourceKinds.ASSETENDPOINTPROFILE,
-                resource_name=endpoint_profile_uri
+                name=endpoint_profile_uri
             )
             spec_padding = padding + PADDING_SIZE
 
@@ -4,6 +4,7 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
+from functools import partial
 from typing import List, NamedTuple
 
 from rich.padding import Padding
@@ -13,7 +14,7 @@ from rich.console import NewLine
 from ...common import OPCUA_SERVICE, CheckTaskStatus, OpsServiceType
 from ...providers.edge_api import DATAFLOW_API_V1, DEVICEREGISTRY_API_V1, MQ_ACTIVE_API
 from .akri import check_akri_deployment
-from .base import CheckManager
+from .base import CheckManager, run_check_funcs
 from .base.display import colorize_string
 from .common import ResourceOutputDetailLevel
 from .dataflow import PADDING, check_dataflows_deployment
@@ -69,16 +70,22 @@ def check_summary(
         ),
     ]
 
-    check_manager = CheckManager(check_name="evalAIOSummary", check_desc="Service summary checks")
-    for check in service_checks:
+    # run service checks concurrently, results are merged below in service order
+    service_results = run_check_funcs(
+        [
+            partial(
+                check.check_func,
+                detail_level=ResourceOutputDetailLevel.summary.value,
+                resource_name=resource_name,
+                as_list=as_list,
+                resource_kinds=resource_kinds,
+            )
+            for check in service_checks
+        ]
+    )
 
-        # run checks for service
-        result = check.check_func(
-            detail_level=ResourceOutputDetailLevel.summary.value,
-            resource_name=resource_name,
-            as_list=as_list,
-            resource_kinds=resource_kinds,
-        )
+    check_manager = CheckManager(check_name="evalAIOSummary", check_desc="Service summary checks")
+    for check, result in zip(service_checks, service_results):
 
         # add service check results to check manager
         target = check.target
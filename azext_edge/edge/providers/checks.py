@@ -11,7 +11,7 @@ from azext_edge.edge.providers.edge_api.dataflow import DataflowResourceKinds
 from rich.console import Console
 
 from ..common import OPCUA_SERVICE, ListableEnum, OpsServiceType
-from .check.base import check_pre_deployment, display_as_list
+from .check.base import check_pre_deployment, check_resource_index, display_as_list
 from .check.common import COLOR_STR_FORMAT, ResourceOutputDetailLevel
 from .check.deviceregistry import check_deviceregistry_deployment
 from .check.mq import check_mq_deployment
@@ -40,7 +40,7 @@ def run_checks(
     if resource_kinds:
         _validate_resource_kinds_under_service(ops_service, resource_kinds)
 
-    with console.status(status="Analyzing cluster...", refresh_per_second=12.5):
+    with console.status(status="Analyzing cluster...", refresh_per_second=12.5), check_resource_index():
         from time import sleep
 
         sleep(0.5)
@@ -4,9 +4,9 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
-from typing import List, Optional, Union, Dict
-from ...util.resource_graph import ResourceGraph
+from typing import Dict, List, NamedTuple, Optional, Union
 
+from ...util.resource_graph import ResourceGraph
 
 QUERIES = {
     "get_custom_location_for_namespace": """
@@ -51,6 +51,14 @@ QUERIES = {
             or type startswith 'microsoft.secretsync'
         | project id, name, apiVersion, type
         """,
+    "get_aio_resources_for_custom_locations": """
+        resources
+        | where extendedLocation.name in~ ({custom_location_ids})
+        | where type startswith 'microsoft.iotoperations'
+            or type startswith 'microsoft.deviceregistry'
+            or type startswith 'microsoft.secretsync'
+        | project id, name, apiVersion, type, customLocationId = tostring(extendedLocation.name)
+        """,
     "get_cl_resources_by_type": """
         resources
         | where extendedLocation.name =~ '{custom_location_id}'
@@ -63,9 +71,24 @@ QUERIES = {
         | where id startswith '{custom_location_id}'
         | project id, name, apiVersion
         """,
+    "get_resource_sync_rules_for_custom_locations": """
+        resources
+        | where type =~ "microsoft.extendedlocation/customlocations/resourcesyncrules"
+        | extend customLocationId = substring(id, 0, indexof(tolower(id), '/resourcesyncrules/'))
+        | where customLocationId in~ ({custom_location_ids})
+        | project id, name, apiVersion, customLocationId
+        """,
 }
 
 
+class AioResourceState(NamedTuple):
+    custom_locations: List[dict]
+    extensions: List[dict]
+    # Keyed by lowercased custom location Id.
+    resources: Dict[str, List[dict]]
+    resource_sync_rules: Dict[str, List[dict]]
+
+
 class ConnectedCluster:
     def __init__(self, cmd, subscription_id: str, cluster_name: str, resource_group_name: str):
         self.subscription_id = subscription_id
@@ -73,6 +96,7 @@ class ConnectedCluster:
         self.resource_group_name = resource_group_name
         self.resource_graph = ResourceGraph(cmd=cmd, subscriptions=[self.subscription_id])
         self._resource_state = None
+        self._live_resource_state = None
 
         # TODO - @digimaun - temp necessary due to circular import
         from ..orchestration.resources import ConnectedClusters
@@ -87,23 +111,38 @@ class ConnectedCluster:
     def resource(self) -> dict:
         if not self._resource_state:
             self._resource_state = self.clusters.show(
-                resource_group_name=self.resource_group_name, cluster_name=self.cluster_name
+                resource_group_name=self.resource_group_name, cluster_name=self.cluster_name, use_cache=True
             )
         return self._resource_state
 
+    @property
+    def live_resource(self) -> dict:
+        """
+        The cluster resource read from ARM, bypassing the resource cache.
+        """
+        if not self._live_resource_state:
+            self._live_resource_state = self.clusters.show(
+                resource_group_name=self.resource_group_name, cluster_name=self.cluster_name
+            )
+            self._resource_state = self._live_resource_state
+        return self._live_resource_state
+
     @property
     def location(self) -> str:
         return self.resource["location"]
 
     @property
     def connected(self) -> bool:
-        properties = self.resource.get("properties", {})
+        # Connectivity guards destructive operations, so it is never served from the resource cache.
+        properties = self.live_resource.get("properties", {})
         return "connectivityStatus" in properties and properties["connectivityStatus"].lower() == "connected"
 
     @property
     def extensions(self) -> List[dict]:
         return list(
-            self.clusters.extensions.list(resource_group_name=self.resource_group_name, cluster_name=self.cluster_name)
+            self.clusters.extensions.list(
+                resource_group_name=self.resource_group_name, cluster_name=self.cluster_name, use_cache=True
+            )
         )
 
     def get_extensions_by_type(self, *type_names: str) -> Optional[Dict[str, dict]]:
@@ -171,6 +210,47 @@ class ConnectedCluster:
         result = self.resource_graph.query_resources(query=query)
         return self._process_query_result(result)
 
+    def get_aio_resource_state(self) -> AioResourceState:
+        """
+        Fetch IoT Operations custom locations, extensions, resources and resource sync rules in two
+        rounds of concurrent queries, regardless of the number of custom locations.
+        """
+        results = self.resource_graph.query_resources_batch(
+            {
+                "custom_locations": QUERIES["get_aio_custom_locations"].format(resource_id=self.resource_id),
+                "extensions": QUERIES["get_aio_extensions"].format(resource_id=self.resource_id),
+            }
+        )
+        custom_locations: List[dict] = self._process_query_result(results["custom_locations"]) or []
+        extensions: List[dict] = self._process_query_result(results["extensions"]) or []
+        resources: Dict[str, List[dict]] = {cl["id"].lower(): [] for cl in custom_locations}
+        resource_sync_rules: Dict[str, List[dict]] = {cl["id"].lower(): [] for cl in custom_locations}
+
+        if custom_locations:
+            custom_location_ids = ", ".join(f"'{cl['id']}'" for cl in custom_locations)
+            results = self.resource_graph.query_resources_batch(
+                {
+                    "resources": QUERIES["get_aio_resources_for_custom_locations"].format(
+                        custom_location_ids=custom_location_ids
+                    ),
+                    "resource_sync_rules": QUERIES["get_resource_sync_rules_for_custom_locations"].format(
+                        custom_location_ids=custom_location_ids
+                    ),
+                }
+            )
+            for key, target in [("resources", resources), ("resource_sync_rules", resource_sync_rules)]:
+                for record in self._process_query_result(results[key]) or []:
+                    custom_location_id = record.get("customLocationId", "").lower()
+                    if custom_location_id in target:
+                        target[custom_location_id].append(record)
+
+        return AioResourceState(
+            custom_locations=custom_locations,
+            extensions=extensions,
+            resources=resources,
+            resource_sync_rules=resource_sync_rules,
+        )
+
     def update_aio_extension(self, extension_name: str, properties: dict) -> dict:
         update_payload = {"properties": properties}
         return self.clusters.extensions.update_cluster_extension(
@@ -4,11 +4,14 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
-from sys import maxsize
-from time import sleep
-from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
-
-from azure.cli.core.azclierror import ArgumentUsageError
+from collections import deque
+from heapq import heappop, heappush
+from threading import Event
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Deque, Dict, List, Optional, Set, Tuple
+
+from azure.cli.core.azclierror import ArgumentUsageError, AzureResponseError, InvalidArgumentValueError
+from azure.core.exceptions import HttpResponseError
 from knack.log import get_logger
 from rich import print
 from rich.console import NewLine
@@ -16,7 +19,7 @@ from rich.live import Live
 from rich.progress import Progress, SpinnerColumn, TimeElapsedColumn
 from rich.table import Table
 
-from ...util.az_client import get_resource_client, wait_for_terminal_states
+from ...util.az_client import get_resource_client, get_throttle_delay
 from ...util.common import should_continue_prompt
 from .common import EXTENSION_TYPE_OPS
 from .resource_map import IoTOperationsResource, IoTOperationsResourceMap
@@ -24,6 +27,11 @@ from .resources import Instances
 
 logger = get_logger(__name__)
 
+DELETE_CONCURRENCY = 16
+DELETE_THROTTLE_RETRIES = 5
+DELETE_THROTTLE_BACKOFF_SEC = 2
+DELETE_WAKE_SEC = 5
+DELETE_TIMEOUT_SEC = 60 * 60
 
 if TYPE_CHECKING:
     from azure.core.polling import LROPoller
@@ -38,6 +46,7 @@ def delete_ops_resources(
     no_progress: Optional[bool] = None,
     force: Optional[bool] = None,
     include_dependencies: Optional[bool] = None,
+    concurrency: Optional[int] = None,
 ):
     manager = DeletionManager(
         cmd=cmd,
@@ -46,6 +55,7 @@ def delete_ops_resources(
         resource_group_name=resource_group_name,
         no_progress=no_progress,
         include_dependencies=include_dependencies,
+        concurrency=concurrency,
     )
     manager.do_work(confirm_yes=confirm_yes, force=force)
 
@@ -59,15 +69,20 @@ class DeletionManager:
         cluster_name: Optional[str] = None,
         include_dependencies: Optional[bool] = None,
         no_progress: Optional[bool] = None,
+        concurrency: Optional[int] = None,
     ):
         from azure.cli.core.commands.client_factory import get_subscription_id
 
+        if concurrency is not None and concurrency < 1:
+            raise InvalidArgumentValueError("--concurrency must be at least 1.")
+
         self.cmd = cmd
         self.instance_name = instance_name
         self.cluster_name = cluster_name
         self.resource_group_name = resource_group_name
         self.instances = Instances(self.cmd)
         self.include_dependencies = include_dependencies
+        self.concurrency = concurrency or DELETE_CONCURRENCY
         self.subscription_id = get_subscription_id(cli_ctx=cmd.cli_ctx)
         self.resource_client = get_resource_client(self.subscription_id)
 
@@ -155,21 +170,12 @@ class DeletionManager:
                 )
                 if aio_ext:
                     todo_extensions.append(aio_ext)
-        todo_custom_locations = self.resource_map.custom_locations
-        todo_resource_sync_rules = []
-        todo_resources = []
-
-        for cl in todo_custom_locations:
-            todo_resource_sync_rules.extend(self.resource_map.get_resource_sync_rules(cl.resource_id))
-            todo_resources.extend(self.resource_map.get_resources(cl.resource_id))
-
-        batched_work = self._batch_resources(
-            resources=todo_resources,
-            resource_sync_rules=todo_resource_sync_rules,
-            custom_locations=todo_custom_locations,
+
+        deletion_graph = self._build_deletion_graph(
+            custom_locations=self.resource_map.custom_locations,
             extensions=todo_extensions,
         )
-        if not batched_work:
+        if not deletion_graph:
             logger.warning("Nothing to delete :)")
             return
 
@@ -182,57 +188,202 @@ class DeletionManager:
                 return
 
         try:
-            for batches_key in batched_work:
-                self._render_display(f"[red]Deleting {batches_key}...")
-                for batch in batched_work[batches_key]:
-                    # TODO: @digimaun - Show summary as result
-                    lros = self._delete_batch(batch)
-                    [lro.result() for lro in lros]
+            # TODO: @digimaun - Show summary as result
+            self._delete_graph(deletion_graph)
         finally:
             self._stop_display()
 
-    def _batch_resources(
+    def _build_deletion_graph(
         self,
-        resources: Optional[List[IoTOperationsResource]] = None,
-        resource_sync_rules: Optional[List[IoTOperationsResource]] = None,
         custom_locations: Optional[List[IoTOperationsResource]] = None,
         extensions: Optional[List[IoTOperationsResource]] = None,
-    ) -> Dict[str, List[List[IoTOperationsResource]]]:
-        batched_work: Dict[str, List[List[IoTOperationsResource]]] = {}
-
-        if resources:
-            # resource_map.get_resources will sort resources in descending order by segment then display name
-            resource_batches: List[List[IoTOperationsResource]] = []
-            last_segments = maxsize
-            current_batch = []
-            for resource in resources:
-                current_segments = resource.segments
-                if current_segments < last_segments and current_batch:
-                    resource_batches.append(current_batch)
-                    current_batch = []
-                current_batch.append(resource)
-                last_segments = current_segments
-            if current_batch:
-                resource_batches.append(current_batch)
-            batched_work["resources"] = resource_batches
-
-        if resource_sync_rules:
-            batched_work["resource sync rules"] = [resource_sync_rules]
-
-        if custom_locations:
-            batched_work["custom locations"] = [custom_locations]
-
-        if extensions:
-            batched_work["extensions"] = [extensions]
-
-        return batched_work
-
-    def _delete_batch(self, resource_batch: List[IoTOperationsResource]) -> Tuple["LROPoller"]:
-        return wait_for_terminal_states(
-            *[
-                self.resource_client.resources.begin_delete_by_id(
-                    resource_id=resource.resource_id, api_version=resource.api_version
-                )
-                for resource in resource_batch
+    ) -> "DeletionGraph":
+        deletion_graph = DeletionGraph()
+        for cl in custom_locations or []:
+            cl_dependents = [
+                *self.resource_map.get_resource_sync_rules(cl.resource_id),
+                *self.resource_map.get_resources(cl.resource_id),
+            ]
+            for resource in cl_dependents:
+                deletion_graph.add(resource)
+            deletion_graph.add(cl, after=cl_dependents)
+
+        # Custom locations reference the cluster extensions, so extensions go last.
+        for ext in extensions or []:
+            deletion_graph.add(ext, after=custom_locations)
+
+        deletion_graph.link_parents()
+        return deletion_graph
+
+    def _delete_graph(self, deletion_graph: "DeletionGraph"):
+        """
+        Delete resources as soon as everything depending on them is gone, with at most
+        self.concurrency deletions in flight.
+
+        After the first failure, or once DELETE_TIMEOUT_SEC has passed, no new deletions are
+        started. In-flight deletions are drained, then a single error lists the failed resources
+        and those left undeleted.
+        """
+        total = len(deletion_graph)
+        ready: Deque[IoTOperationsResource] = deque(deletion_graph.get_ready())
+        deferred: List[Tuple[float, str, IoTOperationsResource]] = []
+        throttled: Dict[str, int] = {}
+        in_flight: Dict[str, Tuple[IoTOperationsResource, "LROPoller"]] = {}
+        failed: Dict[str, str] = {}
+        deleted: Set[str] = set()
+        wake = Event()
+        deadline = monotonic() + DELETE_TIMEOUT_SEC
+        timed_out = False
+
+        while ready or deferred or in_flight:
+            now = monotonic()
+            if now >= deadline:
+                timed_out = True
+                break
+            if failed:
+                # Stop scheduling and only drain what is in flight.
+                ready.clear()
+                deferred.clear()
+
+            while deferred and deferred[0][0] <= now:
+                ready.append(heappop(deferred)[2])
+
+            while ready and not failed and len(in_flight) < self.concurrency:
+                resource = ready.popleft()
+                try:
+                    poller = self._begin_delete(resource)
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    # Recorded with the resource so in-flight deletions are still drained.
+                    self._handle_delete_error(resource, e, throttled, deferred, failed)
+                    continue
+                poller.add_done_callback(lambda _: wake.set())
+                in_flight[resource.resource_id.lower()] = (resource, poller)
+
+            self._render_display(f"[red]Deleting resources... {len(deleted)}/{total}")
+
+            wake.clear()
+            done_keys = [key for key, (_, poller) in in_flight.items() if poller.done()]
+            if not done_keys:
+                if in_flight or deferred:
+                    timeout = min(DELETE_WAKE_SEC, max(deadline - monotonic(), 0))
+                    if deferred:
+                        timeout = min(timeout, max(deferred[0][0] - monotonic(), 0))
+                    wake.wait(timeout)
+                continue
+
+            for key in done_keys:
+                resource, poller = in_flight.pop(key)
+                try:
+                    poller.result()
+                except Exception as e:  # pylint: disable=broad-exception-caught
+                    self._handle_delete_error(resource, e, throttled, deferred, failed)
+                    continue
+                deleted.add(key)
+                self.instances.invalidate_cached(resource.resource_id)
+                ready.extend(deletion_graph.complete(resource))
+
+        if failed or timed_out:
+            undeleted = [
+                resource.resource_id
+                for key, resource in deletion_graph.resources.items()
+                if key not in deleted and key not in failed
             ]
+            error_lines = []
+            if timed_out:
+                error_lines.append(f"Deletion did not complete within {DELETE_TIMEOUT_SEC} seconds.")
+            if failed:
+                error_lines.extend(["The following resources failed to delete:", *failed.values()])
+            if undeleted:
+                error_lines.extend(["The following resources were not deleted:", *undeleted])
+            raise AzureResponseError("\n".join(error_lines))
+
+    def _begin_delete(self, resource: IoTOperationsResource) -> "LROPoller":
+        logger.debug(f"Deleting {resource.resource_id}")
+        return self.resource_client.resources.begin_delete_by_id(
+            resource_id=resource.resource_id, api_version=resource.api_version
         )
+
+    def _handle_delete_error(
+        self,
+        resource: IoTOperationsResource,
+        error: Exception,
+        throttled: Dict[str, int],
+        deferred: List[Tuple[float, str, IoTOperationsResource]],
+        failed: Dict[str, str],
+    ):
+        """
+        Retry throttled deletions with backoff up to DELETE_THROTTLE_RETRIES, otherwise record the failure.
+        """
+        key = resource.resource_id.lower()
+        attempt = throttled.get(key, 0)
+        if (
+            not isinstance(error, HttpResponseError)
+            or error.status_code != 429
+            or attempt >= DELETE_THROTTLE_RETRIES
+        ):
+            logger.debug(f"Deletion of {resource.resource_id} failed: {error}")
+            message = error.message if isinstance(error, HttpResponseError) else str(error) or type(error).__name__
+            failed[key] = f"{resource.resource_id}: {message}"
+            return
+
+        throttled[key] = attempt + 1
+        delay = get_throttle_delay(error, attempt, backoff_sec=DELETE_THROTTLE_BACKOFF_SEC)
+        logger.debug(f"Deletion of {resource.resource_id} throttled, retrying in {delay:.1f}s.")
+        heappush(deferred, (monotonic() + delay, key, resource))
+
+
+class DeletionGraph:
+    """
+    Resources to delete keyed by lowercased resource Id, where each resource waits on the
+    resources that must be deleted before it.
+    """
+
+    def __init__(self):
+        self.resources: Dict[str, IoTOperationsResource] = {}
+        self.blocked_by: Dict[str, Set[str]] = {}
+        self.blocking: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.resources)
+
+    def add(self, resource: IoTOperationsResource, after: Optional[List[IoTOperationsResource]] = None):
+        key = resource.resource_id.lower()
+        self.resources.setdefault(key, resource)
+        self.blocked_by.setdefault(key, set())
+        self.blocking.setdefault(key, set())
+        for dependency in after or []:
+            self._add_edge(key, dependency.resource_id.lower())
+
+    def link_parents(self):
+        """
+        Make each resource wait on its child resources, found by resource Id prefix.
+        """
+        for key in self.resources:
+            segments = key.split("/")
+            for i in range(len(segments) - 1, 1, -1):
+                parent_key = "/".join(segments[:i])
+                if parent_key in self.resources:
+                    self._add_edge(parent_key, key)
+                    break
+
+    def get_ready(self) -> List[IoTOperationsResource]:
+        return [self.resources[key] for key, blocked_by in self.blocked_by.items() if not blocked_by]
+
+    def complete(self, resource: IoTOperationsResource) -> List[IoTOperationsResource]:
+        """
+        Mark a resource as deleted, returning the resources that are now unblocked.
+        """
+        key = resource.resource_id.lower()
+        unblocked = []
+        for dependent_key in sorted(self.blocking.get(key, [])):
+            blocked_by = self.blocked_by[dependent_key]
+            blocked_by.discard(key)
+            if not blocked_by:
+                unblocked.append(self.resources[dependent_key])
+        return unblocked
+
+    def _add_edge(self, key: str, dependency_key: str):
+        if dependency_key == key or dependency_key not in self.resources:
+            return
+        self.blocked_by[key].add(dependency_key)
+        self.blocking[dependency_key].add(key)
@@ -88,51 +88,44 @@ class IoTOperationsResourceMap:
 
     def refresh_resource_state(self):
         refreshed_cluster_container = ClusterContainer()
+        resource_state = self.connected_cluster.get_aio_resource_state()
 
-        custom_locations = self.connected_cluster.get_aio_custom_locations()
-        if custom_locations:
-            for cl in custom_locations:
-                cl_container = CustomLocationsContainer(
-                    resource=IoTOperationsResource(
-                        resource_id=cl["id"], display_name=cl["name"], api_version=cl["apiVersion"]
+        for cl in resource_state.custom_locations:
+            cl_container = CustomLocationsContainer(
+                resource=IoTOperationsResource(
+                    resource_id=cl["id"], display_name=cl["name"], api_version=cl["apiVersion"]
+                )
+            )
+
+            for sync_rule in resource_state.resource_sync_rules.get(cl["id"].lower(), []):
+                cl_container.resource_sync_rules.append(
+                    IoTOperationsResource(
+                        resource_id=sync_rule["id"],
+                        display_name=sync_rule["name"],
+                        api_version=sync_rule["apiVersion"],
                     )
                 )
 
-                cl_sync_rules = self.connected_cluster.get_resource_sync_rules(cl["id"])
-                if cl_sync_rules:
-                    for sync_rule in cl_sync_rules:
-                        cl_container.resource_sync_rules.append(
-                            IoTOperationsResource(
-                                resource_id=sync_rule["id"],
-                                display_name=sync_rule["name"],
-                                api_version=sync_rule["apiVersion"],
-                            )
-                        )
-
-                cl_resources = self.connected_cluster.get_aio_resources(cl["id"])
-                if cl_resources:
-                    for resource in cl_resources:
-                        cl_container.related_resources.append(
-                            IoTOperationsResource(
-                                resource_id=resource["id"],
-                                display_name=resource["name"],
-                                api_version=resource["apiVersion"],
-                            )
-                        )
-
-                refreshed_cluster_container.custom_locations[cl["id"]] = cl_container
-
-        extensions = self.connected_cluster.get_aio_extensions()
-        if extensions:
-            for ext in extensions:
-                refreshed_cluster_container.extensions.append(
+            for resource in resource_state.resources.get(cl["id"].lower(), []):
+                cl_container.related_resources.append(
                     IoTOperationsResource(
-                        resource_id=ext["id"],
-                        display_name=ext["name"],
-                        api_version=ext["apiVersion"],
+                        resource_id=resource["id"],
+                        display_name=resource["name"],
+                        api_version=resource["apiVersion"],
                     )
                 )
 
+            refreshed_cluster_container.custom_locations[cl["id"]] = cl_container
+
+        for ext in resource_state.extensions:
+            refreshed_cluster_container.extensions.append(
+                IoTOperationsResource(
+                    resource_id=ext["id"],
+                    display_name=ext["name"],
+                    api_version=ext["apiVersion"],
+                )
+            )
+
         self._cluster_container = refreshed_cluster_container
 
     def build_tree(self, include_dependencies: bool = True, category_color: str = "cyan") -> Tree:
@@ -142,9 +135,7 @@ class IoTOperationsResourceMap:
         if not include_dependencies:
             # only show aio extension
             # TODO: @c-ryan-k hacky
-            aio_ext_obj = self.connected_cluster.get_extensions_by_type(EXTENSION_TYPE_OPS).get(
-                EXTENSION_TYPE_OPS, {}
-            )
+            aio_ext_obj = self.connected_cluster.get_extensions_by_type(EXTENSION_TYPE_OPS).get(EXTENSION_TYPE_OPS, {})
             if aio_ext_obj:
                 aio_ext_id: str = aio_ext_obj.get("id", "")
                 aio_ext = next((ext for ext in self.extensions if ext.resource_id.lower() == aio_ext_id.lower()), None)
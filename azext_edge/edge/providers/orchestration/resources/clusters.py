@@ -28,13 +28,30 @@ class ConnectedClusters(Queryable):
         self.ops: "ConnectedClusterOperations" = self.connectedk8s_mgmt_client.connected_cluster
         self.extensions: ClusterExtensions = ClusterExtensions(cmd)
 
-    def show(self, resource_group_name: str, cluster_name: str) -> dict:
-        return self.ops.get(
-            resource_group_name=resource_group_name,
-            cluster_name=cluster_name,
+    def show(self, resource_group_name: str, cluster_name: str, use_cache: Optional[bool] = None) -> dict:
+        def _get_cluster() -> dict:
+            return self.ops.get(
+                resource_group_name=resource_group_name,
+                cluster_name=cluster_name,
+            )
+
+        if not use_cache:
+            return _get_cluster()
+        return self.get_cached(
+            resource_id=get_cluster_id(self.subscriptions[0], resource_group_name, cluster_name),
+            api_version=self.connectedk8s_mgmt_client._config.api_version,
+            fetch=_get_cluster,
+            subscription_id=self.subscriptions[0],
         )
 
 
+def get_cluster_id(subscription_id: str, resource_group_name: str, cluster_name: str) -> str:
+    return (
+        f"/subscriptions/{subscription_id}/resourceGroups/{resource_group_name}"
+        f"/providers/Microsoft.Kubernetes/connectedClusters/{cluster_name}"
+    )
+
+
 class ClusterExtensions(Queryable):
     def __init__(self, cmd):
         super().__init__(cmd=cmd)
@@ -43,7 +60,16 @@ class ClusterExtensions(Queryable):
         )
         self.ops: "ExtensionsOperations" = self.clusterconfig_mgmt_client.extensions
 
-    def list(self, resource_group_name: str, cluster_name: str) -> Iterable[dict]:
+    def list(self, resource_group_name: str, cluster_name: str, use_cache: Optional[bool] = None) -> Iterable[dict]:
+        if not use_cache:
+            return self._list(resource_group_name=resource_group_name, cluster_name=cluster_name)
+        return self.get_cached(
+            resource_id=self._get_extensions_id(resource_group_name=resource_group_name, cluster_name=cluster_name),
+            api_version=self.clusterconfig_mgmt_client._config.api_version,
+            fetch=lambda: list(self._list(resource_group_name=resource_group_name, cluster_name=cluster_name)),
+        )
+
+    def _list(self, resource_group_name: str, cluster_name: str) -> Iterable[dict]:
         return self.ops.list(
             resource_group_name=resource_group_name,
             cluster_rp="Microsoft.Kubernetes",
@@ -51,6 +77,10 @@ class ClusterExtensions(Queryable):
             cluster_name=cluster_name,
         )
 
+    def _get_extensions_id(self, resource_group_name: str, cluster_name: str) -> str:
+        cluster_id = get_cluster_id(self.default_subscription_id, resource_group_name, cluster_name)
+        return f"{cluster_id}/providers/Microsoft.KubernetesConfiguration/extensions"
+
     def update_cluster_extension(
         self,
         resource_group_name: str,
@@ -59,7 +89,7 @@ class ClusterExtensions(Queryable):
         update_payload: dict,
         **operation_kwargs,
     ) -> Iterable[dict]:
-        return wait_for_terminal_state(
+        result = wait_for_terminal_state(
             self.ops.begin_update(
                 resource_group_name=resource_group_name,
                 cluster_rp="Microsoft.Kubernetes",
@@ -70,3 +100,7 @@ class ClusterExtensions(Queryable):
                 **operation_kwargs,
             )
         )
+        self.invalidate_cached(
+            self._get_extensions_id(resource_group_name=resource_group_name, cluster_name=cluster_name)
+        )
+        return result
@@ -95,8 +95,25 @@ class Instances(Queryable):
         )
         self.permission_manager = PermissionManager(self.default_subscription_id)
 
-    def show(self, name: str, resource_group_name: str, show_tree: Optional[bool] = None) -> Optional[dict]:
-        result = self.iotops_mgmt_client.instance.get(instance_name=name, resource_group_name=resource_group_name)
+    def show(
+        self,
+        name: str,
+        resource_group_name: str,
+        show_tree: Optional[bool] = None,
+        use_cache: Optional[bool] = None,
+    ) -> Optional[dict]:
+        def _get_instance() -> dict:
+            return self.iotops_mgmt_client.instance.get(instance_name=name, resource_group_name=resource_group_name)
+
+        if use_cache:
+            result = self.get_cached(
+                resource_id=self._get_instance_id(name=name, resource_group_name=resource_group_name),
+                api_version=self.iotops_mgmt_client._config.api_version,
+                fetch=_get_instance,
+                subscription_id=self.subscriptions[0],
+            )
+        else:
+            result = _get_instance()
 
         if show_tree:
             self._show_tree(result)
@@ -123,9 +140,20 @@ class Instances(Queryable):
             resource_map.refresh_resource_state()
         print(resource_map.build_tree(category_color="cyan"))
 
+    def _get_instance_id(self, name: str, resource_group_name: str) -> str:
+        return (
+            f"/subscriptions/{self.subscriptions[0]}/resourceGroups/{resource_group_name}"
+            f"/providers/Microsoft.IoTOperations/instances/{name}"
+        )
+
     def get_associated_cl(self, instance: dict) -> dict:
-        return self.resource_client.resources.get_by_id(
-            resource_id=instance["extendedLocation"]["name"], api_version=CUSTOM_LOCATIONS_API_VERSION
+        custom_location_id = instance["extendedLocation"]["name"]
+        return self.get_cached(
+            resource_id=custom_location_id,
+            api_version=CUSTOM_LOCATIONS_API_VERSION,
+            fetch=lambda: self.resource_client.resources.get_by_id(
+                resource_id=custom_location_id, api_version=CUSTOM_LOCATIONS_API_VERSION
+            ),
         )
 
     def get_resource_map(self, instance: dict) -> IoTOperationsResourceMap:
@@ -170,7 +198,9 @@ class Instances(Queryable):
                 resource_group_name=resource_group_name,
                 resource=instance,
             )
-            return wait_for_terminal_state(poller, **kwargs)
+            result = wait_for_terminal_state(poller, **kwargs)
+            self.invalidate_cached(self._get_instance_id(name=name, resource_group_name=resource_group_name))
+            return result
 
     def remove_mi_user_assigned(
         self,
@@ -289,9 +319,8 @@ class Instances(Queryable):
             self.resource_client.resources.get_by_id(
                 resource_id=keyvault_resource_id_container.resource_id, api_version=KEYVAULT_CLOUD_API_VERSION
             )
-            # TODO - @digimaun
-            self.msi_mgmt_client._config.subscription_id = mi_resource_id_container.subscription_id
-            mi_user_assigned: dict = self.msi_mgmt_client.user_assigned_identities.get(
+            msi_mgmt_client = get_msi_mgmt_client(subscription_id=mi_resource_id_container.subscription_id)
+            mi_user_assigned: dict = msi_mgmt_client.user_assigned_identities.get(
                 resource_group_name=mi_resource_id_container.resource_group_name,
                 resource_name=mi_resource_id_container.resource_name,
             )
@@ -570,9 +599,8 @@ class Instances(Queryable):
                 "No new federated credential will be created."
             )
             return
-        # TODO - @digimaun
-        self.msi_mgmt_client._config.subscription_id = mi_resource_id_container.subscription_id
-        self.msi_mgmt_client.federated_identity_credentials.create_or_update(
+        msi_mgmt_client = get_msi_mgmt_client(subscription_id=mi_resource_id_container.subscription_id)
+        msi_mgmt_client.federated_identity_credentials.create_or_update(
             resource_group_name=mi_resource_id_container.resource_group_name,
             resource_name=mi_resource_id_container.resource_name,
             federated_identity_credential_resource_name=federated_credential_name,
@@ -590,9 +618,8 @@ class Instances(Queryable):
         mi_resource_id_container: ResourceIdContainer,
         federated_credential_name: str,
     ):
-        # TODO - @digimaun
-        self.msi_mgmt_client._config.subscription_id = mi_resource_id_container.subscription_id
-        self.msi_mgmt_client.federated_identity_credentials.delete(
+        msi_mgmt_client = get_msi_mgmt_client(subscription_id=mi_resource_id_container.subscription_id)
+        msi_mgmt_client.federated_identity_credentials.delete(
             resource_group_name=mi_resource_id_container.resource_group_name,
             resource_name=mi_resource_id_container.resource_name,
             federated_identity_credential_resource_name=federated_credential_name,
@@ -601,9 +628,8 @@ class Instances(Queryable):
     def _find_federated_cred(
         self, mi_resource_id_container: ResourceIdContainer, issuer_url: str, subject: str
     ) -> Optional[dict]:
-        # TODO - @digimaun
-        self.msi_mgmt_client._config.subscription_id = mi_resource_id_container.subscription_id
-        cred_iteratable = self.msi_mgmt_client.federated_identity_credentials.list(
+        msi_mgmt_client = get_msi_mgmt_client(subscription_id=mi_resource_id_container.subscription_id)
+        cred_iteratable = msi_mgmt_client.federated_identity_credentials.list(
             resource_group_name=mi_resource_id_container.resource_group_name,
             resource_name=mi_resource_id_container.resource_name,
         )
@@ -22,6 +22,7 @@ from ....util.az_client import (
     get_registry_mgmt_client,
     wait_for_terminal_state,
 )
+from ....util.kql import CUSTOM_LOCATION_PROJECTION, QueryTemplate, join_instance
 from ....util.queryable import Queryable
 from .user_strings import (
     AUTH_REF_MISMATCH_ERROR,
@@ -39,6 +40,18 @@ if TYPE_CHECKING:
 console = Console()
 logger = get_logger(__name__)
 AEP_RESOURCE_TYPE = "Microsoft.DeviceRegistry/assetEndpointProfiles"
+AEP_QUERY = QueryTemplate(
+    resource_type=AEP_RESOURCE_TYPE,
+    filters={
+        "resource_group_name": ("resourceGroup", "=~"),
+        "location": ("location", "=~"),
+        "asset_endpoint_profile_name": ("name", "=~"),
+        "auth_mode": ("properties.authentication.method", "=~"),
+        "endpoint_profile_type": ("properties.endpointProfileType", "=~"),
+        "target_address": ("properties.targetAddress", "=~"),
+    },
+    tail=CUSTOM_LOCATION_PROJECTION,
+)
 
 
 # TODO: soul searching to see if I should combine with assets class
@@ -51,6 +64,15 @@ class AssetEndpointProfiles(Queryable):
         )
         self.ops: "AEPOperations" = self.deviceregistry_mgmt_client.asset_endpoint_profiles
 
+    def _wait_for_write(self, poller, resource_group_name: str, asset_endpoint_profile_name: str, **kwargs):
+        result = wait_for_terminal_state(poller, **kwargs)
+        # Also drops cached query results.
+        self.invalidate_cached(
+            f"/subscriptions/{self.default_subscription_id}/resourceGroups/{resource_group_name}"
+            f"/providers/{AEP_RESOURCE_TYPE}/{asset_endpoint_profile_name}"
+        )
+        return result
+
     def create(
         self,
         asset_endpoint_profile_name: str,
@@ -112,7 +134,7 @@ class AssetEndpointProfiles(Queryable):
                 asset_endpoint_profile_name,
                 resource=aep_body
             )
-            return wait_for_terminal_state(poller, **kwargs)
+            return self._wait_for_write(poller, resource_group_name, asset_endpoint_profile_name, **kwargs)
 
     def delete(self, asset_endpoint_profile_name: str, resource_group_name: str, **kwargs):
         self.show(
@@ -125,7 +147,7 @@ class AssetEndpointProfiles(Queryable):
                 resource_group_name,
                 asset_endpoint_profile_name,
             )
-            return wait_for_terminal_state(poller, **kwargs)
+            return self._wait_for_write(poller, resource_group_name, asset_endpoint_profile_name, **kwargs)
 
     def show(
         self, asset_endpoint_profile_name: str, resource_group_name: str, check_cluster: bool = False
@@ -156,29 +178,22 @@ class AssetEndpointProfiles(Queryable):
         location: Optional[str] = None,
         resource_group_name: Optional[str] = None,
         target_address: Optional[str] = None,
+        count: Optional[bool] = None,
+        stream: Optional[bool] = None,
+        page_size: Optional[int] = None,
+        top: Optional[int] = None,
     ) -> dict:
-        query_body = custom_query or _build_query_body(
+        query = _build_query(
             asset_endpoint_profile_name=asset_endpoint_profile_name,
             auth_mode=auth_mode,
+            custom_query=custom_query,
             endpoint_profile_type=endpoint_profile_type,
             location=location,
             resource_group_name=resource_group_name,
             target_address=target_address
         )
-        query = f"Resources | where type =~\"{AEP_RESOURCE_TYPE}\" " + query_body
-
-        if any([instance_name, instance_resource_group]):
-            instance_query = "Resources | where type =~ 'microsoft.iotoperations/instances' "
-            if instance_name:
-                instance_query += f"| where name =~ \"{instance_name}\""
-            if instance_resource_group:
-                instance_query += f"| where resourceGroup =~ \"{instance_resource_group}\""
-
-            # fetch the custom location + join on innerunique. Then remove the extra customLocation1 generated
-            query = f"{instance_query} | extend customLocation = tostring(extendedLocation.name) "\
-                f"| project customLocation | join kind=innerunique ({query}) on customLocation "\
-                "| project-away customLocation1"
-        return self.query(query=query)
+        query = join_instance(query, instance_name=instance_name, instance_resource_group=instance_resource_group)
+        return self.process_query(query=query, count=count, stream=stream, page_size=page_size, top=top)
 
     def update(
         self,
@@ -218,7 +233,7 @@ class AssetEndpointProfiles(Queryable):
                 asset_endpoint_profile_name,
                 original_aep
             )
-            return wait_for_terminal_state(poller, **kwargs)
+            return self._wait_for_write(poller, resource_group_name, asset_endpoint_profile_name, **kwargs)
 
 
 # Helpers
@@ -325,33 +340,25 @@ def _build_opcua_config(
     return json.dumps(config)
 
 
-def _build_query_body(
+def _build_query(
     asset_endpoint_profile_name: Optional[str] = None,
     auth_mode: Optional[str] = None,
+    custom_query: Optional[str] = None,
     endpoint_profile_type: Optional[str] = None,
     location: Optional[str] = None,
     resource_group_name: Optional[str] = None,
     target_address: Optional[str] = None,
 ) -> str:
-    query_body = ""
-    if resource_group_name:
-        query_body += f"| where resourceGroup =~ \"{resource_group_name}\""
-    if location:
-        query_body += f"| where location =~ \"{location}\""
-    if asset_endpoint_profile_name:
-        query_body += f"| where name =~ \"{asset_endpoint_profile_name}\""
-    if auth_mode:
-        query_body += f"| where properties.authentication.method =~ \"{auth_mode}\""
-    if endpoint_profile_type:
-        query_body += f"| where properties.endpointProfileType =~ \"{endpoint_profile_type}\""
-    if target_address:
-        query_body += f"| where properties.targetAddress =~ \"{target_address}\""
-
-    query_body += "| extend customLocation = tostring(extendedLocation.name) "\
-        "| extend provisioningState = properties.provisioningState "\
-        "| project id, customLocation, location, name, resourceGroup, provisioningState, tags, "\
-        "type, subscriptionId "
-    return query_body
+    if custom_query:
+        return AEP_QUERY.render_custom(custom_query)
+    return AEP_QUERY.render(
+        asset_endpoint_profile_name=asset_endpoint_profile_name,
+        auth_mode=auth_mode,
+        endpoint_profile_type=endpoint_profile_type,
+        location=location,
+        resource_group_name=resource_group_name,
+        target_address=target_address,
+    )
 
 
 def _process_additional_configuration(configuration: str) -> Optional[str]:
@@ -5,27 +5,40 @@
 # ----------------------------------------------------------------------------------------------
 
 import json
-from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+import os
+from collections import deque
+from functools import lru_cache
+from heapq import heappop, heappush
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any, Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 
 from azure.cli.core.azclierror import (
     InvalidArgumentValueError,
     RequiredArgumentMissingError,
 )
+from azure.core.exceptions import HttpResponseError
 from knack.log import get_logger
 from rich.console import Console
 
-from ....common import FileType
+from ....common import MAX_ASSET_DATAPOINTS, MAX_ASSET_EVENTS, FileType
 from ....util import assemble_nargs_to_dict
 from ....util.az_client import (
     DeviceRegistryMgmtApiVersion,
     get_registry_mgmt_client,
+    get_throttle_delay,
     wait_for_terminal_state,
 )
+from ....util.kql import CUSTOM_LOCATION_PROJECTION, QueryTemplate, join_instance
 from ....util.queryable import Queryable
 from .user_strings import (
+    BULK_APPLY_FILE_ERROR,
     DUPLICATE_EVENT_ERROR,
     DUPLICATE_POINT_ERROR,
+    INVALID_BULK_ASSET_ERROR,
     INVALID_OBSERVABILITY_MODE_ERROR,
+    INVALID_SUB_POINT_ERROR,
+    MAX_SUB_POINTS_ERROR,
+    MISSING_SUB_POINT_KEY_ERROR,
 )
 
 if TYPE_CHECKING:
@@ -35,8 +48,96 @@ if TYPE_CHECKING:
 console = Console()
 logger = get_logger(__name__)
 ASSET_RESOURCE_TYPE = "Microsoft.DeviceRegistry/assets"
+ASSET_QUERY = QueryTemplate(
+    resource_type=ASSET_RESOURCE_TYPE,
+    filters={
+        "resource_group_name": ("resourceGroup", "=~"),
+        "location": ("location", "=~"),
+        "asset_name": ("name", "=~"),
+        "default_topic_path": ("properties.defaultTopic.path", "=~"),
+        "default_topic_retain": ("properties.defaultTopic.retain", "=~"),
+        "description": ("properties.description", "=~"),
+        "display_name": ("properties.displayName", "=~"),
+        "enabled": ("properties.enabled", "=="),
+        "documentation_uri": ("properties.documentationUri", "=~"),
+        "endpoint_profile": ("properties.assetEndpointProfileUri", "=~"),
+        "external_asset_id": ("properties.externalAssetId", "=~"),
+        "hardware_revision": ("properties.hardwareRevision", "=~"),
+        "manufacturer": ("properties.manufacturer", "=~"),
+        "manufacturer_uri": ("properties.manufacturerUri", "=~"),
+        "model": ("properties.model", "=~"),
+        "product_code": ("properties.productCode", "=~"),
+        "serial_number": ("properties.serialNumber", "=~"),
+        "software_revision": ("properties.softwareRevision", "=~"),
+    },
+    tail=CUSTOM_LOCATION_PROJECTION,
+)
 VALID_DATA_OBSERVABILITY_MODES = frozenset(["None", "Gauge", "Counter", "Histogram", "Log"])
 VALID_EVENT_OBSERVABILITY_MODES = frozenset(["None", "Log"])
+CSV_CONVERSION_MAP = {
+    "CapabilityId": "capabilityId",
+    "Capability Id": "capabilityId",
+    "Data Source": "dataSource",
+    "EventName": "name",
+    "EventNotifier": "eventNotifier",
+    "Event Notifier": "eventNotifier",
+    "Name": "name",
+    "NodeID": "dataSource",
+    "ObservabilityMode": "observabilityMode",
+    "Observability Mode": "observabilityMode",
+    "QueueSize": "queueSize",
+    "Queue Size": "queueSize",
+    "Sampling Interval Milliseconds": "samplingInterval",
+    "TagName": "name",
+}
+# Columns that identify a CSV import, exported or already in asset form.
+CSV_FIELDNAMES = frozenset([*CSV_CONVERSION_MAP, *CSV_CONVERSION_MAP.values()])
+SUB_POINT_CONFIGURATION_KEYS = frozenset(["samplingInterval", "queueSize"])
+BULK_ASSET_KEYS = frozenset(
+    [
+        "asset_name",
+        "custom_attributes",
+        "default_topic_path",
+        "default_topic_retain",
+        "description",
+        "disabled",
+        "display_name",
+        "documentation_uri",
+        "endpoint_profile",
+        "events",
+        "events_file_path",
+        "external_asset_id",
+        "hardware_revision",
+        "instance_name",
+        "instance_resource_group",
+        "instance_subscription",
+        "location",
+        "manufacturer",
+        "manufacturer_uri",
+        "model",
+        "product_code",
+        "resource_group_name",
+        "serial_number",
+        "software_revision",
+        "ds_publishing_interval",
+        "ds_sampling_interval",
+        "ds_queue_size",
+        "ev_publishing_interval",
+        "ev_sampling_interval",
+        "ev_queue_size",
+        "tags",
+    ]
+)
+BULK_APPLY_CONCURRENCY = 16
+BULK_APPLY_THROTTLE_RETRIES = 5
+BULK_APPLY_THROTTLE_BACKOFF_SEC = 2
+BULK_APPLY_WAKE_SEC = 5
+
+
+class _BulkAsset(NamedTuple):
+    asset_name: str
+    resource_group_name: str
+    body: dict
 
 
 class Assets(Queryable):
@@ -48,6 +149,15 @@ class Assets(Queryable):
         )
         self.ops: "AssetsOperations" = self.deviceregistry_mgmt_client.assets
 
+    def _wait_for_write(self, poller, resource_group_name: str, asset_name: str, **kwargs):
+        result = wait_for_terminal_state(poller, **kwargs)
+        # Also drops cached query results.
+        self.invalidate_cached(
+            f"/subscriptions/{self.default_subscription_id}/resourceGroups/{resource_group_name}"
+            f"/providers/{ASSET_RESOURCE_TYPE}/{asset_name}"
+        )
+        return result
+
     def create(
         self,
         asset_name: str,
@@ -90,30 +200,21 @@ class Assets(Queryable):
             instance_resource_group=instance_resource_group or resource_group_name,
             instance_subscription=instance_subscription
         )
-        cluster_location = extended_location.pop("cluster_location")
-
-        # Properties
-        properties = {
-            "assetEndpointProfileRef": endpoint_profile,
-            "events": _process_asset_sub_points("event_notifier", events),
-        }
-        if events_file_path:
-            properties["events"].extend(
-                _process_asset_sub_points_file_path(file_path=events_file_path)
-            )
-
-        # Other properties
-        _update_properties(
-            properties,
+        asset_body = _build_asset_body(
+            extended_location=extended_location,
+            endpoint_profile=endpoint_profile,
             custom_attributes=custom_attributes,
             default_topic_path=default_topic_path,
             default_topic_retain=default_topic_retain,
             description=description,
-            display_name=display_name,
             disabled=disabled,
+            display_name=display_name,
             documentation_uri=documentation_uri,
+            events=events,
+            events_file_path=events_file_path,
             external_asset_id=external_asset_id,
             hardware_revision=hardware_revision,
+            location=location,
             manufacturer=manufacturer,
             manufacturer_uri=manufacturer_uri,
             model=model,
@@ -126,21 +227,149 @@ class Assets(Queryable):
             ev_publishing_interval=ev_publishing_interval,
             ev_sampling_interval=ev_sampling_interval,
             ev_queue_size=ev_queue_size,
+            tags=tags,
         )
-
-        asset_body = {
-            "extendedLocation": extended_location,
-            "location": location or cluster_location,
-            "properties": properties,
-            "tags": tags,
-        }
         with console.status(f"Creating {asset_name}..."):
             poller = self.ops.begin_create_or_replace(
                 resource_group_name,
                 asset_name,
                 resource=asset_body
             )
-            return wait_for_terminal_state(poller, **kwargs)
+            return self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
+
+    def bulk_apply(
+        self,
+        file_path: str,
+        resource_group_name: Optional[str] = None,
+        instance_name: Optional[str] = None,
+        instance_resource_group: Optional[str] = None,
+        instance_subscription: Optional[str] = None,
+        concurrency: int = BULK_APPLY_CONCURRENCY,
+        **kwargs
+    ) -> List[dict]:
+        """
+        Create or replace every asset of a file, returning a result per asset.
+
+        File entries take the asset create arguments, defaulting to the given resource group and instance.
+        Extended locations are resolved once per instance, and every asset body is built before any is
+        submitted so an invalid entry fails the command early.
+        """
+        from ....util import deserialize_file_content
+        from .helpers import get_extended_location
+
+        if concurrency < 1:
+            raise InvalidArgumentValueError("Concurrency must be at least 1.")
+        entries = deserialize_file_content(file_path=file_path)
+        if isinstance(entries, dict):
+            entries = entries.get("assets")
+        if not entries or not isinstance(entries, list):
+            raise InvalidArgumentValueError(BULK_APPLY_FILE_ERROR.format(file_path))
+
+        defaults = {
+            "resource_group_name": resource_group_name,
+            "instance_name": instance_name,
+            "instance_resource_group": instance_resource_group,
+            "instance_subscription": instance_subscription,
+        }
+        extended_locations: Dict[Tuple[str, str, Optional[str]], dict] = {}
+        assets: Dict[Tuple[str, str], _BulkAsset] = {}
+        for index, entry in enumerate(entries, start=1):
+            entry = _parse_bulk_asset_entry(entry, index=index, file_path=file_path, defaults=defaults)
+            asset_name = entry.pop("asset_name")
+            resource_group_name = entry.pop("resource_group_name")
+            asset_key = (resource_group_name.lower(), asset_name.lower())
+            if asset_key in assets:
+                raise InvalidArgumentValueError(
+                    INVALID_BULK_ASSET_ERROR.format(index, file_path, f"duplicates asset {asset_name}")
+                )
+
+            location_key = (
+                entry.pop("instance_name"),
+                entry.pop("instance_resource_group", None) or resource_group_name,
+                entry.pop("instance_subscription", None),
+            )
+            if location_key not in extended_locations:
+                extended_locations[location_key] = get_extended_location(
+                    cmd=self.cmd,
+                    instance_name=location_key[0],
+                    instance_resource_group=location_key[1],
+                    instance_subscription=location_key[2],
+                )
+            assets[asset_key] = _BulkAsset(
+                asset_name=asset_name,
+                resource_group_name=resource_group_name,
+                body=_build_asset_body(extended_location=extended_locations[location_key], **entry),
+            )
+
+        results = self._apply_assets(list(assets.values()), concurrency=concurrency, **kwargs)
+        failed = sum(1 for result in results if result["status"] != "Succeeded")
+        if failed:
+            logger.warning(f"{failed} of {len(results)} assets failed to apply.")
+        return results
+
+    def _apply_assets(self, assets: List["_BulkAsset"], concurrency: int, **kwargs) -> List[dict]:
+        """
+        Submit assets with at most concurrency in flight. Throttled assets are retried after a backoff, and
+        the number in flight is halved on each throttled request then grows back by one on each success.
+        """
+        from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+        ready: Deque[int] = deque(range(len(assets)))
+        deferred: List[Tuple[float, int]] = []
+        throttled: Dict[int, int] = {}
+        in_flight: Dict[Future, int] = {}
+        results: Dict[int, dict] = {}
+        limit = concurrency
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="aio-asset-apply"
+        ) as executor, console.status("Applying assets...") as status:
+            while ready or deferred or in_flight:
+                now = monotonic()
+                while deferred and deferred[0][0] <= now:
+                    ready.append(heappop(deferred)[1])
+                while ready and len(in_flight) < limit:
+                    index = ready.popleft()
+                    in_flight[executor.submit(self._apply_asset, assets[index], **kwargs)] = index
+                status.update(f"Applying assets... {len(results)}/{len(assets)}")
+
+                timeout = BULK_APPLY_WAKE_SEC
+                if deferred:
+                    timeout = min(timeout, max(deferred[0][0] - monotonic(), 0))
+                if not in_flight:
+                    sleep(timeout)
+                    continue
+
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    try:
+                        resource = future.result()
+                    except HttpResponseError as e:
+                        attempt = throttled.get(index, 0)
+                        if e.status_code == 429 and attempt < BULK_APPLY_THROTTLE_RETRIES:
+                            throttled[index] = attempt + 1
+                            limit = max(1, limit // 2)
+                            delay = get_throttle_delay(e, attempt, backoff_sec=BULK_APPLY_THROTTLE_BACKOFF_SEC)
+                            logger.debug(f"Asset {assets[index].asset_name} throttled, retrying in {delay:.1f}s.")
+                            heappush(deferred, (monotonic() + delay, index))
+                            continue
+                        results[index] = _get_bulk_apply_result(assets[index], error=e)
+                    except Exception as e:  # pylint: disable=broad-except
+                        results[index] = _get_bulk_apply_result(assets[index], error=e)
+                    else:
+                        limit = min(concurrency, limit + 1)
+                        results[index] = _get_bulk_apply_result(assets[index], resource=resource)
+
+        return [results[index] for index in range(len(assets))]
+
+    def _apply_asset(self, asset: "_BulkAsset", **kwargs):
+        poller = self.ops.begin_create_or_replace(
+            asset.resource_group_name,
+            asset.asset_name,
+            resource=asset.body
+        )
+        return self._wait_for_write(poller, asset.resource_group_name, asset.asset_name, **kwargs)
 
     def delete(self, asset_name: str, resource_group_name: str, **kwargs):
         self.show(
@@ -153,7 +382,7 @@ class Assets(Queryable):
                 resource_group_name,
                 asset_name,
             )
-            return wait_for_terminal_state(poller, **kwargs)
+            return self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
 
     def show(
         self, asset_name: str, resource_group_name: str, check_cluster: bool = False
@@ -195,9 +424,14 @@ class Assets(Queryable):
         resource_group_name: Optional[str] = None,
         serial_number: Optional[str] = None,
         software_revision: Optional[str] = None,
+        count: Optional[bool] = None,
+        stream: Optional[bool] = None,
+        page_size: Optional[int] = None,
+        top: Optional[int] = None,
     ):
-        query_body = custom_query or _build_query_body(
+        query = _build_query(
             asset_name=asset_name,
+            custom_query=custom_query,
             default_topic_path=default_topic_path,
             default_topic_retain=default_topic_retain,
             description=description,
@@ -216,20 +450,8 @@ class Assets(Queryable):
             serial_number=serial_number,
             software_revision=software_revision
         )
-        query = f"Resources | where type =~\"{ASSET_RESOURCE_TYPE}\" " + query_body
-
-        if any([instance_name, instance_resource_group]):
-            instance_query = "Resources | where type =~ 'microsoft.iotoperations/instances' "
-            if instance_name:
-                instance_query += f"| where name =~ \"{instance_name}\""
-            if instance_resource_group:
-                instance_query += f"| where resourceGroup =~ \"{instance_resource_group}\""
-
-            # fetch the custom location + join on innerunique. Then remove the extra customLocation1 generated
-            query = f"{instance_query} | extend customLocation = tostring(extendedLocation.name) "\
-                f"| project customLocation | join kind=innerunique ({query}) on customLocation "\
-                "| project-away customLocation1"
-        return self.query(query=query)
+        query = join_instance(query, instance_name=instance_name, instance_resource_group=instance_resource_group)
+        return self.process_query(query=query, count=count, stream=stream, page_size=page_size, top=top)
 
     def update(
         self,
@@ -298,7 +520,7 @@ class Assets(Queryable):
                 asset_name,
                 original_asset
             )
-            return wait_for_terminal_state(poller, **kwargs)
+            return self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
 
     # Dataset
     # TODO: multi-dataset support
@@ -367,7 +589,7 @@ class Assets(Queryable):
                 asset_name,
                 asset
             )
-            asset = wait_for_terminal_state(poller, **kwargs)
+            asset = self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
         if not isinstance(asset, dict):
             asset = asset.as_dict()
 
@@ -430,7 +652,9 @@ class Assets(Queryable):
             file_path=file_path,
             original_items=dataset.get("dataPoints", []),
             point_key="name",
-            replace=replace
+            replace=replace,
+            max_points=MAX_ASSET_DATAPOINTS,
+            point_type="data points"
         )
 
         # note that update does not return the properties
@@ -440,7 +664,7 @@ class Assets(Queryable):
                 asset_name,
                 asset
             )
-            asset = wait_for_terminal_state(poller, **kwargs)
+            asset = self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
         if not isinstance(asset, dict):
             asset = asset.as_dict()
         return _get_dataset(asset, dataset_name)["dataPoints"]
@@ -482,7 +706,7 @@ class Assets(Queryable):
                 asset_name,
                 asset
             )
-            asset = wait_for_terminal_state(poller, **kwargs)
+            asset = self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
         if not isinstance(asset, dict):
             asset = asset.as_dict()
 
@@ -536,7 +760,7 @@ class Assets(Queryable):
                 asset_name,
                 asset
             )
-            asset = wait_for_terminal_state(poller, **kwargs)
+            asset = self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
         if not isinstance(asset, dict):
             asset = asset.as_dict()
         return asset["properties"]["events"]
@@ -591,7 +815,9 @@ class Assets(Queryable):
             file_path=file_path,
             original_items=asset["properties"].get("events", []),
             point_key="name",
-            replace=replace
+            replace=replace,
+            max_points=MAX_ASSET_EVENTS,
+            point_type="events"
         )
 
         # note that update does not return the properties
@@ -601,7 +827,7 @@ class Assets(Queryable):
                 asset_name,
                 asset
             )
-            asset = wait_for_terminal_state(poller, **kwargs)
+            asset = self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
         if not isinstance(asset, dict):
             asset = asset.as_dict()
         return asset["properties"]["events"]
@@ -641,7 +867,7 @@ class Assets(Queryable):
                 asset_name,
                 asset
             )
-            asset = wait_for_terminal_state(poller, **kwargs)
+            asset = self._wait_for_write(poller, resource_group_name, asset_name, **kwargs)
         if not isinstance(asset, dict):
             asset = asset.as_dict()
         return asset["properties"]["events"]
@@ -694,29 +920,52 @@ def _process_asset_sub_points_file_path(
     file_path: str,
     original_items: Optional[List[dict]] = None,
     point_key: Optional[str] = None,
-    replace: bool = False
+    replace: bool = False,
+    max_points: Optional[int] = None,
+    point_type: str = "points",
 ) -> List[Dict[str, str]]:
-    from ....util import deserialize_file_content
-    file_points = list(deserialize_file_content(file_path=file_path))
-    _convert_sub_points_from_csv(file_points)
-
-    if point_key is None:
-        return file_points
-
-    if not original_items:
-        original_items = []
-    original_points = {point[point_key]: point for point in original_items}
-    file_points = {point[point_key]: point for point in file_points}
-    for key in file_points:
-        if key in original_points and not replace:
-            logger.warning(f"{key} is already present in the asset and will be ignored.")
+    """
+    Stream the points of a file, normalizing each record and merging it into original_items by point_key.
+
+    Points of the file take precedence over original items only with replace. The import fails as soon
+    as the merged result would hold more than max_points.
+    """
+    from ....util import iter_file_records
+
+    # name index of the merged points, insertion ordered so replaced points keep their position.
+    points: Dict[Any, dict] = {}
+    file_keys = set()
+    if point_key is not None:
+        for point in original_items or []:
+            points[point[point_key]] = point
+
+    for item, record in enumerate(iter_file_records(file_path=file_path, csv_fieldnames=CSV_FIELDNAMES), start=1):
+        try:
+            point = _convert_sub_point_from_csv(record)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise InvalidArgumentValueError(INVALID_SUB_POINT_ERROR.format(item, file_path, e))
+
+        if point_key is None:
+            key = item
         else:
-            original_points[key] = file_points[key]
-    return list(original_points.values())
+            key = point.get(point_key)
+            if not key:
+                raise InvalidArgumentValueError(MISSING_SUB_POINT_KEY_ERROR.format(item, file_path, point_key))
+            if key in points and key not in file_keys and not replace:
+                logger.warning(f"{key} is already present in the asset and will be ignored.")
+                continue
+            file_keys.add(key)
+
+        points[key] = point
+        if max_points and len(points) > max_points:
+            raise InvalidArgumentValueError(MAX_SUB_POINTS_ERROR.format(file_path, max_points, point_type))
+
+    return list(points.values())
 
 
-def _build_query_body(
+def _build_query(
     asset_name: Optional[str] = None,
+    custom_query: Optional[str] = None,
     default_topic_path: Optional[str] = None,
     default_topic_retain: Optional[str] = None,
     description: Optional[str] = None,
@@ -735,52 +984,132 @@ def _build_query_body(
     serial_number: Optional[str] = None,
     software_revision: Optional[str] = None,
 ) -> str:
-    query_body = ""
-    if resource_group_name:
-        query_body += f"| where resourceGroup =~ \"{resource_group_name}\""
-    if location:
-        query_body += f"| where location =~ \"{location}\""
-    if asset_name:
-        query_body += f"| where name =~ \"{asset_name}\""
-    if default_topic_path:
-        query_body += f"| where properties.defaultTopic.path =~ \"{default_topic_path}\""
-    if default_topic_retain:
-        query_body += f"| where properties.defaultTopic.retain =~ \"{default_topic_retain}\""
-    if description:
-        query_body += f"| where properties.description =~ \"{description}\""
-    if display_name:
-        query_body += f"| where properties.displayName =~ \"{display_name}\""
-    if disabled is not None:
-        query_body += f"| where properties.enabled == {not disabled}"
-    if documentation_uri:
-        query_body += f"| where properties.documentationUri =~ \"{documentation_uri}\""
-    if endpoint_profile:
-        query_body += f"| where properties.assetEndpointProfileUri =~ \"{endpoint_profile}\""
-    if external_asset_id:
-        query_body += f"| where properties.externalAssetId =~ \"{external_asset_id}\""
-    if hardware_revision:
-        query_body += f"| where properties.hardwareRevision =~ \"{hardware_revision}\""
-    if manufacturer:
-        query_body += f"| where properties.manufacturer =~ \"{manufacturer}\""
-    if manufacturer_uri:
-        query_body += f"| where properties.manufacturerUri =~ \"{manufacturer_uri}\""
-    if model:
-        query_body += f"| where properties.model =~ \"{model}\""
-    if product_code:
-        query_body += f"| where properties.productCode =~ \"{product_code}\""
-    if serial_number:
-        query_body += f"| where properties.serialNumber =~ \"{serial_number}\""
-    if software_revision:
-        query_body += f"| where properties.softwareRevision =~ \"{software_revision}\""
-
-    query_body += "| extend customLocation = tostring(extendedLocation.name) "\
-        "| extend provisioningState = properties.provisioningState "\
-        "| project id, customLocation, location, name, resourceGroup, provisioningState, tags, "\
-        "type, subscriptionId "
-    return query_body
+    if custom_query:
+        return ASSET_QUERY.render_custom(custom_query)
+    return ASSET_QUERY.render(
+        asset_name=asset_name,
+        default_topic_path=default_topic_path,
+        default_topic_retain=default_topic_retain,
+        description=description,
+        display_name=display_name,
+        documentation_uri=documentation_uri,
+        enabled=None if disabled is None else not disabled,
+        endpoint_profile=endpoint_profile,
+        external_asset_id=external_asset_id,
+        hardware_revision=hardware_revision,
+        location=location,
+        manufacturer=manufacturer,
+        manufacturer_uri=manufacturer_uri,
+        model=model,
+        product_code=product_code,
+        resource_group_name=resource_group_name,
+        serial_number=serial_number,
+        software_revision=software_revision,
+    )
 
 
 # Helpers
+def _build_asset_body(
+    extended_location: Dict[str, str],
+    endpoint_profile: str,
+    events: Optional[List[List[str]]] = None,
+    events_file_path: Optional[str] = None,
+    location: Optional[str] = None,
+    tags: Optional[Dict[str, str]] = None,
+    disabled: bool = False,
+    ds_publishing_interval: int = 1000,
+    ds_sampling_interval: int = 500,
+    ds_queue_size: int = 1,
+    ev_publishing_interval: int = 1000,
+    ev_sampling_interval: int = 500,
+    ev_queue_size: int = 1,
+    **properties_kwargs
+) -> dict:
+    # extended locations are shared by the assets of an instance
+    extended_location = dict(extended_location)
+    cluster_location = extended_location.pop("cluster_location")
+
+    # Properties
+    properties = {
+        "assetEndpointProfileRef": endpoint_profile,
+        "events": _process_asset_sub_points("event_notifier", events),
+    }
+    if events_file_path:
+        properties["events"].extend(
+            _process_asset_sub_points_file_path(
+                file_path=events_file_path, max_points=MAX_ASSET_EVENTS, point_type="events"
+            )
+        )
+
+    # Other properties
+    _update_properties(
+        properties,
+        disabled=disabled,
+        ds_publishing_interval=ds_publishing_interval,
+        ds_sampling_interval=ds_sampling_interval,
+        ds_queue_size=ds_queue_size,
+        ev_publishing_interval=ev_publishing_interval,
+        ev_sampling_interval=ev_sampling_interval,
+        ev_queue_size=ev_queue_size,
+        **properties_kwargs
+    )
+
+    return {
+        "extendedLocation": extended_location,
+        "location": location or cluster_location,
+        "properties": properties,
+        "tags": tags,
+    }
+
+
+def _parse_bulk_asset_entry(entry: Any, index: int, file_path: str, defaults: Dict[str, Optional[str]]) -> dict:
+    """Asset create arguments of a bulk apply file entry, falling back to the command defaults."""
+    if not isinstance(entry, dict):
+        raise InvalidArgumentValueError(INVALID_BULK_ASSET_ERROR.format(index, file_path, "must be a mapping"))
+    unknown_keys = set(entry) - BULK_ASSET_KEYS
+    if unknown_keys:
+        raise InvalidArgumentValueError(
+            INVALID_BULK_ASSET_ERROR.format(index, file_path, f"has unsupported keys {', '.join(sorted(unknown_keys))}")
+        )
+
+    entry = {**{k: v for k, v in defaults.items() if v is not None}, **entry}
+    for required in ["asset_name", "endpoint_profile", "instance_name", "resource_group_name"]:
+        if not entry.get(required):
+            raise InvalidArgumentValueError(INVALID_BULK_ASSET_ERROR.format(index, file_path, f"is missing {required}"))
+
+    # events and custom attributes may also be written as mappings
+    events = entry.get("events")
+    if events:
+        entry["events"] = [
+            [f"{key}={value}" for key, value in event.items()] if isinstance(event, dict) else event
+            for event in events
+        ]
+    custom_attributes = entry.get("custom_attributes")
+    if isinstance(custom_attributes, dict):
+        entry["custom_attributes"] = [f"{key}={value}" for key, value in custom_attributes.items()]
+    # event files are relative to the bulk apply file
+    events_file_path = entry.get("events_file_path")
+    if events_file_path:
+        entry["events_file_path"] = os.path.join(
+            os.path.dirname(os.path.abspath(os.path.expanduser(file_path))), os.path.expanduser(events_file_path)
+        )
+    return entry
+
+
+def _get_bulk_apply_result(
+    asset: "_BulkAsset", resource: Optional[Union[dict, Any]] = None, error: Optional[Exception] = None
+) -> dict:
+    if resource is not None and not isinstance(resource, dict):
+        resource = resource.as_dict()
+    return {
+        "name": asset.asset_name,
+        "resourceGroup": asset.resource_group_name,
+        "status": "Failed" if error else "Succeeded",
+        "provisioningState": (resource or {}).get("properties", {}).get("provisioningState"),
+        "error": (getattr(error, "message", None) or str(error)) if error else None,
+    }
+
+
 def _build_asset_sub_point(
     data_source: Optional[str] = None,
     event_notifier: Optional[str] = None,
@@ -854,44 +1183,30 @@ def _build_ordered_csv_conversion_map(sub_point_type: str, portal_friendly: bool
     return OrderedDict(csv_conversion_map)
 
 
-def _convert_sub_points_from_csv(sub_points: List[Dict[str, str]]):
-    csv_conversion_map = {
-        "CapabilityId": "capabilityId",
-        "Capability Id": "capabilityId",
-        "Data Source": "dataSource",
-        "EventName": "name",
-        "EventNotifier": "eventNotifier",
-        "Event Notifier": "eventNotifier",
-        "Name": "name",
-        "NodeID": "dataSource",
-        "ObservabilityMode": "observabilityMode",
-        "Observability Mode": "observabilityMode",
-        "QueueSize": "queueSize",
-        "Queue Size": "queueSize",
-        "Sampling Interval Milliseconds": "samplingInterval",
-        "TagName" : "name",
-    }
-    for point in sub_points:
-        # point has csv values
-        point.pop("", None)
-        for key, value in csv_conversion_map.items():
-            if key in point:
-                point[value] = point.pop(key)
-        # now the point has the normal values - do some final transformations
-        if point.get("observabilityMode"):
-            point["observabilityMode"] = point["observabilityMode"].capitalize()
-        configuration = {}
-        if point.get("samplingInterval"):
-            configuration["samplingInterval"] = int(point.pop("samplingInterval"))
-        else:
-            point.pop("samplingInterval", None)
-        if point.get("queueSize"):
-            configuration["queueSize"] = int(point.pop("queueSize"))
+def _convert_sub_point_from_csv(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalizes a csv (or json) record into an asset data point or event in a single pass."""
+    point = {}
+    configuration = {}
+    for header, key in _get_csv_header_map(tuple(record)).items():
+        value = record[header]
+        if key in SUB_POINT_CONFIGURATION_KEYS:
+            if value:
+                configuration[key] = int(value)
         else:
-            point.pop("queueSize", None)
-        if configuration:
-            config_key = "dataPointConfiguration" if "dataSource" in point else "eventConfiguration"
-            point[config_key] = json.dumps(configuration)
+            point[key] = value
+    # now the point has the normal values - do some final transformations
+    if point.get("observabilityMode"):
+        point["observabilityMode"] = point["observabilityMode"].capitalize()
+    if configuration:
+        config_key = "dataPointConfiguration" if "dataSource" in point else "eventConfiguration"
+        point[config_key] = json.dumps(configuration)
+    return point
+
+
+@lru_cache(maxsize=16)
+def _get_csv_header_map(headers: Tuple[str, ...]) -> Dict[str, str]:
+    """Record key to asset key, built once per header row. Blank columns are dropped."""
+    return {header: CSV_CONVERSION_MAP.get(header, header) for header in headers if header != ""}
 
 
 def _convert_sub_points_to_csv(
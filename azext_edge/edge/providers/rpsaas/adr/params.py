@@ -253,6 +253,24 @@ def load_adr_arguments(self, _):
             help="Custom query to use. All other query arguments will be ignored.",
         )
 
+    with self.argument_context("iot ops asset bulk-apply") as context:
+        context.argument(
+            "file_path",
+            options_list=["--file", "--input-file", "--if"],
+            help="File path for the file containing the assets. The following file types are supported: json, yaml.",
+        )
+        context.argument(
+            "instance_name",
+            options_list=["--instance"],
+            help="Instance name to associate assets that do not set an instance with.",
+        )
+        context.argument(
+            "concurrency",
+            options_list=["--concurrency"],
+            help="Maximum number of assets submitted concurrently.",
+            type=int,
+        )
+
     with self.argument_context("iot ops asset query") as context:
         context.argument(
             "disabled",
@@ -262,6 +280,38 @@ def load_adr_arguments(self, _):
             arg_type=get_three_state_flag(),
         )
 
+    for cmd_space in ["iot ops asset query", "iot ops asset endpoint query"]:
+        with self.argument_context(cmd_space) as context:
+            context.argument(
+                "count",
+                options_list=["--count"],
+                help="Only return the number of matching resources, counted by the Resource Graph.",
+                arg_group="Output",
+                arg_type=get_three_state_flag(),
+            )
+            context.argument(
+                "stream",
+                options_list=["--stream"],
+                help="Write matching resources to stdout as newline delimited JSON as each page of results "
+                "is received, rather than returning them once all pages are fetched.",
+                arg_group="Output",
+                arg_type=get_three_state_flag(),
+            )
+            context.argument(
+                "page_size",
+                options_list=["--page-size"],
+                help="Maximum number of resources requested from the Resource Graph per page. Max value is 1000.",
+                arg_group="Output",
+                type=int,
+            )
+            context.argument(
+                "top",
+                options_list=["--top"],
+                help="Maximum number of resources returned in total.",
+                arg_group="Output",
+                type=int,
+            )
+
     with self.argument_context("iot ops asset update") as context:
         context.argument(
             "custom_attributes",
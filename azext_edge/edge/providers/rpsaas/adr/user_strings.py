@@ -5,13 +5,18 @@
 # ----------------------------------------------------------------------------------------------
 
 # Asset Strings
+BULK_APPLY_FILE_ERROR = "{0} must contain a list of assets, or a mapping with an assets list."
 DUPLICATE_EVENT_ERROR = "An event with the name {0} is already present. Please use a different name for "\
     "your event or --replace."
 DUPLICATE_POINT_ERROR = "A data-point with the name {0} is already present. Please use a different name for "\
     "your data-point or --replace."
 ENDPOINT_NOT_FOUND_WARNING = "Endpoint {0} not found. The asset may fail provisioning."
+INVALID_BULK_ASSET_ERROR = "Asset {0} of {1} {2}."
 INVALID_OBSERVABILITY_MODE_ERROR = "{0} has an invalid observability mode [{1}]."
+INVALID_SUB_POINT_ERROR = "Item {0} of {1} is invalid: {2}"
+MAX_SUB_POINTS_ERROR = "Importing {0} would exceed the maximum of {1} {2}."
 MISSING_DATA_EVENT_ERROR = "At least one data point or event is required to create the asset."
+MISSING_SUB_POINT_KEY_ERROR = "Item {0} of {1} is missing the {2}."
 
 
 # Asset Endpoint Strings
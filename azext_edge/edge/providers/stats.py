@@ -7,20 +7,49 @@
 import binascii
 import json
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Optional, Tuple, Union
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
-from azure.cli.core.azclierror import ResourceNotFoundError
+from azure.cli.core.azclierror import InvalidArgumentValueError, ResourceNotFoundError
 from knack.log import get_logger
 from rich.console import Console
 
-from ..common import AIO_BROKER_DIAGNOSTICS_SERVICE, PROTOBUF_SERVICE_API_PORT, PodState
+from ..common import (
+    AIO_BROKER_DIAGNOSTICS_SERVICE,
+    METRICS_SERVICE_API_PORT,
+    PROTOBUF_SERVICE_API_PORT,
+    PodState,
+)
 from ..util import get_timestamp_now_utc
-from .base import V1Pod, get_namespaced_pods_by_prefix, portforward_socket
+from .base import PodRequest, V1Pod, get_namespaced_pods_by_prefix, portforward_http, portforward_socket
 
 logger = get_logger(__name__)
 
 console = Console(highlight=True)
 
+TRACE_RECEIVE_BUFFER_SIZE = 256 * 1024
+FRAME_PREFIX_SIZE = 4
+METRICS_PATH = "/metrics"
+STATS_REFRESH_SEC = 5
+STATS_WINDOW_SIZE = 60
+
+
+class BrokerStat(NamedTuple):
+    key: str
+    metric: str
+    display_name: str
+    # Counters are reported as a rate per second, gauges as their value.
+    is_counter: bool = False
+
+
+BROKER_STATS: List[BrokerStat] = [
+    BrokerStat("publishesReceived", "aio_broker_publishes_received", "Publishes received/sec", is_counter=True),
+    BrokerStat("publishesSent", "aio_broker_publishes_sent", "Publishes sent/sec", is_counter=True),
+    BrokerStat("connectedSessions", "aio_broker_connected_sessions", "Connected sessions"),
+    BrokerStat("totalSubscriptions", "aio_broker_total_subscriptions", "Subscriptions"),
+    BrokerStat("queueDepth", "aio_broker_queue_depth", "Queue depth"),
+]
+
 if TYPE_CHECKING:
     # pylint: disable=no-name-in-module
     from socket import socket
@@ -52,29 +81,212 @@ def _preprocess_stats(
     )
 
 
+def get_stats(
+    namespace: Optional[str] = None,
+    diag_service_pod_prefix: str = AIO_BROKER_DIAGNOSTICS_SERVICE,
+    pod_metrics_port: int = METRICS_SERVICE_API_PORT,
+    watch: Optional[bool] = None,
+    refresh_in_seconds: int = STATS_REFRESH_SEC,
+    window: int = STATS_WINDOW_SIZE,
+    max_samples: Optional[int] = None,
+) -> Optional[Dict[str, Optional[float]]]:
+    """
+    Broker statistics from the diagnostics service metrics endpoint.
+
+    Without watch the current metric values are returned. With watch a single port-forwarded keep-alive
+    connection is sampled every refresh_in_seconds, rendering current and windowed rates live until
+    interrupted or max_samples are taken.
+    """
+    if refresh_in_seconds < 1:
+        raise InvalidArgumentValueError("--refresh must be at least 1 second.")
+    if window < 2:
+        raise InvalidArgumentValueError("--window must be at least 2 samples.")
+
+    namespace, diagnostic_pod = _preprocess_stats(namespace=namespace, diag_service_pod_prefix=diag_service_pod_prefix)
+    # Samples share one keep-alive tunnel to the metrics endpoint.
+    with portforward_http(
+        namespace=namespace, pod_name=diagnostic_pod.metadata.name, pod_port=pod_metrics_port
+    ) as pod_request:
+        if not watch:
+            return parse_broker_metrics(pod_request.get(METRICS_PATH))
+
+        _watch_stats(
+            pod_request=pod_request,
+            namespace=namespace,
+            refresh_in_seconds=refresh_in_seconds,
+            window=window,
+            max_samples=max_samples,
+        )
+
+
+def parse_broker_metrics(content: str) -> Dict[str, Optional[float]]:
+    """
+    Sum the Prometheus samples of each broker stat across label sets.
+    """
+    from ..util.prometheus import iter_samples
+
+    stats_by_metric = {stat.metric: stat for stat in BROKER_STATS}
+    result: Dict[str, Optional[float]] = {stat.key: None for stat in BROKER_STATS}
+    for sample in iter_samples(content.splitlines()):
+        # OpenMetrics exposes counters with a _total suffix.
+        stat = stats_by_metric.get(sample.name) or stats_by_metric.get(sample.name.removesuffix("_total"))
+        if stat:
+            result[stat.key] = (result[stat.key] or 0.0) + sample.value
+
+    return result
+
+
+class _StatsWindow:
+    """
+    Fixed size ring buffer of broker stat samples.
+
+    Counters are converted to a rate per second as each sample arrives. Windowed averages are kept as
+    running sums that are updated as samples enter and leave the ring, so each sample is O(1).
+    """
+
+    def __init__(self, size: int = STATS_WINDOW_SIZE):
+        self.size = size
+        self._samples: List[Optional[Dict[str, Optional[float]]]] = [None] * size
+        self._next = 0
+        self._count = 0
+        self._sums: Dict[str, float] = {stat.key: 0.0 for stat in BROKER_STATS}
+        self._sample_counts: Dict[str, int] = {stat.key: 0 for stat in BROKER_STATS}
+        self._last_timestamp: Optional[float] = None
+        self._last_metrics: Dict[str, Optional[float]] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, timestamp: float, metrics: Dict[str, Optional[float]]):
+        sample: Dict[str, Optional[float]] = {}
+        for stat in BROKER_STATS:
+            value = metrics.get(stat.key)
+            if stat.is_counter:
+                value = self._get_rate(stat.key, timestamp, value)
+            sample[stat.key] = value
+        self._last_timestamp = timestamp
+        self._last_metrics = metrics
+
+        evicted = self._samples[self._next]
+        if evicted:
+            self._apply(evicted, sign=-1)
+        self._samples[self._next] = sample
+        self._apply(sample, sign=1)
+        self._next = (self._next + 1) % self.size
+        self._count = min(self._count + 1, self.size)
+
+    def summarize(self) -> Dict[str, Dict[str, Optional[float]]]:
+        latest = self._samples[self._next - 1] if self._count else {}
+        return {
+            stat.key: {
+                "current": latest.get(stat.key),
+                "average": (
+                    self._sums[stat.key] / self._sample_counts[stat.key] if self._sample_counts[stat.key] else None
+                ),
+            }
+            for stat in BROKER_STATS
+        }
+
+    def _get_rate(self, key: str, timestamp: float, value: Optional[float]) -> Optional[float]:
+        last_value = self._last_metrics.get(key)
+        if value is None or last_value is None or timestamp <= self._last_timestamp:
+            return None
+        # A counter lower than its last value was reset by a broker restart.
+        increase = value - last_value if value >= last_value else value
+        return increase / (timestamp - self._last_timestamp)
+
+    def _apply(self, sample: Dict[str, Optional[float]], sign: int):
+        for key, value in sample.items():
+            if value is not None:
+                self._sums[key] += sign * value
+                self._sample_counts[key] += sign
+
+
+def _watch_stats(
+    pod_request: PodRequest,
+    namespace: str,
+    refresh_in_seconds: int,
+    window: int,
+    max_samples: Optional[int] = None,
+):
+    from rich.live import Live
+
+    stats_window = _StatsWindow(size=window)
+    next_sample_at = monotonic()
+    sample_count = 0
+    with Live(
+        _render_stats(stats_window, namespace=namespace, refresh_in_seconds=refresh_in_seconds),
+        console=console,
+        auto_refresh=False,
+    ) as live:
+        try:
+            while max_samples is None or sample_count < max_samples:
+                sampled_at = monotonic()
+                stats_window.add(timestamp=sampled_at, metrics=parse_broker_metrics(pod_request.get(METRICS_PATH)))
+                sample_count += 1
+                live.update(
+                    _render_stats(stats_window, namespace=namespace, refresh_in_seconds=refresh_in_seconds),
+                    refresh=True,
+                )
+                if max_samples is not None and sample_count >= max_samples:
+                    break
+                # Sample on a fixed schedule regardless of how long each fetch takes.
+                next_sample_at = max(next_sample_at + refresh_in_seconds, monotonic())
+                sleep(max(0.0, next_sample_at - monotonic()))
+        except KeyboardInterrupt:
+            pass
+
+
+def _render_stats(stats_window: _StatsWindow, namespace: str, refresh_in_seconds: int):
+    from rich.table import Table
+
+    table = Table(
+        title=f"Broker stats in namespace {namespace}",
+        caption=f"Sampled every {refresh_in_seconds}s, averaged over the last {len(stats_window)} samples.",
+    )
+    table.add_column("Stat")
+    table.add_column("Current", justify="right")
+    table.add_column("Average", justify="right")
+
+    summary = stats_window.summarize()
+    for stat in BROKER_STATS:
+        table.add_row(
+            stat.display_name,
+            _format_stat(summary[stat.key]["current"]),
+            _format_stat(summary[stat.key]["average"]),
+        )
+    return table
+
+
+def _format_stat(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    return f"{value:,.0f}" if value.is_integer() else f"{value:,.2f}"
+
+
 def get_traces(
     namespace: Optional[str] = None,
     diag_service_pod_prefix: str = AIO_BROKER_DIAGNOSTICS_SERVICE,
     pod_protobuf_port: int = PROTOBUF_SERVICE_API_PORT,
     trace_ids: Optional[List[str]] = None,
     trace_dir: Optional[str] = None,
-) -> Union[List["TracesData"], List[Tuple["ZipInfo", str]], None]:
+    internal_tls: Optional[bool] = None,
+) -> Union[List[dict], Iterable[Tuple["ZipInfo", Union[bytes, str]]], None]:
     """
     trace_ids: List[str] hex representation of trace Ids.
+    internal_tls: whether the broker encrypts internal traffic, looked up from the broker when not provided.
+
+    Traces are streamed from the diagnostics service one framed response at a time. With trace_dir each
+    trace is written to the archive as soon as it is read, and for the support bundle the archive entries
+    are returned as a lazy iterable, so memory use does not grow with the number of traces.
     """
     if not any([trace_ids, trace_dir]):
         raise ValueError("At least trace_ids or trace_dir is required.")
 
-    from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
-
-    from google.protobuf.json_format import MessageToDict
-    from rich.progress import MofNCompleteColumn, Progress
+    from zipfile import ZIP_DEFLATED, ZipFile
 
     from ..util import normalize_dir
 
-    # pylint: disable=no-name-in-module
-    from .proto.diagnostics_service_pb2 import Request, Response, TraceRetrievalInfo
-
     namespace, diagnostic_pod = _preprocess_stats(namespace=namespace, diag_service_pod_prefix=diag_service_pod_prefix)
 
     for_support_bundle = False
@@ -86,14 +298,78 @@ def get_traces(
             for_support_bundle = True
         trace_ids = [binascii.unhexlify(t) for t in trace_ids]
 
+    traces = _stream_traces(
+        namespace=namespace,
+        pod_name=diagnostic_pod.metadata.name,
+        pod_port=pod_protobuf_port,
+        trace_ids=trace_ids,
+        show_progress=not (trace_ids or for_support_bundle),
+        internal_tls=internal_tls,
+    )
+    if for_support_bundle:
+        return _get_trace_archive_entries(traces)
+
+    result: List[dict] = []
+    myzip = None
+    if trace_dir:
+        normalized_dir_path = normalize_dir(dir_path=trace_dir)
+        normalized_dir_path = normalized_dir_path.joinpath(
+            f"broker_traces_{get_timestamp_now_utc(format='%Y%m%dT%H%M%S')}.zip"
+        )
+        # pylint: disable=consider-using-with
+        myzip = ZipFile(file=str(normalized_dir_path), mode="w", compression=ZIP_DEFLATED)
+
+    try:
+        for trace in traces:
+            if trace_ids:
+                result.append(trace.message_dict)
+            if myzip:
+                for zinfo, data in _get_trace_archive_entries([trace]):
+                    myzip.writestr(zinfo_or_arcname=zinfo, data=data)
+    finally:
+        if myzip:
+            myzip.close()
+
+    if result:
+        return result
+
+
+class _RetrievedTrace(NamedTuple):
+    message_dict: dict
+    trace: "TracesData"
+    root_span: dict
+    resource_name: str
+    timestamp: datetime
+
+
+def _stream_traces(
+    namespace: str,
+    pod_name: str,
+    pod_port: int,
+    trace_ids: List[bytes],
+    show_progress: bool = False,
+    internal_tls: Optional[bool] = None,
+) -> Iterator[_RetrievedTrace]:
+    """
+    Request traces from the diagnostics service and yield each one as its framed response is read.
+
+    Frames are parsed in place from the reader's receive buffer, so only the trace being processed is held
+    in memory.
+    """
+    from google.protobuf.json_format import MessageToDict
+    from rich.progress import MofNCompleteColumn, Progress
+
+    # pylint: disable=no-name-in-module
+    from .proto.diagnostics_service_pb2 import Request, Response, TraceRetrievalInfo
+
     with Progress(
         *Progress.get_default_columns(),
         MofNCompleteColumn(),
         transient=False,
-        disable=bool(trace_ids) or for_support_bundle,
+        disable=not show_progress,
     ) as progress:
         with portforward_socket(
-            namespace=namespace, pod_name=diagnostic_pod.metadata.name, pod_port=pod_protobuf_port
+            namespace=namespace, pod_name=pod_name, pod_port=pod_port, internal_tls=internal_tls
         ) as socket:
             request = Request(get_traces=TraceRetrievalInfo(trace_ids=trace_ids))
             serialized_request = request.SerializeToString()
@@ -102,103 +378,72 @@ def get_traces(
             socket.sendall(request_len_b)
             socket.sendall(serialized_request)
 
-            traces: List[dict] = []
-            if trace_dir:
-                normalized_dir_path = normalize_dir(dir_path=trace_dir)
-                normalized_dir_path = normalized_dir_path.joinpath(
-                    f"broker_traces_{get_timestamp_now_utc(format='%Y%m%dT%H%M%S')}.zip"
-                )
-                # pylint: disable=consider-using-with
-                myzip = ZipFile(file=str(normalized_dir_path), mode="w", compression=ZIP_DEFLATED)
-
-            progress_set = False
+            reader = _FrameReader(socket)
             progress_task = None
             total_trace_count = 0
             current_trace_count = 0
-            try:
-                while True:
-                    if current_trace_count and current_trace_count >= total_trace_count:
+            while True:
+                if current_trace_count and current_trace_count >= total_trace_count:
+                    break
+                response_bytes = reader.read_frame()
+                if response_bytes is None:
+                    logger.warning("TCP socket closed. Trace processing aborted.")
+                    return
+
+                response = Response.FromString(response_bytes)
+                current_trace_count = current_trace_count + 1
+
+                if not total_trace_count:
+                    total_trace_count = response.retrieved_trace.total_trace_count
+                    if total_trace_count == 0:
+                        logger.warning("No traces to fetch. Processing aborted.")
                         break
-                    rbytes = _fetch_bytes(socket, 4)
-                    response_size = int.from_bytes(rbytes, byteorder="big")
-                    response_bytes = _fetch_bytes(socket, response_size)
-
-                    if response_bytes == b"":
-                        logger.warning("TCP socket closed. Trace processing aborted.")
-                        return
-
-                    response = Response.FromString(response_bytes)
-                    current_trace_count = current_trace_count + 1
-
-                    if not total_trace_count:
-                        total_trace_count = response.retrieved_trace.total_trace_count
-                        if total_trace_count == 0:
-                            logger.warning("No traces to fetch. Processing aborted.")
-                            break
-
-                    if not progress.disable and not progress_set:
-                        progress_task = progress.add_task(
-                            "[deep_sky_blue4]Gathering traces...", total=response.retrieved_trace.total_trace_count
-                        )
-                        progress_set = True
-
-                    msg_dict = MessageToDict(message=response.retrieved_trace.trace, use_integers_for_enums=True)
-                    root_span, resource_name, timestamp = _determine_root_span(message_dict=msg_dict)
-
-                    if progress_set:
-                        progress.update(progress_task, advance=1)
-                    if not all([root_span, resource_name, timestamp]):
-                        logger.debug("Could not process root span. Skipping trace.")
-                        continue
-
-                    span_trace_id = root_span["traceId"]
-                    span_name = root_span["name"]
-
-                    if trace_ids:
-                        traces.append(msg_dict)
-                    if trace_dir or for_support_bundle:
-                        archive = f"{resource_name}.{span_name}.{span_trace_id}"
-                        pb_suffix = ".otlp.pb"
-                        tempo_suffix = ".tempo.json"
-
-                        datetime_tuple = tuple(timestamp.timetuple())
-                        zinfo_pb = ZipInfo(filename=f"{archive}{pb_suffix}", date_time=datetime_tuple)
-                        # Fixed in Py 3.9 https://github.com/python/cpython/issues/70373
-                        zinfo_pb.file_size = 0
-                        zinfo_pb.compress_size = 0
-
-                        zinfo_tempo = ZipInfo(filename=f"{archive}{tempo_suffix}", date_time=datetime_tuple)
-                        zinfo_tempo.file_size = 0
-                        zinfo_tempo.compress_size = 0
-
-                        otlp_format_pair = (zinfo_pb, response.retrieved_trace.trace.SerializeToString())
-                        tempo_format_pair = (
-                            zinfo_tempo,
-                            json.dumps(_convert_otlp_to_tempo(msg_dict), sort_keys=True),
-                        )
-
-                        if for_support_bundle:
-                            traces.append(otlp_format_pair)
-                            traces.append(tempo_format_pair)
-                            continue
-
-                        # Original OTLP
-                        myzip.writestr(
-                            zinfo_or_arcname=otlp_format_pair[0],
-                            data=otlp_format_pair[1],
-                        )
-                        # Tempo
-                        myzip.writestr(
-                            zinfo_or_arcname=tempo_format_pair[0],
-                            data=tempo_format_pair[1],
-                        )
-
-                if traces:
-                    return traces
-
-            finally:
-                if trace_dir:
-                    myzip.close()
+
+                if not progress.disable and progress_task is None:
+                    progress_task = progress.add_task("[deep_sky_blue4]Gathering traces...", total=total_trace_count)
+
+                msg_dict = MessageToDict(message=response.retrieved_trace.trace, use_integers_for_enums=True)
+                root_span, resource_name, timestamp = _determine_root_span(message_dict=msg_dict)
+
+                if progress_task is not None:
+                    progress.update(progress_task, advance=1)
+                if not all([root_span, resource_name, timestamp]):
+                    logger.debug("Could not process root span. Skipping trace.")
+                    continue
+
+                yield _RetrievedTrace(
+                    message_dict=msg_dict,
+                    trace=response.retrieved_trace.trace,
+                    root_span=root_span,
+                    resource_name=resource_name,
+                    timestamp=timestamp,
+                )
+
+
+def _get_trace_archive_entries(
+    traces: Iterable[_RetrievedTrace],
+) -> Iterator[Tuple["ZipInfo", Union[bytes, str]]]:
+    """
+    Yield the original OTLP and the Grafana Tempo archive entries of each trace.
+    """
+    from zipfile import ZipInfo
+
+    pb_suffix = ".otlp.pb"
+    tempo_suffix = ".tempo.json"
+    for trace in traces:
+        archive = f"{trace.resource_name}.{trace.root_span['name']}.{trace.root_span['traceId']}"
+        datetime_tuple = tuple(trace.timestamp.timetuple())
+
+        zinfo_pb = ZipInfo(filename=f"{archive}{pb_suffix}", date_time=datetime_tuple)
+        # Fixed in Py 3.9 https://github.com/python/cpython/issues/70373
+        zinfo_pb.file_size = 0
+        zinfo_pb.compress_size = 0
+        yield zinfo_pb, trace.trace.SerializeToString()
+
+        zinfo_tempo = ZipInfo(filename=f"{archive}{tempo_suffix}", date_time=datetime_tuple)
+        zinfo_tempo.file_size = 0
+        zinfo_tempo.compress_size = 0
+        yield zinfo_tempo, json.dumps(_convert_otlp_to_tempo(trace.message_dict), sort_keys=True)
 
 
 def _determine_root_span(message_dict: dict) -> Tuple[str, str, Union[datetime, None]]:
@@ -240,32 +485,79 @@ def _determine_root_span(message_dict: dict) -> Tuple[str, str, Union[datetime,
 def _convert_otlp_to_tempo(message_dict: dict) -> dict:
     """
     Convert OTLP payload to Grafana Tempo.
-    """
-    from copy import deepcopy
 
-    new_dict = deepcopy(message_dict)
-
-    new_dict["batches"] = new_dict.pop("resourceSpans")
-    for batch in new_dict.get("batches", []):
-        batch["instrumentationLibrarySpans"] = batch.pop("scopeSpans", [])
-        for inst_lib_span in batch.get("instrumentationLibrarySpans", []):
-            inst_lib_span["instrumentationLibrary"] = inst_lib_span.pop("scope", {})
+    Only the envelopes are rebuilt. Spans are shared with message_dict rather than copied.
+    """
+    tempo_dict = {key: value for key, value in message_dict.items() if key != "resourceSpans"}
+    tempo_dict["batches"] = []
+    for resource_span in message_dict.get("resourceSpans", []):
+        batch = {key: value for key, value in resource_span.items() if key != "scopeSpans"}
+        batch["instrumentationLibrarySpans"] = []
+        for scope_span in resource_span.get("scopeSpans", []):
+            inst_lib_span = {key: value for key, value in scope_span.items() if key != "scope"}
+            inst_lib_span["instrumentationLibrary"] = scope_span.get("scope", {})
+            batch["instrumentationLibrarySpans"].append(inst_lib_span)
+        tempo_dict["batches"].append(batch)
 
-    return new_dict
+    return tempo_dict
 
 
-def _fetch_bytes(socket: "socket", size: int) -> bytes:
-    result_bytes = socket.recv(size)
-    if result_bytes == b"":
-        return result_bytes
+class _FrameReader:
+    """
+    Reads length prefixed frames from a socket through a preallocated receive buffer.
 
-    result_bytes_len = len(result_bytes)
-    while result_bytes_len < size:
-        remaining_bytes_size = size - result_bytes_len
-        interm_bytes = socket.recv(remaining_bytes_size)
-        if interm_bytes == b"":
-            break
-        result_bytes += interm_bytes
-        result_bytes_len += len(interm_bytes)
+    Each recv_into reads ahead as much as the buffer can hold, so several small frames are typically
+    served by a single receive. Frames are returned as memoryview slices of the buffer, which are only
+    valid until the next call to read_frame.
+    """
 
-    return result_bytes
+    def __init__(self, socket: "socket", buffer_size: int = TRACE_RECEIVE_BUFFER_SIZE):
+        self.socket = socket
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        # Unconsumed data is held in _view[_start:_end].
+        self._start = 0
+        self._end = 0
+
+    def read_frame(self) -> Optional[memoryview]:
+        """
+        The next frame, or None when the socket closes before a complete frame is received.
+        """
+        if not self._fill(FRAME_PREFIX_SIZE):
+            return None
+        frame_size = int.from_bytes(self._view[self._start : self._start + FRAME_PREFIX_SIZE], byteorder="big")
+        if not self._fill(FRAME_PREFIX_SIZE + frame_size):
+            return None
+
+        frame_start = self._start + FRAME_PREFIX_SIZE
+        self._start = frame_start + frame_size
+        return self._view[frame_start : self._start]
+
+    def _fill(self, size: int) -> bool:
+        """
+        Receive until at least size unconsumed bytes are buffered.
+        """
+        buffered = self._end - self._start
+        if buffered >= size:
+            return True
+
+        if not buffered:
+            self._start = self._end = 0
+        if size > len(self._buffer):
+            # Frames larger than the buffer grow it, carrying over unconsumed data.
+            buffer = bytearray(max(size, len(self._buffer) * 2))
+            view = memoryview(buffer)
+            view[:buffered] = self._view[self._start : self._end]
+            self._buffer, self._view = buffer, view
+            self._start, self._end = 0, buffered
+        elif self._start + size > len(self._buffer):
+            # Wrap around, moving the partial frame to the front of the buffer.
+            self._view[:buffered] = self._view[self._start : self._end]
+            self._start, self._end = 0, buffered
+
+        while self._end - self._start < size:
+            received = self.socket.recv_into(self._view[self._end :], len(self._buffer) - self._end)
+            if not received:
+                return False
+            self._end += received
+        return True
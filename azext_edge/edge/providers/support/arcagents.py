@@ -5,6 +5,7 @@
 # ----------------------------------------------------------------------------------------------
 
 from functools import partial
+from typing import Iterator
 
 from knack.log import get_logger
 
@@ -56,8 +57,7 @@ def fetch_services():
     return processed
 
 
-def fetch_resources(func: callable, since_seconds: int = None) -> list:
-    resources = []
+def fetch_resources(func: callable, since_seconds: int = None) -> Iterator[dict]:
     for component, has_service in ARC_AGENTS:
         kwargs: dict = {
             "directory_path": f"{MONIKER}/{component}",
@@ -71,8 +71,7 @@ def fetch_resources(func: callable, since_seconds: int = None) -> list:
         else:
             kwargs["label_selector"] = COMPONENT_LABEL_FORMAT.format(label=component)
 
-        resources.extend(func(**kwargs))
-    return resources
+        yield from func(**kwargs)
 
 
 def prepare_bundle(log_age_seconds: int = DAY_IN_SECONDS) -> dict:
@@ -64,22 +64,18 @@ def fetch_replicasets():
 
 
 def fetch_pods(since_seconds: int = DAY_IN_SECONDS):
-    processed = process_v1_pods(
+    yield from process_v1_pods(
         directory_path=STORAGE_DIRECTORY_PATH,
         namespace=STORAGE_NAMESPACE,
         since_seconds=since_seconds,
     )
 
-    processed.extend(
-        process_v1_pods(
-            directory_path=ACSTOR_DIRECTORY_PATH,
-            namespace=ACSTOR_NAMESPACE,
-            since_seconds=since_seconds,
-        )
+    yield from process_v1_pods(
+        directory_path=ACSTOR_DIRECTORY_PATH,
+        namespace=ACSTOR_NAMESPACE,
+        since_seconds=since_seconds,
     )
 
-    return processed
-
 
 def fetch_daemonsets():
     processed = process_daemonsets(
@@ -4,8 +4,9 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
+from datetime import datetime, timezone
 from pathlib import PurePath
-from typing import List, Dict, Optional, Iterable, Tuple, TypeVar, Union
+from typing import IO, Callable, List, Dict, Optional, Iterable, Iterator, Tuple, TypeVar, Union
 from functools import partial
 
 from azext_edge.edge.common import BundleResourceKind, PodState
@@ -14,6 +15,7 @@ from kubernetes.client.exceptions import ApiException
 from kubernetes.client.models import (
     V1Container,
     V1ObjectMeta,
+    V1Pod,
     V1PodSpec,
     V1PodList,
     V1ServiceList,
@@ -27,15 +29,25 @@ from kubernetes.client.models import (
 )
 
 from ..edge_api import EdgeResourceApi
-from ..base import client, get_custom_objects
+from ..base import client, get_custom_objects, get_pod_metrics
+from .manifest import format_manifest_time, get_since_seconds
+from .snapshot import query_snapshot
 from ...util import get_timestamp_now_utc
+from ...util.workers import DaemonWorkerPool
 
 logger = get_logger(__name__)
 generic = client.ApiClient()
 
 DAY_IN_SECONDS: int = 60 * 60 * 24
 POD_STATUS_FAILED_EVICTED: str = "evicted"
+LOG_CHUNK_SIZE: int = 64 * 1024
+LOG_SPOOL_MAX_SIZE: int = 8 * 1024 * 1024
+POD_FAN_OUT_MAX_WORKERS: int = 4
 
+# Container log capture behavior for the current bundle, see configure_log_capture.
+_log_capture_options: dict = {"stream": False, "max_bytes": None, "previous_captures": None}
+
+T = TypeVar("T")
 K8sRuntimeResources = TypeVar(
     "K8sRuntimeResources",
     V1ServiceList,
@@ -100,20 +112,23 @@ def process_v1_pods(
     pod_prefix_for_init_container_logs: Optional[List[str]] = None,
     exclude_prefixes: Optional[List[str]] = None,
     namespace: Optional[str] = None,
-) -> List[dict]:
-    from kubernetes.client.models import V1Pod
-
+) -> Iterator[dict]:
+    """
+    Yield pod manifests, container logs and optionally metrics as each pod is processed.
+    """
     v1_api = client.CoreV1Api()
-    custom_api = client.CustomObjectsApi()
 
-    processed = []
     if not prefix_names:
         prefix_names = []
 
-    if namespace:
-        pods: V1PodList = v1_api.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
-    else:
-        pods: V1PodList = v1_api.list_pod_for_all_namespaces(label_selector=label_selector)
+    pods: V1PodList = query_snapshot(
+        "pods", namespace=namespace, label_selector=label_selector, prefix_names=prefix_names
+    )
+    if pods is None:
+        if namespace:
+            pods = v1_api.list_namespaced_pod(namespace=namespace, label_selector=label_selector)
+        else:
+            pods = v1_api.list_pod_for_all_namespaces(label_selector=label_selector)
 
     if exclude_prefixes:
         pods = exclude_resources_with_prefix(pods, exclude_prefixes)
@@ -122,75 +137,135 @@ def process_v1_pods(
     if label_selector:
         pod_logger_info = f"{pod_logger_info} with label '{label_selector}'."
     logger.info(pod_logger_info)
-    for pod in pods.items:
-        p: V1Pod = pod
-        pod_metadata: V1ObjectMeta = p.metadata
-        pod_namespace: str = pod_metadata.namespace
-        pod_name: str = pod_metadata.name
 
-        if prefix_names:
-            matched_prefix = [pod_name.startswith(prefix) for prefix in prefix_names]
-            if not any(matched_prefix):
-                continue
+    selected_pods = [
+        pod
+        for pod in pods.items
+        if not prefix_names or any(pod.metadata.name.startswith(prefix) for prefix in prefix_names)
+    ]
+    # Pods are processed concurrently, entries are still yielded in listing order.
+    yield from ordered_fan_out(
+        func=partial(
+            _process_v1_pod,
+            api_version=pods.api_version,
+            directory_path=directory_path,
+            v1_api=v1_api,
+            capture_previous_logs=capture_previous_logs,
+            include_metrics=include_metrics,
+            since_seconds=since_seconds,
+            pod_prefix_for_init_container_logs=pod_prefix_for_init_container_logs,
+        ),
+        items=selected_pods,
+        max_workers=POD_FAN_OUT_MAX_WORKERS,
+    )
 
-        # TODO: Workaround
-        p.api_version = pods.api_version
-        p.kind = "Pod"
-        processed.append(
-            {
-                "data": generic.sanitize_for_serialization(obj=p),
-                "zinfo": f"{pod_namespace}/{directory_path}/pod.{pod_name}.yaml",
-            }
-        )
-        pod_spec: V1PodSpec = p.spec
-        pod_containers: List[V1Container] = pod_spec.containers
-
-        if pod_prefix_for_init_container_logs:
-            # check if pod name starts with any prefix in pod_prefix_for_init_container_logs
-            if any(pod_name.startswith(prefix) for prefix in pod_prefix_for_init_container_logs):
-                init_pod_containers: List[V1Container] = pod_spec.init_containers
-                pod_containers.extend(init_pod_containers)
-
-        # exclude evicted pods from log capture since they are not accessible
-        pod_status = pod.status
-        if (
-            pod_status
-            and pod_status.phase == PodState.failed.value
-            and str(pod_status.reason).lower() == POD_STATUS_FAILED_EVICTED
-        ):
-            logger.info(f"Pod {pod_name} in namespace {pod_namespace} is evicted. Skipping log capture.")
-        else:
-            processed.extend(
-                _capture_pod_container_logs(
-                    directory_path=directory_path,
-                    pod_containers=pod_containers,
-                    pod_name=pod_name,
-                    pod_namespace=pod_namespace,
-                    v1_api=v1_api,
-                    since_seconds=since_seconds,
-                    capture_previous_logs=capture_previous_logs,
-                )
+
+def _process_v1_pod(
+    pod: V1Pod,
+    api_version: str,
+    directory_path: str,
+    v1_api: client.CoreV1Api,
+    capture_previous_logs: bool = True,
+    include_metrics: bool = False,
+    since_seconds: int = DAY_IN_SECONDS,
+    pod_prefix_for_init_container_logs: Optional[List[str]] = None,
+) -> List[dict]:
+    pod_metadata: V1ObjectMeta = pod.metadata
+    pod_namespace: str = pod_metadata.namespace
+    pod_name: str = pod_metadata.name
+
+    # TODO: Workaround
+    pod.api_version = api_version
+    pod.kind = "Pod"
+    processed = [
+        {
+            "data": generic.sanitize_for_serialization(obj=pod),
+            "zinfo": f"{pod_namespace}/{directory_path}/pod.{pod_name}.yaml",
+        }
+    ]
+    pod_spec: V1PodSpec = pod.spec
+    # Copy as pods may be shared through the resource snapshot.
+    pod_containers: List[V1Container] = list(pod_spec.containers)
+
+    if pod_prefix_for_init_container_logs:
+        # check if pod name starts with any prefix in pod_prefix_for_init_container_logs
+        if any(pod_name.startswith(prefix) for prefix in pod_prefix_for_init_container_logs):
+            init_pod_containers: List[V1Container] = pod_spec.init_containers
+            pod_containers.extend(init_pod_containers)
+
+    # exclude evicted pods from log capture since they are not accessible
+    pod_status = pod.status
+    if (
+        pod_status
+        and pod_status.phase == PodState.failed.value
+        and str(pod_status.reason).lower() == POD_STATUS_FAILED_EVICTED
+    ):
+        logger.info(f"Pod {pod_name} in namespace {pod_namespace} is evicted. Skipping log capture.")
+    else:
+        processed.extend(
+            _capture_pod_container_logs(
+                directory_path=directory_path,
+                pod_containers=pod_containers,
+                pod_name=pod_name,
+                pod_namespace=pod_namespace,
+                v1_api=v1_api,
+                since_seconds=since_seconds,
+                capture_previous_logs=capture_previous_logs,
+                restart_counts=_get_container_restart_counts(pod),
             )
+        )
 
-        if include_metrics:
-            try:
-                logger.debug(f"Fetching runtime metrics for {pod_name}")
-                metric: dict = custom_api.get_namespaced_custom_object(
-                    "metrics.k8s.io", "v1", pod_namespace, "pods", pod_name
-                )
-                if metric:
-                    processed.append(
-                        {
-                            "data": metric,
-                            "zinfo": f"{pod_namespace}/{directory_path}/pod.{pod_name}.metric.yaml",
-                        }
-                    )
-            except ApiException as e:
-                logger.debug(e.body)
+    if include_metrics:
+        # Metrics for every pod in the namespace are listed once and shared.
+        metric: Optional[dict] = get_pod_metrics(namespace=pod_namespace).get(pod_name)
+        if metric:
+            processed.append(
+                {
+                    "data": metric,
+                    "zinfo": f"{pod_namespace}/{directory_path}/pod.{pod_name}.metric.yaml",
+                }
+            )
 
     return processed
 
 
+def _get_container_restart_counts(pod: V1Pod) -> Dict[str, int]:
+    pod_status = pod.status
+    if not pod_status:
+        return {}
+    container_statuses = (pod_status.container_statuses or []) + (pod_status.init_container_statuses or [])
+    return {status.name: status.restart_count for status in container_statuses}
+
+
+def ordered_fan_out(func: Callable[[T], List[dict]], items: List[T], max_workers: int) -> Iterator[dict]:
+    """
+    Apply func to each item on a bounded thread pool, yielding results in item order.
+
+    At most 2 * max_workers items are in flight, so results completed ahead of a slow
+    predecessor are held without unbounded buffering.
+    """
+    from collections import deque
+
+    if max_workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield from func(item)
+        return
+
+    window = deque()
+    # Daemon workers, so per item work stalled in a log read does not hold up exit once abandoned.
+    executor = DaemonWorkerPool(max_workers=max_workers, thread_name_prefix="aio-support-fan-out")
+    try:
+        for item in items:
+            window.append(executor.submit(func, item))
+            if len(window) >= 2 * max_workers:
+                yield from window.popleft().result()
+        while window:
+            yield from window.popleft().result()
+    finally:
+        # Collectors abandoned mid-iteration should not wait on queued work.
+        executor.shutdown(wait=False)
+
+
 def process_deployments(
     directory_path: str,
     field_selector: Optional[str] = None,
@@ -201,14 +276,22 @@ def process_deployments(
 ) -> List[dict]:
     v1_apps = client.AppsV1Api()
 
-    if namespace:
-        deployments: V1DeploymentList = v1_apps.list_namespaced_deployment(
-            namespace=namespace, label_selector=label_selector, field_selector=field_selector
-        )
-    else:
-        deployments: V1DeploymentList = v1_apps.list_deployment_for_all_namespaces(
-            label_selector=label_selector, field_selector=field_selector
-        )
+    deployments: V1DeploymentList = query_snapshot(
+        "deployments",
+        namespace=namespace,
+        label_selector=label_selector,
+        field_selector=field_selector,
+        prefix_names=prefix_names,
+    )
+    if deployments is None:
+        if namespace:
+            deployments = v1_apps.list_namespaced_deployment(
+                namespace=namespace, label_selector=label_selector, field_selector=field_selector
+            )
+        else:
+            deployments = v1_apps.list_deployment_for_all_namespaces(
+                label_selector=label_selector, field_selector=field_selector
+            )
 
     return _process_kubernetes_resources(
         directory_path=directory_path,
@@ -229,14 +312,22 @@ def process_statefulset(
 ) -> Union[Tuple[List[dict], dict], List[dict]]:
     v1_apps = client.AppsV1Api()
 
-    if namespace:
-        statefulsets: V1StatefulSetList = v1_apps.list_namespaced_stateful_set(
-            namespace=namespace, label_selector=label_selector, field_selector=field_selector
-        )
-    else:
-        statefulsets: V1StatefulSetList = v1_apps.list_stateful_set_for_all_namespaces(
-            label_selector=label_selector, field_selector=field_selector
-        )
+    statefulsets: V1StatefulSetList = query_snapshot(
+        "statefulsets",
+        namespace=namespace,
+        label_selector=label_selector,
+        field_selector=field_selector,
+        prefix_names=prefix_names,
+    )
+    if statefulsets is None:
+        if namespace:
+            statefulsets = v1_apps.list_namespaced_stateful_set(
+                namespace=namespace, label_selector=label_selector, field_selector=field_selector
+            )
+        else:
+            statefulsets = v1_apps.list_stateful_set_for_all_namespaces(
+                label_selector=label_selector, field_selector=field_selector
+            )
     namespace_pods_work = {}
 
     processed = _process_kubernetes_resources(
@@ -268,14 +359,22 @@ def process_services(
 ) -> List[dict]:
     v1_api = client.CoreV1Api()
 
-    if namespace:
-        services: V1ServiceList = v1_api.list_namespaced_service(
-            namespace=namespace, label_selector=label_selector, field_selector=field_selector
-        )
-    else:
-        services: V1ServiceList = v1_api.list_service_for_all_namespaces(
-            label_selector=label_selector, field_selector=field_selector
-        )
+    services: V1ServiceList = query_snapshot(
+        "services",
+        namespace=namespace,
+        label_selector=label_selector,
+        field_selector=field_selector,
+        prefix_names=prefix_names,
+    )
+    if services is None:
+        if namespace:
+            services = v1_api.list_namespaced_service(
+                namespace=namespace, label_selector=label_selector, field_selector=field_selector
+            )
+        else:
+            services = v1_api.list_service_for_all_namespaces(
+                label_selector=label_selector, field_selector=field_selector
+            )
 
     return _process_kubernetes_resources(
         directory_path=directory_path,
@@ -295,12 +394,14 @@ def process_replicasets(
 ) -> List[dict]:
     v1_apps = client.AppsV1Api()
 
-    if namespace:
-        replicasets: V1ReplicaSetList = v1_apps.list_namespaced_replica_set(
-            namespace=namespace, label_selector=label_selector
-        )
-    else:
-        replicasets: V1ReplicaSetList = v1_apps.list_replica_set_for_all_namespaces(label_selector=label_selector)
+    replicasets: V1ReplicaSetList = query_snapshot(
+        "replicasets", namespace=namespace, label_selector=label_selector, prefix_names=prefix_names
+    )
+    if replicasets is None:
+        if namespace:
+            replicasets = v1_apps.list_namespaced_replica_set(namespace=namespace, label_selector=label_selector)
+        else:
+            replicasets = v1_apps.list_replica_set_for_all_namespaces(label_selector=label_selector)
 
     return _process_kubernetes_resources(
         directory_path=directory_path,
@@ -320,14 +421,22 @@ def process_daemonsets(
 ) -> List[dict]:
     v1_apps = client.AppsV1Api()
 
-    if namespace:
-        daemonsets: V1DaemonSetList = v1_apps.list_namespaced_daemon_set(
-            namespace=namespace, label_selector=label_selector, field_selector=field_selector
-        )
-    else:
-        daemonsets: V1DaemonSetList = v1_apps.list_daemon_set_for_all_namespaces(
-            label_selector=label_selector, field_selector=field_selector
-        )
+    daemonsets: V1DaemonSetList = query_snapshot(
+        "daemonsets",
+        namespace=namespace,
+        label_selector=label_selector,
+        field_selector=field_selector,
+        prefix_names=prefix_names,
+    )
+    if daemonsets is None:
+        if namespace:
+            daemonsets = v1_apps.list_namespaced_daemon_set(
+                namespace=namespace, label_selector=label_selector, field_selector=field_selector
+            )
+        else:
+            daemonsets = v1_apps.list_daemon_set_for_all_namespaces(
+                label_selector=label_selector, field_selector=field_selector
+            )
 
     return _process_kubernetes_resources(
         directory_path=directory_path,
@@ -346,14 +455,22 @@ def process_config_maps(
 ) -> List[dict]:
     v1_api = client.CoreV1Api()
 
-    if namespace:
-        config_maps = v1_api.list_namespaced_config_map(
-            namespace=namespace, label_selector=label_selector, field_selector=field_selector
-        )
-    else:
-        config_maps = v1_api.list_config_map_for_all_namespaces(
-            label_selector=label_selector, field_selector=field_selector
-        )
+    config_maps = query_snapshot(
+        "configmaps",
+        namespace=namespace,
+        label_selector=label_selector,
+        field_selector=field_selector,
+        prefix_names=prefix_names,
+    )
+    if config_maps is None:
+        if namespace:
+            config_maps = v1_api.list_namespaced_config_map(
+                namespace=namespace, label_selector=label_selector, field_selector=field_selector
+            )
+        else:
+            config_maps = v1_api.list_config_map_for_all_namespaces(
+                label_selector=label_selector, field_selector=field_selector
+            )
 
     return _process_kubernetes_resources(
         directory_path=directory_path,
@@ -428,13 +545,20 @@ def process_nodes() -> Dict[str, Union[dict, str]]:
     }
 
 
-def get_mq_namespaces() -> List[str]:
+def get_mq_namespaces_internal_tls() -> Dict[str, bool]:
+    """
+    Broker namespaces mapped to whether the first broker in each encrypts internal traffic.
+    """
+    from ..base import is_broker_internal_tls
     from ..edge_api import MQ_ACTIVE_API, MqResourceKinds
 
-    namespaces = []
+    namespaces: Dict[str, bool] = {}
     cluster_brokers = MQ_ACTIVE_API.get_resources(MqResourceKinds.BROKER)
     if cluster_brokers and cluster_brokers["items"]:
-        namespaces.extend([b["metadata"]["namespace"] for b in cluster_brokers["items"]])
+        for broker in cluster_brokers["items"]:
+            namespace = broker["metadata"]["namespace"]
+            if namespace not in namespaces:
+                namespaces[namespace] = is_broker_internal_tls(broker)
 
     return namespaces
 
@@ -501,9 +625,11 @@ def process_jobs(
     exclude_prefixes: Optional[List[str]] = None,
 ) -> List[dict]:
     batch_v1_api = client.BatchV1Api()
-    jobs: V1JobList = batch_v1_api.list_job_for_all_namespaces(
-        label_selector=label_selector, field_selector=field_selector
+    jobs: V1JobList = query_snapshot(
+        "jobs", label_selector=label_selector, field_selector=field_selector, prefix_names=prefix_names
     )
+    if jobs is None:
+        jobs = batch_v1_api.list_job_for_all_namespaces(label_selector=label_selector, field_selector=field_selector)
 
     return _process_kubernetes_resources(
         directory_path=directory_path,
@@ -575,6 +701,24 @@ def default_bundle_name(system_name: str = "aio") -> str:
     return f"support_bundle_{timestamp}_{system_name}.zip"
 
 
+def configure_log_capture(
+    stream: Optional[bool] = None,
+    max_bytes: Optional[int] = None,
+    previous_captures: Optional[Dict[str, datetime]] = None,
+):
+    """
+    Configure how container logs are captured.
+
+    When streaming, logs are read in LOG_CHUNK_SIZE chunks into a spooled file rather than a single str.
+    A max_bytes cap implies streaming and keeps only the tail of each container log.
+    previous_captures maps log paths to when a previous bundle captured them, limiting
+    capture to output produced since.
+    """
+    _log_capture_options["stream"] = bool(stream or max_bytes)
+    _log_capture_options["max_bytes"] = max_bytes
+    _log_capture_options["previous_captures"] = previous_captures
+
+
 def _capture_pod_container_logs(
     directory_path: str,
     pod_containers: List[V1Container],
@@ -583,38 +727,92 @@ def _capture_pod_container_logs(
     v1_api: client.CoreV1Api,
     capture_previous_logs: bool = True,
     since_seconds: int = DAY_IN_SECONDS,
-) -> List[dict]:
-
-    processed = []
+    restart_counts: Optional[Dict[str, int]] = None,
+) -> Iterator[dict]:
     capture_previous_log_runs = [False]
 
     if capture_previous_logs:
         capture_previous_log_runs.append(True)
 
+    restart_counts = restart_counts or {}
+    previous_captures: Optional[Dict[str, datetime]] = _log_capture_options["previous_captures"]
     for container in pod_containers:
         for capture_previous in capture_previous_log_runs:
+            if capture_previous and restart_counts.get(container.name) == 0:
+                # A container that never restarted has no previous run log to read.
+                continue
+            zinfo_previous_segment = "previous." if capture_previous else ""
+            zinfo = f"{pod_namespace}/{directory_path}/pod.{pod_name}.{container.name}.{zinfo_previous_segment}log"
+            log_since_seconds = since_seconds
+            if previous_captures:
+                log_since_seconds = get_since_seconds(previous_captures.get(zinfo), since_seconds)
             try:
                 logger_debug_previous = "previous run " if capture_previous else ""
                 logger.debug(f"Reading {logger_debug_previous}log from pod {pod_name} container {container.name}")
-                log: str = v1_api.read_namespaced_pod_log(
-                    name=pod_name,
-                    namespace=pod_namespace,
-                    since_seconds=since_seconds,
-                    container=container.name,
-                    previous=capture_previous,
-                )
-                zinfo_previous_segment = "previous." if capture_previous else ""
-                zinfo = f"{pod_namespace}/{directory_path}/pod.{pod_name}.{container.name}.{zinfo_previous_segment}log"
-                processed.append(
-                    {
-                        "data": log,
-                        "zinfo": zinfo,
-                    }
-                )
+                captured_at = format_manifest_time(datetime.now(timezone.utc))
+                log_kwargs = {
+                    "name": pod_name,
+                    "namespace": pod_namespace,
+                    "since_seconds": log_since_seconds,
+                    "container": container.name,
+                    "previous": capture_previous,
+                }
+                if _log_capture_options["stream"]:
+                    log = _stream_pod_container_log(
+                        v1_api=v1_api, max_bytes=_log_capture_options["max_bytes"], **log_kwargs
+                    )
+                else:
+                    log: str = v1_api.read_namespaced_pod_log(**log_kwargs)
+                yield {
+                    "data": log,
+                    "zinfo": zinfo,
+                    "namespace": pod_namespace,
+                    "logCapturedAt": captured_at,
+                }
             except ApiException as e:
                 logger.debug(e.body)
 
-    return processed
+
+def _stream_pod_container_log(v1_api: client.CoreV1Api, max_bytes: Optional[int] = None, **kwargs) -> IO[bytes]:
+    """
+    Read a container log in chunks into a spooled temporary file positioned at the start.
+
+    With max_bytes only the tail is kept, trimmed forward to the next line boundary.
+    """
+    from collections import deque
+    from tempfile import SpooledTemporaryFile
+
+    response = v1_api.read_namespaced_pod_log(_preload_content=False, **kwargs)
+    spool = SpooledTemporaryFile(max_size=LOG_SPOOL_MAX_SIZE)  # pylint: disable=consider-using-with
+    try:
+        if not max_bytes:
+            for chunk in response.stream(LOG_CHUNK_SIZE):
+                spool.write(chunk)
+        else:
+            tail = deque()
+            tail_size = 0
+            for chunk in response.stream(LOG_CHUNK_SIZE):
+                tail.append(chunk)
+                tail_size += len(chunk)
+                while tail_size - len(tail[0]) >= max_bytes:
+                    tail_size -= len(tail.popleft())
+            if tail_size > max_bytes:
+                head = tail[0][tail_size - max_bytes :]
+                # Drop the partial leading line unless it is the only line kept.
+                newline = head.find(b"\n")
+                if newline != -1 and (newline + 1 < len(head) or len(tail) > 1):
+                    head = head[newline + 1 :]
+                tail[0] = head
+            for chunk in tail:
+                spool.write(chunk)
+    except Exception:
+        spool.close()
+        raise
+    finally:
+        response.release_conn()
+
+    spool.seek(0)
+    return spool
 
 
 def _process_kubernetes_resources(
@@ -36,7 +36,7 @@ def fetch_pods(
     since_seconds: int = DAY_IN_SECONDS,
 ):
     # capture billing pods for aio usage
-    billing_pods = process_v1_pods(
+    yield from process_v1_pods(
         directory_path=BILLING_RESOURCE_KIND,
         label_selector=AIO_BILLING_USAGE_NAME_LABEL,
         prefix_names=[AIO_USAGE_PREFIX],
@@ -44,16 +44,12 @@ def fetch_pods(
     )
 
     # capture billing pods for arc extension
-    billing_pods.extend(
-        process_v1_pods(
-            directory_path=ARC_BILLING_DIRECTORY_PATH,
-            label_selector=ARC_BILLING_EXTENSION_COMP_LABEL,
-            since_seconds=since_seconds,
-        )
+    yield from process_v1_pods(
+        directory_path=ARC_BILLING_DIRECTORY_PATH,
+        label_selector=ARC_BILLING_EXTENSION_COMP_LABEL,
+        since_seconds=since_seconds,
     )
 
-    return billing_pods
-
 
 def fetch_jobs():
     processed = process_jobs(
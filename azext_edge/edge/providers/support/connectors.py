@@ -35,31 +35,19 @@ OPCUA_NAME_LABEL = NAME_LABEL_FORMAT.format(label="microsoft-iotoperations-opcua
 
 
 def fetch_pods(since_seconds: int = DAY_IN_SECONDS):
-    opcua_pods = []
     pod_name_labels = [
         OPC_APP_LABEL,
         OPC_NAME_LABEL,
         OPC_NAME_VAR_LABEL,
+        OPCUA_NAME_LABEL,
     ]
     for pod_name_label in pod_name_labels:
-        opcua_pods.extend(
-            process_v1_pods(
-                directory_path=CONNECTORS_DIRECTORY_PATH,
-                label_selector=pod_name_label,
-                since_seconds=since_seconds,
-                include_metrics=True,
-            )
-        )
-
-    opcua_pods.extend(
-        process_v1_pods(
+        yield from process_v1_pods(
             directory_path=CONNECTORS_DIRECTORY_PATH,
-            label_selector=OPCUA_NAME_LABEL,
+            label_selector=pod_name_label,
             since_seconds=since_seconds,
             include_metrics=True,
         )
-    )
-    return opcua_pods
 
 
 def fetch_deployments():
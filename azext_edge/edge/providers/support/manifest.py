@@ -0,0 +1,114 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import json
+from datetime import datetime, timezone
+from math import ceil
+from threading import Lock
+from typing import Dict, Optional
+from zipfile import BadZipFile, ZipFile
+
+from azure.cli.core.azclierror import FileOperationError, InvalidArgumentValueError
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+BUNDLE_MANIFEST_NAME = "manifest.json"
+BUNDLE_MANIFEST_VERSION = 1
+MANIFEST_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+class BundleManifest:
+    """
+    Index of support bundle entries keyed by archive path.
+
+    Entries describe the collecting service, kind, namespace, resourceVersion, size, sha256 and
+    the time spent producing them. Per collector totals are kept separately.
+
+    When built from a previous bundle's manifest, objects whose resourceVersion has not changed
+    are reported as unchanged so they can be left out of an incremental bundle.
+    """
+
+    def __init__(self, previous: Optional[dict] = None, since_bundle: Optional[str] = None):
+        self.captured_at = format_manifest_time(datetime.now(timezone.utc))
+        self.since_bundle = since_bundle
+        self.previous_entries: Dict[str, dict] = (previous or {}).get("entries", {})
+        self.entries: Dict[str, dict] = {}
+        self.collectors: Dict[str, Dict[str, dict]] = {}
+        self._lock = Lock()
+
+    def is_unchanged(self, path: str, resource_version: Optional[str]) -> bool:
+        if not resource_version:
+            return False
+        return self.previous_entries.get(path, {}).get("resourceVersion") == resource_version
+
+    def record(self, path: str, **attributes):
+        attributes = {k: v for k, v in attributes.items() if v is not None}
+        with self._lock:
+            self.entries.setdefault(path, {}).update(attributes)
+
+    def record_collector(self, service: str, collector: str, **attributes):
+        attributes = {k: v for k, v in attributes.items() if v is not None}
+        with self._lock:
+            self.collectors.setdefault(service, {}).setdefault(collector, {}).update(attributes)
+
+    def as_dict(self) -> dict:
+        result = {
+            "version": BUNDLE_MANIFEST_VERSION,
+            "capturedAt": self.captured_at,
+        }
+        if self.since_bundle:
+            result["sinceBundle"] = self.since_bundle
+        with self._lock:
+            result["collectors"] = {
+                service: {collector: self.collectors[service][collector] for collector in sorted(collectors)}
+                for service, collectors in sorted(self.collectors.items())
+            }
+            result["entries"] = {path: self.entries[path] for path in sorted(self.entries)}
+        return result
+
+
+def read_bundle_manifest(bundle_path: str) -> dict:
+    try:
+        with ZipFile(file=bundle_path, mode="r") as bundle_zip:
+            if BUNDLE_MANIFEST_NAME not in bundle_zip.namelist():
+                raise InvalidArgumentValueError(
+                    f"{bundle_path} does not contain a {BUNDLE_MANIFEST_NAME}. "
+                    "Incremental capture requires a bundle produced with manifest support."
+                )
+            return json.loads(bundle_zip.read(BUNDLE_MANIFEST_NAME))
+    except (OSError, BadZipFile) as e:
+        raise FileOperationError(f"Unable to read support bundle {bundle_path}: {e}")
+
+
+def get_log_capture_times(manifest: dict) -> Dict[str, datetime]:
+    """
+    Map each log path in a manifest to the time its capture started.
+    """
+    result = {}
+    for path, attributes in manifest.get("entries", {}).items():
+        captured_at = attributes.get("logCapturedAt")
+        if captured_at:
+            result[path] = parse_manifest_time(captured_at)
+    return result
+
+
+def get_since_seconds(previous_capture: Optional[datetime], log_age_seconds: int) -> int:
+    """
+    Seconds of log history needed to cover everything after a previous capture, bounded by log_age_seconds.
+    """
+    if not previous_capture:
+        return log_age_seconds
+    elapsed = (datetime.now(timezone.utc) - previous_capture).total_seconds()
+    return max(1, min(log_age_seconds, ceil(elapsed)))
+
+
+def format_manifest_time(value: datetime) -> str:
+    return value.strftime(MANIFEST_TIME_FORMAT)
+
+
+def parse_manifest_time(value: str) -> datetime:
+    return datetime.strptime(value, MANIFEST_TIME_FORMAT).replace(tzinfo=timezone.utc)
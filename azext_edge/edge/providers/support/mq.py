@@ -5,17 +5,19 @@
 # ----------------------------------------------------------------------------------------------
 
 from functools import partial
-from typing import Iterable, Optional
+from time import monotonic
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 from zipfile import ZipInfo
 
 from knack.log import get_logger
 
 from ..edge_api import MQ_ACTIVE_API, EdgeResourceApi
+from ...util.workers import DaemonWorkerPool
 from ..stats import get_traces
 from .base import (
     DAY_IN_SECONDS,
     assemble_crd_work,
-    get_mq_namespaces,
+    get_mq_namespaces_internal_tls,
     process_config_maps,
     process_daemonsets,
     process_jobs,
@@ -30,34 +32,124 @@ logger = get_logger(__name__)
 
 MQ_NAME_LABEL = NAME_LABEL_FORMAT.format(label=MQ_ACTIVE_API.label)
 MQ_DIRECTORY_PATH = MQ_ACTIVE_API.moniker
-
-
-def fetch_diagnostic_traces():
-    namespaces = get_mq_namespaces()
-    result = []
-    for namespace in namespaces:
+TRACE_FAN_OUT_MAX_WORKERS = 4
+TRACE_QUEUE_MAX_SIZE = 64
+TRACE_QUEUE_PUT_TIMEOUT_SEC = 0.5
+TRACE_QUEUE_GET_TIMEOUT_SEC = 1
+
+
+class _NamespaceTraces(NamedTuple):
+    namespace: str
+    entries: int
+    duration: float
+    error: Optional[Exception] = None
+
+
+def fetch_diagnostic_traces() -> Iterator[dict]:
+    """
+    Pull broker traces from every broker namespace concurrently on a bounded pool.
+
+    Entries are yielded as they are read. The queue between the pulls and the bundle writer is bounded,
+    so a slow writer holds the pulls back rather than buffering traces in memory.
+    """
+    from queue import Empty, Full, Queue
+    from threading import Event
+
+    namespaces_internal_tls = get_mq_namespaces_internal_tls()
+    if not namespaces_internal_tls:
+        return
+
+    entries: Queue = Queue(maxsize=TRACE_QUEUE_MAX_SIZE)
+    stopped = Event()
+
+    def _put(item) -> bool:
+        while not stopped.is_set():
+            try:
+                entries.put(item, timeout=TRACE_QUEUE_PUT_TIMEOUT_SEC)
+                return True
+            except Full:
+                continue
+        return False
+
+    def _pull(namespace: str) -> _NamespaceTraces:
+        started = monotonic()
+        entry_count = 0
+        error = None
         try:
-            traces = get_traces(namespace=namespace, trace_ids=["!support_bundle!"])
-            if traces:
-                for trace in traces:
-                    zinfo = ZipInfo(
-                        filename=f"{namespace}/{MQ_DIRECTORY_PATH}/traces/{trace[0].filename}",
-                        date_time=trace[0].date_time,
-                    )
-                    # Fixed in Py 3.9 https://github.com/python/cpython/issues/70373
-                    zinfo.file_size = 0
-                    zinfo.compress_size = 0
-                    result.append(
-                        {
-                            "data": trace[1],
-                            "zinfo": zinfo,
-                        }
-                    )
-
-        except Exception:
+            traces = get_traces(
+                namespace=namespace,
+                trace_ids=["!support_bundle!"],
+                internal_tls=namespaces_internal_tls[namespace],
+            )
+            for trace in traces or []:
+                if not _put(_get_trace_entry(namespace=namespace, trace=trace)):
+                    break
+                entry_count += 1
+        except Exception as e:
+            error = e
             logger.debug(f"Unable to process diagnostics pod traces against namespace {namespace}.")
-
-    return result
+        finally:
+            _put(None)
+        return _NamespaceTraces(namespace=namespace, entries=entry_count, duration=monotonic() - started, error=error)
+
+    # Daemon workers, so a pull blocked on the diagnostics socket does not hold up exit once abandoned.
+    executor = DaemonWorkerPool(
+        max_workers=min(TRACE_FAN_OUT_MAX_WORKERS, len(namespaces_internal_tls)),
+        thread_name_prefix="aio-support-traces",
+    )
+    try:
+        futures = [executor.submit(_pull, namespace) for namespace in namespaces_internal_tls]
+        pending_namespaces = len(futures)
+        while pending_namespaces:
+            try:
+                entry = entries.get(timeout=TRACE_QUEUE_GET_TIMEOUT_SEC)
+            except Empty:
+                # A pull that died before signalling completion must not leave the consumer waiting.
+                if all(future.done() for future in futures):
+                    break
+                continue
+            if entry is None:
+                pending_namespaces -= 1
+                continue
+            yield entry
+
+        _log_namespace_traces([future.result() for future in futures if not future.exception()])
+    finally:
+        # Pulls abandoned by the bundle writer stop at their next entry.
+        stopped.set()
+        executor.shutdown(wait=False)
+
+
+def _get_trace_entry(namespace: str, trace: Tuple[ZipInfo, Union[bytes, str]]) -> dict:
+    zinfo = ZipInfo(
+        filename=f"{namespace}/{MQ_DIRECTORY_PATH}/traces/{trace[0].filename}",
+        date_time=trace[0].date_time,
+    )
+    # Fixed in Py 3.9 https://github.com/python/cpython/issues/70373
+    zinfo.file_size = 0
+    zinfo.compress_size = 0
+    return {
+        "data": trace[1],
+        "zinfo": zinfo,
+        "namespace": namespace,
+    }
+
+
+def _log_namespace_traces(results: List[_NamespaceTraces]):
+    for result in results:
+        if result.error:
+            logger.info(f"Broker traces from namespace {result.namespace} failed after {result.duration:.1f}s.")
+        else:
+            logger.info(
+                f"Collected {result.entries} broker trace entries from namespace {result.namespace} "
+                f"in {result.duration:.1f}s."
+            )
+    failed = [result.namespace for result in results if result.error]
+    if failed:
+        logger.warning(
+            f"Broker traces were collected from {len(results) - len(failed)} of {len(results)} namespaces. "
+            f"Unable to collect traces from: {', '.join(failed)}."
+        )
 
 
 def fetch_statefulsets():
@@ -0,0 +1,240 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import json
+from functools import partial
+from time import monotonic, sleep
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+from knack.log import get_logger
+from kubernetes.client.models import V1Pod, V1PodList
+
+from ...common import AIO_BROKER_DIAGNOSTICS_SERVICE, METRICS_SERVICE_API_PORT, OpsServiceType
+from ...util import get_timestamp_now_utc
+from ...util.prometheus import is_counter, iter_samples
+from ..base import PortforwardPool, client, portforward_http
+from .base import POD_FAN_OUT_MAX_WORKERS, ordered_fan_out
+from .connectors import CONNECTORS_DIRECTORY_PATH, OPC_APP_LABEL, OPC_NAME_LABEL, OPCUA_NAME_LABEL
+from .dataflow import DATAFLOW_DIRECTORY_PATH, DATAFLOW_NAME_LABEL
+from .mq import MQ_DIRECTORY_PATH, MQ_NAME_LABEL
+from .snapshot import query_snapshot
+
+logger = get_logger(__name__)
+
+PROMETHEUS_SCRAPE_ANNOTATION = "prometheus.io/scrape"
+PROMETHEUS_PORT_ANNOTATION = "prometheus.io/port"
+PROMETHEUS_PATH_ANNOTATION = "prometheus.io/path"
+DEFAULT_METRICS_PATH = "/metrics"
+METRICS_PORT_NAME_HINTS = ("metric", "prom")
+PROMETHEUS_ELEMENT = "prometheus"
+
+
+class MetricsTarget(NamedTuple):
+    namespace: str
+    pod_name: str
+    port: int
+    path: str = DEFAULT_METRICS_PATH
+
+
+class ServiceMetricsPods(NamedTuple):
+    directory_path: str
+    label_selectors: List[str]
+    # Pod name prefix to metrics port, for pods that do not advertise their metrics endpoint.
+    default_ports: Optional[Dict[str, int]] = None
+
+
+SERVICE_METRICS_PODS: Dict[str, ServiceMetricsPods] = {
+    OpsServiceType.mq.value: ServiceMetricsPods(
+        directory_path=MQ_DIRECTORY_PATH,
+        label_selectors=[MQ_NAME_LABEL],
+        default_ports={AIO_BROKER_DIAGNOSTICS_SERVICE: METRICS_SERVICE_API_PORT},
+    ),
+    OpsServiceType.dataflow.value: ServiceMetricsPods(
+        directory_path=DATAFLOW_DIRECTORY_PATH, label_selectors=[DATAFLOW_NAME_LABEL]
+    ),
+    OpsServiceType.connectors.value: ServiceMetricsPods(
+        directory_path=CONNECTORS_DIRECTORY_PATH, label_selectors=[OPC_APP_LABEL, OPC_NAME_LABEL, OPCUA_NAME_LABEL]
+    ),
+}
+
+
+def prepare_bundle(ops_services: List[str], interval_seconds: Optional[int] = None) -> Dict[str, dict]:
+    """
+    Prometheus scrape work keyed by ops service, for the services whose pods expose metrics.
+    """
+    return {
+        ops_service: {
+            PROMETHEUS_ELEMENT: partial(
+                fetch_prometheus_metrics,
+                service_pods=SERVICE_METRICS_PODS[ops_service],
+                interval_seconds=interval_seconds,
+            )
+        }
+        for ops_service in ops_services
+        if ops_service in SERVICE_METRICS_PODS
+    }
+
+
+def fetch_prometheus_metrics(
+    service_pods: ServiceMetricsPods, interval_seconds: Optional[int] = None
+) -> Iterator[dict]:
+    """
+    Scrape the metrics endpoint of each service pod concurrently.
+
+    With interval_seconds every endpoint is scraped a second time after the interval, and the
+    per second rate of each counter between the two samples is included in the snapshot.
+    """
+    targets = get_metrics_targets(
+        label_selectors=service_pods.label_selectors, default_ports=service_pods.default_ports
+    )
+    if not targets:
+        return
+
+    # Tunnels are kept open between samples of the same endpoint.
+    with PortforwardPool() as pool:
+        scrape_target = partial(_scrape, pool=pool)
+        if not interval_seconds or interval_seconds < 1:
+            for scrape in ordered_fan_out(func=scrape_target, items=targets, max_workers=POD_FAN_OUT_MAX_WORKERS):
+                yield _get_snapshot_entry(scrape, directory_path=service_pods.directory_path)
+            return
+
+        started = monotonic()
+        first_scrapes = {
+            scrape["target"]: scrape
+            for scrape in ordered_fan_out(func=scrape_target, items=targets, max_workers=POD_FAN_OUT_MAX_WORKERS)
+        }
+        sleep(max(0.0, interval_seconds - (monotonic() - started)))
+        for scrape in ordered_fan_out(
+            func=scrape_target, items=list(first_scrapes), max_workers=POD_FAN_OUT_MAX_WORKERS
+        ):
+            _add_rates(scrape, previous=first_scrapes[scrape["target"]])
+            yield _get_snapshot_entry(scrape, directory_path=service_pods.directory_path)
+
+
+def get_metrics_targets(
+    label_selectors: List[str], default_ports: Optional[Dict[str, int]] = None
+) -> List[MetricsTarget]:
+    targets: Dict[MetricsTarget, None] = {}
+    for label_selector in label_selectors:
+        pods: V1PodList = query_snapshot("pods", label_selector=label_selector)
+        if pods is None:
+            pods = client.CoreV1Api().list_pod_for_all_namespaces(label_selector=label_selector)
+        for pod in pods.items:
+            for target in _get_pod_metrics_targets(pod, default_ports=default_ports):
+                targets[target] = None
+
+    return list(targets)
+
+
+def _get_pod_metrics_targets(pod: V1Pod, default_ports: Optional[Dict[str, int]] = None) -> List[MetricsTarget]:
+    """
+    Metrics endpoints advertised by the standard prometheus.io annotations, otherwise by container
+    port names, otherwise the default port for the pod name.
+    """
+    namespace: str = pod.metadata.namespace
+    pod_name: str = pod.metadata.name
+    if pod.status and pod.status.phase and pod.status.phase.lower() != "running":
+        return []
+
+    annotations = pod.metadata.annotations or {}
+    if (
+        str(annotations.get(PROMETHEUS_SCRAPE_ANNOTATION)).lower() == "true"
+        and PROMETHEUS_PORT_ANNOTATION in annotations
+    ):
+        try:
+            return [
+                MetricsTarget(
+                    namespace=namespace,
+                    pod_name=pod_name,
+                    port=int(annotations[PROMETHEUS_PORT_ANNOTATION]),
+                    path=annotations.get(PROMETHEUS_PATH_ANNOTATION, DEFAULT_METRICS_PATH),
+                )
+            ]
+        except ValueError:
+            logger.debug(f"Pod {pod_name} has an invalid {PROMETHEUS_PORT_ANNOTATION} annotation.")
+
+    targets = [
+        MetricsTarget(namespace=namespace, pod_name=pod_name, port=port.container_port)
+        for container in (pod.spec.containers if pod.spec else [])
+        for port in (container.ports or [])
+        if port.name and any(hint in port.name.lower() for hint in METRICS_PORT_NAME_HINTS)
+    ]
+    if targets:
+        return targets
+
+    for prefix, port in (default_ports or {}).items():
+        if pod_name.startswith(prefix):
+            return [MetricsTarget(namespace=namespace, pod_name=pod_name, port=port)]
+    return []
+
+
+def _scrape(target: MetricsTarget, pool: PortforwardPool) -> List[dict]:
+    types: Dict[str, str] = {}
+    samples: Dict[str, float] = {}
+    started = monotonic()
+    captured_at = get_timestamp_now_utc()
+    try:
+        with portforward_http(
+            namespace=target.namespace, pod_name=target.pod_name, pod_port=target.port, pool=pool
+        ) as pod_request:
+            for sample in iter_samples(pod_request.iter_lines(target.path), types=types):
+                samples[sample.series] = sample.value
+    except Exception as e:
+        logger.debug(f"Unable to scrape metrics of pod {target.pod_name} port {target.port}: {e}")
+        return []
+
+    counters = sorted({name for name in map(_get_metric_name, samples) if is_counter(name, types)})
+    return [
+        {
+            "target": target,
+            "timestamp": started,
+            "snapshot": {
+                "namespace": target.namespace,
+                "pod": target.pod_name,
+                "port": target.port,
+                "path": target.path,
+                "capturedAt": captured_at,
+                "types": types,
+                "counters": counters,
+                "samples": samples,
+            },
+        }
+    ]
+
+
+def _add_rates(scrape: dict, previous: dict):
+    snapshot = scrape["snapshot"]
+    elapsed = scrape["timestamp"] - previous["timestamp"]
+    if elapsed <= 0:
+        return
+
+    counters = set(snapshot["counters"])
+    previous_samples = previous["snapshot"]["samples"]
+    rates = {}
+    for series, value in snapshot["samples"].items():
+        previous_value = previous_samples.get(series)
+        if previous_value is None or _get_metric_name(series) not in counters:
+            continue
+        # A counter lower than before was reset by a restart.
+        rates[series] = (value - previous_value if value >= previous_value else value) / elapsed
+
+    snapshot["intervalSeconds"] = round(elapsed, 3)
+    snapshot["previousCapturedAt"] = previous["snapshot"]["capturedAt"]
+    snapshot["rates"] = rates
+
+
+def _get_metric_name(series: str) -> str:
+    return series.split("{", 1)[0]
+
+
+def _get_snapshot_entry(scrape: dict, directory_path: str) -> dict:
+    target: MetricsTarget = scrape["target"]
+    return {
+        # Compact JSON, metric snapshots can hold many thousands of series.
+        "data": json.dumps(scrape["snapshot"], separators=(",", ":")),
+        "zinfo": f"{target.namespace}/{directory_path}/pod.{target.pod_name}.{PROMETHEUS_ELEMENT}.{target.port}.json",
+        "namespace": target.namespace,
+    }
@@ -0,0 +1,268 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import re
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from knack.log import get_logger
+
+from ..base import client
+
+logger = get_logger(__name__)
+
+SnapshotRequirement = Tuple[str, str, Tuple[str, ...]]
+
+# Runtime kinds listed once per bundle when a snapshot is active.
+SNAPSHOT_LIST_FUNCS: Dict[str, Callable] = {
+    "pods": lambda: client.CoreV1Api().list_pod_for_all_namespaces(),
+    "deployments": lambda: client.AppsV1Api().list_deployment_for_all_namespaces(),
+    "replicasets": lambda: client.AppsV1Api().list_replica_set_for_all_namespaces(),
+    "services": lambda: client.CoreV1Api().list_service_for_all_namespaces(),
+    "daemonsets": lambda: client.AppsV1Api().list_daemon_set_for_all_namespaces(),
+    "statefulsets": lambda: client.AppsV1Api().list_stateful_set_for_all_namespaces(),
+    "configmaps": lambda: client.CoreV1Api().list_config_map_for_all_namespaces(),
+    "jobs": lambda: client.BatchV1Api().list_job_for_all_namespaces(),
+}
+
+_SET_REQUIREMENT = re.compile(r"^(?P<key>[^\s!=()]+)\s+(?P<op>in|notin)\s*\((?P<values>[^()]*)\)$")
+_EQUALITY_REQUIREMENT = re.compile(r"^(?P<key>[^\s!=()]+)\s*(?P<op>==|!=|=)\s*(?P<value>[^\s!=()]*)$")
+_KEY_REQUIREMENT = re.compile(r"^(?P<op>!?)\s*(?P<key>[^\s!=()]+)$")
+_SUPPORTED_FIELDS = ("metadata.name", "metadata.namespace")
+
+
+def parse_label_selector(selector: Optional[str]) -> Optional[List[SnapshotRequirement]]:
+    """
+    Parse a k8s label selector into (key, op, values) requirements.
+
+    Returns None if the selector uses syntax this parser does not understand.
+    """
+    if not selector:
+        return []
+
+    requirements = []
+    for segment in _split_selector(selector):
+        segment = segment.strip()
+        match = _SET_REQUIREMENT.match(segment)
+        if match:
+            values = tuple(v.strip() for v in match.group("values").split(",") if v.strip())
+            requirements.append((match.group("key"), match.group("op"), values))
+            continue
+        match = _EQUALITY_REQUIREMENT.match(segment)
+        if match:
+            op = "!=" if match.group("op") == "!=" else "="
+            requirements.append((match.group("key"), op, (match.group("value"),)))
+            continue
+        match = _KEY_REQUIREMENT.match(segment)
+        if match:
+            requirements.append((match.group("key"), "!" if match.group("op") else "exists", ()))
+            continue
+        return None
+
+    return requirements
+
+
+def match_label_requirements(requirements: List[SnapshotRequirement], labels: Optional[Dict[str, str]]) -> bool:
+    labels = labels or {}
+    for key, op, values in requirements:
+        if op in ("in", "="):
+            if labels.get(key) not in values:
+                return False
+        elif op in ("notin", "!="):
+            if key in labels and labels[key] in values:
+                return False
+        elif op == "exists":
+            if key not in labels:
+                return False
+        elif op == "!":
+            if key in labels:
+                return False
+    return True
+
+
+def _parse_field_selector(selector: Optional[str]) -> Optional[List[SnapshotRequirement]]:
+    requirements = parse_label_selector(selector)
+    if requirements is None:
+        return None
+    for key, op, _ in requirements:
+        if key not in _SUPPORTED_FIELDS or op not in ("=", "!="):
+            return None
+    return requirements
+
+
+def _split_selector(selector: str) -> List[str]:
+    # Commas separate requirements except within set based value lists.
+    segments = []
+    depth = 0
+    current = []
+    for char in selector:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            segments.append("".join(current))
+            current = []
+            continue
+        current.append(char)
+    segments.append("".join(current))
+    return segments
+
+
+class ResourceSnapshot:
+    """
+    Per-bundle, in-memory view of cluster runtime resources.
+
+    Each kind is listed at most once across all namespaces. Collector queries by namespace,
+    label selector, field selector and name prefix are then served from memory.
+    """
+
+    def __init__(self):
+        self.lists_issued = 0
+        self.queries_served = 0
+        self._listings: Dict[str, object] = {}
+        self._by_namespace: Dict[str, Dict[str, list]] = {}
+        self._by_label_key: Dict[str, Dict[str, list]] = {}
+        # Sorted (name, listing position) pairs per namespace, and cluster wide under None.
+        self._by_name: Dict[str, Dict[Optional[str], List[Tuple[str, int]]]] = {}
+        self._locks: Dict[str, Lock] = {kind: Lock() for kind in SNAPSHOT_LIST_FUNCS}
+        self._stats_lock = Lock()
+
+    @property
+    def calls_saved(self) -> int:
+        return max(self.queries_served - self.lists_issued, 0)
+
+    def query(
+        self,
+        kind: str,
+        namespace: Optional[str] = None,
+        label_selector: Optional[str] = None,
+        field_selector: Optional[str] = None,
+        prefix_names: Optional[List[str]] = None,
+    ):
+        """
+        Return a list object of the kind's type holding the matching items, in listing order.
+
+        Returns None when the query cannot be answered from the snapshot, in which case the
+        caller should use the API directly.
+        """
+        if kind not in SNAPSHOT_LIST_FUNCS:
+            return None
+        label_requirements = parse_label_selector(label_selector)
+        field_requirements = _parse_field_selector(field_selector)
+        if label_requirements is None or field_requirements is None:
+            return None
+
+        listing = self._ensure_kind(kind)
+        if prefix_names:
+            candidates = self._get_by_prefix(kind, listing.items, namespace, prefix_names)
+        elif namespace:
+            candidates = self._by_namespace[kind].get(namespace, [])
+        else:
+            candidates = listing.items
+            for key, op, _ in label_requirements:
+                if op in ("in", "=", "exists"):
+                    candidates = self._by_label_key[kind].get(key, [])
+                    break
+
+        items = [
+            item
+            for item in candidates
+            if match_label_requirements(label_requirements, item.metadata.labels)
+            and match_label_requirements(
+                field_requirements,
+                {"metadata.name": item.metadata.name, "metadata.namespace": item.metadata.namespace},
+            )
+        ]
+        with self._stats_lock:
+            self.queries_served += 1
+
+        return type(listing)(
+            api_version=listing.api_version, kind=listing.kind, metadata=listing.metadata, items=items
+        )
+
+    def _get_by_prefix(self, kind: str, items: list, namespace: Optional[str], prefix_names: List[str]) -> list:
+        names = self._by_name[kind].get(namespace or None, [])
+        positions = set()
+        for prefix in prefix_names:
+            # Names sharing a prefix are adjacent in sorted order, starting where the prefix would insert.
+            index = bisect_left(names, (prefix,))
+            while index < len(names) and names[index][0].startswith(prefix):
+                positions.add(names[index][1])
+                index += 1
+        return [items[position] for position in sorted(positions)]
+
+    def _ensure_kind(self, kind: str):
+        with self._locks[kind]:
+            if kind not in self._listings:
+                listing = SNAPSHOT_LIST_FUNCS[kind]()
+                by_namespace: Dict[str, list] = {}
+                by_label_key: Dict[str, list] = {}
+                by_name: Dict[Optional[str], List[Tuple[str, int]]] = {None: []}
+                for position, item in enumerate(listing.items):
+                    by_namespace.setdefault(item.metadata.namespace, []).append(item)
+                    for label_key in item.metadata.labels or {}:
+                        by_label_key.setdefault(label_key, []).append(item)
+                    name_entry = (item.metadata.name or "", position)
+                    by_name[None].append(name_entry)
+                    by_name.setdefault(item.metadata.namespace, []).append(name_entry)
+                for entries in by_name.values():
+                    entries.sort()
+                self._by_namespace[kind] = by_namespace
+                self._by_label_key[kind] = by_label_key
+                self._by_name[kind] = by_name
+                self._listings[kind] = listing
+                with self._stats_lock:
+                    self.lists_issued += 1
+                logger.debug(f"Snapshot listed {len(listing.items)} {kind}.")
+            return self._listings[kind]
+
+
+_active_snapshot: Optional[ResourceSnapshot] = None
+
+
+def query_snapshot(
+    kind: str,
+    namespace: Optional[str] = None,
+    label_selector: Optional[str] = None,
+    field_selector: Optional[str] = None,
+    prefix_names: Optional[List[str]] = None,
+):
+    """
+    Serve a runtime resource list from the active snapshot, or None if there is none or it cannot answer.
+    """
+    snapshot = _active_snapshot
+    if not snapshot:
+        return None
+    return snapshot.query(
+        kind=kind,
+        namespace=namespace,
+        label_selector=label_selector,
+        field_selector=field_selector,
+        prefix_names=prefix_names,
+    )
+
+
+@contextmanager
+def resource_snapshot(enabled: bool = True) -> Iterator[Optional[ResourceSnapshot]]:
+    global _active_snapshot
+
+    if not enabled:
+        yield None
+        return
+
+    snapshot = ResourceSnapshot()
+    _active_snapshot = snapshot
+    try:
+        yield snapshot
+    finally:
+        _active_snapshot = None
+        logger.info(
+            f"Resource snapshot served {snapshot.queries_served} queries with {snapshot.lists_issued} "
+            f"list calls, saving {snapshot.calls_saved} API calls."
+        )
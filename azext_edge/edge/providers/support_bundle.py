@@ -4,8 +4,16 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
-from typing import List, Optional
-from zipfile import ZipFile, ZIP_DEFLATED
+import json
+from collections import deque
+from concurrent.futures import Future
+from contextlib import ExitStack
+from hashlib import sha256
+from io import SEEK_END
+from pathlib import PurePath
+from threading import Condition, Thread
+from typing import IO, Callable, Deque, Dict, List, Optional, Tuple, Union
+from zipfile import ZipFile, ZipInfo, ZIP_DEFLATED, ZIP64_LIMIT
 
 import yaml
 from knack.log import get_logger
@@ -27,6 +35,15 @@ from ..providers.edge_api import (
     AZUREMONITOR_API_V1,
     EdgeApiManager,
 )
+from ..providers.support.base import LOG_CHUNK_SIZE, LOG_SPOOL_MAX_SIZE, configure_log_capture
+from ..providers.support.manifest import (
+    BUNDLE_MANIFEST_NAME,
+    BundleManifest,
+    get_log_capture_times,
+    read_bundle_manifest,
+)
+from ..providers.support.snapshot import resource_snapshot
+from ..util.workers import DaemonWorkerPool
 
 logger = get_logger(__name__)
 
@@ -42,17 +59,27 @@ COMPAT_ARCCONTAINERSTORAGE_APIS = EdgeApiManager(resource_apis=[ARCCONTAINERSTOR
 COMPAT_SECRETSTORE_APIS = EdgeApiManager(resource_apis=[SECRETSYNC_API_V1, SECRETSTORE_API_V1])
 COMPAT_AZUREMONITOR_APIS = EdgeApiManager(resource_apis=[AZUREMONITOR_API_V1])
 
+DEFAULT_BUNDLE_MAX_WORKERS = 8
+BUNDLE_POLL_INTERVAL_SEC = 0.25
+BUNDLE_DISPLAY_IN_FLIGHT = 5
+DEFAULT_BUNDLE_BUFFER_SIZE = 64 * 1024 * 1024
+
 
 def build_bundle(
     bundle_path: str,
     log_age_seconds: Optional[int] = None,
     ops_services: Optional[List[str]] = None,
     include_mq_traces: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+    element_timeout: Optional[int] = None,
+    buffer_size: Optional[int] = None,
+    stream_logs: Optional[bool] = None,
+    log_max_bytes: Optional[int] = None,
+    use_resource_snapshot: Optional[bool] = None,
+    since_bundle: Optional[str] = None,
+    include_metrics: Optional[bool] = None,
+    metrics_interval: Optional[int] = None,
 ):
-    from rich.live import Live
-    from rich.progress import Progress
-    from rich.table import Table
-
     from .support.billing import prepare_bundle as prepare_billing_bundle
     from .support.mq import prepare_bundle as prepare_mq_bundle
     from .support.connectors import prepare_bundle as prepare_connector_bundle
@@ -68,6 +95,7 @@ def build_bundle(
     from .support.azuremonitor import prepare_bundle as prepare_azuremonitor_bundle
     from .support.certmanager import prepare_bundle as prepare_certmanager_bundle
     from .support.meso import prepare_bundle as prepare_meso_bundle
+    from .support.prometheus import prepare_bundle as prepare_prometheus_bundle
 
     def collect_default_works(
         pending_work: dict,
@@ -83,6 +111,12 @@ def build_bundle(
         deployed_meta_apis = COMPAT_META_APIS.get_deployed()
         pending_work["meta"] = prepare_meta_bundle(log_age_seconds, deployed_meta_apis)
 
+    previous_manifest = read_bundle_manifest(since_bundle) if since_bundle else None
+    configure_log_capture(
+        stream=stream_logs,
+        max_bytes=log_max_bytes,
+        previous_captures=get_log_capture_times(previous_manifest) if previous_manifest else None,
+    )
     pending_work = {k: {} for k in OpsServiceType.list()}
 
     api_map = {
@@ -175,13 +209,228 @@ def build_bundle(
 
         pending_work[service_moniker].update(bundle)
 
+    if include_metrics:
+        for service_moniker, bundle in prepare_prometheus_bundle(parsed_ops_services, metrics_interval).items():
+            pending_work[service_moniker].update(bundle)
+
     collect_default_works(pending_work, log_age_seconds)
 
     total_work_count = 0
     for service in pending_work:
         total_work_count = total_work_count + len(pending_work[service])
 
-    bundle = {service: {} for service, _ in pending_work.items()}
+    manifest = BundleManifest(
+        previous=previous_manifest, since_bundle=PurePath(since_bundle).name if since_bundle else None
+    )
+    with resource_snapshot(enabled=bool(use_resource_snapshot)), BundleZipWriter(
+        file_path=bundle_path, buffer_size=buffer_size, manifest=manifest
+    ) as writer:
+        execute_bundle_work(
+            pending_work=pending_work,
+            total_work_count=total_work_count,
+            writer=writer,
+            max_workers=max_workers,
+            element_timeout=element_timeout,
+        )
+
+    return {"bundlePath": bundle_path}
+
+
+class BundleZipWriter:
+    """
+    Appends support bundle entries to a zip archive from a single writer thread.
+
+    Collectors hand entries to put() as they are produced. Producers block while more than
+    buffer_size bytes are waiting to be written, bounding memory independent of bundle size.
+    Written entries are indexed in a manifest stored in the archive on close. Objects the manifest
+    reports as unchanged since a previous bundle are skipped.
+    """
+
+    def __init__(
+        self, file_path: str, buffer_size: Optional[int] = None, manifest: Optional[BundleManifest] = None
+    ):
+        self.file_path = file_path
+        self.buffer_size = buffer_size or DEFAULT_BUNDLE_BUFFER_SIZE
+        self.manifest = manifest or BundleManifest()
+        self._pending: Deque[Tuple[Union[str, ZipInfo], Union[str, bytes], int, dict]] = deque()
+        self._buffered = 0
+        self._closed = False
+        self._condition = Condition()
+        self._added_path: Dict[str, bool] = {}
+        self._exit_stack = ExitStack()
+        self._zip: Optional[ZipFile] = None
+        self._thread: Optional[Thread] = None
+
+    def __enter__(self) -> "BundleZipWriter":
+        self._zip = self._exit_stack.enter_context(
+            ZipFile(file=self.file_path, mode="w", compression=ZIP_DEFLATED)
+        )
+        self._thread = Thread(target=self._drain, name="aio-bundle-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._zip.writestr(
+            zinfo_or_arcname=BUNDLE_MANIFEST_NAME, data=json.dumps(self.manifest.as_dict(), indent=2)
+        )
+        # Entries arrive in completion order. Ordering the central directory keeps
+        # the archive listing stable however collection was scheduled.
+        self._zip.infolist().sort(key=lambda z: z.filename)
+        self._exit_stack.close()
+
+    def put(
+        self,
+        entry: Optional[dict],
+        service: Optional[str] = None,
+        collector: Optional[str] = None,
+        duration: Optional[float] = None,
+    ):
+        """
+        Queue a collector entry for writing.
+
+        service and collector identify the producer in the manifest, and duration is the time in
+        seconds the collector spent producing this entry. The manifest namespace is taken from the
+        object metadata, or from the entry's namespace for logs and other non-object data.
+        """
+        if not entry:
+            return
+        data = entry.get("data")
+        zinfo = entry.get("zinfo")
+        arcname = _get_zinfo_name(zinfo)
+        attributes = {
+            "service": service,
+            "collector": collector,
+            "kind": "Log" if entry.get("logCapturedAt") else None,
+            "namespace": entry.get("namespace"),
+            "durationSeconds": round(duration, 3) if duration is not None else None,
+            "logCapturedAt": entry.get("logCapturedAt"),
+        }
+        if isinstance(data, dict):
+            metadata = data.get("metadata") or {}
+            resource_version = metadata.get("resourceVersion")
+            attributes["kind"] = data.get("kind") or attributes["kind"]
+            attributes["namespace"] = metadata.get("namespace") or attributes["namespace"]
+            attributes["resourceVersion"] = resource_version
+            if self.manifest.is_unchanged(arcname, resource_version):
+                self.manifest.record(arcname, unchanged=True, **attributes)
+                return
+            data = yaml.safe_dump(data, indent=2)
+
+        size = 0
+        if _is_stream(data):
+            data.seek(0, SEEK_END)
+            stream_size = data.tell()
+            data.seek(0)
+            if not stream_size:
+                data.close()
+                data = None
+            # Streams larger than the spool threshold are backed by disk.
+            size = min(stream_size, LOG_SPOOL_MAX_SIZE)
+        elif data:
+            size = len(data)
+
+        if not data:
+            # Nothing to write, but the capture time still bounds the next incremental log capture.
+            if attributes["logCapturedAt"]:
+                self.manifest.record(arcname, **attributes)
+            return
+
+        with self._condition:
+            # A single entry larger than the buffer is still admitted once the buffer drains.
+            while self._buffered and self._buffered + size > self.buffer_size and not self._closed:
+                self._condition.wait()
+            if self._closed:
+                logger.debug(f"Bundle writer closed, dropping {_get_zinfo_name(zinfo)}.")
+                if _is_stream(data):
+                    data.close()
+                return
+            self._pending.append((zinfo, data, size, attributes))
+            self._buffered += size
+            self._condition.notify_all()
+
+    def _drain(self):
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                zinfo, data, size, attributes = self._pending.popleft()
+
+            try:
+                arcname = _get_zinfo_name(zinfo)
+                if arcname not in self._added_path:
+                    if _is_stream(data):
+                        digest, byte_size = self._write_stream(zinfo=zinfo, stream=data)
+                    else:
+                        self._zip.writestr(zinfo_or_arcname=zinfo, data=data)
+                        # Matches the utf-8 encoding writestr applies to str data.
+                        content = data.encode("utf-8") if isinstance(data, str) else data
+                        digest, byte_size = sha256(content).hexdigest(), len(content)
+                    self._added_path[arcname] = True
+                    self.manifest.record(arcname, size=byte_size, sha256=digest, **attributes)
+            except Exception as e:
+                logger.debug(f"Unable to write {_get_zinfo_name(zinfo)} to bundle:\n{e}")
+            finally:
+                if _is_stream(data):
+                    data.close()
+                with self._condition:
+                    self._buffered -= size
+                    self._condition.notify_all()
+
+    def _write_stream(self, zinfo: Union[str, ZipInfo], stream: IO[bytes]) -> Tuple[str, int]:
+        stream.seek(0, SEEK_END)
+        force_zip64 = stream.tell() > ZIP64_LIMIT
+        stream.seek(0)
+        # Hash while copying so the content is only read once.
+        digest = sha256()
+        byte_size = 0
+        with self._zip.open(zinfo, mode="w", force_zip64=force_zip64) as zip_entry:
+            while True:
+                chunk = stream.read(LOG_CHUNK_SIZE)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                zip_entry.write(chunk)
+                byte_size += len(chunk)
+        return digest.hexdigest(), byte_size
+
+
+def execute_bundle_work(
+    pending_work: Dict[str, Dict[str, Callable]],
+    total_work_count: int,
+    writer: BundleZipWriter,
+    max_workers: Optional[int] = None,
+    element_timeout: Optional[int] = None,
+) -> List[Tuple[str, str]]:
+    """
+    Run support bundle collectors on a bounded thread pool while keeping the progress display current.
+
+    Entries are streamed to the writer as collectors produce them. Returns the (ops_service, element)
+    keys that completed. Collectors that fail or exceed element_timeout (in seconds) are logged and
+    their remaining output is discarded.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from time import monotonic
+
+    from rich.live import Live
+    from rich.progress import Progress
+    from rich.table import Table
+
+    if not max_workers or max_workers < 1:
+        max_workers = DEFAULT_BUNDLE_MAX_WORKERS
+
+    completed: List[Tuple[str, str]] = []
+    started_at: Dict[Tuple[str, str], float] = {}
+    abandoned: Dict[Tuple[str, str], bool] = {}
+
+    def _run_element(work_key: Tuple[str, str], work: Callable):
+        started_at[work_key] = monotonic()
+        _write_element_entries(work_key=work_key, work=work, writer=writer, abandoned=abandoned)
 
     grid = Table.grid(expand=False)
     with Live(grid, console=console, transient=True) as live:
@@ -190,63 +439,119 @@ def build_bundle(
             "[green]Building support bundle",
             total=total_work_count,
         )
-
-        def visually_process(description: str, support_segment: dict, ops_service: str):
-            namespace_task = uber_progress.add_task(f"[cyan]{description}", total=len(support_segment))
-            for element in support_segment:
-                header = f"Fetching [medium_purple4]{element}[/medium_purple4] data..."
-                grid = Table.grid(expand=False)
-                grid.add_column()
-
-                grid.add_row(NewLine(1))
-                grid.add_row(header)
-                grid.add_row(NewLine(1))
-                grid.add_row(uber_progress)
-                live.update(grid, refresh=True)
-
-                try:
-                    # Produce as much support collateral as possible.
-                    bundle[ops_service][element] = support_segment[element]()
-                except Exception as e:
-                    # @digimaun - bdb.BdbQuit?
-                    logger.debug(f"Unable to process {ops_service} {element}:\n{e}")
-                finally:
-                    if not uber_progress.finished:
-                        uber_progress.update(namespace_task, advance=1)
-                        uber_progress.update(uber_task, advance=1)
-
-        for service in pending_work:
-            if pending_work[service]:
-                visually_process(
-                    description=f"Processing {service}",
-                    support_segment=pending_work[service],
-                    ops_service=service,
-                )
-
-    write_zip(file_path=bundle_path, bundle=bundle)
-    return {"bundlePath": bundle_path}
+        service_tasks = {
+            service: uber_progress.add_task(f"[cyan]Processing {service}", total=len(pending_work[service]))
+            for service in pending_work
+            if pending_work[service]
+        }
+
+        def _render(in_flight: List[Tuple[str, str]]):
+            grid = Table.grid(expand=False)
+            grid.add_column()
+
+            grid.add_row(NewLine(1))
+            for _, element in in_flight[:BUNDLE_DISPLAY_IN_FLIGHT]:
+                grid.add_row(f"Fetching [medium_purple4]{element}[/medium_purple4] data...")
+            grid.add_row(NewLine(1))
+            grid.add_row(uber_progress)
+            live.update(grid, refresh=True)
+
+        def _advance(work_key: Tuple[str, str]):
+            if not uber_progress.finished:
+                uber_progress.update(service_tasks[work_key[0]], advance=1)
+                uber_progress.update(uber_task, advance=1)
+
+        executor = DaemonWorkerPool(max_workers=max_workers, thread_name_prefix="aio-bundle")
+        try:
+            futures: Dict[Future, Tuple[str, str]] = {}
+            for service in pending_work:
+                for element in pending_work[service]:
+                    work_key = (service, element)
+                    futures[executor.submit(_run_element, work_key, pending_work[service][element])] = work_key
+
+            pending = set(futures)
+            while pending:
+                in_flight = [futures[f] for f in futures if f in pending and futures[f] in started_at]
+                _render(in_flight)
+                done, pending = wait(pending, timeout=BUNDLE_POLL_INTERVAL_SEC, return_when=FIRST_COMPLETED)
+                for future in done:
+                    work_key = futures[future]
+                    try:
+                        # Produce as much support collateral as possible.
+                        future.result()
+                        completed.append(work_key)
+                        writer.manifest.record_collector(*work_key, status="succeeded")
+                    except Exception as e:
+                        logger.debug(f"Unable to process {work_key[0]} {work_key[1]}:\n{e}")
+                        writer.manifest.record_collector(*work_key, status="failed")
+                    finally:
+                        _advance(work_key)
+
+                if element_timeout:
+                    now = monotonic()
+                    for future in list(pending):
+                        work_key = futures[future]
+                        if work_key in started_at and now - started_at[work_key] > element_timeout:
+                            logger.warning(
+                                f"Processing {work_key[0]} {work_key[1]} exceeded {element_timeout} seconds. "
+                                "Its remaining collateral will be omitted from the bundle."
+                            )
+                            abandoned[work_key] = True
+                            writer.manifest.record_collector(*work_key, status="timedOut")
+                            pending.discard(future)
+                            future.cancel()
+                            _advance(work_key)
+        finally:
+            # Do not block on collectors abandoned due to timeout. Their daemon workers do not hold up exit.
+            executor.shutdown(wait=not element_timeout)
+
+    return completed
+
+
+def _write_element_entries(
+    work_key: Tuple[str, str], work: Callable, writer: BundleZipWriter, abandoned: Dict[Tuple[str, str], bool]
+):
+    from time import monotonic
+
+    started = entry_started = monotonic()
+    entry_count = 0
+    try:
+        result = work()
+        if result is None or isinstance(result, dict):
+            result = [result]
+        for entry in result:
+            if work_key in abandoned:
+                return
+            # Time spent producing the entry, excluding time blocked on the writer.
+            produced_at = monotonic()
+            writer.put(entry, service=work_key[0], collector=work_key[1], duration=produced_at - entry_started)
+            entry_count += 1 if entry else 0
+            entry_started = monotonic()
+    finally:
+        writer.manifest.record_collector(
+            work_key[0], work_key[1], durationSeconds=round(monotonic() - started, 3), entries=entry_count
+        )
 
 
 def write_zip(bundle: dict, file_path: str):
-    with ZipFile(file=file_path, mode="w", compression=ZIP_DEFLATED) as myzip:
-        todo: List[dict] = []
+    with BundleZipWriter(file_path=file_path) as writer:
         for ops_service in bundle:
             for element in bundle[ops_service]:
                 if isinstance(bundle[ops_service][element], list):
-                    todo.extend(bundle[ops_service][element])
+                    for entry in bundle[ops_service][element]:
+                        writer.put(entry, service=ops_service, collector=element)
                 else:
-                    todo.append(bundle[ops_service][element])
-
-        added_path = {}
-        for t in todo:
-            if t:
-                data = t.get("data")
-                zinfo = t.get("zinfo")
-                if data and zinfo not in added_path:
-                    if isinstance(data, dict):
-                        data = yaml.safe_dump(t["data"], indent=2)
-                    myzip.writestr(zinfo_or_arcname=zinfo, data=data)
-                    added_path[zinfo] = True
+                    writer.put(bundle[ops_service][element], service=ops_service, collector=element)
+
+
+def _is_stream(data) -> bool:
+    return hasattr(data, "read")
+
+
+def _get_zinfo_name(zinfo: Union[str, ZipInfo]) -> str:
+    if isinstance(zinfo, ZipInfo):
+        return zinfo.filename
+    return zinfo
 
 
 def str_presenter(dumper, data):
@@ -25,6 +25,7 @@ from .common import (
 from .file_operations import (
     deserialize_file_content,
     dump_content_to_file,
+    iter_file_records,
     normalize_dir,
     read_file_content,
 )
@@ -41,6 +42,7 @@ __all__ = [
     "get_timestamp_now_utc",
     "is_enabled_str",
     "is_env_flag_enabled",
+    "iter_file_records",
     "normalize_dir",
     "parse_dot_notation",
     "parse_kvp_nargs",
@@ -6,8 +6,11 @@
 
 from collections.abc import MutableMapping
 from enum import Enum
-from time import sleep
-from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Tuple, Union
+from random import uniform
+from threading import Event, RLock
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional, Sequence, Tuple, Type, TypeVar, Union
+from urllib.parse import urlparse
 
 from azure.cli.core.azclierror import ValidationError
 from knack.log import get_logger
@@ -26,11 +29,25 @@ AZURE_CLI_CREDENTIAL = AzureCliCredential()
 
 POLL_RETRIES = 240
 POLL_WAIT_SEC = 15
+POLL_INITIAL_WAIT_SEC = 0.5
+POLL_BACKOFF_FACTOR = 2
+POLL_JITTER = 0.2
+
+# Shared transport pool. Connections per host stay above the largest worker count used with one client.
+CLIENT_POOL_CONNECTIONS = 10
+CLIENT_POOL_MAXSIZE = 32
 
 logger = get_logger(__name__)
 
+ClientType = TypeVar("ClientType")
+_CLIENT_LOCK = RLock()
+_CLIENTS: Dict[Tuple[type, str, Optional[str]], Any] = {}
+_SHARED_TRANSPORT = None
+
 
 if TYPE_CHECKING:
+    from azure.core.exceptions import HttpResponseError
+    from azure.core.pipeline.transport import RequestsTransport
     from azure.core.polling import LROPoller
 
     from ..vendor.clients.authzmgmt import AuthorizationManagementClient
@@ -54,85 +71,37 @@ if TYPE_CHECKING:
 def get_extloc_mgmt_client(subscription_id: str, **kwargs) -> "CustomLocations":
     from ..vendor.clients.extendedlocmgmt import CustomLocations
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
-
-    return CustomLocations(
-        credential=AZURE_CLI_CREDENTIAL,
-        subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
-        **kwargs,
-    )
+    return get_mgmt_client(CustomLocations, subscription_id=subscription_id, **kwargs)
 
 
 def get_ssc_mgmt_client(subscription_id: str, **kwargs) -> "MicrosoftSecretSyncController":
     from ..vendor.clients.secretsyncmgmt import MicrosoftSecretSyncController
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
-
-    return MicrosoftSecretSyncController(
-        credential=AZURE_CLI_CREDENTIAL,
-        subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
-        **kwargs,
-    )
+    return get_mgmt_client(MicrosoftSecretSyncController, subscription_id=subscription_id, **kwargs)
 
 
 def get_msi_mgmt_client(subscription_id: str, **kwargs) -> "ManagedServiceIdentityClient":
     from ..vendor.clients.msimgmt import ManagedServiceIdentityClient
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
-
-    return ManagedServiceIdentityClient(
-        credential=AZURE_CLI_CREDENTIAL,
-        subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
-        **kwargs,
-    )
+    return get_mgmt_client(ManagedServiceIdentityClient, subscription_id=subscription_id, **kwargs)
 
 
 def get_clusterconfig_mgmt_client(subscription_id: str, **kwargs) -> "KubernetesConfigurationClient":
     from ..vendor.clients.clusterconfigmgmt import KubernetesConfigurationClient
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
-
-    return KubernetesConfigurationClient(
-        credential=AZURE_CLI_CREDENTIAL,
-        subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
-        **kwargs,
-    )
+    return get_mgmt_client(KubernetesConfigurationClient, subscription_id=subscription_id, **kwargs)
 
 
 def get_connectedk8s_mgmt_client(subscription_id: str, **kwargs) -> "ConnectedKubernetesClient":
     from ..vendor.clients.connectedclustermgmt import ConnectedKubernetesClient
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
-
-    return ConnectedKubernetesClient(
-        credential=AZURE_CLI_CREDENTIAL,
-        subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
-        **kwargs,
-    )
+    return get_mgmt_client(ConnectedKubernetesClient, subscription_id=subscription_id, **kwargs)
 
 
 def get_storage_mgmt_client(subscription_id: str, **kwargs) -> "StorageManagementClient":
     from ..vendor.clients.storagemgmt import StorageManagementClient
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
-
-    return StorageManagementClient(
-        credential=AZURE_CLI_CREDENTIAL,
-        subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
-        **kwargs,
-    )
+    return get_mgmt_client(StorageManagementClient, subscription_id=subscription_id, **kwargs)
 
 
 class DeviceRegistryMgmtApiVersion(Enum):
@@ -153,15 +122,8 @@ def get_registry_mgmt_client(
     if isinstance(api_version, DeviceRegistryMgmtApiVersion):
         api_version = api_version.value
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
-    kwargs["api_version"] = api_version
-
-    return MicrosoftDeviceRegistryManagementService(
-        credential=AZURE_CLI_CREDENTIAL,
-        subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
-        **kwargs,
+    return get_mgmt_client(
+        MicrosoftDeviceRegistryManagementService, subscription_id=subscription_id, api_version=api_version, **kwargs
     )
 
 
@@ -175,14 +137,10 @@ def get_iotops_mgmt_client(
 ) -> "MicrosoftIoTOperationsManagementService":
     from ..vendor.clients.iotopsmgmt import MicrosoftIoTOperationsManagementService
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
-    kwargs["api_version"] = api_version.value
-
-    return MicrosoftIoTOperationsManagementService(
-        credential=AZURE_CLI_CREDENTIAL,
+    return get_mgmt_client(
+        MicrosoftIoTOperationsManagementService,
         subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
+        api_version=api_version.value,
         **kwargs,
     )
 
@@ -190,24 +148,82 @@ def get_iotops_mgmt_client(
 def get_resource_client(subscription_id: str, **kwargs) -> "ResourceManagementClient":
     from ..vendor.clients.resourcesmgmt import ResourceManagementClient
 
-    if "http_logging_policy" not in kwargs:
-        kwargs["http_logging_policy"] = get_default_logging_policy()
+    return get_mgmt_client(ResourceManagementClient, subscription_id=subscription_id, **kwargs)
 
-    return ResourceManagementClient(
-        credential=AZURE_CLI_CREDENTIAL,
+
+def get_authz_client(subscription_id: str, **kwargs) -> "AuthorizationManagementClient":
+    from ..vendor.clients.authzmgmt import AuthorizationManagementClient
+
+    return get_mgmt_client(AuthorizationManagementClient, subscription_id=subscription_id, **kwargs)
+
+
+def get_keyvault_client(subscription_id: str, **kwargs) -> "KeyVaultClient":
+    from ..vendor.clients.keyvault import KeyVaultClient
+
+    # TODO: this only supports azure public cloud for now
+    return get_mgmt_client(
+        KeyVaultClient,
         subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
+        client_options={"credential_scopes": ["https://vault.azure.net/.default"]},
         **kwargs,
     )
 
 
-def get_authz_client(subscription_id: str, **kwargs) -> "AuthorizationManagementClient":
-    from ..vendor.clients.authzmgmt import AuthorizationManagementClient
-
+def get_mgmt_client(
+    client_type: Type[ClientType],
+    subscription_id: str,
+    api_version: Optional[str] = None,
+    client_options: Optional[dict] = None,
+    **kwargs,
+) -> ClientType:
+    """
+    Management client for the client type, subscription and api version, shared process-wide.
+
+    Clients are created once, are safe to use from multiple threads and send requests over the
+    shared pooled transport. Any kwargs are caller specific client configuration, so a dedicated
+    client is created (still over the shared transport) rather than one from the registry.
+    client_options hold configuration fixed for the client type.
+    """
+    if kwargs:
+        return _create_mgmt_client(client_type, subscription_id, api_version, **(client_options or {}), **kwargs)
+
+    key = (client_type, subscription_id, api_version)
+    with _CLIENT_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = _create_mgmt_client(client_type, subscription_id, api_version, **(client_options or {}))
+            _CLIENTS[key] = client
+        return client
+
+
+def get_shared_transport() -> "RequestsTransport":
+    """
+    HTTP transport shared by management clients, pooling and keeping alive connections per host.
+    """
+    global _SHARED_TRANSPORT  # pylint: disable=global-statement
+    with _CLIENT_LOCK:
+        if _SHARED_TRANSPORT is None:
+            _SHARED_TRANSPORT = _create_transport()
+        return _SHARED_TRANSPORT
+
+
+def clear_mgmt_clients():
+    """
+    Drop registered management clients. The shared transport is kept.
+    """
+    with _CLIENT_LOCK:
+        _CLIENTS.clear()
+
+
+def _create_mgmt_client(client_type: Type[ClientType], subscription_id: str, api_version: Optional[str], **kwargs):
     if "http_logging_policy" not in kwargs:
         kwargs["http_logging_policy"] = get_default_logging_policy()
+    if "transport" not in kwargs:
+        kwargs["transport"] = get_shared_transport()
+    if api_version:
+        kwargs["api_version"] = api_version
 
-    return AuthorizationManagementClient(
+    return client_type(
         credential=AZURE_CLI_CREDENTIAL,
         subscription_id=subscription_id,
         user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
@@ -215,44 +231,118 @@ def get_authz_client(subscription_id: str, **kwargs) -> "AuthorizationManagement
     )
 
 
-def get_keyvault_client(subscription_id: str, **kwargs) -> "KeyVaultClient":
-    from ..vendor.clients.keyvault import KeyVaultClient
+def _create_transport() -> "RequestsTransport":
+    from azure.core.pipeline.transport import RequestsTransport
+    from requests import Session
+    from requests.adapters import HTTPAdapter
+    from urllib3 import Retry
 
-    # TODO: this only supports azure public cloud for now
-    client = KeyVaultClient(
-        credential=AZURE_CLI_CREDENTIAL,
-        subscription_id=subscription_id,
-        user_agent_policy=UserAgentPolicy(user_agent=USER_AGENT),
-        credential_scopes=["https://vault.azure.net/.default"],
-        **kwargs,
+    session = Session()
+    # Retries belong to each client's retry policy, as with the default transport.
+    adapter = HTTPAdapter(
+        pool_connections=CLIENT_POOL_CONNECTIONS,
+        pool_maxsize=CLIENT_POOL_MAXSIZE,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
     )
+    for protocol in ["http://", "https://"]:
+        session.mount(protocol, adapter)
 
-    return client
+    # The session is not owned by the transport, so closing any one client leaves it open for the others.
+    return RequestsTransport(session=session, session_owner=False)
 
 
 def wait_for_terminal_state(poller: "LROPoller", wait_sec: int = POLL_WAIT_SEC, **_) -> JSON:
     # resource client does not handle sigint well
-    counter = 0
-    while counter < POLL_RETRIES:
-        sleep(wait_sec)
-        counter = counter + 1
-        if poller.done():
-            break
+    _wait_for_pollers(pollers=(poller,), retries=POLL_RETRIES, max_wait_sec=wait_sec)
     return poller.result()
 
 
 def wait_for_terminal_states(
     *pollers: "LROPoller", retries: int = POLL_RETRIES, wait_sec: int = POLL_WAIT_SEC, **_
 ) -> Tuple["LROPoller"]:
-    counter = 0
-    while counter < retries:
-        sleep(wait_sec)
-        counter = counter + 1
-        batch_done = all(poller.done() for poller in pollers)
-        if batch_done:
+    _wait_for_pollers(pollers=pollers, retries=retries, max_wait_sec=wait_sec)
+    return pollers
+
+
+def _wait_for_pollers(pollers: Sequence["LROPoller"], retries: int, max_wait_sec: float) -> Dict[int, float]:
+    """
+    Wait until all pollers are done, returning seconds from the start of waiting to completion by poller index.
+
+    Pollers are checked immediately, then at intervals backing off exponentially with jitter from
+    POLL_INITIAL_WAIT_SEC up to max_wait_sec, deferring to a service Retry-After hint when longer.
+    Any poller completing wakes the wait early. Waiting stops after retries waits or
+    retries * max_wait_sec seconds, whichever comes first.
+    """
+    started = monotonic()
+    timeout_sec = retries * max_wait_sec
+    wake = Event()
+    for poller in pollers:
+        poller.add_done_callback(lambda _: wake.set())
+
+    pending = dict(enumerate(pollers))
+    latencies: Dict[int, float] = {}
+    interval = POLL_INITIAL_WAIT_SEC
+    for attempt in range(retries + 1):
+        wake.clear()
+        for index, poller in list(pending.items()):
+            if poller.done():
+                latencies[index] = monotonic() - started
+                del pending[index]
+                logger.info(f"Long-running operation {_describe_poller(poller)}completed in {latencies[index]:.1f}s.")
+
+        remaining = timeout_sec - (monotonic() - started)
+        if not pending or remaining <= 0 or attempt == retries:
             break
 
-    return pollers
+        retry_after = max((_get_retry_after(poller) for poller in pending.values()), default=0)
+        delay = min(max(interval, retry_after), max_wait_sec) * uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+        _wait_for_wake(wake, min(delay, remaining))
+        interval = min(interval * POLL_BACKOFF_FACTOR, max_wait_sec)
+
+    return latencies
+
+
+def _wait_for_wake(wake: Event, timeout_sec: float):
+    # Wait in short slices so a keyboard interrupt is handled promptly on every platform.
+    deadline = monotonic() + timeout_sec
+    while not wake.is_set():
+        remaining = deadline - monotonic()
+        if remaining <= 0:
+            return
+        wake.wait(min(remaining, 1))
+
+
+def _get_retry_after(poller: "LROPoller") -> float:
+    try:
+        headers = poller.polling_method()._pipeline_response.http_response.headers
+        retry_after = headers.get("retry-after")
+        return float(retry_after) if isinstance(retry_after, (str, int, float)) else 0
+    except (AttributeError, TypeError, ValueError):
+        # No response yet, or a non-numeric (http-date) hint.
+        return 0
+
+
+def get_throttle_delay(error: "HttpResponseError", attempt: int, backoff_sec: float) -> float:
+    """
+    Seconds to wait before retrying a throttled request, preferring the service's Retry-After.
+    """
+    retry_after = None
+    if error.response is not None:
+        retry_after = error.response.headers.get("Retry-After")
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return backoff_sec * (2**attempt) * uniform(0.8, 1.2)
+
+
+def _describe_poller(poller: "LROPoller") -> str:
+    try:
+        request = poller.polling_method()._initial_response.http_request
+        if isinstance(request.method, str) and isinstance(request.url, str):
+            return f"{request.method} {urlparse(request.url).path} "
+    except AttributeError:
+        pass
+    return ""
 
 
 def get_tenant_id() -> str:
@@ -17,8 +17,20 @@ from typing import Dict, List, Optional
 
 from knack.log import get_logger
 
+from .kql import CLAUSE_SEPARATOR, QueryTemplate
+
 logger = get_logger(__name__)
 
+RESOURCE_QUERY = QueryTemplate(
+    filters={
+        "name": ("name", "=~"),
+        "resource_group": ("resourceGroup", "=~"),
+        "location": ("location", "=~"),
+        "type": ("type", "=~"),
+    }
+)
+RESOURCE_QUERY_PROJECTION = "project id, location, name, resourceGroup, properties, tags, type, subscriptionId"
+
 
 def parse_kvp_nargs(kvp_nargs: List[str]) -> dict:
     """
@@ -57,54 +69,26 @@ def assemble_nargs_to_dict(hash_list: List[str]) -> Dict[str, str]:
 
 
 def build_query(cmd, subscription_id: Optional[str] = None, custom_query: Optional[str] = None, **kwargs):
-    url = "/providers/Microsoft.ResourceGraph/resources?api-version=2022-10-01"
-    subscriptions = [subscription_id] if subscription_id else []
-    payload = {"subscriptions": subscriptions, "query": "Resources ", "options": {}}
+    from .resource_graph import ResourceGraph
 
     # TODO: add more query options as they pop up
-    if kwargs.get("name"):
-        payload["query"] += f'| where name =~ "{kwargs.get("name")}" '
-    if kwargs.get("resource_group"):
-        payload["query"] += f'| where resourceGroup =~ "{kwargs.get("resource_group")}" '
-    if kwargs.get("location"):
-        payload["query"] += f'| where location =~ "{kwargs.get("location")}" '
-    if kwargs.get("type"):
-        payload["query"] += f'| where type =~ "{kwargs.get("type")}" '
-    if custom_query:
-        payload["query"] += custom_query
-    payload["query"] += "| project id, location, name, resourceGroup, properties, tags, type, subscriptionId"
+    projection = RESOURCE_QUERY_PROJECTION
     if kwargs.get("additional_project"):
-        payload["query"] += f', {kwargs.get("additional_project")}'
-
-    return _process_raw_request(cmd, url, "POST", payload)
-
-
-def _process_raw_request(cmd, url: str, method: str, payload: Optional[dict] = None, keyword: str = "data"):
-    # since I don't want to download the resourcegraph sdk - we are stuck with this
-    # note that we are trying to limit dependencies
-    from azure.cli.core.util import send_raw_request
-
-    result = []
-    skip_token = "sentinel"
-    while skip_token:
-        try:
-            body = json.dumps(payload) if payload is not None else None
-            res = send_raw_request(cli_ctx=cmd.cli_ctx, url=url, method=method, body=body)
-        except Exception as e:
-            raise e
-        if not res.content:
-            return
-        json_response = res.json()
-        result.extend(json_response[keyword])
-        skip_token = json_response.get("$skipToken")
-        if skip_token:
-            if not payload:
-                payload = {"options": {}}
-            if "options" not in payload:
-                payload["options"] = {}
-            payload["options"]["$skipToken"] = skip_token
-
-    return result
+        projection += f", {kwargs.get('additional_project')}"
+    query_text = CLAUSE_SEPARATOR.join(
+        [
+            RESOURCE_QUERY.render(
+                custom_query=custom_query,
+                name=kwargs.get("name"),
+                resource_group=kwargs.get("resource_group"),
+                location=kwargs.get("location"),
+                type=kwargs.get("type"),
+            ),
+            projection,
+        ]
+    )
+    subscriptions = [subscription_id] if subscription_id else None
+    return ResourceGraph(cmd=cmd, subscriptions=subscriptions).query_resources(query=query_text)["data"]
 
 
 def get_timestamp_now_utc(format: str = "%Y-%m-%dT%H:%M:%S") -> str:
@@ -9,12 +9,14 @@ import json
 import yaml
 import os
 from pathlib import PurePath
-from typing import Any, Callable, List, Optional, Union
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 from azure.cli.core.azclierror import FileOperationError, InvalidArgumentValueError
 from knack.log import get_logger
 
 logger = get_logger(__name__)
 
+RECORD_FILE_EXTENSIONS = {".csv", ".json", ".yaml", ".yml"}
+
 
 # TODO: unit test
 def dump_content_to_file(
@@ -65,16 +67,8 @@ def normalize_dir(dir_path: Optional[str] = None) -> PurePath:
 
 
 def read_file_content(file_path: str, read_as_binary: bool = False) -> Union[bytes, str]:
-    from pathlib import Path
-
     logger.debug("Processing %s", file_path)
-    pure_path = Path(os.path.abspath(os.path.expanduser(file_path)))
-
-    if not pure_path.exists():
-        raise FileOperationError(f"{file_path} does not exist.")
-
-    if not pure_path.is_file():
-        raise FileOperationError(f"{file_path} is not a file.")
+    pure_path = _get_file(file_path)
 
     if read_as_binary:
         logger.debug("Reading %s as binary", file_path)
@@ -116,6 +110,46 @@ def deserialize_file_content(file_path: str) -> Any:
     raise FileOperationError(f"File contents for {file_path} cannot be read.")
 
 
+def iter_file_records(file_path: str, csv_fieldnames: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Records of a file holding a list of objects, such as exported asset data points.
+
+    CSV rows are read and yielded one at a time. Other formats are deserialized as a whole. A file
+    without a known extension is read as CSV only when its header row holds one of csv_fieldnames.
+    """
+    extension = file_path.split(".")[-1]
+    if extension != "csv":
+        content = deserialize_file_content(file_path=file_path)
+        # Without a known extension, CSV content loads as a single YAML string or as a DictReader.
+        if not isinstance(content, (str, csv.DictReader)) or extension in ["json", "yaml", "yml"]:
+            if isinstance(content, (dict, str, bytes)) or not isinstance(content, Iterable):
+                raise FileOperationError(f"File contents for {file_path} must be a list.")
+            yield from content
+            return
+        if not _has_csv_header(file_path=file_path, fieldnames=csv_fieldnames):
+            validate_file_extension(file_path, RECORD_FILE_EXTENSIONS)
+
+    logger.debug("Streaming %s", file_path)
+    pure_path = _get_file(file_path)
+    try:
+        # 'utf-8-sig' so that BOM in WinOS won't cause trouble, it also reads plain utf-8.
+        with open(pure_path, "r", encoding="utf-8-sig", newline="") as f:
+            yield from csv.DictReader(f)
+    except (UnicodeError, csv.Error) as e:
+        raise FileOperationError(f"Failed to read file {file_path}: {e}")
+
+
+def _has_csv_header(file_path: str, fieldnames: Optional[Iterable[str]] = None) -> bool:
+    if not fieldnames:
+        return False
+    try:
+        with open(_get_file(file_path), "r", encoding="utf-8-sig", newline="") as f:
+            header = next(csv.reader(f), [])
+    except (UnicodeError, csv.Error):
+        return False
+    return not set(fieldnames).isdisjoint(column.strip() for column in header)
+
+
 def validate_file_extension(file_name: str, expected_exts: set[str]) -> str:
     ext = os.path.splitext(file_name)[1]
     lowercased_exts = {ext.lower() for ext in expected_exts}
@@ -128,6 +162,19 @@ def validate_file_extension(file_name: str, expected_exts: set[str]) -> str:
     return ext
 
 
+def _get_file(file_path: str) -> PurePath:
+    from pathlib import Path
+
+    pure_path = Path(os.path.abspath(os.path.expanduser(file_path)))
+    if not pure_path.exists():
+        raise FileOperationError(f"{file_path} does not exist.")
+
+    if not pure_path.is_file():
+        raise FileOperationError(f"{file_path} is not a file.")
+
+    return pure_path
+
+
 def _try_loading_as(loader: Callable, content: str, error_type: Exception, raise_error: bool = True) -> Optional[Any]:
     try:
         return loader(content)
@@ -0,0 +1,122 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+QUERY_TABLE = "Resources"
+INSTANCE_RESOURCE_TYPE = "microsoft.iotoperations/instances"
+CLAUSE_SEPARATOR = " | "
+# Summary projection shared by extended location resource queries.
+CUSTOM_LOCATION_PROJECTION = (
+    "extend customLocation = tostring(extendedLocation.name)",
+    "extend provisioningState = properties.provisioningState",
+    "project id, customLocation, location, name, resourceGroup, provisioningState, tags, type, subscriptionId",
+)
+
+
+class QueryTemplate:
+    """
+    Resource Graph query over a fixed set of optional filters.
+
+    Filters map a keyword to a (column, operator) pair and are rendered in declaration order, so
+    the same set of filter values always renders the same query text.
+    """
+
+    def __init__(
+        self,
+        filters: Dict[str, Tuple[str, str]],
+        resource_type: Optional[str] = None,
+        tail: Iterable[str] = (),
+        table: str = QUERY_TABLE,
+    ):
+        self.filters = filters
+        self.resource_type = resource_type
+        self.tail = tuple(tail)
+        self.table = table
+
+    def render(self, custom_query: Optional[str] = None, **values) -> str:
+        unknown = set(values).difference(self.filters)
+        if unknown:
+            raise ValueError(f"Unknown query filters: {', '.join(sorted(unknown))}.")
+        return _render(self, _normalize(custom_query), tuple(values.get(key) for key in self.filters))
+
+    def render_custom(self, custom_query: str) -> str:
+        """
+        Query the template resource type with a caller provided body in place of the filters and tail.
+        """
+        clauses = [self.table]
+        if self.resource_type:
+            clauses.append(where("type", "=~", self.resource_type))
+        custom_query = _normalize(custom_query)
+        if custom_query:
+            clauses.append(custom_query)
+        return CLAUSE_SEPARATOR.join(clauses)
+
+
+def quote(value: Any) -> str:
+    """
+    KQL literal for a filter value. Strings are double quoted and escaped.
+    """
+    if isinstance(value, bool):
+        return str(value).lower()
+    if isinstance(value, (int, float)):
+        return str(value)
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def where(column: str, operator: str, value: Any) -> str:
+    return f"where {column} {operator} {quote(value)}"
+
+
+def join_instance(
+    query: str, instance_name: Optional[str] = None, instance_resource_group: Optional[str] = None
+) -> str:
+    """
+    Limit a query projecting customLocation to the resources of the matching instances.
+    """
+    if not any([instance_name, instance_resource_group]):
+        return query
+    clauses = [QUERY_TABLE, where("type", "=~", INSTANCE_RESOURCE_TYPE)]
+    if instance_name:
+        clauses.append(where("name", "=~", instance_name))
+    if instance_resource_group:
+        clauses.append(where("resourceGroup", "=~", instance_resource_group))
+    # fetch the custom location + join on innerunique. Then remove the extra customLocation1 generated
+    clauses.extend(
+        [
+            "extend customLocation = tostring(extendedLocation.name)",
+            "project customLocation",
+            f"join kind=innerunique ({query}) on customLocation",
+            "project-away customLocation1",
+        ]
+    )
+    return CLAUSE_SEPARATOR.join(clauses)
+
+
+@lru_cache(maxsize=128)
+def _render(template: QueryTemplate, custom_query: Optional[str], values: Tuple[Any, ...]) -> str:
+    clauses = [template.table]
+    if template.resource_type:
+        clauses.append(where("type", "=~", template.resource_type))
+    for (column, operator), value in zip(template.filters.values(), values):
+        if value is not None and value != "":
+            clauses.append(where(column, operator, value))
+    if custom_query:
+        clauses.append(custom_query)
+    clauses.extend(template.tail)
+    return CLAUSE_SEPARATOR.join(clauses)
+
+
+def _normalize(custom_query: Optional[str]) -> Optional[str]:
+    """
+    Trim a custom query fragment and drop its leading pipe.
+    """
+    custom_query = (custom_query or "").strip()
+    if custom_query.startswith("|"):
+        custom_query = custom_query[1:].strip()
+    return custom_query or None
@@ -0,0 +1,68 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional
+
+# Sample suffixes of metric families whose samples only ever increase.
+COUNTER_SUFFIXES = {"_total": {"counter"}, "_count": {"histogram", "summary"}, "_sum": {"histogram", "summary"}}
+
+
+class PrometheusSample(NamedTuple):
+    name: str
+    # Metric name and labels as exposed, identifying the time series.
+    series: str
+    value: float
+
+
+def iter_samples(lines: Iterable[str], types: Optional[Dict[str, str]] = None) -> Iterator[PrometheusSample]:
+    """
+    Parse the Prometheus text exposition format one line at a time.
+
+    Metric family types declared by TYPE comments are recorded into types when provided.
+    Timestamps are ignored and malformed lines are skipped.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("#"):
+            if types is not None:
+                comment = line.split(maxsplit=3)
+                if len(comment) == 4 and comment[1] == "TYPE":
+                    types[comment[2]] = comment[3]
+            continue
+
+        labels_end = line.rfind("}")
+        if labels_end > -1:
+            series = line[: labels_end + 1]
+            name = series[: series.find("{")]
+            sample = line[labels_end + 1 :].split()
+        else:
+            series, *sample = line.split()
+            name = series
+        if not sample:
+            continue
+        try:
+            value = float(sample[0])
+        except ValueError:
+            continue
+        yield PrometheusSample(name=name, series=series, value=value)
+
+
+def is_counter(name: str, types: Dict[str, str]) -> bool:
+    """
+    Whether samples of the metric named name only increase, based on its declared family type.
+    """
+    if name in types:
+        return types[name] == "counter"
+    for suffix, family_types in COUNTER_SUFFIXES.items():
+        if not name.endswith(suffix):
+            continue
+        family_type = types.get(name.removesuffix(suffix))
+        # Untyped _total samples are counters by convention.
+        if family_type in family_types or (family_type is None and suffix == "_total"):
+            return True
+    return False
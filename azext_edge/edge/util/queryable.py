@@ -4,10 +4,16 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
-from typing import List, Optional, Union
+import json
+import sys
+from typing import Any, Callable, Iterator, List, Optional, Union
+
+from azure.cli.core.azclierror import InvalidArgumentValueError, MutuallyExclusiveArgumentError
 
 from .az_client import get_resource_client
-from .resource_graph import ResourceGraph
+from .resource_cache import get_cache_key, get_resource_cache
+from .common import url_safe_hash_phrase
+from .resource_graph import GRAPH_API_VERSION, GRAPH_MAX_PAGE_SIZE, GRAPH_RESOURCE_SCOPE, ResourceGraph
 from knack.log import get_logger
 
 GRAPH_ENDPOINT = "https://graph.microsoft.com/"
@@ -31,6 +37,7 @@ class Queryable:
         self.subscriptions = subscriptions
         self.resource_graph = ResourceGraph(cmd=cmd, subscriptions=self.subscriptions)
         self.resource_client = get_resource_client(subscription_id=self.default_subscription_id)
+        self.resource_cache = get_resource_cache(cmd.cli_ctx)
 
     def _process_query_result(self, result: dict, first: bool = False) -> Optional[Union[dict, List[dict]]]:
         if "data" in result:
@@ -38,8 +45,91 @@ class Queryable:
                 return result["data"][0]
             return result["data"]
 
-    def query(self, query: str, first: bool = False) -> Optional[Union[dict, List[dict]]]:
-        return self._process_query_result(result=self.resource_graph.query_resources(query=query), first=first)
+    def get_cached(
+        self, resource_id: str, api_version: str, fetch: Callable[[], Any], subscription_id: Optional[str] = None
+    ) -> Any:
+        """
+        Serve a read-only lookup from the resource cache when caching is enabled.
+        """
+        if not self.resource_cache:
+            return fetch()
+        return self.resource_cache.get_or_fetch(
+            key=get_cache_key(subscription_id or self.default_subscription_id, resource_id, api_version), fetch=fetch
+        )
+
+    def invalidate_cached(self, resource_id: str):
+        if self.resource_cache:
+            self.resource_cache.invalidate_resource(resource_id)
+            # Cached query results may include the resource.
+            self.resource_cache.invalidate_resource(GRAPH_RESOURCE_SCOPE)
+
+    def get_cached_query(self, query: str, fetch: Callable[[], Any], top: Optional[int] = None) -> Any:
+        """
+        Serve a Resource Graph query result from the resource cache when caching is enabled.
+
+        Queries are keyed by their text, so callers should build them with a query template.
+        """
+        return self.get_cached(
+            resource_id=f"{GRAPH_RESOURCE_SCOPE}/{url_safe_hash_phrase(f'{top}|{query}')}",
+            api_version=GRAPH_API_VERSION,
+            fetch=fetch,
+            subscription_id=",".join(sorted(self.subscriptions)),
+        )
+
+    def query(
+        self, query: str, first: bool = False, page_size: Optional[int] = None, top: Optional[int] = None
+    ) -> Optional[Union[dict, List[dict]]]:
+        return self._process_query_result(
+            result=self.resource_graph.query_resources(query=query, page_size=page_size, top=top), first=first
+        )
+
+    def query_rows(self, query: str, page_size: Optional[int] = None, top: Optional[int] = None) -> Iterator[dict]:
+        for page in self.resource_graph.iter_pages(query=query, page_size=page_size, top=top):
+            yield from page
+
+    def count(self, query: str) -> int:
+        return self.resource_graph.count(query=query)
+
+    def stream_query(self, query: str, page_size: Optional[int] = None, top: Optional[int] = None) -> int:
+        """
+        Write query rows to stdout as newline delimited JSON as each page arrives. Returns the row count.
+        """
+        total = 0
+        for page in self.resource_graph.iter_pages(query=query, page_size=page_size, top=top):
+            for row in page:
+                sys.stdout.write(json.dumps(row, separators=(",", ":")) + "\n")
+            sys.stdout.flush()
+            total += len(page)
+        return total
+
+    def process_query(
+        self,
+        query: str,
+        count: Optional[bool] = None,
+        stream: Optional[bool] = None,
+        page_size: Optional[int] = None,
+        top: Optional[int] = None,
+    ) -> Optional[Union[dict, List[dict]]]:
+        """
+        Run a list query in one of the supported output modes - a server side count, rows streamed
+        to stdout or the accumulated result. Counts and accumulated results are served from the
+        resource cache when caching is enabled.
+        """
+        if page_size is not None and not 0 < page_size <= GRAPH_MAX_PAGE_SIZE:
+            raise InvalidArgumentValueError(f"--page-size must be between 1 and {GRAPH_MAX_PAGE_SIZE}.")
+        if top is not None and top < 1:
+            raise InvalidArgumentValueError("--top must be at least 1.")
+        if count and stream:
+            raise MutuallyExclusiveArgumentError("--count and --stream cannot be used together.")
+
+        if count:
+            return {"count": self.get_cached_query(query=f"{query} | count", fetch=lambda: self.count(query=query))}
+        if stream:
+            self.stream_query(query=query, page_size=page_size, top=top)
+            return
+        return self.get_cached_query(
+            query=query, top=top, fetch=lambda: self.query(query=query, page_size=page_size, top=top)
+        )
 
     def get_resource_group(self, name: str) -> dict:
         return self.resource_client.resource_groups.get(resource_group_name=name)
@@ -0,0 +1,251 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import atexit
+import json
+import os
+from threading import Lock
+from time import monotonic, sleep, time
+from typing import Any, Callable, Dict, Optional
+
+from knack.log import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_FILE_NAME = "iotOpsResourceCache.json"
+CACHE_KEY_FORMAT_VERSION = "formatVersion"
+CACHE_KEY_ENTRIES = "entries"
+FORMAT_VERSION_V1_VALUE = "v1"
+CONFIG_ROOT_LABEL = "iotops"
+CONFIG_CACHE_TTL_LABEL = "cache_ttl"
+CONFIG_CACHE_MAX_ENTRIES_LABEL = "cache_max_entries"
+DEFAULT_CACHE_MAX_ENTRIES = 256
+CLI_DATA_CACHE_KEY = "iotops_resource_cache"
+CLI_DATA_NO_CACHE_KEY = "iotops_no_cache"
+CACHE_KEY_SEPARATOR = "|"
+CACHE_LOCK_TIMEOUT_SEC = 2
+CACHE_LOCK_RETRY_SEC = 0.02
+CACHE_LOCK_STALE_SEC = 10
+
+
+class ResourceCache:
+    """
+    Persistent cache of read-only ARM lookups shared across CLI invocations.
+
+    Entries expire after ttl_seconds. When more than max_entries are held, the least
+    recently used entries are evicted.
+
+    Concurrent invocations share the file. Each write re-reads the file under a lock file and
+    applies only this invocation's changes, so entries set or invalidated elsewhere are kept.
+    Reads never write, recency is tracked in memory and flushed once at exit.
+    """
+
+    def __init__(self, path: str, ttl_seconds: int, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Optional[Dict[str, dict]] = None
+        self._loaded_mtime: Optional[int] = None
+        self._accessed: Dict[str, float] = {}
+        self._flush_registered = False
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._load().get(key)
+            if not entry:
+                return None
+            now = time()
+            if entry["expiresAt"] <= now:
+                return None
+            entry["accessedAt"] = now
+            self._accessed[key] = now
+            if not self._flush_registered:
+                atexit.register(self.flush)
+                self._flush_registered = True
+            logger.debug(f"Resource cache hit for {key}.")
+            return entry["value"]
+
+    def set(self, key: str, value: Any):
+        now = time()
+        entry = {"value": value, "expiresAt": now + self.ttl_seconds, "accessedAt": now}
+        with self._lock:
+            self._save(lambda entries: entries.__setitem__(key, entry))
+
+    def invalidate_resource(self, resource_id: str):
+        """
+        Drop entries for a resource, its ancestors and its descendants, such as a list of child resources.
+        """
+        scope = resource_id.lower()
+
+        def _invalidate(entries: Dict[str, dict]):
+            for key in [key for key in entries if _is_related_scope(scope, key.split(CACHE_KEY_SEPARATOR)[1])]:
+                entries.pop(key)
+                self._accessed.pop(key, None)
+
+        with self._lock:
+            self._save(_invalidate)
+
+    def get_or_fetch(self, key: str, fetch: Callable[[], Any]) -> Any:
+        value = self.get(key)
+        if value is None:
+            value = fetch()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+    def flush(self):
+        """
+        Persist recency of entries read since the last write.
+        """
+        with self._lock:
+            if self._accessed:
+                self._save()
+
+    def _evict(self, entries: Dict[str, dict], now: float):
+        for key in [key for key, entry in entries.items() if entry["expiresAt"] <= now]:
+            entries.pop(key)
+        overflow = len(entries) - self.max_entries
+        if overflow > 0:
+            for key in sorted(entries, key=lambda k: entries[k]["accessedAt"])[:overflow]:
+                entries.pop(key)
+
+    def _load(self) -> Dict[str, dict]:
+        # Re-read only when another invocation has replaced the file since it was last read.
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            mtime = None
+        if self._entries is None or mtime != self._loaded_mtime:
+            self._entries = self._read()
+            self._loaded_mtime = mtime
+            for key, accessed_at in self._accessed.items():
+                if key in self._entries:
+                    self._entries[key]["accessedAt"] = max(self._entries[key]["accessedAt"], accessed_at)
+        return self._entries
+
+    def _read(self) -> Dict[str, dict]:
+        try:
+            with open(self.path, "r", encoding="utf8") as f:
+                content = json.load(f)
+            if content.get(CACHE_KEY_FORMAT_VERSION) == FORMAT_VERSION_V1_VALUE:
+                return content.get(CACHE_KEY_ENTRIES, {})
+        except FileNotFoundError:
+            pass
+        # A damaged cache is discarded rather than failing the command.
+        except (OSError, ValueError, AttributeError) as e:
+            logger.debug(f"Unable to read resource cache {self.path}: {e}")
+        return {}
+
+    def _save(self, update: Optional[Callable[[Dict[str, dict]], None]] = None):
+        """
+        Apply update and the pending recency to the current file content, then replace the file.
+        """
+        if not _acquire_file_lock(self.path):
+            # The cache is best effort, drop this write rather than risk losing another invocation's.
+            logger.debug(f"Unable to lock resource cache {self.path}, skipping write.")
+            self._entries = None
+            return
+        try:
+            # Always start from the file as it is now, never from this invocation's copy.
+            self._entries = None
+            entries = self._load()
+            if update:
+                update(entries)
+            self._evict(entries, time())
+            # Write then replace so concurrent invocations never observe a partial file.
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf8") as f:
+                    json.dump({CACHE_KEY_FORMAT_VERSION: FORMAT_VERSION_V1_VALUE, CACHE_KEY_ENTRIES: entries}, f)
+                os.replace(temp_path, self.path)
+                self._loaded_mtime = os.stat(self.path).st_mtime_ns
+                self._accessed.clear()
+            except (OSError, TypeError, ValueError) as e:
+                logger.debug(f"Unable to write resource cache {self.path}: {e}")
+                self._entries = None
+        finally:
+            _release_file_lock(self.path)
+
+
+def _acquire_file_lock(path: str) -> bool:
+    """
+    Create the lock file next to the cache, waiting up to CACHE_LOCK_TIMEOUT_SEC for another holder.
+    """
+    lock_path = f"{path}.lock"
+    deadline = monotonic() + CACHE_LOCK_TIMEOUT_SEC
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                # A lock left behind by an interrupted invocation is broken once it is stale.
+                if time() - os.stat(lock_path).st_mtime > CACHE_LOCK_STALE_SEC:
+                    os.remove(lock_path)
+                    continue
+            except OSError:
+                continue
+        except OSError as e:
+            logger.debug(f"Unable to create resource cache lock {lock_path}: {e}")
+            return False
+        if monotonic() >= deadline:
+            return False
+        sleep(CACHE_LOCK_RETRY_SEC)
+
+
+def _release_file_lock(path: str):
+    try:
+        os.remove(f"{path}.lock")
+    except OSError:
+        pass
+
+
+def get_cache_key(subscription_id: str, resource_id: str, api_version: str) -> str:
+    return CACHE_KEY_SEPARATOR.join([subscription_id, resource_id, api_version]).lower()
+
+
+def _is_related_scope(scope: str, other_scope: str) -> bool:
+    return scope == other_scope or scope.startswith(f"{other_scope}/") or other_scope.startswith(f"{scope}/")
+
+
+def get_resource_cache(cli_ctx) -> Optional[ResourceCache]:
+    """
+    The resource cache for this invocation, or None when caching is not enabled.
+
+    Caching is opt-in by setting iotops.cache_ttl to a number of seconds, for example with
+    'az config set iotops.cache_ttl=300' or the AZURE_IOTOPS_CACHE_TTL environment variable.
+    """
+    data: dict = cli_ctx.data
+    if data.get(CLI_DATA_NO_CACHE_KEY):
+        return None
+    if CLI_DATA_CACHE_KEY in data:
+        return data[CLI_DATA_CACHE_KEY]
+
+    resource_cache = None
+    try:
+        ttl_seconds = cli_ctx.config.getint(CONFIG_ROOT_LABEL, CONFIG_CACHE_TTL_LABEL, fallback=0)
+        max_entries = cli_ctx.config.getint(
+            CONFIG_ROOT_LABEL, CONFIG_CACHE_MAX_ENTRIES_LABEL, fallback=DEFAULT_CACHE_MAX_ENTRIES
+        )
+        if isinstance(ttl_seconds, int) and isinstance(max_entries, int) and ttl_seconds > 0 and max_entries > 0:
+            resource_cache = ResourceCache(
+                path=os.path.join(cli_ctx.config.config_dir, CACHE_FILE_NAME),
+                ttl_seconds=ttl_seconds,
+                max_entries=max_entries,
+            )
+    except (AttributeError, ValueError) as e:
+        logger.debug(f"Resource cache is disabled: {e}")
+
+    data[CLI_DATA_CACHE_KEY] = resource_cache
+    return resource_cache
+
+
+def disable_resource_cache(cli_ctx):
+    """
+    Bypass the resource cache for the rest of this invocation.
+    """
+    cli_ctx.data[CLI_DATA_NO_CACHE_KEY] = True
@@ -5,12 +5,18 @@
 # ----------------------------------------------------------------------------------------------
 
 import json
-from typing import List, Optional, TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, TYPE_CHECKING
 
 from azure.cli.core.util import send_raw_request
 
 GRAPH_API_VERSION = "2022-10-01"
-GRAPH_RESOURCE_PATH = f"/providers/Microsoft.ResourceGraph/resources?api-version={GRAPH_API_VERSION}"
+GRAPH_RESOURCE_SCOPE = "/providers/Microsoft.ResourceGraph/resources"
+GRAPH_RESOURCE_PATH = f"{GRAPH_RESOURCE_SCOPE}?api-version={GRAPH_API_VERSION}"
+GRAPH_MAX_PAGE_SIZE = 1000
+GRAPH_MAX_WORKERS = 4
+# Column produced by a summarize count() query.
+GRAPH_COUNT_COLUMN = "count_"
 
 if TYPE_CHECKING:
     from requests.models import Response
@@ -23,26 +29,41 @@ class ResourceGraph:
         if subscriptions:
             self.subscriptions.extend(subscriptions)
 
-    def query_resources(self, query: str, page_size: Optional[int] = None) -> dict:
+    def query_resources(self, query: str, page_size: Optional[int] = None, top: Optional[int] = None) -> dict:
         """Query Azure Resource Graph (ARG).
 
         Args:
           query: An ARG compatible query string.
           page_size: Integer corresponding to max records per page. Currently Id must be included
             for skipToken paging to work correctly.
+          top: Integer corresponding to max records in total.
 
         Returns:
           A dict including a 'data' property that has the accumulated resources.
         """
-        return self._process_resource_query(query=query, page_size=page_size)
+        return self._process_resource_query(query=query, page_size=page_size, top=top)
 
-    def _process_resource_query(self, query: str, page_size: Optional[int] = None) -> List[dict]:
-        result = {"data": []}
+    def iter_pages(
+        self, query: str, page_size: Optional[int] = None, top: Optional[int] = None
+    ) -> Iterator[List[dict]]:
+        """Query Azure Resource Graph (ARG), yielding the records of each page as it is received.
+
+        Args:
+          query: An ARG compatible query string.
+          page_size: Integer corresponding to max records per page.
+          top: Integer corresponding to max records in total. No further pages are requested once reached.
+
+        Returns:
+          An iterator of record lists, one per page.
+        """
         request_payload = {"subscriptions": self.subscriptions, "query": query, "options": {}}
         if page_size:
             request_payload["options"]["$top"] = page_size
 
+        remaining = top
         while True:
+            if remaining is not None:
+                request_payload["options"]["$top"] = min(page_size or GRAPH_MAX_PAGE_SIZE, remaining)
             request_body = json.dumps(request_payload)
             # send_raw_request throws azure.cli.core.azclierror.HTTPError on not OK status code.
             raw_request_response: Response = send_raw_request(
@@ -52,11 +73,50 @@ class ResourceGraph:
                 method="POST",
             )
             response_payload: dict = raw_request_response.json()
-            result["data"].extend(response_payload.get("data", []))
+            data: List[dict] = response_payload.get("data", [])
+            if remaining is not None:
+                data = data[:remaining]
+                remaining -= len(data)
+            yield data
 
-            if "$skipToken" not in response_payload:
+            if "$skipToken" not in response_payload or remaining == 0:
                 break
 
             request_payload["options"] = {"$skipToken": response_payload["$skipToken"]}
 
+    def count(self, query: str) -> int:
+        """Count the records of an Azure Resource Graph (ARG) query server side with summarize count()."""
+        data = self._process_resource_query(query=f"{query} | summarize count()")["data"]
+        return data[0].get(GRAPH_COUNT_COLUMN, 0) if data else 0
+
+    def query_resources_batch(self, queries: Dict[str, str], page_size: int = GRAPH_MAX_PAGE_SIZE) -> Dict[str, dict]:
+        """Query Azure Resource Graph (ARG) with independent queries concurrently.
+
+        Args:
+          queries: Map of caller defined keys to ARG compatible query strings.
+          page_size: Integer corresponding to max records per page. Defaults to the ARG maximum
+            so most queries complete in a single round-trip.
+
+        Returns:
+          A dict keyed like queries, where each value includes a 'data' property that has the
+          accumulated resources of that query.
+        """
+        if len(queries) <= 1:
+            return {
+                key: self._process_resource_query(query=query, page_size=page_size) for key, query in queries.items()
+            }
+
+        with ThreadPoolExecutor(
+            max_workers=min(len(queries), GRAPH_MAX_WORKERS), thread_name_prefix="aio-graph"
+        ) as executor:
+            futures = {
+                key: executor.submit(self._process_resource_query, query=query, page_size=page_size)
+                for key, query in queries.items()
+            }
+            return {key: future.result() for key, future in futures.items()}
+
+    def _process_resource_query(self, query: str, page_size: Optional[int] = None, top: Optional[int] = None) -> dict:
+        result = {"data": []}
+        for page in self.iter_pages(query=query, page_size=page_size, top=top):
+            result["data"].extend(page)
         return result
@@ -0,0 +1,62 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from threading import Thread
+from typing import Callable, List
+
+
+class DaemonWorkerPool:
+    """
+    Bounded pool of daemon worker threads.
+
+    Unlike ThreadPoolExecutor, whose workers are joined at interpreter exit, a worker stuck in hung
+    work such as a stalled pod log read does not keep the command from returning.
+    """
+
+    def __init__(self, max_workers: int, thread_name_prefix: str):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._work_queue = SimpleQueue()
+        self._threads: List[Thread] = []
+
+    def submit(self, fn: Callable, *args) -> Future:
+        future = Future()
+        self._work_queue.put((future, fn, args))
+        if len(self._threads) < self.max_workers:
+            thread = Thread(target=self._work, name=f"{self.thread_name_prefix}_{len(self._threads)}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return future
+
+    def shutdown(self, wait: bool = True):
+        # Cancel work that has not started, then stop each worker once it is idle.
+        while True:
+            try:
+                item = self._work_queue.get_nowait()
+            except Empty:
+                break
+            if item:
+                item[0].cancel()
+        for _ in self._threads:
+            self._work_queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _work(self):
+        while True:
+            item = self._work_queue.get()
+            if item is None:
+                return
+            future, fn, args = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(fn(*args))
+            except BaseException as e:  # pylint: disable=broad-exception-caught
+                future.set_exception(e)
@@ -11,6 +11,16 @@ import pytest
 import responses
 
 
+# Management clients are shared process-wide, so each test starts with a fresh registry.
+@pytest.fixture(autouse=True)
+def clear_mgmt_clients():
+    from azext_edge.edge.util.az_client import clear_mgmt_clients
+
+    clear_mgmt_clients()
+    yield
+    clear_mgmt_clients()
+
+
 # Sets current working directory to the directory of the executing file
 @pytest.fixture
 def set_cwd(request):
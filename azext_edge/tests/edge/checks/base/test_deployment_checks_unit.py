@@ -288,3 +288,24 @@ def test_check_pre_deployment(mocker, acs_config, storage_space_check):
     for idx, check in enumerate(expected_checks):
         assert result[idx]["name"] == check
         assert result[idx]["status"] == "success"
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_run_check_funcs(max_workers: int):
+    from functools import partial
+    from threading import current_thread
+    from time import sleep
+
+    from azext_edge.edge.providers.check.base import run_check_funcs
+
+    def _check(i: int) -> dict:
+        # later checks finish first
+        sleep(0.01 * (6 - i))
+        return {"name": f"check{i}", "thread": current_thread().name}
+
+    results = run_check_funcs([partial(_check, i) for i in range(6)], max_workers=max_workers)
+    assert [r["name"] for r in results] == [f"check{i}" for i in range(6)]
+    assert all(r["thread"].startswith("aio-check") for r in results) is (max_workers > 1)
+
+    with pytest.raises(ValueError):
+        run_check_funcs([partial(_check, 0), Mock(side_effect=ValueError)], max_workers=max_workers)
@@ -0,0 +1,98 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import pytest
+
+from azext_edge.edge.providers.check.base import (
+    check_resource_index,
+    get_resource_by_ref,
+    get_resources_by_name,
+    get_valid_resource_names,
+)
+from azext_edge.edge.providers.check.base.index import compile_name_pattern
+from azext_edge.edge.providers.check.deviceregistry import evaluate_assets
+from azext_edge.edge.providers.edge_api import DEVICEREGISTRY_API_V1, DeviceRegistryResourceKinds
+
+
+def _resource(name: str, namespace: str, **spec) -> dict:
+    return {"metadata": {"name": name, "namespace": namespace}, "spec": spec}
+
+
+@pytest.mark.parametrize(
+    "pattern, name, expected",
+    [
+        ("asset-1", "asset-1", True),
+        ("Asset-1", "asset-1", True),
+        ("asset-1", "asset-10", False),
+        ("asset-*", "asset-10", True),
+        ("asset-?", "asset-10", False),
+        ("asset-[12]", "asset-2", True),
+        ("asset-*", None, False),
+    ],
+)
+def test_compile_name_pattern(pattern: str, name: str, expected: bool):
+    assert compile_name_pattern(pattern)(name) is expected
+
+
+def test_check_resource_index(mocker):
+    profiles = [
+        _resource("profile-a", "ns1"),
+        _resource("profile-b", "ns1"),
+        _resource("profile-a", "ns2"),
+    ]
+    mocked_get_resources = mocker.patch(
+        "azext_edge.edge.providers.edge_api.base.EdgeResourceApi.get_resources",
+        return_value={"items": profiles},
+    )
+    kind = DeviceRegistryResourceKinds.ASSETENDPOINTPROFILE
+
+    with check_resource_index() as index:
+        assert get_resources_by_name(DEVICEREGISTRY_API_V1, kind, resource_name=None) == profiles
+        assert get_resources_by_name(DEVICEREGISTRY_API_V1, kind, resource_name="profile-a") == [
+            profiles[0],
+            profiles[2],
+        ]
+        assert get_resources_by_name(DEVICEREGISTRY_API_V1, kind, resource_name="*-b") == [profiles[1]]
+        assert get_resources_by_name(DEVICEREGISTRY_API_V1, kind, resource_name=None, namespace="ns2") == [
+            profiles[2]
+        ]
+        assert get_resource_by_ref(DEVICEREGISTRY_API_V1, kind, name="profile-a", namespace="ns2") is profiles[2]
+        assert get_resource_by_ref(DEVICEREGISTRY_API_V1, kind, name="profile-c") is None
+        assert get_resource_by_ref(DEVICEREGISTRY_API_V1, kind, name="") is None
+        assert get_valid_resource_names(DEVICEREGISTRY_API_V1, kind.value, namespace="ns1") == [
+            "profile-a",
+            "profile-b",
+        ]
+
+    assert index.lists_issued == 1
+    mocked_get_resources.assert_called_once_with(kind=kind.value)
+
+
+def test_evaluate_assets_with_index(mocker):
+    assets = [
+        _resource(f"asset-{i}", f"ns{i % 2}", assetEndpointProfileRef=f"profile-{i % 3}") for i in range(20)
+    ]
+    profiles = [_resource("profile-0", "ns0"), _resource("profile-1", "ns1")]
+    mocked_get_resources = mocker.patch(
+        "azext_edge.edge.providers.edge_api.base.EdgeResourceApi.get_resources",
+        side_effect=[{"items": assets}, {"items": profiles}],
+    )
+
+    with check_resource_index():
+        result = evaluate_assets(as_list=True)
+
+    assert mocked_get_resources.call_count == 2
+    target = result["targets"]["assets.deviceregistry.microsoft.com"]
+    ref_evaluations = [
+        evaluation
+        for namespace in target
+        for evaluation in target[namespace]["evaluations"]
+        if "spec.assetEndpointProfileRef" in evaluation["value"]
+    ]
+    assert len(ref_evaluations) == 20
+    for evaluation in ref_evaluations:
+        expected = "error" if evaluation["value"]["spec.assetEndpointProfileRef"] == "profile-2" else "success"
+        assert evaluation["status"] == expected
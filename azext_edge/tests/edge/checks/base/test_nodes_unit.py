@@ -252,3 +252,33 @@ def test_check_nodes(mocked_node_client, kernel_version_check, storage_space_che
 
 def bool_to_status(status: bool):
     return "success" if status else "error"
+
+
+def test_check_nodes_usage(mocked_client, mocker):
+    from azext_edge.edge.providers.check.base.node import check_nodes
+
+    mocker.patch.dict("azext_edge.edge.providers.base._metrics_cache", clear=True)
+    node_names = [generate_random_string() for _ in range(2)]
+    mocked_client.CoreV1Api().list_node.return_value = V1NodeList(
+        items=[
+            V1Node(
+                metadata=V1ObjectMeta(name=name),
+                status=V1NodeStatus(
+                    allocatable={"cpu": 4, "memory": "16G", "ephemeral-storage": "30G"},
+                    node_info=mocker.Mock(architecture="amd64", kernel_version="5.4.0"),
+                ),
+            )
+            for name in node_names
+        ]
+    )
+    mocked_client.CustomObjectsApi().list_cluster_custom_object.return_value = {
+        "apiVersion": "metrics.k8s.io/v1beta1",
+        "items": [{"metadata": {"name": node_names[0]}, "usage": {"cpu": "250m", "memory": "1500000Ki"}}],
+    }
+
+    result = check_nodes(as_list=True)
+    mocked_client.CustomObjectsApi().list_cluster_custom_object.assert_called_once_with(
+        group="metrics.k8s.io", version="v1beta1", plural="nodes"
+    )
+    table = result["targets"]["cluster/nodes"]["_all_"]["displays"][-1].renderable
+    assert table.caption == f"Current usage\n{node_names[0]}: 0.25 vCPU, 1.54G memory"
@@ -28,12 +28,6 @@ def mocked_config(request, mocker):
     yield {"param": current_context, "mock": patched}
 
 
-@pytest.fixture
-def mocked_urlopen(mocker):
-    patched = mocker.patch("azext_edge.edge.providers.base.urlopen", autospec=True)
-    yield patched
-
-
 @pytest.fixture
 def mocked_register_providers(mocker):
     patched = mocker.patch("azext_edge.edge.providers.orchestration.rp_namespace.register_providers", autospec=True)
@@ -124,11 +118,11 @@ def mocked_dump_content_to_file(mocker):
 
 
 @pytest.fixture
-def mocked_deserialize_file_content(mocker, request):
+def mocked_iter_file_records(mocker, request):
     from ..generators import generate_random_string
     request_params = getattr(request, "param", generate_random_string())
     yield mocker.patch(
-        "azext_edge.edge.util.deserialize_file_content",
+        "azext_edge.edge.util.iter_file_records",
         return_value=request_params,
         autospec=True
     )
@@ -0,0 +1,132 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import socket
+from http.client import RemoteDisconnected
+from time import sleep
+from typing import List, Tuple
+from unittest.mock import Mock
+from urllib.error import HTTPError
+
+import pytest
+
+from azext_edge.edge.providers.base import PodRequest, PortforwardPool, PortforwardTunnel, portforward_socket
+
+
+@pytest.fixture
+def mocked_open_tunnel(mocker):
+    """
+    Tunnels over local socket pairs. Yields the opened tunnels with the pod side of each socket pair.
+    """
+    opened: List[Tuple[PortforwardTunnel, socket.socket]] = []
+
+    def _open_tunnel(namespace: str, pod_name: str, pod_port: int, internal_tls=None):
+        client_socket, pod_socket = socket.socketpair()
+        tunnel = PortforwardTunnel(
+            key=(namespace, pod_name, int(pod_port)), portforward=Mock(connected=True), pod_socket=client_socket
+        )
+        opened.append((tunnel, pod_socket))
+        return tunnel
+
+    mocker.patch("azext_edge.edge.providers.base.open_portforward_tunnel", side_effect=_open_tunnel)
+    yield opened
+    for _, pod_socket in opened:
+        pod_socket.close()
+
+
+def test_portforward_pool_reuse(mocked_open_tunnel):
+    with PortforwardPool() as pool:
+        for _ in range(3):
+            with pool.socket(namespace="namespace", pod_name="pod", pod_port=9600) as pod_socket:
+                pod_socket.sendall(b"ping")
+        assert len(mocked_open_tunnel) == 1
+
+        # Tunnels are keyed by namespace, pod and port.
+        with pool.socket(namespace="namespace", pod_name="pod", pod_port="9800"):
+            pass
+        with pool.socket(namespace="namespace", pod_name="other", pod_port=9600):
+            pass
+        assert len(mocked_open_tunnel) == 3
+
+    # Idle tunnels are closed with the pool.
+    for tunnel, _ in mocked_open_tunnel:
+        assert tunnel.socket.fileno() == -1
+        tunnel.portforward.close.assert_called_once()
+
+
+def test_portforward_pool_concurrent_leases(mocked_open_tunnel):
+    with PortforwardPool(max_idle_per_key=1) as pool:
+        with pool.socket(namespace="namespace", pod_name="pod", pod_port=9600):
+            with pool.socket(namespace="namespace", pod_name="pod", pod_port=9600):
+                # A leased tunnel is never shared.
+                assert len(mocked_open_tunnel) == 2
+        # Only max_idle_per_key tunnels are kept once released, the most recently released.
+        assert [tunnel.socket.fileno() == -1 for tunnel, _ in mocked_open_tunnel] == [False, True]
+
+
+def test_portforward_pool_discards(mocked_open_tunnel):
+    pool = PortforwardPool(idle_timeout_sec=0.01)
+
+    # Released after an error.
+    with pytest.raises(RuntimeError):
+        with pool.socket(namespace="namespace", pod_name="pod", pod_port=9600):
+            raise RuntimeError()
+    assert mocked_open_tunnel[-1][0].socket.fileno() == -1
+
+    # Closed by the pod while idle.
+    with pool.socket(namespace="namespace", pod_name="pod", pod_port=9600):
+        pass
+    mocked_open_tunnel[-1][1].close()
+    with pool.socket(namespace="namespace", pod_name="pod", pod_port=9600):
+        pass
+    assert len(mocked_open_tunnel) == 3
+    assert mocked_open_tunnel[1][0].socket.fileno() == -1
+
+    # Idle beyond the timeout.
+    sleep(0.05)
+    with pool.socket(namespace="namespace", pod_name="pod", pod_port=9600):
+        pass
+    assert len(mocked_open_tunnel) == 4
+    assert mocked_open_tunnel[2][0].socket.fileno() == -1
+    pool.close()
+
+
+def test_portforward_socket(mocked_open_tunnel):
+    # Without a pool the tunnel lives for the context.
+    with portforward_socket(namespace="namespace", pod_name="pod", pod_port="9800", internal_tls=False):
+        pass
+    with portforward_socket(namespace="namespace", pod_name="pod", pod_port="9800", internal_tls=False):
+        pass
+    assert len(mocked_open_tunnel) == 2
+    assert all(tunnel.socket.fileno() == -1 for tunnel, _ in mocked_open_tunnel)
+
+    with PortforwardPool() as pool:
+        for _ in range(2):
+            with portforward_socket(namespace="namespace", pod_name="pod", pod_port="9800", pool=pool):
+                pass
+    assert len(mocked_open_tunnel) == 3
+
+
+@pytest.mark.parametrize(
+    "error, retried",
+    [
+        (HTTPError(url="http://pod", code=503, msg="Service Unavailable", hdrs=None, fp=None), False),
+        (RemoteDisconnected("Remote end closed connection without response"), True),
+        (BrokenPipeError(), True),
+        (ConnectionResetError(), True),
+    ],
+)
+def test_pod_request_get_retry(mocker, error: Exception, retried: bool):
+    pod_request = PodRequest(namespace="namespace", pod_name="pod", pod_port="9600", pool=Mock())
+    mocked_get = mocker.patch.object(pod_request, "_get", side_effect=[error, "metrics"])
+
+    # Only failures of a stale tunnel are retried, error responses are raised as is.
+    if retried:
+        assert pod_request.get("/metrics") == "metrics"
+    else:
+        with pytest.raises(HTTPError):
+            pod_request.get("/metrics")
+    assert mocked_get.call_count == (2 if retried else 1)
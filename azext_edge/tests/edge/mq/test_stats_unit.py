@@ -6,6 +6,8 @@
 
 import binascii
 from copy import deepcopy
+from typing import List
+from unittest.mock import Mock
 from zipfile import ZIP_DEFLATED, ZipInfo
 
 import pytest
@@ -28,14 +30,30 @@ from ...generators import generate_random_string
 from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
 
 
+class _FramedStream:
+    """
+    Serves length prefixed responses through recv_into, in chunks smaller than a frame.
+    """
+
+    def __init__(self, responses: List[bytes], chunk_size: int = 7):
+        self.data = b"".join(len(r).to_bytes(4, byteorder="big") + r for r in responses)
+        self.chunk_size = chunk_size
+        self.offset = 0
+
+    def recv_into(self, view: memoryview, size: int) -> int:
+        chunk = self.data[self.offset : self.offset + min(size, self.chunk_size)]
+        view[: len(chunk)] = chunk
+        self.offset += len(chunk)
+        return len(chunk)
+
+
 @pytest.mark.parametrize(
-    "trace_ids,trace_dir,recv_side_effect",
+    "trace_ids,trace_dir,responses",
     [
         pytest.param(
             ["2f799d7a9d1e8e182a52dc190baebce2"],
             None,
             [
-                int(1).to_bytes(length=4, byteorder="big"),
                 Response(
                     retrieved_trace=RetrievedTraceWrapper(
                         trace=ParseDict(TEST_TRACE.data, TracesData()),
@@ -49,7 +67,6 @@ from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
             ["2f799d7a9d1e8e182a52dc190baebce2", "4a32aaad8f3c5483b5b4960a06b82dfd"],
             None,
             [
-                int(2).to_bytes(length=4, byteorder="big"),
                 Response(
                     retrieved_trace=RetrievedTraceWrapper(
                         trace=ParseDict(TEST_TRACE.data, TracesData()),
@@ -57,7 +74,6 @@ from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
                         total_trace_count=2,
                     )
                 ).SerializeToString(),
-                int(2).to_bytes(length=4, byteorder="big"),
                 Response(
                     retrieved_trace=RetrievedTraceWrapper(
                         trace=ParseDict(TEST_TRACE.data, TracesData()),
@@ -71,7 +87,6 @@ from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
             ["!support_bundle!"],
             None,
             [
-                int(2).to_bytes(length=4, byteorder="big"),
                 Response(
                     retrieved_trace=RetrievedTraceWrapper(
                         trace=ParseDict(TEST_TRACE.data, TracesData()),
@@ -79,7 +94,6 @@ from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
                         total_trace_count=2,
                     )
                 ).SerializeToString(),
-                int(2).to_bytes(length=4, byteorder="big"),
                 Response(
                     retrieved_trace=RetrievedTraceWrapper(
                         trace=ParseDict(TEST_TRACE.data, TracesData()),
@@ -93,7 +107,6 @@ from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
             [],
             ".",
             [
-                int(2).to_bytes(length=4, byteorder="big"),
                 Response(
                     retrieved_trace=RetrievedTraceWrapper(
                         trace=ParseDict(TEST_TRACE.data, TracesData()),
@@ -101,7 +114,6 @@ from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
                         total_trace_count=2,
                     )
                 ).SerializeToString(),
-                int(2).to_bytes(length=4, byteorder="big"),
                 Response(
                     retrieved_trace=RetrievedTraceWrapper(
                         trace=ParseDict(TEST_TRACE.data, TracesData()),
@@ -115,7 +127,6 @@ from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
             ["2f799d7a9d1e8e182a52dc190baebce2"],
             ".",
             [
-                int(2).to_bytes(length=4, byteorder="big"),
                 Response(
                     retrieved_trace=RetrievedTraceWrapper(
                         trace=ParseDict(TEST_TRACE.data, TracesData()),
@@ -127,9 +138,7 @@ from .traces_data import TEST_TRACE, TEST_TRACE_PARTIAL
         ),
     ],
 )
-def test_get_traces(
-    mocker, mocked_cmd, mocked_client, mocked_config, mocked_zipfile, trace_ids, trace_dir, recv_side_effect
-):
+def test_get_traces(mocker, mocked_cmd, mocked_client, mocked_config, mocked_zipfile, trace_ids, trace_dir, responses):
     from azext_edge.edge.providers.stats import get_traces
     # pylint: disable=unnecessary-dunder-call
     pods = [
@@ -153,23 +162,25 @@ def test_get_traces(
     request_len_b = len(serialized_request).to_bytes(4, byteorder="big")
 
     portforward_socket_mock = mocker.patch("azext_edge.edge.providers.stats.portforward_socket")
-    portforward_socket_mock().__enter__().recv.side_effect = recv_side_effect
-    result = get_traces(
-        namespace=namespace, trace_ids=trace_ids, trace_dir=trace_dir
-    )
+    portforward_socket_mock().__enter__().recv_into.side_effect = _FramedStream(responses).recv_into
+    result = get_traces(namespace=namespace, trace_ids=trace_ids, trace_dir=trace_dir)
+    if for_support_bundle:
+        # Support bundle entries are produced lazily.
+        assert not isinstance(result, list)
+        result = list(result)
 
     request_bytes_length = portforward_socket_mock().__enter__().sendall.call_args_list[0].args[0]
     assert request_bytes_length == request_len_b
     request_bytes_trace_ids = portforward_socket_mock().__enter__().sendall.call_args_list[1].args[0]
     assert request_bytes_trace_ids == serialized_request
 
-    if trace_ids:
-        assert len(result) == len(recv_side_effect) / 2
+    if trace_ids and not for_support_bundle:
+        assert len(result) == len(responses)
         assert isinstance(result, list)
         assert isinstance(result[0], dict)
 
     if for_support_bundle:
-        assert len(result) == len(recv_side_effect)  # for_support_bundle effectively doubles the return items
+        assert len(result) == len(responses) * 2  # for_support_bundle effectively doubles the return items
         assert isinstance(result, list)
         assert isinstance(result[0], tuple)
         assert isinstance(result[0][0], ZipInfo)
@@ -183,69 +194,104 @@ def test_get_traces(
         # When writing to zip, the operation effectively writes 2 files per trace.
         # One in vanilla OTLP one in Tempo format.
         # TODO assert formats.
-        assert len(mocked_zipfile.mock_calls) == len(recv_side_effect)
+        assert len(mocked_zipfile.mock_calls) == len(responses) * 2
     # pylint: enable=unnecessary-dunder-call
 
 
 @pytest.mark.parametrize(
-    "total_bytes,fetch_bytes",
+    "frame_sizes,chunk_size,buffer_size",
     [
-        pytest.param(10, 10),
-        pytest.param(10, 5),
-        pytest.param(10, 1),
-        pytest.param(10, 3),
-        pytest.param(10, 0),
-        pytest.param(10, -1),  # -1 is a special value to exercise partial fetching of bytes
+        pytest.param([10], 14, 64, id="single_receive"),
+        pytest.param([10, 0, 3], 1, 64, id="byte_at_a_time"),
+        pytest.param([10, 20, 30, 5], 7, 32, id="wrap_around"),
+        pytest.param([10, 100, 10], 64, 16, id="grow"),
+        pytest.param([30] * 10, 1024, 1024, id="read_ahead"),
     ],
 )
-def test__fetch_bytes(mocker, total_bytes: int, fetch_bytes: int):
-    import math
+def test__frame_reader(frame_sizes: List[int], chunk_size: int, buffer_size: int):
     import secrets
 
-    from azext_edge.edge.providers.stats import _fetch_bytes
-
-    if fetch_bytes > 0:
-        total_fetches = math.ceil(total_bytes / fetch_bytes)
-    elif fetch_bytes == 0:
-        total_fetches = 1
-    elif fetch_bytes == -1:
-        total_fetches = 2
-    else:
-        raise RuntimeError("Unsupported scenario.")
-
-    socket_mock = mocker.MagicMock()
-
-    handle_fetch_count = 0
-
-    def handle_fetch(*args, **kwargs):
-        nonlocal handle_fetch_count
-        if args[0] >= fetch_bytes:
-            if fetch_bytes == -1:
-                if handle_fetch_count > 0:
-                    return_bytes = 0
-                else:
-                    return_bytes = 1
-            else:
-                return_bytes = fetch_bytes
-        else:
-            return_bytes = args[0]
-
-        handle_fetch_count = handle_fetch_count + 1
-        return secrets.token_bytes(return_bytes)
-
-    socket_mock.recv.side_effect = handle_fetch
-    result = _fetch_bytes(socket_mock, size=total_bytes)
-    assert socket_mock.recv.call_count == total_fetches
-
-    if fetch_bytes == 0:
-        assert result == b""
-        return
+    from azext_edge.edge.providers.stats import _FrameReader
 
-    if fetch_bytes == -1:
-        assert len(result) == 1
-        return
+    frames = [secrets.token_bytes(size) for size in frame_sizes]
+    stream = _FramedStream(frames, chunk_size=chunk_size)
+    socket_mock = Mock(recv_into=Mock(side_effect=stream.recv_into))
+    reader = _FrameReader(socket_mock, buffer_size=buffer_size)
+
+    for frame in frames:
+        assert reader.read_frame() == frame
+    assert reader.read_frame() is None
+
+    if min(chunk_size, buffer_size) >= len(stream.data):
+        # All frames are served from the read ahead of a single receive, then the close is observed.
+        assert socket_mock.recv_into.call_count == 2
+
+
+def test__frame_reader_truncated():
+    from azext_edge.edge.providers.stats import _FrameReader
+
+    stream = _FramedStream([b"complete", b"truncated"])
+    stream.data = stream.data[:-1]
+    reader = _FrameReader(Mock(recv_into=Mock(side_effect=stream.recv_into)), buffer_size=16)
+
+    assert reader.read_frame() == b"complete"
+    assert reader.read_frame() is None
 
-    assert len(result) == total_bytes
+
+def test_get_traces_throughput(mocker):
+    """
+    Benchmark trace pulls against a local fake diagnostics server.
+    """
+    import socket
+    from contextlib import contextmanager
+    from threading import Thread
+    from time import perf_counter
+
+    from azext_edge.edge.providers.stats import get_traces
+
+    trace_count = 500
+    response = Response(
+        retrieved_trace=RetrievedTraceWrapper(
+            trace=ParseDict(TEST_TRACE.data, TracesData()),
+            current_trace_count=1,
+            total_trace_count=trace_count,
+        )
+    ).SerializeToString()
+    frame = len(response).to_bytes(4, byteorder="big") + response
+
+    server = socket.create_server(("127.0.0.1", 0))
+
+    def _serve():
+        connection, _ = server.accept()
+        with connection:
+            request_size = int.from_bytes(connection.recv(4), byteorder="big")
+            connection.recv(request_size)
+            # Frames are sent in batches so the client sees partial and coalesced frames.
+            for i in range(0, trace_count, 64):
+                connection.sendall(frame * min(64, trace_count - i))
+
+    @contextmanager
+    def _local_socket(**_):
+        with socket.create_connection(server.getsockname()) as client_socket:
+            yield client_socket
+
+    mocker.patch("azext_edge.edge.providers.stats._preprocess_stats", return_value=("namespace", mocker.MagicMock()))
+    mocker.patch("azext_edge.edge.providers.stats.portforward_socket", _local_socket)
+    server_thread = Thread(target=_serve, daemon=True)
+    server_thread.start()
+    try:
+        started = perf_counter()
+        entry_count = sum(1 for _ in get_traces(trace_ids=["!support_bundle!"]))
+        elapsed = perf_counter() - started
+    finally:
+        server_thread.join(timeout=10)
+        server.close()
+
+    assert entry_count == trace_count * 2
+    print(
+        f"Pulled {trace_count} traces ({len(frame) * trace_count / 1e6:.1f} MB) in {elapsed:.2f}s, "
+        f"{trace_count / elapsed:.0f} traces/s."
+    )
 
 
 def test___determine_root_span():
@@ -361,3 +407,143 @@ def test__preprocess_stats(
 
     target_namespace, target_pod = _preprocess_stats(namespace=target_namespace)
     assert target_pod.metadata.name == test_state["expected_pods"][test_state["expected_pod_index"]].metadata.name
+
+
+def test__convert_otlp_to_tempo():
+    from azext_edge.edge.providers.stats import _convert_otlp_to_tempo
+
+    message_dict = deepcopy(TEST_TRACE.data)
+    original = deepcopy(message_dict)
+    tempo_dict = _convert_otlp_to_tempo(message_dict)
+
+    # The OTLP payload is left intact and spans are shared rather than copied.
+    assert message_dict == original
+    assert "resourceSpans" not in tempo_dict
+    assert len(tempo_dict["batches"]) == len(message_dict["resourceSpans"])
+    for batch, resource_span in zip(tempo_dict["batches"], message_dict["resourceSpans"]):
+        assert "scopeSpans" not in batch
+        assert batch["resource"] is resource_span["resource"]
+        for inst_lib_span, scope_span in zip(batch["instrumentationLibrarySpans"], resource_span["scopeSpans"]):
+            assert inst_lib_span["instrumentationLibrary"] == scope_span.get("scope", {})
+            assert inst_lib_span["spans"] is scope_span["spans"]
+
+
+TEST_BROKER_METRICS = """
+# HELP aio_broker_publishes_received Publishes received.
+# TYPE aio_broker_publishes_received counter
+aio_broker_publishes_received_total{{pod="aio-broker-frontend-0",label="a b"}} {received} 1700000000000
+aio_broker_publishes_received_total{{pod="aio-broker-frontend-1"}} {received}
+aio_broker_publishes_sent {sent}
+aio_broker_connected_sessions{{pod="aio-broker-frontend-0"}} 4
+aio_broker_total_subscriptions 12
+aio_broker_unrelated 99
+"""
+
+
+def test_parse_broker_metrics():
+    from azext_edge.edge.providers.stats import parse_broker_metrics
+
+    result = parse_broker_metrics(TEST_BROKER_METRICS.format(received=10, sent=5))
+    assert result == {
+        "publishesReceived": 20.0,
+        "publishesSent": 5.0,
+        "connectedSessions": 4.0,
+        "totalSubscriptions": 12.0,
+        "queueDepth": None,
+    }
+
+
+def test_stats_window():
+    from azext_edge.edge.providers.stats import _StatsWindow
+
+    stats_window = _StatsWindow(size=3)
+    assert stats_window.summarize()["publishesReceived"] == {"current": None, "average": None}
+
+    # Publishes received grow by 10/sec, then by 40/sec, then the counter is reset by a restart.
+    samples = [(0, 0, 1), (1, 10, 3), (2, 20, 5), (3, 60, 7), (5, 20, 9)]
+    for timestamp, received, sessions in samples:
+        stats_window.add(timestamp, {"publishesReceived": received, "connectedSessions": sessions})
+
+    assert len(stats_window) == 3
+    summary = stats_window.summarize()
+    assert summary["publishesReceived"] == {"current": 10.0, "average": (10 + 40 + 10) / 3}
+    # Only the last 3 samples are in the window.
+    assert summary["connectedSessions"] == {"current": 9, "average": 7.0}
+    assert summary["queueDepth"] == {"current": None, "average": None}
+
+
+@pytest.mark.parametrize("watch", [False, True])
+def test_get_stats(mocker, watch):
+    import socket
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from threading import Thread
+
+    from azext_edge.edge.providers.base import PortforwardTunnel
+    from azext_edge.edge.providers.stats import get_stats
+
+    requests = []
+    connections = []
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            connections.append(self.client_address)
+
+        def do_GET(self):
+            requests.append(self.path)
+            content = TEST_BROKER_METRICS.format(received=len(requests) * 100, sent=len(requests)).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            # The server closes the connection after the second request.
+            if len(requests) == 2:
+                self.send_header("Connection", "close")
+                self.close_connection = True
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MetricsHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+
+    def _open_tunnel(namespace: str, pod_name: str, pod_port: int, internal_tls=None):
+        assert internal_tls is False
+        return PortforwardTunnel(
+            key=(namespace, pod_name, pod_port),
+            portforward=mocker.Mock(connected=True),
+            pod_socket=socket.create_connection(server.server_address),
+        )
+
+    pod = V1Pod(metadata=V1ObjectMeta(name=AIO_BROKER_DIAGNOSTICS_SERVICE, namespace="namespace"))
+    mocker.patch("azext_edge.edge.providers.stats._preprocess_stats", return_value=("namespace", pod))
+    mocker.patch("azext_edge.edge.providers.base.open_portforward_tunnel", side_effect=_open_tunnel)
+    patched_sleep = mocker.patch("azext_edge.edge.providers.stats.sleep")
+    try:
+        result = get_stats(watch=watch, refresh_in_seconds=1, window=2, max_samples=4)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    if not watch:
+        assert result["publishesReceived"] == 200.0
+        assert requests == ["/metrics"]
+        return
+
+    assert result is None
+    assert requests == ["/metrics"] * 4
+    assert patched_sleep.call_count == 3
+    # Samples reuse one tunnel, a new one is opened only after the server closes it.
+    assert len(connections) == 2
+
+
+@pytest.mark.parametrize("refresh_in_seconds,window", [(0, 60), (5, 1)])
+def test_get_stats_validation(refresh_in_seconds, window):
+    from azure.cli.core.azclierror import InvalidArgumentValueError
+
+    from azext_edge.edge.providers.stats import get_stats
+
+    with pytest.raises(InvalidArgumentValueError):
+        get_stats(refresh_in_seconds=refresh_in_seconds, window=window)
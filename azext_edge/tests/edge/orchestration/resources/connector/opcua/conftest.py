@@ -35,7 +35,7 @@ def mocked_instance(mocker):
 
 @pytest.fixture
 def mocked_sleep(mocker):
-    patched = mocker.patch("azext_edge.edge.util.az_client.sleep", return_value=None)
+    patched = mocker.patch("azext_edge.edge.util.az_client._wait_for_wake", return_value=None)
     yield patched
 
 
@@ -65,19 +65,16 @@ def test_connected_cluster_queries(
     _assert_query_result(
         connected_cluster.get_custom_location_for_namespace(namespace=target_namespace), expected_type=dict
     )
-    mocked_resource_graph.return_value.query_resources.assert_called_with(
-        query=f"""
+    mocked_resource_graph.return_value.query_resources.assert_called_with(query=f"""
         resources
         | where type =~ 'microsoft.extendedlocation/customlocations'
         | where properties.hostResourceId =~ '{connected_cluster.resource_id}'
         | where properties.namespace =~ '{target_namespace}'
         | project id, name, location, properties, apiVersion
-        """
-    )
+        """)
 
     _assert_query_result(connected_cluster.get_aio_extensions())
-    mocked_resource_graph.return_value.query_resources.assert_called_with(
-        query=f"""
+    mocked_resource_graph.return_value.query_resources.assert_called_with(query=f"""
         kubernetesconfigurationresources
         | where type =~ 'microsoft.kubernetesconfiguration/extensions'
         | where id startswith '{connected_cluster.resource_id}'
@@ -86,12 +83,10 @@ def test_connected_cluster_queries(
             or properties.ExtensionType =~ 'microsoft.azure.secretstore'
             or properties.ExtensionType =~ 'microsoft.arc.containerstorage'
         | project id, name, apiVersion
-        """
-    )
+        """)
 
     _assert_query_result(connected_cluster.get_aio_custom_locations())
-    mocked_resource_graph.return_value.query_resources.assert_called_with(
-        query=f"""
+    mocked_resource_graph.return_value.query_resources.assert_called_with(query=f"""
         resources
         | where type =~ 'microsoft.extendedlocation/customlocations'
         | where properties.hostResourceId =~ '{connected_cluster.resource_id}'
@@ -107,31 +102,26 @@ def test_connected_cluster_queries(
                 or extensionType startswith 'microsoft.deviceregistry'
         ) on clusterExtensionId
         | distinct id, name, apiVersion
-        """
-    )
+        """)
 
     target_custom_location = generate_random_string()
     _assert_query_result(connected_cluster.get_aio_resources(custom_location_id=target_custom_location))
-    mocked_resource_graph.return_value.query_resources.assert_called_with(
-        query=f"""
+    mocked_resource_graph.return_value.query_resources.assert_called_with(query=f"""
         resources
         | where extendedLocation.name =~ '{target_custom_location}'
         | where type startswith 'microsoft.iotoperations'
             or type startswith 'microsoft.deviceregistry'
             or type startswith 'microsoft.secretsync'
         | project id, name, apiVersion, type
-        """
-    )
+        """)
 
     _assert_query_result(connected_cluster.get_resource_sync_rules(custom_location_id=target_custom_location))
-    mocked_resource_graph.return_value.query_resources.assert_called_with(
-        query=f"""
+    mocked_resource_graph.return_value.query_resources.assert_called_with(query=f"""
         resources
         | where type =~ "microsoft.extendedlocation/customlocations/resourcesyncrules"
         | where id startswith '{target_custom_location}'
         | project id, name, apiVersion
-        """
-    )
+        """)
 
 
 def get_connected_cluster_payload(connectivityStatus: str = "Connected") -> dict:
@@ -179,3 +169,83 @@ def test_connected_cluster_attr(
         and "connectivityStatus" in expected_resource_state["properties"]
         and expected_resource_state["properties"]["connectivityStatus"].lower() == "connected"
     )
+
+
+@pytest.mark.parametrize("custom_location_count", [0, 1, 3])
+def test_connected_cluster_aio_resource_state(
+    mocked_cmd: Mock,
+    mocked_resource_graph: Mock,
+    mocked_connected_clusters: Mock,
+    custom_location_count: int,
+):
+    from azext_edge.edge.providers.orchestration.connected_cluster import ConnectedCluster
+
+    connected_cluster = ConnectedCluster(
+        cmd=mocked_cmd,
+        subscription_id=get_zeroed_subscription(),
+        cluster_name=generate_random_string(),
+        resource_group_name=generate_random_string(),
+    )
+    cl_ids = [f"/subscriptions/sub/customLocations/{generate_random_string()}" for _ in range(custom_location_count)]
+    custom_locations = [{"id": cl_id, "name": cl_id.split("/")[-1], "apiVersion": "v1"} for cl_id in cl_ids]
+    extensions = [{"id": generate_random_string(), "name": generate_random_string(), "apiVersion": "v1"}]
+    # Each custom location has one more resource than the last, ARG may return the Id in any casing.
+    resources = [
+        {"id": generate_random_string(), "customLocationId": cl_id.upper() if i % 2 else cl_id}
+        for i, cl_id in enumerate(cl_ids)
+        for _ in range(i + 1)
+    ]
+    sync_rules = [{"id": f"{cl_id}/resourceSyncRules/rule", "customLocationId": cl_id} for cl_id in cl_ids]
+
+    def _query_resources_batch(queries: dict) -> dict:
+        results = {
+            "custom_locations": {"data": custom_locations},
+            "extensions": {"data": extensions},
+            "resources": {"data": resources},
+            "resource_sync_rules": {"data": sync_rules},
+        }
+        return {key: results[key] for key in queries}
+
+    mocked_resource_graph.return_value.query_resources_batch.side_effect = _query_resources_batch
+    state = connected_cluster.get_aio_resource_state()
+
+    assert state.custom_locations == custom_locations
+    assert state.extensions == extensions
+    expected_rounds = 2 if custom_location_count else 1
+    assert mocked_resource_graph.return_value.query_resources_batch.call_count == expected_rounds
+    mocked_resource_graph.return_value.query_resources.assert_not_called()
+    for i, cl_id in enumerate(cl_ids):
+        assert len(state.resources[cl_id.lower()]) == i + 1
+        assert state.resource_sync_rules[cl_id.lower()] == [sync_rules[i]]
+
+    if custom_location_count:
+        batch_queries = mocked_resource_graph.return_value.query_resources_batch.call_args.args[0]
+        expected_in = ", ".join(f"'{cl_id}'" for cl_id in cl_ids)
+        assert f"extendedLocation.name in~ ({expected_in})" in batch_queries["resources"]
+        assert f"customLocationId in~ ({expected_in})" in batch_queries["resource_sync_rules"]
+
+
+def test_connected_cluster_connected_is_live(mocked_cmd: Mock, mocked_connected_clusters: Mock):
+    from azext_edge.edge.providers.orchestration.connected_cluster import (
+        ConnectedCluster,
+    )
+
+    rg_name = generate_random_string()
+    cluster_name = generate_random_string()
+    cached = {"id": generate_random_string(), "properties": {"connectivityStatus": "Connected"}}
+    live = {"id": cached["id"], "properties": {"connectivityStatus": "Offline"}}
+    mocked_connected_clusters.return_value.show.side_effect = lambda use_cache=None, **_: cached if use_cache else live
+
+    connected_cluster = ConnectedCluster(
+        cmd=mocked_cmd,
+        subscription_id=get_zeroed_subscription(),
+        cluster_name=cluster_name,
+        resource_group_name=rg_name,
+    )
+    assert connected_cluster.resource == cached
+    # The connectivity guard never trusts the cached resource.
+    assert connected_cluster.connected is False
+    mocked_connected_clusters.return_value.show.assert_called_with(
+        resource_group_name=rg_name, cluster_name=cluster_name
+    )
+    assert connected_cluster.resource == live
@@ -4,10 +4,12 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Set, Union
 from unittest.mock import Mock
 
 import pytest
+from azure.cli.core.azclierror import AzureResponseError, InvalidArgumentValueError
+from azure.core.exceptions import HttpResponseError
 
 from azext_edge.edge.providers.orchestration.deletion import IoTOperationsResource
 from azext_edge.edge.providers.orchestration.common import EXTENSION_TYPE_OPS
@@ -38,12 +40,6 @@ def mocked_get_resource_client(mocker):
     yield patched
 
 
-@pytest.fixture
-def mocked_wait_for_terminal_states(mocker):
-    patched = mocker.patch("azext_edge.edge.providers.orchestration.deletion.wait_for_terminal_states", autospec=True)
-    yield patched
-
-
 @pytest.fixture
 def mocked_live_display(mocker):
     patched = mocker.patch("azext_edge.edge.providers.orchestration.deletion.Live")
@@ -59,7 +55,7 @@ def spy_deletion_manager(mocker):
         "_display_resource_tree": mocker.spy(DeletionManager, "_display_resource_tree"),
         "_render_display": mocker.spy(DeletionManager, "_render_display"),
         "_stop_display": mocker.spy(DeletionManager, "_stop_display"),
-        "_delete_batch": mocker.spy(DeletionManager, "_delete_batch"),
+        "_begin_delete": mocker.spy(DeletionManager, "_begin_delete"),
     }
 
 
@@ -82,87 +78,67 @@ def _assemble_resource_map_mock(
     )
 
 
-@pytest.mark.parametrize(
-    "expected_resources_map",
-    [
-        {
-            "resources": None,
-            "resource sync rules": None,
-            "custom locations": None,
-            "extensions": [],
-            "meta": {
-                "expected_total": 0,
-            },
-        },
-        {
-            "resources": [
-                generate_ops_resource(4),
-            ],
-            "resource sync rules": [generate_ops_resource()],
-            "custom locations": [generate_ops_resource()],
-            "extensions": [generate_ops_resource()],
-            "meta": {
-                "expected_total": 4,
-                "resource_batches": 1,
-            },
-        },
-        {
-            "resources": [
-                generate_ops_resource(4),
-                generate_ops_resource(4),
-                generate_ops_resource(3),
-                generate_ops_resource(1),
-            ],
-            "resource sync rules": [],
-            "custom locations": [generate_ops_resource()],
-            "extensions": [generate_ops_resource(), generate_ops_resource()],
-            "meta": {
-                "expected_total": 7,
-                "resource_batches": 3,
-            },
-        },
-    ],
-)
-def test_batch_resources(
-    mocker,
-    mocked_cmd: Mock,
-    mocked_get_resource_client: Mock,
-    mocked_resource_map: Mock,
-    expected_resources_map: Dict[str, Union[dict, Optional[List[IoTOperationsResource]]]],
-):
-    from azext_edge.edge.providers.orchestration.deletion import DeletionManager
+def _arm_resource(resource_id: str) -> IoTOperationsResource:
+    return IoTOperationsResource(
+        resource_id=resource_id, display_name=resource_id.split("/")[-1], api_version=generate_random_string()
+    )
 
-    instance_name = generate_random_string()
-    rg_name = generate_random_string()
+
+def _assemble_arm_resource_map(resource_map_mock: Mock) -> Dict[str, IoTOperationsResource]:
+    rg_id = "/subscriptions/sub/resourceGroups/rg/providers"
+    instance_id = f"{rg_id}/Microsoft.IoTOperations/instances/myinstance"
+    cl_id = f"{rg_id}/Microsoft.ExtendedLocation/customLocations/mycl"
+    resources = {
+        "listener": _arm_resource(f"{instance_id}/brokers/default/listeners/default"),
+        "authn": _arm_resource(f"{instance_id}/brokers/default/authentications/default"),
+        "broker": _arm_resource(f"{instance_id}/brokers/default"),
+        "instance": _arm_resource(instance_id),
+        "asset": _arm_resource(f"{rg_id}/Microsoft.DeviceRegistry/assets/myasset"),
+        "sync_rule": _arm_resource(f"{cl_id}/resourceSyncRules/myrule"),
+        "custom_location": _arm_resource(cl_id),
+        "extension": _arm_resource(
+            "/subscriptions/sub/resourceGroups/rg/providers/Microsoft.Kubernetes/connectedClusters/mycluster"
+            "/providers/Microsoft.KubernetesConfiguration/extensions/aio"
+        ),
+    }
+    resource_map_mock.extensions = [resources["extension"]]
+    resource_map_mock.custom_locations = [resources["custom_location"]]
+    resource_map_mock.get_resources.return_value = [
+        resources[key] for key in ["listener", "authn", "broker", "instance", "asset"]
+    ]
+    resource_map_mock.get_resource_sync_rules.return_value = [resources["sync_rule"]]
+    return resources
+
+
+def test_build_deletion_graph(mocked_cmd: Mock, mocked_get_resource_client: Mock, mocked_resource_map: Mock):
+    from azext_edge.edge.providers.orchestration.deletion import DeletionManager
 
     deletion_manager = DeletionManager(
         cmd=mocked_cmd,
-        instance_name=instance_name,
-        resource_group_name=rg_name,
-    )
-    batches = deletion_manager._batch_resources(
-        resources=expected_resources_map["resources"],
-        resource_sync_rules=expected_resources_map["resource sync rules"],
-        custom_locations=expected_resources_map["custom locations"],
-        extensions=expected_resources_map["extensions"],
+        instance_name=generate_random_string(),
+        resource_group_name=generate_random_string(),
     )
+    deletion_manager.resource_map = Mock()
+    resources = _assemble_arm_resource_map(deletion_manager.resource_map)
 
-    actual_total = 0
-    if expected_resources_map["resources"]:
-        assert "resources" in batches
-        assert expected_resources_map["meta"]["resource_batches"] == len(batches["resources"])
-        for batch in batches["resources"]:
-            actual_total += len(batch)
-            segments_set = set([r.segments for r in batch])
-            assert len(segments_set) == 1
+    graph = deletion_manager._build_deletion_graph(
+        custom_locations=deletion_manager.resource_map.custom_locations,
+        extensions=deletion_manager.resource_map.extensions,
+    )
+    assert len(graph) == len(resources)
+    assert {r.display_name for r in graph.get_ready()} == {"default", "myasset", "myrule"}
+    assert len(graph.get_ready()) == 4
 
-    for map_key in ["resource sync rules", "custom locations", "extensions"]:
-        if expected_resources_map[map_key]:
-            assert map_key in batches
-            for batch in batches[map_key]:
-                actual_total += len(batch)
+    assert graph.complete(resources["listener"]) == []
+    assert graph.complete(resources["authn"]) == [resources["broker"]]
+    assert graph.complete(resources["broker"]) == [resources["instance"]]
+    assert graph.complete(resources["instance"]) == []
+    assert graph.complete(resources["sync_rule"]) == []
+    assert graph.complete(resources["asset"]) == [resources["custom_location"]]
+    assert graph.complete(resources["custom_location"]) == [resources["extension"]]
+    assert graph.complete(resources["extension"]) == []
 
-    assert actual_total == expected_resources_map["meta"]["expected_total"]
+    assert len(deletion_manager._build_deletion_graph()) == 0
 
 
 # IoTOperationsResourceMap returns empty array over None
@@ -177,7 +153,6 @@ def test_batch_resources(
             "extensions": [],
             "meta": {
                 "expected_total": 0,
-                "expected_delete_calls": 1,  # aio extension
             },
         },
         {
@@ -187,8 +162,6 @@ def test_batch_resources(
             "extensions": [generate_ops_resource()],
             "meta": {
                 "expected_total": 5,
-                "resource_batches": 2,
-                "expected_delete_calls": 5,
             },
         },
         # Currently no associated custom location means no non-extensions get deleted
@@ -199,8 +172,6 @@ def test_batch_resources(
             "extensions": [generate_ops_resource()],
             "meta": {
                 "expected_total": 4,
-                "resource_batches": 2,
-                "expected_delete_calls": 1,
             },
         },
         {
@@ -210,8 +181,6 @@ def test_batch_resources(
             "extensions": [generate_ops_resource()],
             "meta": {
                 "expected_total": 1,
-                "resource_batches": 0,
-                "expected_delete_calls": 1,
                 "no_progress": True,
             },
         },
@@ -223,7 +192,6 @@ def test_delete_lifecycle(
     mocked_cmd: Mock,
     mocked_resource_map: Mock,
     mocked_get_resource_client: Mock,
-    mocked_wait_for_terminal_states: Mock,
     mocked_live_display: Mock,
     mocked_logger: Mock,
     spy_deletion_manager: Dict[str, Mock],
@@ -254,7 +222,13 @@ def test_delete_lifecycle(
 
     delete_ops_resources(**kwargs)
 
-    expected_delete_calls: int = expected_resources_map["meta"].get("expected_delete_calls", 0)
+    # Every resource is deleted individually. Without a custom location only extensions are deleted.
+    expected_deletions = {"aio-ext-id"}
+    if include_dependencies:
+        expected_deletions.update(ext.resource_id for ext in mocked_resource_map().extensions)
+    if expected_resources_map["custom locations"]:
+        for key in ["resources", "resource sync rules", "custom locations"]:
+            expected_deletions.update(resource.resource_id for resource in expected_resources_map[key])
 
     spy_deletion_manager["_display_resource_tree"].assert_called_once()
     spy_deletion_manager["_process"].assert_called_once()
@@ -268,15 +242,250 @@ def test_delete_lifecycle(
         ]
     ):
         assert mocked_logger.warning.call_args[0][0] == "Nothing to delete :)"
-        spy_deletion_manager["_delete_batch"].assert_not_called()
+        spy_deletion_manager["_begin_delete"].assert_not_called()
         return
 
-    if expected_delete_calls > 0:
-        spy_deletion_manager["_render_display"].assert_called()
-        spy_deletion_manager["_stop_display"].assert_called_once()
+    spy_deletion_manager["_render_display"].assert_called()
+    spy_deletion_manager["_stop_display"].assert_called_once()
 
-    assert spy_deletion_manager["_delete_batch"].call_count == expected_delete_calls
+    deleted = [call.args[1].resource_id for call in spy_deletion_manager["_begin_delete"].call_args_list]
+    assert len(deleted) == len(expected_deletions)
+    assert set(deleted) == expected_deletions
     assert mocked_live_display.call_count >= 1
 
     if kwargs["no_progress"]:
         mocked_live_display.assert_called_once_with(None, transient=False, refresh_per_second=8, auto_refresh=False)
+
+
+class _FakePoller:
+    def __init__(self, is_done: Callable[[], bool], error: Optional[Exception] = None):
+        self._is_done = is_done
+        self._error = error
+
+    def add_done_callback(self, _):
+        pass
+
+    def done(self) -> bool:
+        return self._is_done()
+
+    def result(self):
+        if self._error:
+            raise self._error
+
+
+def _throttled_error(status_code: int = 429) -> HttpResponseError:
+    error = HttpResponseError(message="Too many requests.")
+    error.status_code = status_code
+    return error
+
+
+def test_delete_graph_schedule(mocked_cmd: Mock, mocked_get_resource_client: Mock, mocked_resource_map: Mock):
+    from azext_edge.edge.providers.orchestration.deletion import DeletionManager
+
+    deletion_manager = DeletionManager(
+        cmd=mocked_cmd,
+        instance_name=generate_random_string(),
+        resource_group_name=generate_random_string(),
+        no_progress=True,
+        concurrency=2,
+    )
+    deletion_manager.resource_map = Mock()
+    resources = _assemble_arm_resource_map(deletion_manager.resource_map)
+    key_by_id = {resource.resource_id: key for key, resource in resources.items()}
+    begun: List[str] = []
+    in_flight: Set[str] = set()
+    in_flight_at_instance: Set[str] = set()
+    max_in_flight = 0
+
+    def _begin_delete_by_id(resource_id: str, api_version: str):
+        nonlocal max_in_flight
+        key = key_by_id[resource_id]
+        begun.append(key)
+        in_flight.add(key)
+        max_in_flight = max(max_in_flight, len(in_flight))
+        if key == "instance":
+            in_flight_at_instance.update(in_flight)
+
+        def _is_done() -> bool:
+            # The asset stays in flight until the instance, at the end of the broker chain, has begun.
+            if key == "asset" and "instance" not in begun:
+                return False
+            in_flight.discard(key)
+            return True
+
+        return _FakePoller(_is_done)
+
+    deletion_manager.resource_client = Mock()
+    deletion_manager.resource_client.resources.begin_delete_by_id.side_effect = _begin_delete_by_id
+    deletion_manager._delete_graph(
+        deletion_manager._build_deletion_graph(
+            custom_locations=deletion_manager.resource_map.custom_locations,
+            extensions=deletion_manager.resource_map.extensions,
+        )
+    )
+
+    assert sorted(begun) == sorted(resources)
+    assert max_in_flight == 2
+    for child, parent in [
+        ("listener", "broker"),
+        ("authn", "broker"),
+        ("broker", "instance"),
+        ("instance", "custom_location"),
+        ("asset", "custom_location"),
+        ("sync_rule", "custom_location"),
+        ("custom_location", "extension"),
+    ]:
+        assert begun.index(child) < begun.index(parent)
+    # The instance did not wait on the unrelated asset deletion.
+    assert "asset" in in_flight_at_instance
+
+
+@pytest.mark.parametrize("status_code", [429, 500])
+def test_delete_graph_throttled(
+    mocker, mocked_cmd: Mock, mocked_get_resource_client: Mock, mocked_resource_map: Mock, status_code: int
+):
+    from azext_edge.edge.providers.orchestration.deletion import DELETE_THROTTLE_RETRIES, DeletionManager
+
+    mocker.patch("azext_edge.edge.providers.orchestration.deletion.get_throttle_delay", return_value=0)
+    deletion_manager = DeletionManager(
+        cmd=mocked_cmd,
+        instance_name=generate_random_string(),
+        resource_group_name=generate_random_string(),
+        no_progress=True,
+    )
+    deletion_manager.resource_map = Mock()
+    resources = _assemble_arm_resource_map(deletion_manager.resource_map)
+    key_by_id = {resource.resource_id: key for key, resource in resources.items()}
+    begun: List[str] = []
+
+    def _begin_delete_by_id(resource_id: str, api_version: str):
+        key = key_by_id[resource_id]
+        begun.append(key)
+        attempts = begun.count(key)
+        # Throttled when starting the listener delete, and when the broker delete completes.
+        if key == "listener" and attempts == 1:
+            raise _throttled_error(status_code)
+        if key == "broker" and attempts <= DELETE_THROTTLE_RETRIES:
+            return _FakePoller(lambda: True, _throttled_error(status_code))
+        return _FakePoller(lambda: True)
+
+    deletion_manager.resource_client = Mock()
+    deletion_manager.resource_client.resources.begin_delete_by_id.side_effect = _begin_delete_by_id
+    deletion_graph = deletion_manager._build_deletion_graph(
+        custom_locations=deletion_manager.resource_map.custom_locations,
+        extensions=deletion_manager.resource_map.extensions,
+    )
+
+    if status_code != 429:
+        with pytest.raises(AzureResponseError) as e:
+            deletion_manager._delete_graph(deletion_graph)
+        assert begun.count("listener") == 1
+        # The failure is reported along with everything left undeleted, including its parents.
+        error_msg = str(e.value)
+        assert f"{resources['listener'].resource_id}: Too many requests." in error_msg
+        for key in ["broker", "instance", "custom_location", "extension"]:
+            assert resources[key].resource_id in error_msg.split("were not deleted:")[1]
+        return
+
+    deletion_manager._delete_graph(deletion_graph)
+    assert sorted(set(begun)) == sorted(resources)
+    assert begun.count("listener") == 2
+    assert begun.count("broker") == DELETE_THROTTLE_RETRIES + 1
+    assert begun.index("instance") > len(begun) - 4
+
+
+def test_delete_graph_unexpected_errors(
+    mocker, mocked_cmd: Mock, mocked_get_resource_client: Mock, mocked_resource_map: Mock
+):
+    from azext_edge.edge.providers.orchestration.deletion import DeletionManager
+
+    mocker.patch("azext_edge.edge.providers.orchestration.deletion.DELETE_WAKE_SEC", 0.01)
+    deletion_manager = DeletionManager(
+        cmd=mocked_cmd,
+        instance_name=generate_random_string(),
+        resource_group_name=generate_random_string(),
+        no_progress=True,
+    )
+    deletion_manager.resource_map = Mock()
+    resources = _assemble_arm_resource_map(deletion_manager.resource_map)
+    key_by_id = {resource.resource_id: key for key, resource in resources.items()}
+    sync_rule_polls = 0
+
+    def _sync_rule_done() -> bool:
+        nonlocal sync_rule_polls
+        sync_rule_polls += 1
+        return sync_rule_polls > 2
+
+    def _begin_delete_by_id(resource_id: str, api_version: str):
+        key = key_by_id[resource_id]
+        if key == "listener":
+            raise ConnectionResetError("Connection reset by peer")
+        if key == "sync_rule":
+            # Still in flight when the listener fails, then fails itself.
+            return _FakePoller(_sync_rule_done, RuntimeError("Polling failed."))
+        return _FakePoller(lambda: True)
+
+    deletion_manager.resource_client = Mock()
+    deletion_manager.resource_client.resources.begin_delete_by_id.side_effect = _begin_delete_by_id
+    deletion_graph = deletion_manager._build_deletion_graph(
+        custom_locations=deletion_manager.resource_map.custom_locations,
+        extensions=deletion_manager.resource_map.extensions,
+    )
+
+    with pytest.raises(AzureResponseError) as e:
+        deletion_manager._delete_graph(deletion_graph)
+
+    # The in-flight deletion was drained, and every failure is reported with its resource.
+    assert sync_rule_polls > 2
+    failed, undeleted = str(e.value).split("were not deleted:")
+    assert f"{resources['listener'].resource_id}: Connection reset by peer" in failed
+    assert f"{resources['sync_rule'].resource_id}: Polling failed." in failed
+    for key in ["authn", "broker", "instance", "asset", "custom_location", "extension"]:
+        assert resources[key].resource_id in undeleted
+
+
+def test_delete_graph_timeout(mocker, mocked_cmd: Mock, mocked_get_resource_client: Mock, mocked_resource_map: Mock):
+    from azext_edge.edge.providers.orchestration.deletion import DeletionManager
+
+    mocker.patch("azext_edge.edge.providers.orchestration.deletion.DELETE_TIMEOUT_SEC", 0.5)
+    deletion_manager = DeletionManager(
+        cmd=mocked_cmd,
+        instance_name=generate_random_string(),
+        resource_group_name=generate_random_string(),
+        no_progress=True,
+    )
+    deletion_manager.resource_map = Mock()
+    resources = _assemble_arm_resource_map(deletion_manager.resource_map)
+    key_by_id = {resource.resource_id: key for key, resource in resources.items()}
+
+    def _begin_delete_by_id(resource_id: str, api_version: str):
+        # The asset deletion never completes.
+        return _FakePoller(lambda: key_by_id[resource_id] != "asset")
+
+    deletion_manager.resource_client = Mock()
+    deletion_manager.resource_client.resources.begin_delete_by_id.side_effect = _begin_delete_by_id
+    deletion_graph = deletion_manager._build_deletion_graph(
+        custom_locations=deletion_manager.resource_map.custom_locations,
+        extensions=deletion_manager.resource_map.extensions,
+    )
+
+    with pytest.raises(AzureResponseError) as e:
+        deletion_manager._delete_graph(deletion_graph)
+    error_msg = str(e.value)
+    assert "did not complete within 0.5 seconds" in error_msg
+    undeleted = error_msg.split("were not deleted:")[1]
+    for key in ["asset", "custom_location", "extension"]:
+        assert resources[key].resource_id in undeleted
+    assert resources["instance"].resource_id not in undeleted
+
+
+def test_delete_concurrency_validation(mocked_cmd: Mock, mocked_get_resource_client: Mock, mocked_resource_map: Mock):
+    from azext_edge.edge.providers.orchestration.deletion import DeletionManager
+
+    with pytest.raises(InvalidArgumentValueError):
+        DeletionManager(
+            cmd=mocked_cmd,
+            instance_name=generate_random_string(),
+            resource_group_name=generate_random_string(),
+            concurrency=0,
+        )
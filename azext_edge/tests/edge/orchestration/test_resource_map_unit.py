@@ -12,6 +12,7 @@ from random import randint
 import pytest
 from rich.tree import Tree
 
+from azext_edge.edge.providers.orchestration.connected_cluster import AioResourceState
 from azext_edge.edge.providers.orchestration.resource_map import IoTOperationsResource
 from azext_edge.edge.providers.orchestration.common import EXTENSION_TYPE_OPS
 
@@ -64,10 +65,12 @@ def _assemble_connected_cluster_mock(
     cluster_mock().subscription_id = sub
     cluster_mock().cluster_name = cluster_name
     cluster_mock().resource_group_name = rg_name
-    cluster_mock().get_aio_extensions.return_value = extensions
-    cluster_mock().get_aio_custom_locations.return_value = custom_locations
-    cluster_mock().get_aio_resources.return_value = resources
-    cluster_mock().get_resource_sync_rules.return_value = sync_rules
+    cluster_mock().get_aio_resource_state.return_value = AioResourceState(
+        custom_locations=custom_locations or [],
+        extensions=extensions or [],
+        resources={cl["id"].lower(): resources or [] for cl in custom_locations or []},
+        resource_sync_rules={cl["id"].lower(): sync_rules or [] for cl in custom_locations or []},
+    )
     cluster_mock().get_extensions_by_type.return_value = {EXTENSION_TYPE_OPS: aio_extension}
 
 
@@ -116,16 +119,10 @@ def test_resource_map(
     resource_map = IoTOperationsResourceMap(cmd=mocked_cmd, cluster_name=cluster_name, resource_group_name=rg_name)
 
     assert resource_map.subscription_id == sub
-    mocked_connected_cluster().get_aio_extensions.assert_called_once()
+    mocked_connected_cluster().get_aio_resource_state.assert_called_once()
     _assert_ops_resource_eq(resource_map.extensions, expected_extensions)
-
-    mocked_connected_cluster().get_aio_custom_locations.assert_called_once()
     _assert_ops_resource_eq(resource_map.custom_locations, expected_custom_locations)
 
-    cl_count = 0 if not expected_custom_locations else len(expected_custom_locations)
-    assert mocked_connected_cluster().get_aio_resources.call_count == cl_count
-    assert mocked_connected_cluster().get_resource_sync_rules.call_count == cl_count
-
     if expected_custom_locations:
         for cl in expected_custom_locations:
             _assert_ops_resource_eq(resource_map.get_resources(cl["id"]), expected_resources, verify_segment_order=True)
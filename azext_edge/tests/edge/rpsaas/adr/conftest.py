@@ -48,13 +48,13 @@ def asset_helpers_fixture(mocker, request):
     patched_to_csv = mocker.patch(f"{ASSETS_PATH}._convert_sub_points_to_csv")
     patched_to_csv.return_value = request_params.get("convert_sub_points_to_csv", generate_random_string())
 
-    patched_from_csv = mocker.patch(f"{ASSETS_PATH}._convert_sub_points_from_csv")
+    patched_from_csv = mocker.patch(f"{ASSETS_PATH}._convert_sub_point_from_csv")
     yield {
         "process_asset_sub_points": patched_sp,
         "process_asset_sub_points_file_path": patched_spfp,
         "update_properties": patched_up,
         "convert_sub_points_to_csv": patched_to_csv,
-        "convert_sub_points_from_csv": patched_from_csv
+        "convert_sub_point_from_csv": patched_from_csv
     }
 
 
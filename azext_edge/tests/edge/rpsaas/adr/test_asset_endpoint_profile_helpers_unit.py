@@ -20,7 +20,7 @@ from azext_edge.edge.common import SecurityPolicies, SecurityModes
 from azext_edge.edge.providers.rpsaas.adr.asset_endpoint_profiles import (
     _assert_above_min,
     _build_opcua_config,
-    _build_query_body,
+    _build_query,
     _process_additional_configuration,
     _process_authentication,
     _update_properties,
@@ -206,7 +206,7 @@ def test_build_opcua_config_error(req):
 @pytest.mark.parametrize("location", [None, generate_random_string()])
 @pytest.mark.parametrize("resource_group_name", [None, generate_random_string()])
 @pytest.mark.parametrize("target_address", [None, generate_random_string()])
-def test_build_query_body(
+def test_build_query(
     asset_endpoint_profile_name,
     auth_mode,
     endpoint_profile_type,
@@ -214,7 +214,7 @@ def test_build_query_body(
     resource_group_name,
     target_address
 ):
-    result = _build_query_body(
+    result = _build_query(
         asset_endpoint_profile_name=asset_endpoint_profile_name,
         auth_mode=auth_mode,
         endpoint_profile_type=endpoint_profile_type,
@@ -222,6 +222,7 @@ def test_build_query_body(
         resource_group_name=resource_group_name,
         target_address=target_address
     )
+    assert result.startswith('Resources | where type =~ "Microsoft.DeviceRegistry/assetEndpointProfiles"')
     result = [line.strip() for line in result.split("|")]
     assert result[-1] == "project id, customLocation, location, name, resourceGroup, provisioningState, tags, "\
         "type, subscriptionId"
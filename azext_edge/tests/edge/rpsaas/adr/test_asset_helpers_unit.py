@@ -15,15 +15,16 @@ from azext_edge.edge.providers.rpsaas.adr.assets import (
     _build_asset_sub_point,
     _build_ordered_csv_conversion_map,
     _build_default_configuration,
-    _build_query_body,
+    _build_query,
     _build_topic,
-    _convert_sub_points_from_csv,
+    _convert_sub_point_from_csv,
     _convert_sub_points_to_csv,
     _get_dataset,
     _process_asset_sub_points,
     _process_asset_sub_points_file_path,
     _process_custom_attributes,
     _update_properties,
+    CSV_FIELDNAMES,
     VALID_DATA_OBSERVABILITY_MODES,
     VALID_EVENT_OBSERVABILITY_MODES
 )
@@ -185,15 +186,27 @@ def test_build_ordered_csv_conversion_map(sub_point_type, portal_friendly):
         "disabled": False,
         "external_asset_id": generate_random_string(),
         "hardware_revision": generate_random_string(),
+    },
+    {
+        "custom_query": f"| where properties.model == \"{generate_random_string()}\"",
+        "model": generate_random_string(),
     }
 ])
-def test_build_query_body(req):
-    result = _build_query_body(**req)
+def test_build_query(req):
+    result = _build_query(**req)
+    # Identical filters always produce identical query text.
+    assert result == _build_query(**dict(reversed(req.items())))
+    assert result.startswith('Resources | where type =~ "Microsoft.DeviceRegistry/assets"')
+    if req.get("custom_query"):
+        # A custom query replaces the filters and projection.
+        assert result == 'Resources | where type =~ "Microsoft.DeviceRegistry/assets" ' + req["custom_query"]
+        return
+
     assert result.endswith(
-        "| extend customLocation = tostring(extendedLocation.name) "
-        "| extend provisioningState = properties.provisioningState "
-        "| project id, customLocation, location, name, resourceGroup, provisioningState, tags, "
-        "type, subscriptionId "
+        " | extend customLocation = tostring(extendedLocation.name)"
+        " | extend provisioningState = properties.provisioningState"
+        " | project id, customLocation, location, name, resourceGroup, provisioningState, tags, "
+        "type, subscriptionId"
     )
     query_list = [line.strip() for line in result.split("|")]
     if req.get("resource_group_name"):
@@ -211,7 +224,7 @@ def test_build_query_body(req):
     if req.get("display_name"):
         assert f'where properties.displayName =~ \"{req["display_name"]}\"' in query_list
     if req.get("disabled") is not None:
-        assert f'where properties.enabled == {not req["disabled"]}' in query_list
+        assert f'where properties.enabled == {str(not req["disabled"]).lower()}' in query_list
     if req.get("documentation_uri"):
         assert f'where properties.documentationUri =~ \"{req["documentation_uri"]}\"' in query_list
     if req.get("endpoint_profile"):
@@ -334,9 +347,9 @@ def test_build_topic(original_topic, topic_path, topic_retain):
         },
     ],
 ])
-def test_convert_sub_points_from_csv(sub_points):
+def test_convert_sub_point_from_csv(sub_points):
     original_copy = deepcopy(sub_points)
-    _convert_sub_points_from_csv(sub_points)
+    sub_points = [_convert_sub_point_from_csv(point) for point in sub_points]
 
     for i in range(len(original_copy)):
         for key in original_copy[i]:
@@ -596,8 +609,8 @@ def test_process_asset_sub_points_file_path(mocker, req, duplicates):
             point_key: req["original_items"][0][point_key],
             generate_random_string(): generate_random_string()
         })
-    mocked_deserialize = mocker.patch(
-        "azext_edge.edge.util.deserialize_file_content",
+    mocked_iter_file_records = mocker.patch(
+        "azext_edge.edge.util.iter_file_records",
         return_value=deepcopy(file_points),
         autospec=True
     )
@@ -606,7 +619,7 @@ def test_process_asset_sub_points_file_path(mocker, req, duplicates):
         point_key=point_key,
         **req
     )
-    mocked_deserialize.assert_called_with(file_path=file_path)
+    mocked_iter_file_records.assert_called_with(file_path=file_path, csv_fieldnames=CSV_FIELDNAMES)
     if not point_key:
         assert result == file_points
     elif duplicates and not req.get("replace"):
@@ -617,6 +630,90 @@ def test_process_asset_sub_points_file_path(mocker, req, duplicates):
         assert file_points[0] in result
 
 
+@pytest.mark.parametrize("records, error", [
+    ([{"Name": "a"}, {"Data Source": "b"}], "Item 2 of points.csv is missing the name."),
+    ([{"Name": "a", "Queue Size": "b"}], "Item 1 of points.csv is invalid: invalid literal for int()"),
+    ([{"Name": "a"}, {"Name": "b"}, {"Name": "c"}], "Importing points.csv would exceed the maximum of 2 data points."),
+])
+def test_process_asset_sub_points_file_path_error(mocker, records, error):
+    def _iter_file_records(file_path, csv_fieldnames):
+        yield from records
+        pytest.fail("Records should not be read after an error.")
+
+    mocker.patch("azext_edge.edge.util.iter_file_records", side_effect=_iter_file_records)
+    with pytest.raises(InvalidArgumentValueError) as e:
+        _process_asset_sub_points_file_path(
+            file_path="points.csv", point_key="name", max_points=2, point_type="data points"
+        )
+    assert e.value.error_msg.startswith(error)
+
+
+@pytest.mark.parametrize("replace", [False, True])
+def test_process_asset_sub_points_file_path_csv(mocker, tmp_path, replace):
+    mocker.patch("azext_edge.edge.providers.rpsaas.adr.assets.logger")
+    file_path = tmp_path / "points.csv"
+    file_path.write_text(
+        "NodeID,TagName,QueueSize,ObservabilityMode,Sampling Interval Milliseconds,\n"
+        "ns=1;s=a,a,,gauge,10,\n"
+        "ns=1;s=b,b,2,,,\n"
+        "ns=1;s=c,c,,counter,,\n",
+        encoding="utf-8-sig"
+    )
+    original_items = [{"name": "b", "dataSource": "ns=1;s=original"}, {"name": "z", "dataSource": "ns=1;s=z"}]
+
+    result = _process_asset_sub_points_file_path(
+        file_path=str(file_path),
+        original_items=original_items,
+        point_key="name",
+        replace=replace,
+        max_points=4,
+    )
+
+    # the name index keeps original points in place
+    assert [point["name"] for point in result] == ["b", "z", "a", "c"]
+    assert result[0] == (
+        {"name": "b", "dataSource": "ns=1;s=b", "observabilityMode": "", "dataPointConfiguration": '{"queueSize": 2}'}
+        if replace else original_items[0]
+    )
+    assert result[2] == {
+        "name": "a",
+        "dataSource": "ns=1;s=a",
+        "observabilityMode": "Gauge",
+        "dataPointConfiguration": '{"samplingInterval": 10}',
+    }
+    assert result[3] == {"name": "c", "dataSource": "ns=1;s=c", "observabilityMode": "Counter"}
+
+
+def test_process_asset_sub_points_file_path_benchmark(tmp_path):
+    """
+    Benchmark csv imports, the import time should grow linearly with the number of rows.
+    """
+    from time import perf_counter
+
+    def _import(row_count: int) -> float:
+        file_path = tmp_path / f"points_{row_count}.csv"
+        with open(file_path, "w", encoding="utf-8", newline="") as f:
+            f.write("NodeID,TagName,QueueSize,ObservabilityMode,Sampling Interval Milliseconds\n")
+            f.writelines(f"ns=3;s=Tag{i},Tag{i},{i % 10 + 1},gauge,500\n" for i in range(row_count))
+        original_items = [{"name": f"Tag{i}", "dataSource": f"ns=3;s=Tag{i}"} for i in range(0, row_count, 2)]
+
+        started = perf_counter()
+        result = _process_asset_sub_points_file_path(
+            file_path=str(file_path), original_items=original_items, point_key="name", replace=True
+        )
+        elapsed = perf_counter() - started
+        assert len(result) == row_count
+        return elapsed
+
+    # warm up
+    _import(1000)
+    small = min(_import(10000) for _ in range(3))
+    large = _import(100000)
+    print(f"Imported 10000 rows in {small:.3f}s and 100000 rows in {large:.3f}s.")
+    # linear growth is a ratio of 10, allow for noise but catch quadratic behavior
+    assert large < small * 30
+
+
 @pytest.mark.parametrize("current_attributes", [{}, {"example1": generate_random_string()}])
 @pytest.mark.parametrize("custom_attributes", [
     [f"example1={generate_random_string()}", f"{generate_random_string()}={generate_random_string()}"],
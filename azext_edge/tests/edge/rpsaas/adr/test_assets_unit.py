@@ -11,9 +11,11 @@ import responses
 
 from azure.cli.core.azclierror import InvalidArgumentValueError
 from azext_edge.edge.commands_assets import (
+    bulk_apply_assets,
     create_asset,
     delete_asset,
     list_assets,
+    query_assets,
     show_asset,
     update_asset,
     list_asset_datasets,
@@ -30,6 +32,7 @@ from azext_edge.edge.commands_assets import (
     remove_asset_event,
 )
 from azext_edge.edge.common import FileType
+from azext_edge.edge.providers.rpsaas.adr.assets import CSV_FIELDNAMES
 
 from .conftest import get_asset_mgmt_uri, get_asset_record
 from ....generators import generate_random_string
@@ -138,6 +141,159 @@ def test_asset_create(
     assert asset_helpers_fixture["process_asset_sub_points_file_path"].called is bool(req.get("events_file_path"))
 
 
+def test_asset_bulk_apply(
+    mocked_cmd,
+    mocked_get_extended_location,
+    mocked_responses: responses,
+    tmp_path,
+):
+    import yaml
+    resource_group_name = generate_random_string()
+    other_resource_group_name = generate_random_string()
+    instance_name = generate_random_string()
+    (tmp_path / "events.csv").write_text("EventNotifier,EventName\nns=1;s=file,fileEvent\n", encoding="utf-8")
+    assets = [
+        {
+            "asset_name": "boiler",
+            "endpoint_profile": "opcua",
+            "description": "Boiler.",
+            "events": [{"event_notifier": "ns=1;s=alarm", "name": "alarm", "observability_mode": "log"}],
+            "events_file_path": "events.csv",
+            "custom_attributes": {"site": "a"},
+        },
+        {
+            "asset_name": "pump",
+            "endpoint_profile": "opcua",
+            "resource_group_name": other_resource_group_name,
+            "instance_name": "other",
+            "tags": {"line": "2"},
+        },
+        {"asset_name": "invalid", "endpoint_profile": "opcua"},
+    ]
+    file_path = tmp_path / "assets.yaml"
+    file_path.write_text(yaml.safe_dump({"assets": assets}), encoding="utf-8")
+
+    for asset_name, asset_resource_group, status in [
+        ("boiler", resource_group_name, 200),
+        ("pump", other_resource_group_name, 200),
+        ("invalid", resource_group_name, 400),
+    ]:
+        mocked_responses.add(
+            method=responses.PUT,
+            url=get_asset_mgmt_uri(asset_name=asset_name, asset_resource_group=asset_resource_group),
+            json=(
+                get_asset_record(asset_name=asset_name, asset_resource_group=asset_resource_group)
+                if status == 200 else {"error": {"code": "BadRequest", "message": "Invalid asset."}}
+            ),
+            status=status,
+            content_type="application/json",
+        )
+
+    result = bulk_apply_assets(
+        cmd=mocked_cmd,
+        file_path=str(file_path),
+        resource_group_name=resource_group_name,
+        instance_name=instance_name,
+        wait_sec=0,
+    )
+
+    assert [(r["name"], r["resourceGroup"], r["status"]) for r in result] == [
+        ("boiler", resource_group_name, "Succeeded"),
+        ("pump", other_resource_group_name, "Succeeded"),
+        ("invalid", resource_group_name, "Failed"),
+    ]
+    assert result[0]["provisioningState"] and result[0]["error"] is None
+    assert "Invalid asset." in result[2]["error"]
+
+    # the extended location is resolved once per instance
+    assert mocked_get_extended_location.call_count == 2
+    extended_location = mocked_get_extended_location.original_return_value
+    bodies = {
+        call.request.url.split("?")[0].rsplit("/", 1)[-1]: json.loads(call.request.body)
+        for call in mocked_responses.calls
+    }
+    boiler = bodies["boiler"]
+    assert boiler["extendedLocation"]["name"] == extended_location["name"]
+    assert boiler["location"] == extended_location["cluster_location"]
+    assert boiler["properties"]["description"] == "Boiler."
+    assert boiler["properties"]["attributes"] == {"site": "a"}
+    assert [event["name"] for event in boiler["properties"]["events"]] == ["alarm", "fileEvent"]
+    assert boiler["properties"]["events"][0]["observabilityMode"] == "Log"
+    assert bodies["pump"]["tags"] == {"line": "2"}
+
+
+@pytest.mark.parametrize("content, error", [
+    ({"items": []}, "must contain a list of assets"),
+    ([{"asset_name": "a"}], "Asset 1 of {} is missing endpoint_profile."),
+    ([{"asset_name": "a", "endpoint_profile": "e", "unknown": 1}], "Asset 1 of {} has unsupported keys unknown."),
+    (
+        [{"asset_name": "a", "endpoint_profile": "e"}, {"asset_name": "A", "endpoint_profile": "e"}],
+        "Asset 2 of {} duplicates asset A."
+    ),
+])
+def test_asset_bulk_apply_error(mocked_cmd, mocked_get_extended_location, tmp_path, content, error):
+    file_path = tmp_path / "assets.json"
+    file_path.write_text(json.dumps(content), encoding="utf-8")
+
+    with pytest.raises(InvalidArgumentValueError) as e:
+        bulk_apply_assets(
+            cmd=mocked_cmd,
+            file_path=str(file_path),
+            resource_group_name=generate_random_string(),
+            instance_name=generate_random_string(),
+        )
+    assert error.format(file_path) in e.value.error_msg
+
+
+def test_asset_bulk_apply_throttled(mocker, mocked_cmd, mocked_get_extended_location, tmp_path):
+    from threading import Lock
+    from azure.core.exceptions import HttpResponseError
+    from azext_edge.edge.providers.rpsaas.adr.assets import BULK_APPLY_THROTTLE_RETRIES
+
+    mocker.patch("azext_edge.edge.providers.rpsaas.adr.assets.get_throttle_delay", return_value=0)
+    asset_names = ["throttled", "always_throttled", "failed"] + [f"asset{i}" for i in range(5)]
+    file_path = tmp_path / "assets.json"
+    file_path.write_text(
+        json.dumps([{"asset_name": name, "endpoint_profile": "e"} for name in asset_names]), encoding="utf-8"
+    )
+    attempts = {name: 0 for name in asset_names}
+    lock = Lock()
+
+    def _apply_asset(asset, **_):
+        with lock:
+            attempts[asset.asset_name] += 1
+            attempt = attempts[asset.asset_name]
+        if (asset.asset_name == "throttled" and attempt == 1) or asset.asset_name == "always_throttled":
+            error = HttpResponseError(message="Too many requests.")
+            error.status_code = 429
+            raise error
+        if asset.asset_name == "failed":
+            error = HttpResponseError(message="Internal error.")
+            error.status_code = 500
+            raise error
+        return {"properties": {"provisioningState": "Succeeded"}}
+
+    mocker.patch(
+        "azext_edge.edge.providers.rpsaas.adr.assets.Assets._apply_asset", side_effect=_apply_asset, autospec=False
+    )
+    result = bulk_apply_assets(
+        cmd=mocked_cmd,
+        file_path=str(file_path),
+        resource_group_name=generate_random_string(),
+        instance_name=generate_random_string(),
+        concurrency=4,
+    )
+
+    statuses = {r["name"]: r["status"] for r in result}
+    assert [r["name"] for r in result] == asset_names
+    assert statuses.pop("always_throttled") == "Failed"
+    assert statuses.pop("failed") == "Failed"
+    assert set(statuses.values()) == {"Succeeded"}
+    assert attempts["throttled"] == 2
+    assert attempts["always_throttled"] == BULK_APPLY_THROTTLE_RETRIES + 1
+    assert attempts["failed"] == 1
+
+
 @pytest.mark.parametrize("discovered", [False])  # TODO: discovered
 def test_asset_delete(mocked_cmd, mocked_check_cluster_connectivity, mocked_responses: responses, discovered: bool):
     asset_name = generate_random_string()
@@ -587,7 +743,7 @@ def test_data_point_import(
     mocked_cmd,
     mocked_responses: responses,
     mocked_check_cluster_connectivity,
-    mocked_deserialize_file_content,
+    mocked_iter_file_records,
     replace
 ):
     # remove logger warnings
@@ -633,7 +789,7 @@ def test_data_point_import(
             }
         ]
     }
-    mocked_deserialize_file_content.return_value = file_dataset["dataPoints"]
+    mocked_iter_file_records.return_value = file_dataset["dataPoints"]
     mock_asset_record["properties"]["datasets"] = [cloud_dataset]
     mocked_responses.add(
         method=responses.GET,
@@ -664,7 +820,7 @@ def test_data_point_import(
     )
 
     assert result == result_datapoints
-    mocked_deserialize_file_content.assert_called_once_with(file_path=file_path)
+    mocked_iter_file_records.assert_called_once_with(file_path=file_path, csv_fieldnames=CSV_FIELDNAMES)
     datasets = json.loads(mocked_responses.calls[-1].request.body)["properties"]["datasets"]
     assert datasets
     point_map = {point["name"]: point for point in datasets[0]["dataPoints"]}
@@ -673,13 +829,16 @@ def test_data_point_import(
     # check the duplicate point
     if replace:
         point = file_dataset["dataPoints"][0]
+        # file points are normalized on import
+        expected_mode = point["observabilityMode"].capitalize()
         assert file_dataset["dataPoints"][1]["name"] in point_map
     else:
         point = cloud_dataset["dataPoints"][0]
+        expected_mode = point["observabilityMode"]
     assert cloud_dataset["dataPoints"][1]["name"] in point_map
     assert point_map[dup_name]["dataPointConfiguration"] == point["dataPointConfiguration"]
     assert point_map[dup_name]["dataSource"] == point["dataSource"]
-    assert point_map[dup_name]["observabilityMode"] == point["observabilityMode"]
+    assert point_map[dup_name]["observabilityMode"] == expected_mode
 
 
 @pytest.mark.parametrize("data_points_present", [True, False])
@@ -956,7 +1115,7 @@ def test_event_import(
     mocked_cmd,
     mocked_responses: responses,
     mocked_check_cluster_connectivity,
-    mocked_deserialize_file_content,
+    mocked_iter_file_records,
     replace
 ):
     # remove logger warnings
@@ -995,7 +1154,7 @@ def test_event_import(
             "eventNotifier": generate_random_string(),
         }
     ]
-    mocked_deserialize_file_content.return_value = file_events
+    mocked_iter_file_records.return_value = file_events
     mock_asset_record["properties"]["events"] = cloud_events
     mocked_responses.add(
         method=responses.GET,
@@ -1022,7 +1181,7 @@ def test_event_import(
     )
 
     assert result == result_events
-    mocked_deserialize_file_content.assert_called_once_with(file_path=file_path)
+    mocked_iter_file_records.assert_called_once_with(file_path=file_path, csv_fieldnames=CSV_FIELDNAMES)
     events = json.loads(mocked_responses.calls[-1].request.body)["properties"]["events"]
     assert events
     point_map = {point["name"]: point for point in events}
@@ -1031,13 +1190,16 @@ def test_event_import(
     # check the duplicate point
     if replace:
         point = file_events[0]
+        # file points are normalized on import
+        expected_mode = point["observabilityMode"].capitalize()
         assert file_events[1]["name"] in point_map
     else:
         point = cloud_events[0]
+        expected_mode = point["observabilityMode"]
     assert cloud_events[1]["name"] in point_map
     assert point_map[dup_name]["eventConfiguration"] == point["eventConfiguration"]
     assert point_map[dup_name]["eventNotifier"] == point["eventNotifier"]
-    assert point_map[dup_name]["observabilityMode"] == point["observabilityMode"]
+    assert point_map[dup_name]["observabilityMode"] == expected_mode
 
 
 @pytest.mark.parametrize("events_present", [True, False])
@@ -1120,3 +1282,47 @@ def test_event_remove(
     event_names = [event["name"] for event in events]
     assert event_name not in event_names
     assert alt_event_name in event_names
+
+
+def test_asset_write_invalidates_query_cache(
+    mocker,
+    mocked_cmd,
+    mocked_get_extended_location,
+    mocked_responses: responses,
+    tmp_path,
+):
+    from azext_edge.edge.util.resource_cache import ResourceCache
+
+    resource_cache = ResourceCache(path=str(tmp_path / "cache.json"), ttl_seconds=600)
+    mocker.patch("azext_edge.edge.util.queryable.get_resource_cache", return_value=resource_cache)
+    mocked_send_raw_request = mocker.patch("azext_edge.edge.util.resource_graph.send_raw_request")
+    rows = [{"name": generate_random_string()}]
+    mocked_send_raw_request.return_value.json.side_effect = lambda: {"data": list(rows)}
+    resource_group_name = generate_random_string()
+
+    assert query_assets(cmd=mocked_cmd, resource_group_name=resource_group_name) == rows
+    assert query_assets(cmd=mocked_cmd, resource_group_name=resource_group_name) == rows
+    assert query_assets(cmd=mocked_cmd, resource_group_name=resource_group_name, count=True)
+    assert mocked_send_raw_request.call_count == 2
+
+    asset_name = generate_random_string()
+    mocked_responses.add(
+        method=responses.PUT,
+        url=get_asset_mgmt_uri(asset_name=asset_name, asset_resource_group=resource_group_name),
+        json=get_asset_record(asset_name=asset_name, asset_resource_group=resource_group_name),
+        status=200,
+        content_type="application/json",
+    )
+    create_asset(
+        cmd=mocked_cmd,
+        asset_name=asset_name,
+        endpoint_profile=generate_random_string(),
+        resource_group_name=resource_group_name,
+        instance_name=generate_random_string(),
+        wait_sec=0,
+    )
+    rows.append({"name": asset_name})
+
+    # The write drops cached query results, so the new asset is seen.
+    assert query_assets(cmd=mocked_cmd, resource_group_name=resource_group_name) == rows
+    assert mocked_send_raw_request.call_count == 3
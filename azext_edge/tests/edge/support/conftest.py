@@ -204,22 +204,30 @@ def mocked_assemble_crd_work(mocker):
 
 
 @pytest.fixture
-def mocked_namespaced_custom_objects(mocked_client):
-    def _handle_namespaced_custom_object(*args, **kwargs):
-        custom_object = {
-            "kind": "PodMetrics",
-            "apiVersion": "metrics.k8s.io/v1",
-            "metadata": {
-                "name": "mock_custom_object",
-                "namespace": "namespace",
-                "creationTimestamp": "0000-00-00T00:00:00Z",
-            },
-            "timestamp": "0000-00-00T00:00:00Z",
+def mocked_namespaced_custom_objects(mocker, mocked_client):
+    def _handle_list_namespaced_custom_object(*args, **kwargs):
+        pods = mocked_client.CoreV1Api().list_pod_for_all_namespaces.return_value.items
+        return {
+            "kind": "PodMetricsList",
+            "apiVersion": "metrics.k8s.io/v1beta1",
+            "items": [
+                {
+                    "metadata": {
+                        "name": pod.metadata.name,
+                        "namespace": kwargs["namespace"],
+                        "creationTimestamp": "0000-00-00T00:00:00Z",
+                    },
+                    "timestamp": "0000-00-00T00:00:00Z",
+                }
+                for pod in pods
+                if pod.metadata.namespace == kwargs["namespace"]
+            ],
         }
 
-        return custom_object
-
-    mocked_client.CustomObjectsApi().get_namespaced_custom_object.side_effect = _handle_namespaced_custom_object
+    # Pod metrics are listed through the shared provider client and cache.
+    mocker.patch("azext_edge.edge.providers.base.client", mocked_client)
+    mocker.patch.dict("azext_edge.edge.providers.base._metrics_cache", clear=True)
+    mocked_client.CustomObjectsApi().list_namespaced_custom_object.side_effect = _handle_list_namespaced_custom_object
 
     yield mocked_client
 
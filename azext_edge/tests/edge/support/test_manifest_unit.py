@@ -0,0 +1,125 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zipfile import ZipFile
+
+import pytest
+from azure.cli.core.azclierror import FileOperationError, InvalidArgumentValueError
+
+from azext_edge.edge.providers.support.manifest import (
+    BUNDLE_MANIFEST_NAME,
+    BundleManifest,
+    format_manifest_time,
+    get_log_capture_times,
+    get_since_seconds,
+    read_bundle_manifest,
+)
+from azext_edge.edge.providers.support_bundle import BundleZipWriter
+
+
+def _pod(name: str, resource_version: str) -> dict:
+    return {"kind": "Pod", "metadata": {"name": name, "resourceVersion": resource_version}}
+
+
+def _select(entries: dict, *keys: str) -> dict:
+    return {path: {k: v for k, v in attributes.items() if k in keys} for path, attributes in entries.items()}
+
+
+def test_incremental_bundle(tmp_path):
+    first_path = str(tmp_path / "first.zip")
+    with BundleZipWriter(file_path=first_path) as writer:
+        writer.put({"data": _pod("a", "1"), "zinfo": "ns/pod.a.yaml"})
+        writer.put({"data": _pod("b", "1"), "zinfo": "ns/pod.b.yaml"})
+        writer.put({"data": "log line\n", "zinfo": "ns/pod.a.c.log", "logCapturedAt": "2024-10-01T00:00:00.000000Z"})
+        writer.put({"data": "", "zinfo": "ns/pod.b.c.log", "logCapturedAt": "2024-10-01T00:00:01.000000Z"})
+
+    first_manifest = read_bundle_manifest(first_path)
+    assert first_manifest["version"] == 1
+    assert _select(first_manifest["entries"], "resourceVersion", "logCapturedAt") == {
+        "ns/pod.a.c.log": {"logCapturedAt": "2024-10-01T00:00:00.000000Z"},
+        "ns/pod.a.yaml": {"resourceVersion": "1"},
+        "ns/pod.b.c.log": {"logCapturedAt": "2024-10-01T00:00:01.000000Z"},
+        "ns/pod.b.yaml": {"resourceVersion": "1"},
+    }
+    # empty logs are indexed for their capture time only
+    assert "sha256" not in first_manifest["entries"]["ns/pod.b.c.log"]
+    assert first_manifest["entries"]["ns/pod.a.c.log"]["size"] == len("log line\n")
+    assert set(get_log_capture_times(first_manifest)) == {"ns/pod.a.c.log", "ns/pod.b.c.log"}
+
+    second_path = str(tmp_path / "second.zip")
+    manifest = BundleManifest(previous=first_manifest, since_bundle="first.zip")
+    with BundleZipWriter(file_path=second_path, manifest=manifest) as writer:
+        writer.put({"data": _pod("a", "1"), "zinfo": "ns/pod.a.yaml"})
+        writer.put({"data": _pod("b", "2"), "zinfo": "ns/pod.b.yaml"})
+
+    with ZipFile(second_path) as bundle_zip:
+        assert bundle_zip.namelist() == [BUNDLE_MANIFEST_NAME, "ns/pod.b.yaml"]
+        second_manifest = json.loads(bundle_zip.read(BUNDLE_MANIFEST_NAME))
+
+    assert second_manifest["sinceBundle"] == "first.zip"
+    assert _select(second_manifest["entries"], "resourceVersion", "unchanged") == {
+        "ns/pod.a.yaml": {"resourceVersion": "1", "unchanged": True},
+        "ns/pod.b.yaml": {"resourceVersion": "2"},
+    }
+
+
+def test_read_bundle_manifest_errors(tmp_path):
+    with pytest.raises(FileOperationError):
+        read_bundle_manifest(str(tmp_path / "missing.zip"))
+
+    no_manifest = str(tmp_path / "no_manifest.zip")
+    with ZipFile(no_manifest, mode="w") as bundle_zip:
+        bundle_zip.writestr("nodes.yaml", "items: []\n")
+    with pytest.raises(InvalidArgumentValueError):
+        read_bundle_manifest(no_manifest)
+
+
+@pytest.mark.parametrize(
+    "elapsed, log_age, expected",
+    [
+        (None, 86400, 86400),
+        (timedelta(minutes=30), 86400, 1801),
+        (timedelta(days=3), 86400, 86400),
+        (timedelta(seconds=-5), 86400, 1),
+    ],
+)
+def test_get_since_seconds(elapsed: Optional[timedelta], log_age: int, expected: int):
+    previous_capture = datetime.now(timezone.utc) - elapsed if elapsed is not None else None
+    assert get_since_seconds(previous_capture, log_age) in (expected, expected - 1)
+
+
+def test_capture_pod_container_logs_since_previous(mocker):
+    from kubernetes.client.models import V1Container
+
+    from azext_edge.edge.providers.support.base import _capture_pod_container_logs, configure_log_capture
+
+    v1_api = mocker.Mock()
+    v1_api.read_namespaced_pod_log.return_value = "new lines\n"
+    previous = datetime.now(timezone.utc) - timedelta(minutes=10)
+
+    configure_log_capture(previous_captures={"ns/dir/pod.pod.known.log": previous})
+    try:
+        result = list(
+            _capture_pod_container_logs(
+                directory_path="dir",
+                pod_containers=[V1Container(name="known"), V1Container(name="new")],
+                pod_name="pod",
+                pod_namespace="ns",
+                v1_api=v1_api,
+                capture_previous_logs=False,
+                since_seconds=3600,
+            )
+        )
+    finally:
+        configure_log_capture()
+
+    since = [c.kwargs["since_seconds"] for c in v1_api.read_namespaced_pod_log.call_args_list]
+    assert 600 <= since[0] <= 601
+    assert since[1] == 3600
+    assert all(entry["logCapturedAt"] > format_manifest_time(previous) for entry in result)
@@ -0,0 +1,191 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import json
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import pytest
+from kubernetes.client.models import (
+    V1Container,
+    V1ContainerPort,
+    V1ObjectMeta,
+    V1Pod,
+    V1PodList,
+    V1PodSpec,
+    V1PodStatus,
+)
+
+from azext_edge.edge.common import OpsServiceType
+from azext_edge.edge.providers.support.prometheus import (
+    PROMETHEUS_ELEMENT,
+    SERVICE_METRICS_PODS,
+    MetricsTarget,
+    _get_pod_metrics_targets,
+    fetch_prometheus_metrics,
+    prepare_bundle,
+)
+
+PROMETHEUS_PATH = "azext_edge.edge.providers.support.prometheus"
+
+
+def _generate_pod(
+    name: str,
+    namespace: str = "aio",
+    annotations: Optional[Dict[str, str]] = None,
+    ports: Optional[List[V1ContainerPort]] = None,
+    phase: str = "Running",
+) -> V1Pod:
+    return V1Pod(
+        metadata=V1ObjectMeta(name=name, namespace=namespace, annotations=annotations),
+        spec=V1PodSpec(containers=[V1Container(name="main", ports=ports)]),
+        status=V1PodStatus(phase=phase),
+    )
+
+
+@pytest.mark.parametrize(
+    "pod, expected",
+    [
+        pytest.param(
+            _generate_pod(
+                "annotated",
+                annotations={"prometheus.io/scrape": "true", "prometheus.io/port": "8080", "prometheus.io/path": "/m"},
+                ports=[V1ContainerPort(name="metrics", container_port=9090)],
+            ),
+            [MetricsTarget(namespace="aio", pod_name="annotated", port=8080, path="/m")],
+            id="annotations",
+        ),
+        pytest.param(
+            _generate_pod(
+                "named-ports",
+                annotations={"prometheus.io/scrape": "true", "prometheus.io/port": "invalid"},
+                ports=[
+                    V1ContainerPort(name="http", container_port=80),
+                    V1ContainerPort(name="metrics", container_port=9090),
+                    V1ContainerPort(name="prom-grpc", container_port=9091),
+                ],
+            ),
+            [
+                MetricsTarget(namespace="aio", pod_name="named-ports", port=9090),
+                MetricsTarget(namespace="aio", pod_name="named-ports", port=9091),
+            ],
+            id="port_names",
+        ),
+        pytest.param(
+            _generate_pod("aio-broker-diagnostics-service-0", ports=[V1ContainerPort(container_port=80)]),
+            [MetricsTarget(namespace="aio", pod_name="aio-broker-diagnostics-service-0", port=9600)],
+            id="default_port",
+        ),
+        pytest.param(_generate_pod("aio-broker-frontend-0"), [], id="no_endpoint"),
+        pytest.param(
+            _generate_pod("pending", ports=[V1ContainerPort(name="metrics", container_port=9090)], phase="Pending"),
+            [],
+            id="not_running",
+        ),
+    ],
+)
+def test_get_pod_metrics_targets(pod: V1Pod, expected: List[MetricsTarget]):
+    assert (
+        _get_pod_metrics_targets(pod, default_ports=SERVICE_METRICS_PODS[OpsServiceType.mq.value].default_ports)
+        == expected
+    )
+
+
+def test_prepare_bundle():
+    bundle = prepare_bundle(
+        [OpsServiceType.mq.value, OpsServiceType.billing.value, OpsServiceType.dataflow.value], interval_seconds=10
+    )
+
+    assert set(bundle) == {OpsServiceType.mq.value, OpsServiceType.dataflow.value}
+    work = bundle[OpsServiceType.mq.value][PROMETHEUS_ELEMENT]
+    assert work.keywords == {"service_pods": SERVICE_METRICS_PODS[OpsServiceType.mq.value], "interval_seconds": 10}
+
+
+@pytest.fixture
+def mocked_metrics_pods(mocker):
+    pods = V1PodList(
+        items=[
+            _generate_pod("aio-broker-diagnostics-service-0"),
+            _generate_pod("aio-broker-frontend-0"),
+            _generate_pod("other", namespace="ns", ports=[V1ContainerPort(name="metrics", container_port=9090)]),
+        ]
+    )
+    yield mocker.patch(f"{PROMETHEUS_PATH}.query_snapshot", return_value=pods)
+
+
+@pytest.fixture
+def mocked_portforward_http(mocker):
+    scrapes: List[dict] = []
+
+    class FakePodRequest:
+        def __init__(self, pod_name: str, pod_port: int):
+            self.pod_name = pod_name
+            self.pod_port = pod_port
+
+        def iter_lines(self, resource_path: str):
+            scrapes.append({"pod": self.pod_name, "port": self.pod_port, "path": resource_path})
+            if self.pod_name == "other":
+                raise ConnectionResetError("reset")
+            received = 100 * sum(scrape["pod"] == self.pod_name for scrape in scrapes)
+            return iter(
+                [
+                    "# TYPE aio_broker_publishes_received counter",
+                    f'aio_broker_publishes_received{{pod="frontend-0"}} {received}',
+                    "# TYPE aio_broker_connected_sessions gauge",
+                    "aio_broker_connected_sessions 3",
+                ]
+            )
+
+    @contextmanager
+    def portforward_http(namespace: str, pod_name: str, pod_port: int, pool=None):
+        assert pool is not None
+        yield FakePodRequest(pod_name, pod_port)
+
+    mocker.patch(f"{PROMETHEUS_PATH}.portforward_http", side_effect=portforward_http)
+    yield scrapes
+
+
+@pytest.mark.parametrize("interval_seconds", [None, 10])
+def test_fetch_prometheus_metrics(
+    mocker, mocked_metrics_pods, mocked_portforward_http, interval_seconds: Optional[int]
+):
+    clock = {"now": 0.0}
+
+    def sleep(seconds: float):
+        clock["now"] += seconds
+
+    mocked_sleep = mocker.patch(f"{PROMETHEUS_PATH}.sleep", side_effect=sleep)
+    mocker.patch(f"{PROMETHEUS_PATH}.monotonic", side_effect=lambda: clock["now"])
+
+    result = list(
+        fetch_prometheus_metrics(
+            service_pods=SERVICE_METRICS_PODS[OpsServiceType.mq.value], interval_seconds=interval_seconds
+        )
+    )
+
+    # Only the diagnostics pod responds, the failing scrape is omitted.
+    assert len(result) == 1
+    assert result[0]["zinfo"] == "aio/broker/pod.aio-broker-diagnostics-service-0.prometheus.9600.json"
+    snapshot = json.loads(result[0]["data"])
+    assert snapshot["counters"] == ["aio_broker_publishes_received"]
+    assert snapshot["types"] == {
+        "aio_broker_publishes_received": "counter",
+        "aio_broker_connected_sessions": "gauge",
+    }
+
+    if not interval_seconds:
+        mocked_sleep.assert_not_called()
+        assert len(mocked_portforward_http) == 2
+        assert snapshot["samples"]['aio_broker_publishes_received{pod="frontend-0"}'] == 100
+        assert "rates" not in snapshot
+        return
+
+    mocked_sleep.assert_called_once_with(10.0)
+    # The failed endpoint is not scraped a second time.
+    assert len(mocked_portforward_http) == 3
+    assert snapshot["samples"]['aio_broker_publishes_received{pod="frontend-0"}'] == 200
+    assert snapshot["intervalSeconds"] == 10.0
+    assert snapshot["rates"] == {'aio_broker_publishes_received{pod="frontend-0"}': 10.0}
@@ -0,0 +1,130 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+from typing import Dict, Optional
+
+import pytest
+
+from azext_edge.edge.providers.support.base import process_deployments
+from azext_edge.edge.providers.support.snapshot import (
+    ResourceSnapshot,
+    match_label_requirements,
+    parse_label_selector,
+    query_snapshot,
+    resource_snapshot,
+)
+
+
+@pytest.fixture
+def mocked_snapshot_client(mocker):
+    from kubernetes.client.models import V1Deployment, V1DeploymentList, V1ObjectMeta
+
+    patched = mocker.patch("azext_edge.edge.providers.support.snapshot.client", autospec=True)
+    deployments = [
+        ("aio", "aio-broker-frontend", {"app.kubernetes.io/name": "microsoft-iotoperations-mqttbroker"}),
+        ("aio", "aio-opc-supervisor", {"app": "aio-opc-supervisor"}),
+        ("aio", "aio-dataflow-operator", {"app.kubernetes.io/name": "microsoft-iotoperations-dataflows"}),
+        ("other", "aio-broker-frontend", {"app.kubernetes.io/name": "microsoft-iotoperations-mqttbroker"}),
+        ("other", "unlabeled", None),
+    ]
+    patched.AppsV1Api().list_deployment_for_all_namespaces.return_value = V1DeploymentList(
+        api_version="apps/v1",
+        items=[
+            V1Deployment(metadata=V1ObjectMeta(namespace=ns, name=name, labels=labels))
+            for ns, name, labels in deployments
+        ],
+    )
+    yield patched
+
+
+@pytest.mark.parametrize(
+    "selector, expected",
+    [
+        (None, []),
+        ("app.kubernetes.io/name in (a, b)", [("app.kubernetes.io/name", "in", ("a", "b"))]),
+        ("app notin (a),tier=web", [("app", "notin", ("a",)), ("tier", "=", ("web",))]),
+        ("name==x, env!=prod", [("name", "=", ("x",)), ("env", "!=", ("prod",))]),
+        ("app, !canary", [("app", "exists", ()), ("canary", "!", ())]),
+        ("app in a", None),
+    ],
+)
+def test_parse_label_selector(selector: Optional[str], expected):
+    assert parse_label_selector(selector) == expected
+
+
+@pytest.mark.parametrize(
+    "selector, labels, expected",
+    [
+        ("app in (a, b)", {"app": "b"}, True),
+        ("app in (a, b)", {"app": "c"}, False),
+        ("app notin (a)", {}, True),
+        ("app notin (a)", {"app": "a"}, False),
+        ("app=a,tier", {"app": "a"}, False),
+        ("app=a,!tier", {"app": "a"}, True),
+        ("app!=a", None, True),
+    ],
+)
+def test_match_label_requirements(selector: str, labels: Optional[Dict[str, str]], expected: bool):
+    assert match_label_requirements(parse_label_selector(selector), labels) is expected
+
+
+def test_snapshot_query(mocked_snapshot_client):
+    snapshot = ResourceSnapshot()
+    broker = snapshot.query(
+        "deployments", label_selector="app.kubernetes.io/name in (microsoft-iotoperations-mqttbroker)"
+    )
+    assert [(d.metadata.namespace, d.metadata.name) for d in broker.items] == [
+        ("aio", "aio-broker-frontend"),
+        ("other", "aio-broker-frontend"),
+    ]
+    assert broker.api_version == "apps/v1"
+
+    namespaced = snapshot.query("deployments", namespace="other")
+    assert [d.metadata.name for d in namespaced.items] == ["aio-broker-frontend", "unlabeled"]
+
+    by_field = snapshot.query("deployments", field_selector="metadata.name==aio-opc-supervisor")
+    assert [d.metadata.name for d in by_field.items] == ["aio-opc-supervisor"]
+
+    assert snapshot.query("deployments", field_selector="status.phase=Running") is None
+    assert snapshot.query("pvcs") is None
+
+    # Name prefixes are served from a sorted name index, results keep listing order.
+    by_prefix = snapshot.query("deployments", prefix_names=["aio-opc-", "aio-broker-", "missing-"])
+    assert [(d.metadata.namespace, d.metadata.name) for d in by_prefix.items] == [
+        ("aio", "aio-broker-frontend"),
+        ("aio", "aio-opc-supervisor"),
+        ("other", "aio-broker-frontend"),
+    ]
+    namespaced_prefix = snapshot.query(
+        "deployments", namespace="other", prefix_names=["aio-"], label_selector="app.kubernetes.io/name"
+    )
+    assert [(d.metadata.namespace, d.metadata.name) for d in namespaced_prefix.items] == [
+        ("other", "aio-broker-frontend")
+    ]
+    assert snapshot.query("deployments", prefix_names=["aio-z"]).items == []
+    assert len(snapshot.query("deployments", prefix_names=[""]).items) == 5
+
+    mocked_snapshot_client.AppsV1Api().list_deployment_for_all_namespaces.assert_called_once()
+    assert snapshot.lists_issued == 1
+    assert snapshot.queries_served == 7
+    assert snapshot.calls_saved == 6
+
+
+def test_snapshot_serves_collectors(mocked_snapshot_client, mocker):
+    mocked_support_client = mocker.patch("azext_edge.edge.providers.support.base.client", autospec=True)
+
+    assert query_snapshot("deployments") is None
+    with resource_snapshot() as snapshot:
+        dataflow = process_deployments(
+            directory_path="dataflow", label_selector="app.kubernetes.io/name in (microsoft-iotoperations-dataflows)"
+        )
+        opc = process_deployments(directory_path="connectors", prefix_names=["aio-opc-"])
+
+    assert [d["zinfo"] for d in dataflow] == ["aio/dataflow/deployment.aio-dataflow-operator.yaml"]
+    assert [d["zinfo"] for d in opc] == ["aio/connectors/deployment.aio-opc-supervisor.yaml"]
+    assert snapshot.calls_saved == 1
+    mocked_support_client.AppsV1Api().list_deployment_for_all_namespaces.assert_not_called()
+    assert query_snapshot("deployments") is None
@@ -6,6 +6,8 @@
 
 import copy
 import random
+from functools import partial
+from time import sleep
 from os.path import abspath, expanduser, join
 from typing import List, Optional, Union
 from zipfile import ZipInfo
@@ -455,19 +457,18 @@ def assert_list_pods(
                 pods_with_container[namespace][pod_name].pop("mock-init-container")
 
             if "include_metrics" in kwargs and kwargs["include_metrics"]:
-                mocked_client.CustomObjectsApi().get_namespaced_custom_object.assert_any_call(
+                mocked_client.CustomObjectsApi().list_namespaced_custom_object.assert_any_call(
                     group="metrics.k8s.io",
-                    version="v1",
+                    version="v1beta1",
                     namespace=namespace,
                     plural="pods",
-                    name=pod_name,
                 )
                 assert_zipfile_write(
                     mocked_zipfile,
                     zinfo=f"{namespace}/{directory_path}/pod.{pod_name}.metric.yaml",
-                    data="apiVersion: metrics.k8s.io/v1\nkind: PodMetrics\nmetadata:\n  "
-                    "creationTimestamp: '0000-00-00T00:00:00Z'\n  name: mock_custom_object\n  "
-                    "namespace: namespace\ntimestamp: '0000-00-00T00:00:00Z'\n",
+                    data="apiVersion: metrics.k8s.io/v1beta1\nkind: PodMetrics\nmetadata:\n  "
+                    f"creationTimestamp: '0000-00-00T00:00:00Z'\n  name: {pod_name}\n  "
+                    f"namespace: {namespace}\ntimestamp: '0000-00-00T00:00:00Z'\n",
                 )
 
             if pod_name not in kwargs.get("prefix_names", []):
@@ -838,9 +839,124 @@ def test_create_bundle_mq_traces(
     test_zipinfo = ZipInfo("mock_namespace/broker/traces/trace_key")
     test_zipinfo.file_size = 0
     test_zipinfo.compress_size = 0
+    assert get_trace_kwargs["internal_tls"] is False
     assert_zipfile_write(mocked_zipfile, zinfo=test_zipinfo, data="trace_data")
 
 
+def test_fetch_diagnostic_traces(mocker):
+    from threading import Barrier, current_thread
+
+    from azext_edge.edge.providers.support.mq import fetch_diagnostic_traces
+
+    namespaces_internal_tls = {"ns1": True, "ns2": False, "ns3": False}
+    mocker.patch(
+        "azext_edge.edge.providers.support.mq.get_mq_namespaces_internal_tls",
+        return_value=namespaces_internal_tls,
+    )
+    # Every pull waits on the others, so collection only completes when namespaces are pulled concurrently.
+    barrier = Barrier(len(namespaces_internal_tls), timeout=10)
+
+    daemon_pulls = set()
+
+    def _get_traces(namespace: str, **_):
+        daemon_pulls.add(current_thread().daemon)
+        barrier.wait()
+        if namespace == "ns2":
+            raise RuntimeError("Diagnostics service unavailable.")
+        return iter([(ZipInfo(f"{namespace}.{i}.otlp.pb"), b"data") for i in range(3)])
+
+    patched_get_traces = mocker.patch("azext_edge.edge.providers.support.mq.get_traces", side_effect=_get_traces)
+    patched_logger = mocker.patch("azext_edge.edge.providers.support.mq.logger")
+
+    entries = list(fetch_diagnostic_traces())
+
+    assert sorted(entry["zinfo"].filename for entry in entries) == [
+        f"{namespace}/{MQ_DIRECTORY_PATH}/traces/{namespace}.{i}.otlp.pb"
+        for namespace in ["ns1", "ns3"]
+        for i in range(3)
+    ]
+    for call in patched_get_traces.call_args_list:
+        assert call.kwargs["internal_tls"] is namespaces_internal_tls[call.kwargs["namespace"]]
+    # Each namespace is accounted for, and the failed namespace is surfaced.
+    assert patched_logger.info.call_count == len(namespaces_internal_tls)
+    patched_logger.warning.assert_called_once()
+    assert "2 of 3" in patched_logger.warning.call_args.args[0]
+    assert "ns2" in patched_logger.warning.call_args.args[0]
+    # A pull blocked on the diagnostics socket must not hold up interpreter exit.
+    assert daemon_pulls == {True}
+
+
+def test_fetch_diagnostic_traces_failed_pulls(mocker):
+    from concurrent.futures import Future
+
+    from azext_edge.edge.providers.support.mq import fetch_diagnostic_traces
+
+    class _FailedPool:
+        # Pulls die before signalling completion.
+        def __init__(self, **_):
+            pass
+
+        def submit(self, *_):
+            future = Future()
+            future.set_exception(RuntimeError("Pull failed."))
+            return future
+
+        def shutdown(self, **_):
+            pass
+
+    mocker.patch(
+        "azext_edge.edge.providers.support.mq.get_mq_namespaces_internal_tls", return_value={"ns1": False, "ns2": True}
+    )
+    mocker.patch("azext_edge.edge.providers.support.mq.DaemonWorkerPool", _FailedPool)
+    mocker.patch("azext_edge.edge.providers.support.mq.TRACE_QUEUE_GET_TIMEOUT_SEC", 0.1)
+
+    # The consumer notices the failed pulls rather than waiting on the queue forever.
+    assert list(fetch_diagnostic_traces()) == []
+
+
+def test_get_mq_namespaces_internal_tls(mocked_mq_active_api):
+    from azext_edge.edge.providers.support.base import get_mq_namespaces_internal_tls
+
+    mocked_mq_active_api.get_resources.return_value = {
+        "items": [
+            {"metadata": {"namespace": "ns1"}, "spec": {"advanced": {"encryptInternalTraffic": "Enabled"}}},
+            {"metadata": {"namespace": "ns1"}, "spec": {}},
+            {"metadata": {"namespace": "ns2"}, "spec": {"advanced": {"encryptInternalTraffic": "Disabled"}}},
+            {"metadata": {"namespace": "ns3"}},
+        ]
+    }
+    # Brokers are listed once for the cluster, the first broker in a namespace decides.
+    assert get_mq_namespaces_internal_tls() == {"ns1": True, "ns2": False, "ns3": False}
+    mocked_mq_active_api.get_resources.assert_called_once()
+
+
+def test_fetch_diagnostic_traces_abandoned(mocker):
+    from azext_edge.edge.providers.support.mq import fetch_diagnostic_traces
+
+    mocker.patch(
+        "azext_edge.edge.providers.support.mq.get_mq_namespaces_internal_tls", return_value={"namespace": False}
+    )
+    pulled = 0
+
+    def _traces():
+        nonlocal pulled
+        while True:
+            pulled += 1
+            yield (ZipInfo("trace.otlp.pb"), b"data")
+
+    mocker.patch("azext_edge.edge.providers.support.mq.get_traces", return_value=_traces())
+
+    traces = fetch_diagnostic_traces()
+    next(traces)
+    traces.close()
+    # Pulls are bounded by the queue and stop once the consumer goes away.
+    sleep(1)
+    stopped_at = pulled
+    sleep(1)
+    assert pulled == stopped_at
+    assert pulled < 1000
+
+
 @pytest.mark.parametrize(
     "mocked_cluster_resources",
     [
@@ -966,3 +1082,459 @@ def test_create_bundle_schemas(
         directory_path=SCHEMAS_DIRECTORY_PATH,
         label_selector=SCHEMAS_NAME_LABEL,
     )
+
+
+class _CollectingWriter:
+    def __init__(self):
+        from threading import Lock
+
+        from azext_edge.edge.providers.support.manifest import BundleManifest
+
+        self.entries = []
+        self.manifest = BundleManifest()
+        self._lock = Lock()
+
+    def put(self, entry, **_):
+        with self._lock:
+            self.entries.append(entry)
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 4])
+def test_execute_bundle_work(mocked_root_logger, max_workers: Optional[int]):
+    from azext_edge.edge.providers.support_bundle import execute_bundle_work
+
+    def _raise():
+        raise RuntimeError("collector failure")
+
+    def _yield_entries(i: int):
+        yield {"data": f"a{i}", "zinfo": f"a/{i}"}
+        yield {"data": f"a{i}.log", "zinfo": f"a/{i}.log"}
+
+    pending_work = {
+        "svc_a": {f"element_{i}": partial(_yield_entries, i) for i in range(10)},
+        "svc_b": {"failing": _raise, "single": lambda: {"data": "b", "zinfo": "b/single"}},
+        "svc_c": {},
+    }
+    writer = _CollectingWriter()
+    completed = execute_bundle_work(
+        pending_work=pending_work, total_work_count=12, writer=writer, max_workers=max_workers
+    )
+
+    assert len(completed) == 11
+    assert ("svc_b", "failing") not in completed
+    assert len(writer.entries) == 21
+    assert {"data": "b", "zinfo": "b/single"} in writer.entries
+    for i in range(10):
+        assert {"data": f"a{i}.log", "zinfo": f"a/{i}.log"} in writer.entries
+    mocked_root_logger.debug.assert_called_once()
+
+
+def test_execute_bundle_work_element_timeout(mocked_root_logger):
+    from threading import Event
+
+    from azext_edge.edge.providers.support_bundle import execute_bundle_work
+
+    release = Event()
+
+    def _stuck():
+        yield {"data": "before", "zinfo": "before"}
+        release.wait(5)
+        yield {"data": "after", "zinfo": "after"}
+
+    pending_work = {
+        "svc": {
+            "stuck": _stuck,
+            "fast": lambda: {"data": "fast", "zinfo": "fast"},
+        }
+    }
+    writer = _CollectingWriter()
+    try:
+        completed = execute_bundle_work(
+            pending_work=pending_work, total_work_count=2, writer=writer, max_workers=2, element_timeout=1
+        )
+    finally:
+        release.set()
+
+    assert completed == [("svc", "fast")]
+    assert {"data": "after", "zinfo": "after"} not in writer.entries
+    assert writer.manifest.collectors["svc"]["stuck"]["status"] == "timedOut"
+    assert writer.manifest.collectors["svc"]["fast"]["status"] == "succeeded"
+    mocked_root_logger.warning.assert_called_once()
+    assert "svc stuck exceeded 1 seconds" in mocked_root_logger.warning.call_args.args[0]
+
+
+@pytest.mark.parametrize("collector", ["hung", "nested"])
+def test_execute_bundle_work_element_timeout_exits(collector: str):
+    import subprocess
+    import sys
+    from pathlib import Path
+    from time import monotonic
+
+    # A collector that never returns must not keep the process alive once it is abandoned. The nested
+    # collector stalls in a pod log read on the pod fan out workers it starts itself.
+    script = f"""
+from threading import Event
+from unittest.mock import patch
+
+from kubernetes.client.models import V1Container, V1ObjectMeta, V1Pod, V1PodList, V1PodSpec
+
+from azext_edge.edge.providers.support.base import process_v1_pods
+from azext_edge.edge.providers.support.manifest import BundleManifest
+from azext_edge.edge.providers.support_bundle import execute_bundle_work
+
+class Writer:
+    manifest = BundleManifest()
+    def put(self, entry, **_):
+        pass
+
+def _hung():
+    Event().wait()
+    return {{"data": "never", "zinfo": "never"}}
+
+def _nested():
+    return process_v1_pods(directory_path="dir", capture_previous_logs=False)
+
+pods = [
+    V1Pod(metadata=V1ObjectMeta(namespace="ns", name=f"pod-{{i}}"), spec=V1PodSpec(containers=[V1Container(name="c")]))
+    for i in range(4)
+]
+with patch("azext_edge.edge.providers.support.base.client") as mocked_client:
+    mocked_client.CoreV1Api().list_pod_for_all_namespaces.return_value = V1PodList(api_version="v1", items=pods)
+    mocked_client.CoreV1Api().read_namespaced_pod_log.side_effect = lambda *_, **__: Event().wait()
+    completed = execute_bundle_work(
+        pending_work={{"svc": {{"{collector}": _{collector}}}}}, total_work_count=1, writer=Writer(), element_timeout=1
+    )
+assert completed == []
+"""
+    repo_root = Path(__file__).resolve().parents[4]
+    started = monotonic()
+    result = subprocess.run([sys.executable, "-c", script], cwd=repo_root, timeout=60, capture_output=True)
+    assert result.returncode == 0, result.stderr
+    # Module imports aside, the process exits right after the element timeout.
+    assert monotonic() - started < 20
+
+
+def test_write_zip_dedup(mocked_zipfile):
+    from azext_edge.edge.providers.support_bundle import write_zip
+
+    trace_zinfo = ZipInfo("ns/broker/traces/trace_key")
+    bundle = {
+        "svc_b": {"pods": [{"data": "log", "zinfo": "ns/b/pod.log"}, {"data": "dupe", "zinfo": "ns/a/dupe.yaml"}]},
+        "svc_a": {
+            "crds": [{"data": {"kind": "Thing"}, "zinfo": "ns/a/dupe.yaml"}, None, {"data": "", "zinfo": "ns/a/empty"}],
+            "traces": [{"data": "trace", "zinfo": trace_zinfo}],
+            "single": {"data": "node", "zinfo": "nodes.yaml"},
+        },
+    }
+    write_zip(bundle=bundle, file_path="bundle.zip")
+
+    # pylint: disable-next=unnecessary-dunder-call
+    calls = mocked_zipfile(file="").__enter__().writestr.call_args_list
+    assert [c.kwargs["zinfo_or_arcname"] for c in calls] == [
+        "ns/b/pod.log",
+        "ns/a/dupe.yaml",
+        trace_zinfo,
+        "nodes.yaml",
+        "manifest.json",
+    ]
+    # first entry received for a duplicated path wins
+    assert calls[1].kwargs["data"] == "dupe"
+
+
+@pytest.mark.parametrize("buffer_size", [1, 1024 * 1024])
+def test_bundle_zip_writer(tmp_path, buffer_size: int):
+    from threading import Thread
+    from zipfile import ZipFile
+
+    from azext_edge.edge.providers.support_bundle import BundleZipWriter
+
+    file_path = str(tmp_path / "bundle.zip")
+    names = [f"ns/{generate_random_string()}.yaml" for _ in range(20)]
+    with BundleZipWriter(file_path=file_path, buffer_size=buffer_size) as writer:
+        producers = [
+            Thread(target=lambda chunk: [writer.put({"data": {"name": n}, "zinfo": n}) for n in chunk], args=(c,))
+            for c in [names[:10], names[10:]]
+        ]
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        writer.put({"data": "dupe", "zinfo": names[0]})
+
+    with ZipFile(file_path) as bundle_zip:
+        assert bundle_zip.namelist() == sorted(names + ["manifest.json"])
+        assert bundle_zip.read(names[0]).decode() == f"name: {names[0]}\n"
+
+
+def test_bundle_manifest_index(tmp_path, mocked_root_logger):
+    import json
+    from hashlib import sha256
+    from tempfile import SpooledTemporaryFile
+    from zipfile import ZipFile
+
+    from azext_edge.edge.providers.support_bundle import BundleZipWriter, execute_bundle_work
+
+    log = SpooledTemporaryFile()
+    log.write(b"log line\n")
+
+    def _raise():
+        raise RuntimeError("collector failure")
+
+    pending_work = {
+        "broker": {
+            "pods": lambda: [
+                {
+                    "data": {"kind": "Pod", "metadata": {"namespace": "aio", "resourceVersion": "7"}},
+                    "zinfo": "aio/broker/pod.a.yaml",
+                },
+                {
+                    "data": log,
+                    "zinfo": "aio/broker/pod.a.log",
+                    "namespace": "aio",
+                    "logCapturedAt": "2024-01-01T00:00:00.000000Z",
+                },
+                {
+                    "data": {"kind": "ClusterRole", "metadata": {"name": "broker-role"}},
+                    "zinfo": "aio/broker/clusterrole.broker-role.yaml",
+                },
+            ],
+            "failing": _raise,
+        },
+        "arcagents": {
+            "deployments": lambda: {
+                "data": {"kind": "Deployment", "metadata": {"namespace": "azure-arc"}},
+                "zinfo": "arcagents/clusterconnect-agent/deployment.clusterconnect-agent.yaml",
+            }
+        },
+        "common": {"nodes": lambda: {"data": "nodes", "zinfo": "nodes.yaml"}},
+    }
+    file_path = str(tmp_path / "bundle.zip")
+    with BundleZipWriter(file_path=file_path) as writer:
+        execute_bundle_work(pending_work=pending_work, total_work_count=4, writer=writer)
+
+    with ZipFile(file_path) as bundle_zip:
+        manifest = json.loads(bundle_zip.read("manifest.json"))
+        entries = manifest["entries"]
+        for path, attributes in entries.items():
+            content = bundle_zip.read(path)
+            assert attributes["size"] == len(content)
+            assert attributes["sha256"] == sha256(content).hexdigest()
+            assert attributes["durationSeconds"] >= 0
+
+    assert list(entries) == [
+        "aio/broker/clusterrole.broker-role.yaml",
+        "aio/broker/pod.a.log",
+        "aio/broker/pod.a.yaml",
+        "arcagents/clusterconnect-agent/deployment.clusterconnect-agent.yaml",
+        "nodes.yaml",
+    ]
+    pod = entries["aio/broker/pod.a.yaml"]
+    assert (pod["service"], pod["collector"], pod["kind"], pod["namespace"], pod["resourceVersion"]) == (
+        "broker",
+        "pods",
+        "Pod",
+        "aio",
+        "7",
+    )
+    assert entries["aio/broker/pod.a.log"]["kind"] == "Log"
+    assert entries["aio/broker/pod.a.log"]["size"] == len(b"log line\n")
+    assert entries["aio/broker/pod.a.log"]["namespace"] == "aio"
+    assert "namespace" not in entries["aio/broker/clusterrole.broker-role.yaml"]
+    arc_deployment = entries["arcagents/clusterconnect-agent/deployment.clusterconnect-agent.yaml"]
+    assert arc_deployment["namespace"] == "azure-arc"
+    assert "namespace" not in entries["nodes.yaml"]
+    assert manifest["collectors"]["broker"]["pods"]["entries"] == 3
+    assert manifest["collectors"]["broker"]["pods"]["status"] == "succeeded"
+    assert manifest["collectors"]["broker"]["failing"]["status"] == "failed"
+    assert manifest["collectors"]["common"]["nodes"]["durationSeconds"] >= 0
+
+
+@pytest.mark.parametrize(
+    "max_bytes, expected_log",
+    [
+        (None, b"line one\nline two\nline three\n"),
+        (16, b"line three\n"),
+        (11, b"line three\n"),
+        (4, b"ree\n"),
+    ],
+)
+def test_capture_pod_container_logs_streamed(mocker, max_bytes: Optional[int], expected_log: bytes):
+    from kubernetes.client.models import V1Container
+
+    from azext_edge.edge.providers.support.base import _capture_pod_container_logs, configure_log_capture
+
+    chunks = [b"line one\nli", b"ne two\nline", b" three\n"]
+    v1_api = mocker.Mock()
+    v1_api.read_namespaced_pod_log.return_value.stream.return_value = iter(chunks)
+
+    configure_log_capture(max_bytes=max_bytes, stream=True)
+    try:
+        result = list(
+            _capture_pod_container_logs(
+                directory_path="dir",
+                pod_containers=[V1Container(name="container")],
+                pod_name="pod",
+                pod_namespace="ns",
+                v1_api=v1_api,
+                capture_previous_logs=False,
+            )
+        )
+    finally:
+        configure_log_capture()
+
+    assert len(result) == 1
+    assert result[0]["zinfo"] == "ns/dir/pod.pod.container.log"
+    assert result[0]["data"].read() == expected_log
+    result[0]["data"].close()
+    assert v1_api.read_namespaced_pod_log.call_args.kwargs["_preload_content"] is False
+    v1_api.read_namespaced_pod_log.return_value.release_conn.assert_called_once()
+
+
+@pytest.mark.parametrize("max_workers", [1, 3])
+def test_ordered_fan_out(max_workers: int):
+    from threading import current_thread
+    from time import sleep
+
+    from azext_edge.edge.providers.support.base import ordered_fan_out
+
+    daemon_workers = set()
+
+    def _process(i: int):
+        daemon_workers.add(current_thread().daemon)
+        # Later items finish first.
+        sleep(0.01 * (10 - i))
+        return [{"zinfo": f"{i}.yaml"}, {"zinfo": f"{i}.log"}]
+
+    result = list(ordered_fan_out(func=_process, items=list(range(10)), max_workers=max_workers))
+    assert [r["zinfo"] for r in result] == [f"{i}.{ext}" for i in range(10) for ext in ["yaml", "log"]]
+    if max_workers > 1:
+        # Work stalled on an abandoned fan out must not hold up interpreter exit.
+        assert daemon_workers == {True}
+
+
+def test_process_v1_pods_skips_previous_logs_without_restarts(mocker):
+    from kubernetes.client.models import (
+        V1Container,
+        V1ContainerStatus,
+        V1ObjectMeta,
+        V1Pod,
+        V1PodList,
+        V1PodSpec,
+        V1PodStatus,
+    )
+
+    from azext_edge.edge.providers.support.base import process_v1_pods
+
+    def _status(name: str, restart_count: int):
+        return V1ContainerStatus(name=name, restart_count=restart_count, image="", image_id="", ready=True)
+
+    pods = [
+        V1Pod(
+            metadata=V1ObjectMeta(namespace="ns", name=f"pod-{i}"),
+            spec=V1PodSpec(containers=[V1Container(name="stable"), V1Container(name="restarted")]),
+            status=V1PodStatus(phase="Running", container_statuses=[_status("stable", 0), _status("restarted", 2)]),
+        )
+        for i in range(6)
+    ]
+    patched = mocker.patch("azext_edge.edge.providers.support.base.client", autospec=True)
+    patched.CoreV1Api().list_pod_for_all_namespaces.return_value = V1PodList(api_version="v1", items=pods)
+    patched.CoreV1Api().read_namespaced_pod_log.return_value = "log"
+
+    result = list(process_v1_pods(directory_path="dir"))
+
+    expected = []
+    for i in range(6):
+        expected.extend(
+            [
+                f"ns/dir/pod.pod-{i}.yaml",
+                f"ns/dir/pod.pod-{i}.stable.log",
+                f"ns/dir/pod.pod-{i}.restarted.log",
+                f"ns/dir/pod.pod-{i}.restarted.previous.log",
+            ]
+        )
+    assert [r["zinfo"] for r in result] == expected
+    previous_calls = [c for c in patched.CoreV1Api().read_namespaced_pod_log.call_args_list if c.kwargs["previous"]]
+    assert len(previous_calls) == 6
+    assert {c.kwargs["container"] for c in previous_calls} == {"restarted"}
+
+
+def test_process_v1_pods_lists_metrics_per_namespace(mocker):
+    from kubernetes.client.models import V1ObjectMeta, V1Pod, V1PodList, V1PodSpec
+
+    from azext_edge.edge.providers.support.base import process_v1_pods
+
+    pods = [
+        V1Pod(metadata=V1ObjectMeta(namespace=ns, name=f"pod-{i}"), spec=V1PodSpec(containers=[]))
+        for ns in ["ns1", "ns2"]
+        for i in range(5)
+    ]
+    mocked_support_client = mocker.patch("azext_edge.edge.providers.support.base.client", autospec=True)
+    mocked_support_client.CoreV1Api().list_pod_for_all_namespaces.return_value = V1PodList(api_version="v1", items=pods)
+    mocked_base_client = mocker.patch("azext_edge.edge.providers.base.client", autospec=True)
+    mocker.patch.dict("azext_edge.edge.providers.base._metrics_cache", clear=True)
+    mocked_base_client.CustomObjectsApi().list_namespaced_custom_object.side_effect = lambda **kwargs: {
+        "items": [{"metadata": {"name": "pod-1", "namespace": kwargs["namespace"]}, "usage": {"cpu": "1m"}}]
+    }
+
+    result = list(process_v1_pods(directory_path="dir", include_metrics=True, capture_previous_logs=False))
+
+    assert mocked_base_client.CustomObjectsApi().list_namespaced_custom_object.call_count == 2
+    metrics = [r for r in result if r["zinfo"].endswith(".metric.yaml")]
+    assert [m["zinfo"] for m in metrics] == ["ns1/dir/pod.pod-1.metric.yaml", "ns2/dir/pod.pod-1.metric.yaml"]
+    assert metrics[0]["data"]["kind"] == "PodMetrics"
+    assert metrics[0]["data"]["apiVersion"] == "metrics.k8s.io/v1beta1"
+
+
+def test_get_pod_metrics_locks_per_namespace(mocker):
+    from concurrent.futures import ThreadPoolExecutor
+    from threading import Event
+
+    from azext_edge.edge.providers.base import get_pod_metrics
+
+    mocked_base_client = mocker.patch("azext_edge.edge.providers.base.client", autospec=True)
+    mocker.patch.dict("azext_edge.edge.providers.base._metrics_cache", clear=True)
+    ns2_listed = Event()
+    ns1_unblocked = []
+
+    def _list(namespace: str, **_):
+        # The ns1 list call is only answered once ns2 has been listed alongside it.
+        if namespace == "ns1":
+            ns1_unblocked.append(ns2_listed.wait(10))
+        else:
+            ns2_listed.set()
+        return {"items": [{"metadata": {"name": f"{namespace}-pod"}}]}
+
+    mocked_base_client.CustomObjectsApi().list_namespaced_custom_object.side_effect = _list
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = [executor.submit(get_pod_metrics, namespace) for namespace in ["ns1", "ns1", "ns2"]]
+        results = [future.result() for future in futures]
+
+    assert ns1_unblocked == [True]
+    assert [list(result) for result in results] == [["ns1-pod"], ["ns1-pod"], ["ns2-pod"]]
+    # Callers for the same namespace still share a single list call.
+    assert mocked_base_client.CustomObjectsApi().list_namespaced_custom_object.call_count == 2
+
+
+def test_bundle_zip_writer_streams(tmp_path):
+    from tempfile import SpooledTemporaryFile
+    from zipfile import ZipFile
+
+    from azext_edge.edge.providers.support_bundle import BundleZipWriter
+
+    def _spool(content: bytes):
+        spool = SpooledTemporaryFile()
+        spool.write(content)
+        spool.seek(0)
+        return spool
+
+    file_path = str(tmp_path / "bundle.zip")
+    empty = _spool(b"")
+    with BundleZipWriter(file_path=file_path) as writer:
+        writer.put({"data": _spool(b"streamed log\n" * 1000), "zinfo": "ns/pod.log"})
+        writer.put({"data": empty, "zinfo": "ns/empty.log"})
+        writer.put({"data": "plain", "zinfo": "ns/plain.log"})
+
+    assert empty.closed
+    with ZipFile(file_path) as bundle_zip:
+        assert bundle_zip.namelist() == ["manifest.json", "ns/plain.log", "ns/pod.log"]
+        assert bundle_zip.read("ns/pod.log") == b"streamed log\n" * 1000
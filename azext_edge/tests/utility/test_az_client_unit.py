@@ -4,8 +4,10 @@
 # Licensed under the MIT License. See License file in the project root for license information.
 # ----------------------------------------------------------------------------------------------
 
+from typing import Optional
+
 import pytest
-from ..generators import generate_random_string
+from ..generators import generate_random_string, get_zeroed_subscription
 
 AZ_CLIENT_PATH = "azext_edge.edge.util.az_client"
 
@@ -13,7 +15,7 @@ AZ_CLIENT_PATH = "azext_edge.edge.util.az_client"
 @pytest.mark.parametrize("done", [True, False])
 def test_wait_for_terminal_state(mocker, done):
     # could be fixture with param
-    sleep_patch = mocker.patch(f"{AZ_CLIENT_PATH}.sleep")
+    wait_patch = mocker.patch(f"{AZ_CLIENT_PATH}._wait_for_wake")
     poll_num = 10
     mocker.patch(f"{AZ_CLIENT_PATH}.POLL_RETRIES", poll_num)
 
@@ -25,7 +27,87 @@ def test_wait_for_terminal_state(mocker, done):
 
     result = wait_for_terminal_state(poller)
     assert result == poller.result.return_value
-    assert sleep_patch.call_count == (1 if done else poll_num)
+    # completed operations are not waited on
+    assert wait_patch.call_count == (0 if done else poll_num)
+    for wait_call in wait_patch.call_args_list:
+        assert wait_call.args[1] <= 15 * 1.2
+
+
+class _ThreadedPoller:
+    """Completes on a timer, signalling done callbacks like LROPoller."""
+
+    def __init__(self, delay: float, retry_after: Optional[str] = None):
+        from threading import Event, Timer
+
+        self._done = Event()
+        self._callbacks = []
+        self._retry_after = retry_after
+        self._timer = Timer(delay, self._complete)
+        self._timer.start()
+
+    def _complete(self):
+        self._done.set()
+        for callback in self._callbacks:
+            callback(self)
+
+    def add_done_callback(self, func):
+        if self._done.is_set():
+            func(self)
+        self._callbacks.append(func)
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def polling_method(self):
+        from unittest.mock import Mock
+
+        headers = {"retry-after": self._retry_after} if self._retry_after else {}
+        return Mock(_pipeline_response=Mock(http_response=Mock(headers=headers)))
+
+    def result(self):
+        return {"done": self.done()}
+
+
+def test_wait_for_terminal_states_wakes_on_completion():
+    from time import monotonic
+
+    from azext_edge.edge.util.az_client import _wait_for_pollers, wait_for_terminal_states
+
+    # Without early wake-up, the 15 second max interval would be reached.
+    pollers = [_ThreadedPoller(delay) for delay in [0.1, 0.3, 0.6]]
+    started = monotonic()
+    result = wait_for_terminal_states(*pollers)
+    assert monotonic() - started < 5
+    assert result == tuple(pollers)
+    assert all(poller.done() for poller in pollers)
+
+    latencies = _wait_for_pollers([_ThreadedPoller(0.2), _ThreadedPoller(0.4)], retries=10, max_wait_sec=15)
+    assert set(latencies) == {0, 1}
+    assert latencies[0] < latencies[1] < 5
+
+
+@pytest.mark.parametrize(
+    "retry_after, expected_min_delay",
+    [(None, 0.5), ("3", 3), ("Fri, 31 Dec 1999 23:59:59 GMT", 0.5)],
+)
+def test_wait_for_pollers_backoff(mocker, retry_after: Optional[str], expected_min_delay: float):
+    from azext_edge.edge.util.az_client import POLL_JITTER, _wait_for_pollers
+
+    wait_patch = mocker.patch(f"{AZ_CLIENT_PATH}._wait_for_wake")
+    poller = _ThreadedPoller(delay=60, retry_after=retry_after)
+    try:
+        latencies = _wait_for_pollers([poller], retries=6, max_wait_sec=4)
+    finally:
+        poller._timer.cancel()
+
+    assert latencies == {}
+    delays = [wait_call.args[1] for wait_call in wait_patch.call_args_list]
+    assert len(delays) == 6
+    assert delays[0] >= expected_min_delay * (1 - POLL_JITTER)
+    assert delays[0] <= max(expected_min_delay, 0.5) * (1 + POLL_JITTER)
+    # backoff is capped by the max wait
+    assert all(delay <= 4 * (1 + POLL_JITTER) for delay in delays)
+    assert delays[-1] >= 4 * (1 - POLL_JITTER)
 
 
 def test_get_tenant_id(mocker):
@@ -38,3 +120,46 @@ def test_get_tenant_id(mocker):
     result = get_tenant_id()
     assert result == tenant_id
     profile_patch.assert_called_once()
+
+
+def test_get_mgmt_client():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from azext_edge.edge.util.az_client import (
+        CLIENT_POOL_MAXSIZE,
+        DeviceRegistryMgmtApiVersion,
+        clear_mgmt_clients,
+        get_registry_mgmt_client,
+        get_resource_client,
+        get_shared_transport,
+    )
+
+    subscription_id = get_zeroed_subscription()
+    # One client per client type, subscription and api version, even when requested concurrently.
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(executor.map(lambda _: get_resource_client(subscription_id=subscription_id), range(32)))
+    client = clients[0]
+    assert all(c is client for c in clients)
+    assert get_resource_client(subscription_id=generate_random_string()) is not client
+    registry_client = get_registry_mgmt_client(subscription_id=subscription_id)
+    assert get_registry_mgmt_client(subscription_id=subscription_id, api_version="2024-11-01") is registry_client
+    assert (
+        get_registry_mgmt_client(
+            subscription_id=subscription_id, api_version=DeviceRegistryMgmtApiVersion.V20250701_preview
+        )
+        is not registry_client
+    )
+    # Caller specific configuration gets a dedicated client.
+    assert get_resource_client(subscription_id=subscription_id, polling_interval=1) is not client
+
+    # All clients send over the shared pooled transport, which outlives any one client.
+    transport = get_shared_transport()
+    assert client._client._pipeline._transport is transport
+    assert registry_client._client._pipeline._transport is transport
+    assert transport.session.get_adapter("https://management.azure.com")._pool_maxsize == CLIENT_POOL_MAXSIZE
+    client.close()
+    assert transport.session is not None
+
+    clear_mgmt_clients()
+    assert get_resource_client(subscription_id=subscription_id) is not client
+    assert get_shared_transport() is transport
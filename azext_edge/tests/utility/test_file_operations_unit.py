@@ -8,11 +8,12 @@ import csv
 import json
 import yaml
 import os
+from types import GeneratorType
 from typing import List, NamedTuple, Optional, Union
 from pathlib import Path
 
 import pytest
-from azure.cli.core.azclierror import FileOperationError
+from azure.cli.core.azclierror import FileOperationError, InvalidArgumentValueError
 
 from ..generators import generate_random_string
 
@@ -230,3 +231,91 @@ def test_try_loading_as(mocker, error, raise_error, return_value):
         )
         assert result == (None if error else return_value)
     loader.assert_called_once_with(content)
+
+
+@pytest.mark.parametrize("encoding", ["utf-8-sig", "utf-8"])
+def test_iter_file_records_csv(tmp_path, encoding):
+    from azext_edge.edge.util import iter_file_records
+
+    file_path = tmp_path / "points.csv"
+    rows = [{"Name": generate_random_string(), "Queue Size": str(i)} for i in range(3)]
+    with open(file_path, "w", encoding=encoding, newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["Name", "Queue Size"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    records = iter_file_records(file_path=str(file_path))
+    # rows are read lazily
+    assert next(records) == rows[0]
+    assert list(records) == rows[1:]
+
+    with pytest.raises(FileOperationError, match="does not exist."):
+        list(iter_file_records(file_path=str(tmp_path / "missing.csv")))
+
+
+@pytest.mark.parametrize("extension", ["txt", "csv.bak"])
+def test_iter_file_records_csv_unknown_extension(tmp_path, extension):
+    from azext_edge.edge.util import iter_file_records
+
+    file_path = tmp_path / f"points.{extension}"
+    rows = [{"Name": generate_random_string(), "Queue Size": str(i)} for i in range(3)]
+    with open(file_path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=["Name", "Queue Size"])
+        writer.writeheader()
+        writer.writerows(rows)
+
+    assert list(iter_file_records(file_path=str(file_path), csv_fieldnames=["Name", "name"])) == rows
+
+    # Without a known column in the header row the content is not guessed to be CSV.
+    with pytest.raises(InvalidArgumentValueError, match="Invalid file extension"):
+        list(iter_file_records(file_path=str(file_path), csv_fieldnames=["name"]))
+    with pytest.raises(InvalidArgumentValueError, match="Invalid file extension"):
+        list(iter_file_records(file_path=str(file_path)))
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        # JSON records are imported as JSON.
+        '[{"name": "point", "dataSource": "ns=1;i=1"}]',
+        # Damaged JSON and plain text are rejected rather than read as CSV.
+        '[{"name": "point", "dataSource": "ns=1;i=1"}',
+        "some notes about the data points",
+    ],
+)
+def test_iter_file_records_txt(tmp_path, content):
+    from azext_edge.edge.util import iter_file_records
+
+    file_path = tmp_path / "points.txt"
+    file_path.write_text(content)
+    records = iter_file_records(file_path=str(file_path), csv_fieldnames=["Name", "name"])
+
+    if content.endswith("]"):
+        assert list(records) == json.loads(content)
+        return
+    with pytest.raises(InvalidArgumentValueError, match="Invalid file extension found for"):
+        list(records)
+
+
+@pytest.mark.parametrize("content", [
+    [{"name": generate_random_string()}, {"name": generate_random_string()}],
+    ({"name": generate_random_string()} for _ in range(2)),
+    {"name": generate_random_string()},
+    generate_random_string(),
+    None,
+])
+def test_iter_file_records_deserialized(mocker, content):
+    patched_deserialize = mocker.patch(
+        "azext_edge.edge.util.file_operations.deserialize_file_content", return_value=content
+    )
+    from azext_edge.edge.util import iter_file_records
+    file_path = f"{generate_random_string()}.json"
+
+    if isinstance(content, (list, GeneratorType)):
+        expected = list(content)
+        patched_deserialize.return_value = iter(expected)
+        assert list(iter_file_records(file_path=file_path)) == expected
+    else:
+        with pytest.raises(FileOperationError, match="must be a list."):
+            list(iter_file_records(file_path=file_path))
+    patched_deserialize.assert_called_once_with(file_path=file_path)
@@ -0,0 +1,76 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import pytest
+
+from azext_edge.edge.util.kql import QueryTemplate, join_instance, quote
+
+from ..generators import generate_random_string
+
+TEMPLATE = QueryTemplate(
+    resource_type="Microsoft.Test/widgets",
+    filters={
+        "resource_group_name": ("resourceGroup", "=~"),
+        "name": ("name", "=~"),
+        "enabled": ("properties.enabled", "=="),
+    },
+    tail=["project id, name"],
+)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("widget", '"widget"'),
+        ('say "hi"', '"say \\"hi\\""'),
+        ("C:\\path", '"C:\\\\path"'),
+        (True, "true"),
+        (False, "false"),
+        (7, "7"),
+    ],
+)
+def test_quote(value, expected):
+    assert quote(value) == expected
+
+
+def test_query_template_render():
+    name = generate_random_string()
+    resource_group = generate_random_string()
+
+    result = TEMPLATE.render(name=name, resource_group_name=resource_group, enabled=False)
+    assert result == (
+        'Resources | where type =~ "Microsoft.Test/widgets" '
+        f'| where resourceGroup =~ "{resource_group}" | where name =~ "{name}" '
+        "| where properties.enabled == false | project id, name"
+    )
+    # Filters render in declaration order, and unset filters are skipped.
+    assert TEMPLATE.render(enabled=False, resource_group_name=resource_group, name=name) == result
+    assert TEMPLATE.render(name=name, resource_group_name="", enabled=None) == (
+        f'Resources | where type =~ "Microsoft.Test/widgets" | where name =~ "{name}" | project id, name'
+    )
+    # Custom queries are trimmed and land before the tail.
+    assert TEMPLATE.render(custom_query="  | where location =~ 'westus' ") == (
+        "Resources | where type =~ \"Microsoft.Test/widgets\" | where location =~ 'westus' | project id, name"
+    )
+    assert TEMPLATE.render_custom("| take 1") == 'Resources | where type =~ "Microsoft.Test/widgets" | take 1'
+
+    with pytest.raises(ValueError):
+        TEMPLATE.render(model=generate_random_string())
+
+
+@pytest.mark.parametrize("instance_name", [None, generate_random_string()])
+@pytest.mark.parametrize("instance_resource_group", [None, generate_random_string()])
+def test_join_instance(instance_name, instance_resource_group):
+    query = TEMPLATE.render()
+    result = join_instance(query, instance_name=instance_name, instance_resource_group=instance_resource_group)
+    if not any([instance_name, instance_resource_group]):
+        assert result == query
+        return
+
+    assert result.startswith('Resources | where type =~ "microsoft.iotoperations/instances"')
+    assert f"| join kind=innerunique ({query}) on customLocation | project-away customLocation1" in result
+    assert (f'| where name =~ "{instance_name}"' in result) is bool(instance_name)
+    assert (f'| where resourceGroup =~ "{instance_resource_group}"' in result) is bool(instance_resource_group)
@@ -0,0 +1,75 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+from typing import Dict
+
+import pytest
+
+from azext_edge.edge.util.prometheus import PrometheusSample, is_counter, iter_samples
+
+EXPOSITION = """
+# HELP aio_broker_publishes_received Publishes received.
+# TYPE aio_broker_publishes_received counter
+aio_broker_publishes_received{pod="aio-broker-frontend-0"} 42
+aio_broker_publishes_received{pod="aio-broker-frontend-1",topic="a b}"} 7 1700000000000
+# TYPE aio_broker_connected_sessions gauge
+aio_broker_connected_sessions 3
+# TYPE request_duration_seconds histogram
+request_duration_seconds_bucket{le="+Inf"} 10
+request_duration_seconds_count 10
+request_duration_seconds_sum 2.5
+untyped_requests_total 9
+malformed_line
+malformed_value{a="b"} NaNx
+"""
+
+
+def test_iter_samples():
+    types: Dict[str, str] = {}
+    samples = list(iter_samples(EXPOSITION.splitlines(), types=types))
+
+    assert samples == [
+        PrometheusSample(
+            name="aio_broker_publishes_received",
+            series='aio_broker_publishes_received{pod="aio-broker-frontend-0"}',
+            value=42.0,
+        ),
+        PrometheusSample(
+            name="aio_broker_publishes_received",
+            series='aio_broker_publishes_received{pod="aio-broker-frontend-1",topic="a b}"}',
+            value=7.0,
+        ),
+        PrometheusSample(name="aio_broker_connected_sessions", series="aio_broker_connected_sessions", value=3.0),
+        PrometheusSample(
+            name="request_duration_seconds_bucket", series='request_duration_seconds_bucket{le="+Inf"}', value=10.0
+        ),
+        PrometheusSample(name="request_duration_seconds_count", series="request_duration_seconds_count", value=10.0),
+        PrometheusSample(name="request_duration_seconds_sum", series="request_duration_seconds_sum", value=2.5),
+        PrometheusSample(name="untyped_requests_total", series="untyped_requests_total", value=9.0),
+    ]
+    assert types == {
+        "aio_broker_publishes_received": "counter",
+        "aio_broker_connected_sessions": "gauge",
+        "request_duration_seconds": "histogram",
+    }
+
+
+@pytest.mark.parametrize(
+    "name, types, expected",
+    [
+        ("aio_broker_publishes_received", {"aio_broker_publishes_received": "counter"}, True),
+        ("aio_broker_connected_sessions", {"aio_broker_connected_sessions": "gauge"}, False),
+        ("requests_total", {"requests": "counter"}, True),
+        ("requests_total", {}, True),
+        ("requests_total", {"requests_total": "gauge"}, False),
+        ("request_duration_seconds_count", {"request_duration_seconds": "histogram"}, True),
+        ("request_duration_seconds_sum", {"request_duration_seconds": "summary"}, True),
+        ("request_duration_seconds_bucket", {"request_duration_seconds": "histogram"}, False),
+        ("request_duration_seconds_count", {}, False),
+    ],
+)
+def test_is_counter(name: str, types: Dict[str, str], expected: bool):
+    assert is_counter(name, types) is expected
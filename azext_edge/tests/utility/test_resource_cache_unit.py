@@ -0,0 +1,234 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+import json
+from typing import Optional
+from unittest.mock import Mock
+
+import pytest
+
+from azext_edge.edge.util.resource_cache import (
+    CACHE_FILE_NAME,
+    ResourceCache,
+    disable_resource_cache,
+    get_cache_key,
+    get_resource_cache,
+)
+
+from ..generators import generate_random_string, get_zeroed_subscription
+
+SUB = get_zeroed_subscription()
+CLUSTER_ID = f"/subscriptions/{SUB}/resourceGroups/rg/providers/Microsoft.Kubernetes/connectedClusters/cluster"
+EXTENSIONS_ID = f"{CLUSTER_ID}/providers/Microsoft.KubernetesConfiguration/extensions"
+
+
+@pytest.fixture
+def mocked_time(mocker):
+    clock = {"now": 1000.0}
+    mocker.patch("azext_edge.edge.util.resource_cache.time", side_effect=lambda: clock["now"])
+    yield clock
+
+
+def test_resource_cache_ttl_and_persistence(tmp_path, mocked_time):
+    path = str(tmp_path / CACHE_FILE_NAME)
+    key = get_cache_key(SUB, CLUSTER_ID, "2024-07-15-preview")
+    fetch = Mock(return_value={"id": CLUSTER_ID})
+
+    cache = ResourceCache(path=path, ttl_seconds=60)
+    assert cache.get_or_fetch(key, fetch) == {"id": CLUSTER_ID}
+    assert cache.get_or_fetch(key, fetch) == {"id": CLUSTER_ID}
+    assert fetch.call_count == 1
+
+    # A later invocation is served from disk until the entry expires.
+    mocked_time["now"] += 59
+    assert ResourceCache(path=path, ttl_seconds=60).get(key) == {"id": CLUSTER_ID}
+    mocked_time["now"] += 1
+    assert ResourceCache(path=path, ttl_seconds=60).get(key) is None
+
+    # Keys are case insensitive and include the api version.
+    assert key == get_cache_key(SUB.upper(), CLUSTER_ID.upper(), "2024-07-15-PREVIEW")
+    assert key != get_cache_key(SUB, CLUSTER_ID, "2025-01-01")
+
+
+def test_resource_cache_lru_eviction(tmp_path, mocked_time):
+    path = str(tmp_path / CACHE_FILE_NAME)
+    cache = ResourceCache(path=path, ttl_seconds=600, max_entries=2)
+    keys = [get_cache_key(SUB, f"{CLUSTER_ID}{i}", "v1") for i in range(3)]
+
+    cache.set(keys[0], 0)
+    mocked_time["now"] += 1
+    cache.set(keys[1], 1)
+    mocked_time["now"] += 1
+    # Touch the first entry so the second is least recently used.
+    assert cache.get(keys[0]) == 0
+    mocked_time["now"] += 1
+    cache.set(keys[2], 2)
+
+    with open(path, encoding="utf8") as f:
+        assert sorted(json.load(f)["entries"]) == sorted([keys[0], keys[2]])
+
+
+def test_resource_cache_invalidate_resource(tmp_path):
+    cache = ResourceCache(path=str(tmp_path / CACHE_FILE_NAME), ttl_seconds=600)
+    keys = {
+        "cluster": get_cache_key(SUB, CLUSTER_ID, "v1"),
+        "extensions": get_cache_key(SUB, EXTENSIONS_ID, "v1"),
+        "sibling": get_cache_key(SUB, f"{CLUSTER_ID}2", "v1"),
+    }
+    for key in keys.values():
+        cache.set(key, {})
+
+    # Deleting an extension drops the extension list and the cluster which contains it.
+    cache.invalidate_resource(f"{EXTENSIONS_ID}/aio")
+    assert cache.get(keys["extensions"]) is None
+    assert cache.get(keys["cluster"]) is None
+    assert cache.get(keys["sibling"]) == {}
+
+
+def test_resource_cache_concurrent_invocations(tmp_path):
+    path = str(tmp_path / CACHE_FILE_NAME)
+    keys = {
+        "cluster": get_cache_key(SUB, CLUSTER_ID, "v1"),
+        "extensions": get_cache_key(SUB, EXTENSIONS_ID, "v1"),
+        "sibling": get_cache_key(SUB, f"{CLUSTER_ID}2", "v1"),
+    }
+    first = ResourceCache(path=path, ttl_seconds=600)
+    second = ResourceCache(path=path, ttl_seconds=600)
+
+    first.set(keys["cluster"], "cluster")
+    assert second.get(keys["cluster"]) == "cluster"
+    # Writes merge with the file, so neither invocation loses the other's entries.
+    second.set(keys["extensions"], "extensions")
+    first.set(keys["sibling"], "sibling")
+    with open(path, encoding="utf8") as f:
+        assert sorted(json.load(f)["entries"]) == sorted(keys.values())
+
+    # An invalidation elsewhere is seen by reads, and a stale copy is never written back.
+    second.invalidate_resource(CLUSTER_ID)
+    assert first.get(keys["cluster"]) is None
+    first.set(keys["sibling"], "updated")
+    with open(path, encoding="utf8") as f:
+        assert json.load(f)["entries"].keys() == {keys["sibling"]}
+
+
+def test_resource_cache_get_does_not_write(tmp_path, mocked_time):
+    path = tmp_path / CACHE_FILE_NAME
+    key = get_cache_key(SUB, CLUSTER_ID, "v1")
+    cache = ResourceCache(path=str(path), ttl_seconds=600)
+    cache.set(key, {"id": CLUSTER_ID})
+    content = path.read_text()
+
+    mocked_time["now"] += 10
+    for _ in range(3):
+        assert cache.get(key) == {"id": CLUSTER_ID}
+    assert path.read_text() == content
+
+    # Recency is persisted once.
+    cache.flush()
+    assert json.loads(path.read_text())["entries"][key]["accessedAt"] == mocked_time["now"]
+
+
+def test_resource_cache_file_lock(tmp_path, mocker):
+    import os
+    from time import time
+
+    mocker.patch("azext_edge.edge.util.resource_cache.CACHE_LOCK_TIMEOUT_SEC", 0.1)
+    path = tmp_path / CACHE_FILE_NAME
+    lock_path = tmp_path / f"{CACHE_FILE_NAME}.lock"
+    key = get_cache_key(SUB, CLUSTER_ID, "v1")
+    cache = ResourceCache(path=str(path), ttl_seconds=600)
+
+    # The write is skipped while another invocation holds the lock.
+    lock_path.touch()
+    cache.set(key, {})
+    assert not path.exists()
+    assert lock_path.exists()
+
+    # A lock left behind by an interrupted invocation is broken.
+    os.utime(lock_path, (time() - 60, time() - 60))
+    cache.set(key, {})
+    assert key in json.loads(path.read_text())["entries"]
+    assert not lock_path.exists()
+
+
+def test_resource_cache_damaged_file(tmp_path):
+    path = tmp_path / CACHE_FILE_NAME
+    path.write_text("{not json")
+    cache = ResourceCache(path=str(path), ttl_seconds=600)
+    assert cache.get(get_cache_key(SUB, CLUSTER_ID, "v1")) is None
+    cache.set(get_cache_key(SUB, CLUSTER_ID, "v1"), {"id": CLUSTER_ID})
+    assert json.loads(path.read_text())["formatVersion"] == "v1"
+
+
+@pytest.mark.parametrize(
+    "ttl, no_cache, expected", [(None, None, False), (0, None, False), (300, None, True), (300, True, False)]
+)
+def test_get_resource_cache(tmp_path, ttl: Optional[int], no_cache: Optional[bool], expected: bool):
+    def _getint(section: str, option: str, fallback: int) -> int:
+        assert section == "iotops"
+        return ttl if ttl is not None and option == "cache_ttl" else fallback
+
+    cli_ctx = Mock(data={})
+    cli_ctx.config.config_dir = str(tmp_path)
+    cli_ctx.config.getint.side_effect = _getint
+    if no_cache:
+        disable_resource_cache(cli_ctx)
+
+    resource_cache = get_resource_cache(cli_ctx)
+    assert bool(resource_cache) is expected
+    if expected:
+        assert resource_cache.ttl_seconds == ttl
+        assert resource_cache.path == str(tmp_path / CACHE_FILE_NAME)
+        assert get_resource_cache(cli_ctx) is resource_cache
+
+
+def test_queryable_get_cached(mocked_cmd, tmp_path, mocker):
+    from azext_edge.edge.util.queryable import Queryable
+
+    queryable = Queryable(cmd=mocked_cmd)
+    fetch = Mock(return_value={"name": generate_random_string()})
+    # Caching is off unless configured.
+    assert queryable.resource_cache is None
+    queryable.get_cached(resource_id=CLUSTER_ID, api_version="v1", fetch=fetch)
+    queryable.get_cached(resource_id=CLUSTER_ID, api_version="v1", fetch=fetch)
+    assert fetch.call_count == 2
+
+    queryable.resource_cache = ResourceCache(path=str(tmp_path / CACHE_FILE_NAME), ttl_seconds=600)
+    first = queryable.get_cached(resource_id=CLUSTER_ID, api_version="v1", fetch=fetch)
+    assert queryable.get_cached(resource_id=CLUSTER_ID, api_version="v1", fetch=fetch) == first
+    assert fetch.call_count == 3
+    queryable.invalidate_cached(CLUSTER_ID)
+    queryable.get_cached(resource_id=CLUSTER_ID, api_version="v1", fetch=fetch)
+    assert fetch.call_count == 4
+
+
+def test_queryable_cached_query(mocked_cmd, tmp_path, mocker):
+    from azext_edge.edge.util.queryable import Queryable
+
+    queryable = Queryable(cmd=mocked_cmd)
+    queryable.resource_cache = ResourceCache(path=str(tmp_path / CACHE_FILE_NAME), ttl_seconds=600)
+    rows = [{"name": generate_random_string()}]
+    mocked_query = mocker.patch.object(queryable.resource_graph, "query_resources", return_value={"data": rows})
+    mocked_count = mocker.patch.object(queryable.resource_graph, "count", return_value=1)
+    query = generate_random_string()
+
+    # Repeated queries and counts are served from the cache, keyed by query text and top.
+    assert queryable.process_query(query=query) == rows
+    assert queryable.process_query(query=query, page_size=10) == rows
+    assert mocked_query.call_count == 1
+    queryable.process_query(query=query, top=1)
+    queryable.process_query(query=generate_random_string())
+    assert mocked_query.call_count == 3
+    assert queryable.process_query(query=query, count=True) == {"count": 1}
+    assert queryable.process_query(query=query, count=True) == {"count": 1}
+    assert mocked_count.call_count == 1
+
+    # Any invalidation drops cached query results.
+    queryable.invalidate_cached(CLUSTER_ID)
+    queryable.process_query(query=query)
+    queryable.process_query(query=query, count=True)
+    assert mocked_query.call_count == 4
+    assert mocked_count.call_count == 2
@@ -115,3 +115,129 @@ def test_query_resources(mocker, mocked_cmd, test_scenario: dict):
                 assert mocked_send_raw_request.call_args_list[i + 1].kwargs == expected_send_raw_request_call
 
     assert mocked_send_raw_request.call_count == total_send_raw_request_calls
+
+
+@pytest.mark.parametrize("query_count", [1, 5])
+def test_query_resources_batch(mocker, mocked_cmd, query_count: int):
+    mocked_send_raw_request: Mock = mocker.patch("azext_edge.edge.util.resource_graph.send_raw_request")
+    # Every query returns two pages, where each record echoes its query.
+    skip_token = generate_random_string()
+
+    def _send_raw_request(body: str, **_):
+        request_body = json.loads(body)
+        response = mocker.MagicMock()
+        if "$skipToken" in request_body["options"]:
+            response.json.return_value = {"data": [{"query": request_body["query"], "page": 2}]}
+        else:
+            assert request_body["options"]["$top"] == GRAPH_MAX_PAGE_SIZE
+            response.json.return_value = {
+                "data": [{"query": request_body["query"], "page": 1}],
+                "$skipToken": skip_token,
+            }
+        return response
+
+    mocked_send_raw_request.side_effect = _send_raw_request
+
+    from azext_edge.edge.util.resource_graph import GRAPH_MAX_PAGE_SIZE, ResourceGraph
+
+    resource_graph = ResourceGraph(cmd=mocked_cmd, subscriptions=[get_zeroed_subscription()])
+    queries = {f"key{i}": generate_random_string() for i in range(query_count)}
+    result = resource_graph.query_resources_batch(queries)
+
+    assert list(result) == list(queries)
+    for key, query in queries.items():
+        assert result[key]["data"] == [{"query": query, "page": 1}, {"query": query, "page": 2}]
+    assert mocked_send_raw_request.call_count == query_count * 2
+
+
+def _mock_paged_send_raw_request(mocker, mocked_send_raw_request: Mock, total: int, server_page_size: int = 3):
+    """Serve `total` records, honoring the requested $top, with the offset carried in the skip token."""
+
+    def _send_raw_request(body: str, **_):
+        options = json.loads(body)["options"]
+        offset = int(options.get("$skipToken", 0))
+        end = min(total, offset + min(options.get("$top", server_page_size), server_page_size))
+        response = mocker.MagicMock()
+        response.json.return_value = {"data": [{"index": i} for i in range(offset, end)]}
+        if end < total:
+            response.json.return_value["$skipToken"] = str(end)
+        return response
+
+    mocked_send_raw_request.side_effect = _send_raw_request
+
+
+@pytest.mark.parametrize(
+    "total, page_size, top, expected_pages",
+    [
+        (7, None, None, [3, 3, 1]),
+        (7, 2, None, [2, 3, 2]),
+        (7, None, 4, [3, 1]),
+        (7, 2, 3, [2, 1]),
+        (2, None, 5, [2]),
+        (0, None, None, [0]),
+    ],
+)
+def test_iter_pages(mocker, mocked_cmd, total: int, page_size, top, expected_pages):
+    mocked_send_raw_request: Mock = mocker.patch("azext_edge.edge.util.resource_graph.send_raw_request")
+    _mock_paged_send_raw_request(mocker, mocked_send_raw_request, total=total)
+
+    from azext_edge.edge.util.resource_graph import ResourceGraph
+
+    resource_graph = ResourceGraph(cmd=mocked_cmd, subscriptions=[get_zeroed_subscription()])
+    pages = list(resource_graph.iter_pages(query=generate_random_string(), page_size=page_size, top=top))
+    assert [len(page) for page in pages] == expected_pages
+    assert list(itertools.chain.from_iterable(pages)) == [{"index": i} for i in range(sum(expected_pages))]
+    # No page beyond top is requested.
+    assert mocked_send_raw_request.call_count == len(expected_pages)
+
+    requested_tops = [
+        json.loads(c.kwargs["body"])["options"].get("$top") for c in mocked_send_raw_request.call_args_list
+    ]
+    if top:
+        assert requested_tops[-1] == top - sum(expected_pages[:-1])
+
+    result = resource_graph.query_resources(query=generate_random_string(), page_size=page_size, top=top)
+    assert len(result["data"]) == sum(expected_pages)
+
+
+@pytest.mark.parametrize("response_data, expected", [([{"count_": 42}], 42), ([], 0)])
+def test_count(mocker, mocked_cmd, response_data, expected):
+    mocked_send_raw_request: Mock = mocker.patch("azext_edge.edge.util.resource_graph.send_raw_request")
+    mocked_send_raw_request.return_value.json.return_value = {"data": response_data}
+
+    from azext_edge.edge.util.resource_graph import ResourceGraph
+
+    query = generate_random_string()
+    resource_graph = ResourceGraph(cmd=mocked_cmd, subscriptions=[get_zeroed_subscription()])
+    assert resource_graph.count(query=query) == expected
+    assert json.loads(mocked_send_raw_request.call_args.kwargs["body"])["query"] == f"{query} | summarize count()"
+
+
+def test_queryable_process_query(mocker, mocked_cmd, capsys):
+    mocked_send_raw_request: Mock = mocker.patch("azext_edge.edge.util.resource_graph.send_raw_request")
+    _mock_paged_send_raw_request(mocker, mocked_send_raw_request, total=5)
+
+    from azure.cli.core.azclierror import InvalidArgumentValueError, MutuallyExclusiveArgumentError
+
+    from azext_edge.edge.util.queryable import Queryable
+
+    queryable = Queryable(cmd=mocked_cmd)
+    query = generate_random_string()
+    assert queryable.process_query(query=query) == [{"index": i} for i in range(5)]
+    assert queryable.process_query(query=query, top=2) == [{"index": 0}, {"index": 1}]
+    assert list(queryable.query_rows(query=query, page_size=2)) == [{"index": i} for i in range(5)]
+
+    # Stream writes compact ndjson and returns nothing for the cli to print.
+    capsys.readouterr()
+    assert queryable.process_query(query=query, stream=True, top=4) is None
+    assert capsys.readouterr().out == "".join(f'{{"index":{i}}}\n' for i in range(4))
+
+    mocked_send_raw_request.side_effect = None
+    mocked_send_raw_request.return_value.json.return_value = {"data": [{"count_": 5}]}
+    assert queryable.process_query(query=query, count=True) == {"count": 5}
+
+    with pytest.raises(MutuallyExclusiveArgumentError):
+        queryable.process_query(query=query, count=True, stream=True)
+    for kwargs in [{"page_size": 0}, {"page_size": 1001}, {"top": 0}]:
+        with pytest.raises(InvalidArgumentValueError):
+            queryable.process_query(query=query, **kwargs)
@@ -0,0 +1,53 @@
+# coding=utf-8
+# ----------------------------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License file in the project root for license information.
+# ----------------------------------------------------------------------------------------------
+
+from threading import Event, current_thread
+
+import pytest
+
+from azext_edge.edge.util.workers import DaemonWorkerPool
+
+
+def test_daemon_worker_pool():
+    pool = DaemonWorkerPool(max_workers=2, thread_name_prefix="test-pool")
+
+    def _work(value: int):
+        if value < 0:
+            raise ValueError(value)
+        return value * 2, current_thread()
+
+    futures = [pool.submit(_work, i) for i in range(4)]
+    results = [future.result(timeout=10) for future in futures]
+    assert [value for value, _ in results] == [0, 2, 4, 6]
+    threads = {thread for _, thread in results}
+    assert len(threads) <= 2
+    assert all(thread.daemon and thread.name.startswith("test-pool_") for thread in threads)
+
+    with pytest.raises(ValueError):
+        pool.submit(_work, -1).result(timeout=10)
+    pool.shutdown()
+    assert not any(thread.is_alive() for thread in threads)
+
+
+def test_daemon_worker_pool_shutdown_no_wait():
+    pool = DaemonWorkerPool(max_workers=1, thread_name_prefix="test-pool")
+    release = Event()
+    started = Event()
+
+    def _stall():
+        started.set()
+        release.wait(10)
+
+    stalled = pool.submit(_stall)
+    queued = pool.submit(_stall)
+    assert started.wait(10)
+
+    # Queued work is cancelled, running work is left to its daemon worker.
+    pool.shutdown(wait=False)
+    assert queued.cancelled()
+    assert stalled.running()
+    release.set()
+    assert stalled.result(timeout=10) is None